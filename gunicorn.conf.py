@@ -0,0 +1,89 @@
+"""
+Gunicorn configuration for Vaani
+Production server: one master preloads the app and its read-only data, then forks
+workers that share those pages copy-on-write.
+
+Run:
+    gunicorn -c gunicorn.conf.py
+
+Environment:
+    PORT              listen port (default 5000)
+    WEB_CONCURRENCY   number of workers (default: CPU count)
+    VAANI_SERVER      'asgi' (default): uvicorn workers serving vaani.asgi:app
+                      'wsgi': threaded workers serving the Flask app, vaani.web:app
+
+Signals to the master:
+    HUP               graceful restart: fresh workers are forked from the preloaded
+                      master and old ones finish their requests before exiting
+    USR2, then TERM   deploy new code or data: USR2 starts a new master that
+                      preloads again; TERM to the old master then drains it
+    TTIN / TTOU       one more / one fewer worker
+"""
+
+import multiprocessing
+import os
+
+from vaani.core import config as Config
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+if os.getenv('VAANI_SERVER', 'asgi') == 'wsgi':
+    wsgi_app = 'vaani.web:app'
+    worker_class = 'gthread'
+    threads = Config.WORKER_THREADS
+else:
+    wsgi_app = 'vaani.asgi:app'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+
+# Import the app (Config, API keys, LanguageManager, OfflineMode, intent router)
+# once in the master instead of once per worker
+preload_app = True
+
+# Any worker may get a session's next request, so sessions live in a shared file
+if workers > 1:
+    os.environ.setdefault('SESSION_BACKEND', 'sqlite')
+
+# Streamed answers can take a while; a worker that stops heartbeating is restarted
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    from vaani.core.workers import preload
+
+    for directory in ["data/expense_data", "data/offline_cache", "cache", "logs"]:
+        os.makedirs(directory, exist_ok=True)
+    loaded = preload()
+    server.log.info("Preloaded read-only data: %s", loaded)
+
+
+def post_fork(server, worker):
+    from vaani import web
+    from vaani.core.workers import start_worker
+
+    start_worker()
+    web.audio_cache.start_janitor()
+    web.connectivity.start()
+    web.price_prefetcher.start()
+    web.start_keep_alive()
+
+
+def worker_exit(server, worker):
+    from vaani.core.workers import stop_worker
+
+    stop_worker()
+
+
+def child_exit(server, worker):
+    from vaani.core.workers import forget_worker
+
+    # Covers workers that were killed without running worker_exit
+    forget_worker(worker.pid, master_pid=server.pid)
+
+
+def on_exit(server):
+    from vaani.core.workers import clear_state
+
+    clear_state(master_pid=server.pid)
@@ -0,0 +1,167 @@
+# benchmark_async_server.py - Thread-per-request Flask vs the ASGI app under concurrent load
+#
+# Each server runs in its own process with the weather upstream replaced by a
+# fixed delay (time.sleep for Flask, asyncio.sleep for ASGI) and TTS switched
+# off, so the numbers show how each model waits, not how fast the network is.
+#
+# Usage: python tests/benchmark_async_server.py [requests] [concurrency] [latency_ms]
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+SERVERS = ['flask', 'asgi']
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _fake_weather(city):
+    return {'main': {'temp': 30, 'humidity': 60}, 'weather': [{'description': 'clear sky'}],
+            'wind': {'speed': 2}, 'name': city}
+
+
+def serve(kind, port, latency):
+    """Run one server with simulated upstream latency (child process)"""
+    from vaani import web
+    from vaani.services.weather import weather_service
+
+    def fetch(city):
+        time.sleep(latency)
+        return _fake_weather(city)
+
+    async def fetch_async(city):
+        await asyncio.sleep(latency)
+        return _fake_weather(city)
+
+    weather_service._fetch_current_weather = fetch
+    weather_service._fetch_current_weather_async = fetch_async
+    web.text_to_speech_file = lambda *args, **kwargs: None
+
+    if kind == 'flask':
+        from werkzeug.serving import make_server
+        make_server('127.0.0.1', port, web.app, threaded=True).serve_forever()
+    else:
+        import uvicorn
+        from vaani import asgi
+
+        async def no_audio(text, lang='hi'):
+            return None
+        asgi._audio_url = no_audio
+        uvicorn.run(asgi.app, host='127.0.0.1', port=port, log_level='warning')
+
+
+def _proc_status(pid):
+    """Peak RSS (MB) and current thread count of a process, from /proc"""
+    fields = {}
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            key, _, value = line.partition(':')
+            fields[key] = value.split()
+    return int(fields['VmHWM'][0]) / 1024, int(fields['Threads'][0])
+
+
+def _sample_threads(pid, stop, peak):
+    """Record the highest thread count seen until stop is set"""
+    while not stop.is_set():
+        try:
+            peak[0] = max(peak[0], _proc_status(pid)[1])
+        except OSError:
+            return
+        stop.wait(0.05)
+
+
+async def _load(port, total, concurrency):
+    import httpx
+
+    url = f'http://127.0.0.1:{port}/api/query'
+    times = []
+    failures = 0
+    pending = iter(range(total))
+    # A new connection per request, like many separate clients
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=0)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal failures
+            for i in pending:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(url, json={'query': f"शहर{i} का मौसम",
+                                                            'session_id': f"bench-{i}"})
+                    response.raise_for_status()
+                except Exception:
+                    failures += 1
+                    continue
+                times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+    return times, failures, elapsed
+
+
+def _wait_for_port(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def benchmark_server(kind, total, concurrency, latency):
+    port = _free_port()
+    server = subprocess.Popen([sys.executable, __file__, '--serve', kind, str(port), str(latency)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                              env={**os.environ, 'SDL_AUDIODRIVER': 'dummy'})
+    try:
+        if not _wait_for_port(port):
+            raise RuntimeError("server did not start")
+        asyncio.run(_load(port, min(concurrency, total), concurrency))  # warm up
+        stop, peak = threading.Event(), [0]
+        sampler = threading.Thread(target=_sample_threads, args=(server.pid, stop, peak), daemon=True)
+        sampler.start()
+        times, failures, elapsed = asyncio.run(_load(port, total, concurrency))
+        stop.set()
+        sampler.join()
+        rss_mb, threads = _proc_status(server.pid)[0], peak[0]
+    finally:
+        server.terminate()
+        server.wait()
+    return times, failures, elapsed, rss_mb, threads
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    latency = (int(sys.argv[3]) if len(sys.argv) > 3 else 200) / 1000
+    print(f"{total} requests, {concurrency} concurrent, {latency * 1000:.0f} ms upstream latency")
+    print(f"{'Server':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'failed':>8}{'peak MB':>10}{'max threads':>13}")
+
+    for kind in SERVERS:
+        try:
+            times, failures, elapsed, rss_mb, threads = benchmark_server(kind, total, concurrency, latency)
+        except Exception as e:
+            print(f"{kind:<8}  ✗ {e}")
+            continue
+        p95 = statistics.quantiles(times, n=20)[-1] if len(times) > 1 else float('nan')
+        print(f"{kind:<8}{len(times) / elapsed:>10.1f}{statistics.median(times):>10.1f}"
+              f"{p95:>10.1f}{failures:>8}{rss_mb:>10.1f}{threads:>13}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,55 @@
+# benchmark_expense_ledger.py - Add-transaction and summary time as a user's history grows
+#
+# Usage: python tests/benchmark_expense_ledger.py [history] [operations]
+
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from vaani.services.finance.expense_ledger import ExpenseLedger
+
+CATEGORIES = ["खाना", "किराना", "यातायात", "खेती", "फोन"]
+
+
+def timed(fn, count):
+    times = []
+    for i in range(count):
+        start = time.perf_counter()
+        fn(i)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(name, times):
+    times = sorted(times)
+    print(f"  {name:<16} median {statistics.median(times):.3f} ms   p95 {times[int(len(times) * 0.95)]:.3f} ms")
+
+
+def main():
+    history = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    start_date = datetime.now() - timedelta(days=3 * 365)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = ExpenseLedger(f"{tmp}/ledger.db")
+        for size in (1000, history):
+            user = f"user{size}"
+            ledger.ensure_user(user)
+            began = time.perf_counter()
+            for i in range(size):
+                ledger.append(user, "expense", CATEGORIES[i % len(CATEGORIES)], 10 + i % 90,
+                              date=start_date + timedelta(minutes=i * 3 * 365 * 24 * 60 // size))
+            print(f"{size} transactions of history (written in {time.perf_counter() - began:.1f} s)")
+
+            today = datetime.now().date().isoformat()
+            month = datetime.now().strftime("%Y-%m")
+            report("add", timed(lambda i: ledger.append(user, "expense", "खाना", 50), operations))
+            report("today summary", timed(lambda i: (ledger.summary(user, 'day', today),
+                                                     list(ledger.transactions(user, 'day', today))), operations))
+            report("month summary", timed(lambda i: ledger.summary(user, 'month', month), operations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmark_offline_store.py - Offline answer lookup and save time as the store grows
+#
+# Usage: python tests/benchmark_offline_store.py [answers] [lookups]
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from vaani.core.offline_store import OfflineAnswerStore
+
+# Word pools for synthetic questions: a few very common words and a long tail
+COMMON = ["क्या", "कैसे", "है", "में", "की", "का", "के", "कब", "कितना", "बताओ"]
+SUBJECTS = [f"विषय{i}" for i in range(5000)]
+PLACES = [f"जगह{i}" for i in range(2000)]
+
+
+def question(rng):
+    words = rng.sample(COMMON, 3) + [rng.choice(SUBJECTS), rng.choice(PLACES)]
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def timed(fn, args_list):
+    times = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OfflineAnswerStore(f"{tmp}/answers.db")
+        questions = [question(rng) for _ in range(total)]
+
+        start = time.perf_counter()
+        db = store._db()
+        for i, q in enumerate(questions):
+            store.put('general', q, f"जवाब {i}")
+            if i and i % 20000 == 0:
+                print(f"  {i} answers saved ({time.perf_counter() - start:.0f}s)")
+        db.execute("PRAGMA optimize")
+
+        saves = timed(store.put, [('general', question(rng), "नया जवाब") for _ in range(lookups)])
+        exact = timed(store.find, [('general', rng.choice(questions)) for _ in range(lookups)])
+        # Similar: one word of a saved question changed
+        similar = []
+        for _ in range(lookups):
+            words = rng.choice(questions).split()
+            words[rng.randrange(len(words))] = rng.choice(COMMON)
+            similar.append(('general', ' '.join(words)))
+        near = timed(store.find, similar)
+        misses = timed(store.find, [('general', question(rng)) for _ in range(lookups)])
+
+    print(f"{total} cached answers")
+    print(f"{'Operation':<16}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, times in [("save", saves), ("exact lookup", exact), ("similar lookup", near), ("miss", misses)]:
+        times.sort()
+        print(f"{name:<16}{statistics.mean(times):>10.2f}{times[len(times) // 2]:>10.2f}"
+              f"{times[int(len(times) * 0.99)]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmark_tts_engines.py - Per-sentence synthesis time for every installed TTS engine
+#
+# Usage: python tests/benchmark_tts_engines.py [iterations]
+
+import statistics
+import sys
+import time
+
+from vaani.core.connectivity import check_connectivity
+from vaani.core.tts_engines import ENGINE_CLASSES
+
+SENTENCES = [
+    "नमस्ते, मैं वाणी हूं।",
+    "आज लखनऊ में बारिश की संभावना पचास प्रतिशत है।",
+    "गेहूं का भाव मंडी में दो हजार एक सौ रुपये प्रति क्विंटल है।",
+    "आपातकाल में एम्बुलेंस के लिए एक सौ आठ पर कॉल करें।",
+]
+
+
+def benchmark_engine(engine, iterations):
+    """Time every sentence `iterations` times; returns per-sentence times in ms"""
+    times = []
+    for _ in range(iterations):
+        for sentence in SENTENCES:
+            start = time.perf_counter()
+            engine.synthesize(sentence, 'hi')
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    online = check_connectivity()
+    print(f"Online: {online}")
+    print(f"{'Engine':<10}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}{'chars/s':>10}")
+
+    chars = sum(len(s) for s in SENTENCES) * iterations
+    for name, cls in ENGINE_CLASSES.items():
+        engine = cls()
+        if not engine.available() or not engine.supports('hi'):
+            print(f"{name:<10}  not installed / no Hindi voice")
+            continue
+        if engine.requires_network and not online:
+            print(f"{name:<10}  skipped (offline)")
+            continue
+        try:
+            times = benchmark_engine(engine, iterations)
+        except Exception as e:
+            print(f"{name:<10}  ✗ {e}")
+            continue
+        total_s = sum(times) / 1000
+        print(f"{name:<10}{statistics.mean(times):>10.1f}{statistics.median(times):>10.1f}"
+              f"{max(times):>10.1f}{chars / total_s:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmark_voice_effects.py - News anchor voice effects: pydub/FFmpeg path vs in-memory NumPy path
+#
+# Usage: python tests/benchmark_voice_effects.py [iterations]
+#
+# Uses a real gTTS sentence when online; otherwise a synthetic tone, which
+# both paths read as WAV (so the pydub numbers then exclude the MP3 decode).
+
+import math
+import statistics
+import struct
+import sys
+import time
+import wave
+from io import BytesIO
+
+from vaani.core import audio_effects
+from vaani.core.tts_engines import GTTSEngine
+from vaani.core.voice_tool import PYDUB_AVAILABLE, FFMPEG_AVAILABLE, apply_voice_effects
+
+SENTENCE = "आज लखनऊ में बारिश की संभावना पचास प्रतिशत है, कृपया छाता साथ रखें।"
+
+
+def _sample_audio():
+    try:
+        return GTTSEngine().synthesize(SENTENCE, 'hi'), 'mp3'
+    except Exception as e:
+        print(f"gTTS unavailable ({e}); using a 3 second synthetic tone")
+    rate = 24000
+    frames = b''.join(struct.pack('<h', int(12000 * math.sin(2 * math.pi * 220 * i / rate)))
+                      for i in range(3 * rate))
+    output = BytesIO()
+    with wave.open(output, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return output.getvalue(), 'wav'
+
+
+def pydub_path(audio_bytes, audio_format):
+    """The original chain: decode, pitch, speedup, normalize, re-encode to MP3"""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(BytesIO(audio_bytes), format=audio_format)
+    output = BytesIO()
+    apply_voice_effects(audio, 'news_anchor').export(output, format='mp3')
+    return output.getvalue()
+
+
+def numpy_path(audio_bytes, audio_format):
+    return audio_effects.process(audio_bytes, audio_format, 'news_anchor')
+
+
+def measure(func, audio_bytes, audio_format, iterations):
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func(audio_bytes, audio_format)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    audio_bytes, audio_format = _sample_audio()
+    print(f"Input: {len(audio_bytes)} bytes of {audio_format}, {iterations} iterations")
+    print(f"{'Path':<8}{'mean ms':>10}{'p50 ms':>10}{'max ms':>10}")
+
+    paths = []
+    if audio_effects.NUMPY_AVAILABLE:
+        paths.append(('numpy', numpy_path))
+    else:
+        print("numpy   not installed")
+    if PYDUB_AVAILABLE and FFMPEG_AVAILABLE:
+        paths.append(('pydub', pydub_path))
+    else:
+        print("pydub   pydub/FFmpeg not available")
+
+    for name, func in paths:
+        try:
+            times = measure(func, audio_bytes, audio_format, iterations)
+        except Exception as e:
+            print(f"{name:<8}✗ {e}")
+            continue
+        print(f"{name:<8}{statistics.mean(times):>10.1f}{statistics.median(times):>10.1f}{max(times):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,7 @@ from vaani.services.agriculture.agri_scheme_service import (
 )
 
 
-def mock_bolo(text):
+def mock_bolo(text, pause=0.0):
     """Mock function for bolo to print instead of speak."""
     print(f"[BOLO] {text}")
 
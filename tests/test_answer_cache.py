@@ -0,0 +1,115 @@
+"""
+Test script for the Gemini answer cache
+Checks normalization, near-duplicate reuse, number/operator guards, TTL and the size budget.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from vaani.core import answer_cache
+from vaani.core.answer_cache import AnswerCache, normalize_question, template_key
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = AnswerCache(str(tmp_path / "answers.db"), ttl=60, threshold=0.8)
+    monkeypatch.setattr(answer_cache, "_answer_cache", cache)
+    return cache
+
+
+def test_normalize_question():
+    assert normalize_question("मुझे बताओ, इंद्रधनुष कैसे बनता है?") == "इंद्रधनुष कैसे बनता है"
+    assert normalize_question("ज़मीन में पाँच बीज") == normalize_question("जमीन में पांच बीज")
+    assert normalize_question("२५ और ३०") == "25 और 30"
+
+
+def test_near_duplicates_share_an_answer(cache):
+    template = template_key('gk', "सवाल: {question}")
+    cache.put(template, "पौधे हरे क्यों होते हैं?", "क्लोरोफिल की वजह से।")
+
+    assert cache.get(template, "पौधे हरे क्यों होते हैं") == "क्लोरोफिल की वजह से।"
+    assert cache.get(template, "पौधे हरे क्यों होते है?") == "क्लोरोफिल की वजह से।"
+    assert cache.get(template, "पत्ते पीले क्यों होते हैं?") is None
+    # Another prompt template never sees this answer
+    assert cache.get(template_key('gk', "प्रश्न: {question}"), "पौधे हरे क्यों होते हैं") is None
+    assert cache.get(template, "पौधे हरे क्यों होते है", threshold=1.0) is None
+
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['near_hits'], stats['misses']) == (1, 1, 3)
+    assert stats['hit_rate'] == "40.0%"
+
+
+def test_numbers_and_guard_must_match(cache):
+    cache.put('calc', "5 बोरी x 50 किलो कुल कितना", "250 किलो", guard='×')
+    assert cache.get('calc', "6 बोरी x 50 किलो कुल कितना", guard='×') is None
+    assert cache.get('calc', "5 बोरी x 50 किलो कुल कितना है", guard='×') == "250 किलो"
+
+    cache.put('calc', "5+3", "8", guard='+')
+    assert cache.get('calc', "5-3", guard='-') is None
+    assert cache.get('calc', "5 + 3", guard='+') == "8"
+
+
+def test_question_words_and_negations_must_match(cache):
+    cache.put('gk', "प्रधानमंत्री किसान सम्मान निधि योजना में आवेदन क्यों करें", "क्योंकि...")
+    assert cache.get('gk', "प्रधानमंत्री किसान सम्मान निधि योजना में आवेदन कैसे करें") is None
+    assert cache.get('gk', "प्रधानमंत्री किसान सम्मान निधि योजना में आवेदन क्यों करें?") == "क्योंकि..."
+
+    cache.put('gk', "क्या मुझे किसान क्रेडिट कार्ड से लोन लेना चाहिए या नहीं", "सोच समझकर।")
+    assert cache.get('gk', "क्या मुझे किसान क्रेडिट कार्ड से लोन लेना चाहिए") is None
+    assert cache.get('gk', "क्या किसान क्रेडिट कार्ड से लोन लेना चाहिए या नहीं") == "सोच समझकर।"
+
+
+def test_every_spoken_number_must_match(cache):
+    cache.put('gk', "पैंतालीस बोरी का औसत वजन निकालो", "A45")
+    assert cache.get('gk', "पैंतीस बोरी का औसत वजन निकालो") is None
+    assert cache.get('gk', "साढ़े तीन बोरी का औसत वजन निकालो") is None
+    assert cache.get('gk', "पैंतालीस बोरी का औसत वजन निकालो जी") == "A45"
+
+
+def test_ttl_and_size_budget(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.db"), ttl=0.2, max_entries=3)
+    for i, question in enumerate(["सूरज क्यों चमकता है", "चांद क्यों घटता है", "बारिश कैसे होती है", "हवा क्यों चलती है"]):
+        cache.put('gk', question, f"जवाब {i}")
+    assert len(cache) == 3
+    assert cache.get('gk', "सूरज क्यों चमकता है") is None
+    assert cache.get_stats()['evicted'] == 1
+
+    time.sleep(0.25)
+    assert cache.get('gk', "हवा क्यों चलती है") is None
+    assert cache.purge_expired() == 3
+
+
+def test_answers_persist_across_instances(tmp_path):
+    path = str(tmp_path / "answers.db")
+    AnswerCache(path).put('gk', "आसमान नीला क्यों है", "रोशनी के बिखरने से।")
+    assert AnswerCache(path).get('gk', "आसमान नीला क्यों है?") == "रोशनी के बिखरने से।"
+
+
+def test_services_call_gemini_once(cache, monkeypatch):
+    from vaani.services.knowledge.general_knowledge_service import GeneralKnowledgeService
+    from vaani.services.finance.simple_calculator_service import SimpleCalculatorService
+
+    prompts = []
+
+    def generate_content(prompt):
+        prompts.append(prompt)
+        return SimpleNamespace(text=f"जवाब {len(prompts)}")
+
+    gk = GeneralKnowledgeService()
+    gk.model = SimpleNamespace(generate_content=generate_content)
+    assert gk.ask_question("तारे क्यों टिमटिमाते हैं?") == ("जवाब 1", None)
+    assert gk.ask_question("तारे क्यों टिमटिमाते हैं") == ("जवाब 1", None)
+
+    calculator = SimpleCalculatorService()
+    calculator.model = SimpleNamespace(generate_content=generate_content)
+    monkeypatch.setattr(calculator, "solve_locally", lambda query: None)
+    assert calculator.solve_with_explanation("12 और 8 जोड़ो") == ("जवाब 2", None)
+    assert calculator.solve_with_explanation("12 और 8 जोड़ो?") == ("जवाब 2", None)
+    assert calculator.solve_with_explanation("12 और 8 घटाओ") == ("जवाब 3", None)
+    assert len(prompts) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
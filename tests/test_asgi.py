@@ -0,0 +1,154 @@
+"""
+Test script for the ASGI application
+Drives vaani.asgi.app directly: async queries, streaming order, cancellation
+on client disconnect and the Flask fallback for other routes.
+"""
+
+import asyncio
+import json
+import time
+
+import vaani.asgi as asgi
+
+
+async def _call(method, path, payload=None, disconnect_after=None):
+    """Send one request to the app; returns the list of sent ASGI messages"""
+    sent = []
+    messages = [{'type': 'http.request', 'body': json.dumps(payload or {}).encode(), 'more_body': False}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        if disconnect_after is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(disconnect_after)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+             'headers': [(b'content-type', b'application/json')], 'http_version': '1.1'}
+    await asgi.app(scope, receive, send)
+    return sent
+
+
+def _body(sent):
+    return b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body')
+
+
+def _no_audio(monkeypatch):
+    async def no_audio(text, lang='hi'):
+        return None
+    monkeypatch.setattr(asgi, "_audio_url", no_audio)
+
+
+def test_concurrent_queries_share_the_loop(monkeypatch):
+    """Twenty queries waiting 0.2s upstream finish together, not one after another"""
+    async def fake_dispatch(command, session, say):
+        await asyncio.sleep(0.2)
+        say(f"जवाब: {command}", pause=0.3)
+
+    monkeypatch.setattr(asgi, "dispatch_command_async", fake_dispatch)
+    _no_audio(monkeypatch)
+
+    async def run():
+        return await asyncio.gather(*[
+            _call('POST', '/api/query', {'query': f"सवाल {i}", 'session_id': f"asgi-{i}"}) for i in range(20)
+        ])
+
+    start = time.perf_counter()
+    responses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    result = json.loads(_body(responses[3]))
+    assert result['success'] is True
+    assert result['text'] == "जवाब: सवाल 3"
+    assert set(result) == {'success', 'text', 'audio_file', 'language', 'waiting_for_news'}
+
+
+def test_stream_keeps_chunk_order(monkeypatch):
+    chunks = ["पहला वाक्य।", "दूसरा वाक्य।", "तीसरा वाक्य।"]
+
+    async def fake_dispatch(command, session, say):
+        for text in chunks:
+            say(text)
+
+    async def slow_first(text, lang='hi'):
+        # Earlier chunks take longer, so they finish out of order
+        await asyncio.sleep(0.05 * (len(chunks) - chunks.index(text)))
+        return None
+
+    monkeypatch.setattr(asgi, "dispatch_command_async", fake_dispatch)
+    monkeypatch.setattr(asgi, "_audio_url", slow_first)
+
+    sent = asyncio.run(_call('POST', '/api/query/stream', {'query': 'कुछ भी'}))
+    events = [json.loads(raw.split("\n")[1][len("data: "):])
+              for raw in _body(sent).decode().strip().split("\n\n")]
+
+    assert [event.get('index') for event in events[:-1]] == [0, 1, 2]
+    assert [event['text'] for event in events[:-1]] == chunks
+    assert events[-1]['text'] == ' '.join(chunks)
+
+
+def test_disconnect_cancels_query(monkeypatch):
+    """A client that goes away stops the upstream wait instead of finishing it"""
+    state = {}
+
+    async def hanging_dispatch(command, session, say):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            state['cancelled'] = True
+            raise
+
+    monkeypatch.setattr(asgi, "dispatch_command_async", hanging_dispatch)
+
+    start = time.perf_counter()
+    sent = asyncio.run(_call('POST', '/api/query', {'query': 'धीमा सवाल'}, disconnect_after=0.1))
+
+    assert state.get('cancelled') is True
+    assert time.perf_counter() - start < 1.0
+    assert sent == []
+
+
+def test_other_routes_use_flask_app():
+    sent = asyncio.run(_call('GET', '/api/health'))
+    assert sent[0]['status'] == 200
+    assert json.loads(_body(sent))['status'] == 'ok'
+
+    sent = asyncio.run(_call('POST', '/api/query', {'query': '  '}))
+    assert sent[0]['status'] == 400
+
+
+def test_startup_starts_background_jobs(monkeypatch):
+    """uvicorn vaani.asgi:app starts the janitor and the price prefetcher, as gunicorn workers do"""
+    started = []
+    monkeypatch.setattr(asgi.web.audio_cache, "start_janitor", lambda: started.append('janitor'))
+    monkeypatch.setattr(asgi.web.price_prefetcher, "start", lambda: started.append('prices'))
+    sent = []
+    messages = [{'type': 'lifespan.startup'}]
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    async def startup():
+        task = asyncio.ensure_future(asgi.app({'type': 'lifespan'}, receive, send))
+        while not sent:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(startup())
+    assert sent == [{'type': 'lifespan.startup.complete'}]
+    assert started == ['janitor', 'prices']
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,115 @@
+"""
+Test script for the content-addressed audio cache
+Covers key separation, byte accounting, pinned entries and LFU/LRU eviction.
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from vaani.core.audio_cache import AudioCache, audio_key
+
+
+def _writer(size, calls=None):
+    def render(filepath):
+        if calls is not None:
+            calls.append(filepath)
+            time.sleep(0.05)
+        with open(filepath, 'wb') as f:
+            f.write(b'\xff' * size)
+        return True
+    return render
+
+
+def test_keys_include_language_and_engine():
+    """The same text in another language or engine is a different entry"""
+    assert audio_key("नमस्ते", 'hi') != audio_key("नमस्ते", 'mr')
+    assert audio_key("नमस्ते", 'hi', engine='gtts') != audio_key("नमस्ते", 'hi', engine='espeak')
+    assert audio_key("नमस्ते", 'hi', voice_style='news_anchor') != audio_key("नमस्ते", 'hi')
+
+
+def test_hits_and_byte_accounting():
+    """Second request is a hit and bytes are tracked without scanning"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, max_bytes=10_000)
+        path = cache.get_or_create("पहला", 'hi', 'default', 'gtts', _writer(1000))
+
+        assert os.path.exists(path)
+        assert cache.get("पहला", 'hi') == path
+        stats = cache.get_stats()
+        assert stats['bytes'] == 1000 and stats['files'] == 1 and stats['hits'] == 1
+
+
+def test_concurrent_misses_render_once():
+    """Identical concurrent misses share one synthesis"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, max_bytes=10_000)
+        calls = []
+        threads = [threading.Thread(target=cache.get_or_create,
+                                    args=("एक ही", 'hi', 'default', 'gtts', _writer(100, calls)))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+
+
+def test_eviction_respects_pins_and_frequency():
+    """Over budget, rarely used entries go first and pinned ones stay"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp, max_bytes=2500)
+        cache.pin("नमस्ते", 'hi')
+        for text in ["नमस्ते", "लोकप्रिय", "कभी कभी"]:
+            cache.get_or_create(text, 'hi', 'default', 'gtts', _writer(1000))
+        for _ in range(3):
+            cache.get("लोकप्रिय", 'hi')
+
+        assert cache.run_janitor() == 1
+        assert cache.get("नमस्ते", 'hi') is not None
+        assert cache.get("लोकप्रिय", 'hi') is not None
+        assert cache.get("कभी कभी", 'hi') is None
+        assert cache.total_bytes == 2000
+        assert len([f for f in os.listdir(tmp) if f.endswith('.mp3')]) == 2
+
+
+def test_index_survives_restart():
+    """A new cache instance reloads entries from the saved index"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+        path = cache.get_or_create("फिर से", 'hi', 'default', 'gtts', _writer(500))
+        cache.save_index()
+
+        reloaded = AudioCache(tmp)
+        assert reloaded.get("फिर से", 'hi') == path
+        assert reloaded.total_bytes == 500
+
+
+def test_workers_share_one_janitor():
+    """Only one cache per directory evicts, over every worker's files; evicted hits re-render"""
+    with tempfile.TemporaryDirectory() as tmp:
+        worker_a, worker_b = AudioCache(tmp, max_bytes=1500), AudioCache(tmp, max_bytes=1500)
+        worker_a.get_or_create("पहला", 'hi', 'default', 'gtts', _writer(1000))
+        worker_b.get_or_create("दूसरा", 'hi', 'default', 'gtts', _writer(1000))
+
+        # Worker A sees B's file in its rescan, so the budget covers both
+        assert worker_a.run_janitor() == 1
+        assert worker_a.total_bytes == 1000
+        assert worker_b.run_janitor() == 0
+
+        calls = []
+        assert worker_b.get("दूसरा", 'hi') is None
+        assert worker_b.get_stats()['vanished'] == 1
+        path = worker_b.get_or_create("दूसरा", 'hi', 'default', 'gtts', _writer(1000, calls))
+        assert os.path.exists(path) and len(calls) == 1
+
+
+if __name__ == "__main__":
+    test_keys_include_language_and_engine()
+    test_hits_and_byte_accounting()
+    test_concurrent_misses_render_once()
+    test_eviction_respects_pins_and_frequency()
+    test_index_survives_restart()
+    test_workers_share_one_janitor()
+    print("✓ Audio cache tests passed")
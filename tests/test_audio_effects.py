@@ -0,0 +1,75 @@
+"""
+Test script for the in-memory (NumPy) voice effects
+Checks pitch, tempo and normalization of the news anchor chain on a test tone.
+"""
+
+import math
+import struct
+import wave
+from io import BytesIO
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from vaani.core import audio_effects
+from vaani.core.audio_effects import EffectChain, VOICE_CHAINS, decode, encode_wav
+
+
+def _tone_wav(freq=220.0, seconds=1.0, rate=24000, amplitude=0.5):
+    frames = b''.join(
+        struct.pack('<h', int(amplitude * 32767 * math.sin(2 * math.pi * freq * i / rate)))
+        for i in range(int(seconds * rate))
+    )
+    output = BytesIO()
+    with wave.open(output, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return output.getvalue()
+
+
+def _frequency(samples, rate):
+    """Dominant frequency of a mono signal"""
+    spectrum = np.abs(np.fft.rfft(samples[:, 0]))
+    return np.fft.rfftfreq(len(samples), 1 / rate)[spectrum.argmax()]
+
+
+def test_wav_round_trip():
+    samples, rate = decode(_tone_wav(), 'wav')
+    assert rate == 24000 and samples.shape == (24000, 1)
+    again, _ = decode(encode_wav(samples, rate), 'wav')
+    assert np.abs(again - samples).max() < 1e-3
+
+
+def test_news_anchor_chain_shifts_pitch_and_tempo():
+    samples, rate = decode(_tone_wav(), 'wav')
+    processed = VOICE_CHAINS['news_anchor'].apply(samples, rate)
+
+    pitch = 2.0 ** 0.3
+    expected_seconds = 1.0 / pitch / 1.05
+    assert abs(len(processed) / rate - expected_seconds) < 0.03
+    assert abs(_frequency(processed, rate) / 220.0 - pitch) < 0.05
+    assert abs(np.abs(processed).max() - 10 ** (-0.1 / 20)) < 1e-3
+
+
+def test_time_stretch_keeps_pitch():
+    samples, rate = decode(_tone_wav(), 'wav')
+    stretched = EffectChain(tempo=1.5).apply(samples, rate)
+    assert abs(len(stretched) / rate - 1.0 / 1.5) < 0.03
+    assert abs(_frequency(stretched, rate) - 220.0) < 10
+
+
+def test_process_returns_wav():
+    output = audio_effects.process(_tone_wav(), 'wav', 'news_anchor')
+    with wave.open(BytesIO(output), 'rb') as wav:
+        assert wav.getframerate() == 24000 and wav.getnchannels() == 1
+
+
+if __name__ == "__main__":
+    test_wav_round_trip()
+    test_news_anchor_chain_shifts_pitch_and_tempo()
+    test_time_stretch_keeps_pitch()
+    test_process_returns_wav()
+    print("✓ Audio effects tests passed")
@@ -0,0 +1,109 @@
+"""
+Test script for the shared Cache Manager
+Covers LRU bounds, per-category TTL expiry, clear(category) and stats.
+"""
+
+import threading
+import time
+
+from vaani.core.cache_manager import CacheManager
+
+
+def test_lru_eviction_by_entries():
+    """Least recently used entries are evicted first"""
+    cache = CacheManager(max_entries=3)
+    for key in ["a", "b", "c"]:
+        cache.set(key, key.upper(), 'static')
+
+    cache.get("a")                      # "b" is now least recently used
+    cache.set("d", "D", 'static')
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_byte_budget():
+    """Entries are evicted to stay within the memory budget"""
+    cache = CacheManager(max_bytes=4096)
+    for i in range(20):
+        cache.set(f"k{i}", "x" * 500, 'static')
+
+    stats = cache.get_stats()
+    assert stats['memory_bytes'] <= 4096
+    assert stats['evictions'] > 0
+    assert not cache.set("huge", "x" * 10000, 'static')
+
+
+def test_category_ttl_and_sweep():
+    """Expired entries are swept without being read"""
+    cache = CacheManager()
+    cache.register_category('short', 0.05)
+    for i in range(5):
+        cache.set(f"s{i}", i, 'short')
+    cache.set("keep", "value", 'static')
+
+    time.sleep(0.1)
+    cache.set("trigger", "sweep", 'static')   # every set runs the sweep
+
+    assert cache.category_size('short') == 0
+    assert cache.get_stats()['expirations'] == 5
+    assert cache.get("keep") == "value"
+
+
+def test_clear_category():
+    """clear(category) only removes that category"""
+    cache = CacheManager()
+    cache.set("w1", "sunny", 'weather')
+    cache.set("n1", "headline", 'news')
+
+    cache.clear('weather')
+
+    assert cache.get("w1") is None
+    assert cache.get("n1") == "headline"
+    assert cache.get_stats()['categories']['news']['entries'] == 1
+
+
+def test_view_and_stats():
+    """Category views behave like dicts and feed per-category stats"""
+    cache = CacheManager()
+    prices = cache.view('agri_prices')
+    prices["आलू_लखनऊ"] = ("1200", "Lucknow", "Potato")
+
+    assert "आलू_लखनऊ" in prices
+    assert len(prices) == 1
+    assert prices.get("प्याज_लखनऊ") is None
+    assert prices["आलू_लखनऊ"][0] == "1200"
+
+    stats = cache.get_stats()['categories']['agri_prices']
+    assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+def test_concurrent_counters():
+    """Stats stay consistent under concurrent access"""
+    cache = CacheManager()
+    cache.set("shared", 1, 'static')
+
+    def worker():
+        for _ in range(1000):
+            cache.get("shared")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 8000
+    assert stats['total_queries'] == 8000
+
+
+if __name__ == "__main__":
+    test_lru_eviction_by_entries()
+    test_byte_budget()
+    test_category_ttl_and_sweep()
+    test_clear_category()
+    test_view_and_stats()
+    test_concurrent_counters()
+    print("✓ Cache manager tests passed")
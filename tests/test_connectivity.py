@@ -0,0 +1,126 @@
+"""
+Test script for the connectivity monitor
+Checks non-blocking reads, adaptive probing, passive upstream signals and change hooks.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from vaani.core import connectivity, http
+from vaani.core.connectivity import ConnectivityMonitor
+
+
+class FakeProbe:
+    def __init__(self, online=True, delay=0.0):
+        self.online, self.delay, self.calls = online, delay, 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.online
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_is_online_never_waits_for_the_probe():
+    probe = FakeProbe(online=False, delay=0.5)
+    monitor = ConnectivityMonitor(probe, interval=60)
+    try:
+        start = time.perf_counter()
+        assert monitor.is_online()                 # unknown counts as online
+        assert time.perf_counter() - start < 0.05
+        assert _wait_for(lambda: monitor.online is False)
+        assert not monitor.is_online()
+    finally:
+        monitor.stop()
+
+
+def test_probes_faster_after_a_change():
+    probe = FakeProbe(online=True)
+    monitor = ConnectivityMonitor(probe, interval=60, fast_interval=0.02, fast_probes=3)
+    changes = []
+    monitor.on_change(changes.append)
+    monitor.start()
+    try:
+        # First result is a change: three quick probes, then the steady interval
+        assert _wait_for(lambda: monitor.next_interval() == 60)
+        time.sleep(0.1)
+        assert probe.calls == 4
+        assert changes == [True]
+        assert monitor.get_state()['changes'] == 0   # the first result is not a change of state
+    finally:
+        monitor.stop()
+
+
+def test_upstream_failures_switch_offline_at_once():
+    probe = FakeProbe(online=True)
+    monitor = ConnectivityMonitor(probe, interval=60, fast_interval=60, failure_threshold=3)
+    monitor.check()
+    changes = []
+    monitor.on_change(changes.append)
+
+    monitor.record_failure('api.example.com')
+    monitor.record_failure('api.example.com')
+    assert monitor.is_online()
+    monitor.record_failure('api.example.com')
+    assert not monitor.is_online()
+    assert monitor.get_state()['source'] == 'api.example.com'
+
+    # The failure wakes the thread for a confirming probe right away
+    assert _wait_for(lambda: probe.calls >= 2)
+    assert _wait_for(lambda: monitor.online is True)
+    assert changes == [False, True]
+    monitor.stop()
+
+
+def test_hook_errors_do_not_stop_the_others():
+    monitor = ConnectivityMonitor(FakeProbe(online=False), interval=60)
+    seen = []
+    monitor.on_change(lambda online: 1 / 0)
+    monitor.on_change(seen.append)
+    monitor.check()
+    assert seen == [False]
+
+
+def test_http_client_reports_connection_failures(monkeypatch):
+    monitor = ConnectivityMonitor(FakeProbe(online=True), interval=60, failure_threshold=2)
+    monitor.check()
+    monkeypatch.setattr(connectivity, "_monitor", monitor)
+    monitor.start = lambda: None
+
+    def refuse(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("no route to host")
+
+    client = http.HttpClient(max_retries=0)
+    monkeypatch.setattr(client._host_state("api.example.com").session, "request", refuse)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get("https://api.example.com/data")
+    assert monitor.online is False
+
+
+def test_concurrent_readers_see_one_state():
+    monitor = ConnectivityMonitor(FakeProbe(online=True), interval=60)
+    monitor.check()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(monitor.is_online())) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    monitor.stop()
+    assert results == [True] * 16
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
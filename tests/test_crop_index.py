@@ -0,0 +1,63 @@
+"""
+Test script for the crop knowledge index
+Validates every crop file and checks lookups against the old linear scans.
+"""
+
+import json
+import os
+import tempfile
+
+from vaani.core import config as Config
+from vaani.services.agriculture.crop_index import build_index, load_index, get_crop_index
+
+
+def test_all_crop_files_valid():
+    """Every file in data/crop_data parses into a crop entry"""
+    payload, errors = build_index()
+    assert errors == []
+    assert len(payload["crops"]) == len(payload["signature"]) == 30
+
+
+def test_lookups_match_linear_scan():
+    """Crop and stage detection agree with the old next(...) scans"""
+    index = get_crop_index()
+    commands = [f"{crop} की {stage}" for crop in Config.agri_commodities[:15] for stage in Config.agri_stages[:6]]
+    commands += ["प्याज और आलू का भाव", "मुझे खेती के बारे में बताओ"]
+
+    for command in commands:
+        assert index.find_crop(command) == next((c for c in Config.agri_commodities if c in command), None)
+        assert index.find_stage(command) == next((s for s in Config.agri_stages if s in command), None)
+
+
+def test_sections_and_file_names():
+    """Section lookups tolerate underscores; file names are trimmed"""
+    index = get_crop_index()
+    assert index.get_crop("भिंडी") is not None          # stored as "भिंडी .json"
+    assert index.section_key("गेहूं", "उन्नत किस्में") == "उन्नत किस्में"
+    assert index.section_key("आलू", "सरल परिचय") == "सरल_परिचय"
+    assert index.section_key("xyz123", "परिचय") is None
+
+
+def test_stale_artifact_is_rebuilt():
+    """Changing a crop file invalidates the saved artifact"""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = os.path.join(tmp, "crop_data")
+        os.makedirs(data_dir)
+        index_file = os.path.join(tmp, "crop_index.pkl")
+        with open(os.path.join(data_dir, "गेहूं.json"), "w", encoding="utf-8") as f:
+            json.dump({"परिचय": "पुराना"}, f, ensure_ascii=False)
+
+        assert load_index(index_file, data_dir).get_crop("गेहूं")["परिचय"] == "पुराना"
+        assert os.path.exists(index_file)
+
+        with open(os.path.join(data_dir, "गेहूं.json"), "w", encoding="utf-8") as f:
+            json.dump({"परिचय": "नया विवरण"}, f, ensure_ascii=False)
+        assert load_index(index_file, data_dir).get_crop("गेहूं")["परिचय"] == "नया विवरण"
+
+
+if __name__ == "__main__":
+    test_all_crop_files_valid()
+    test_lookups_match_linear_scan()
+    test_sections_and_file_names()
+    test_stale_artifact_is_rebuilt()
+    print("✓ Crop index tests passed")
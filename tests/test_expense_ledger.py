@@ -0,0 +1,126 @@
+"""
+Test script for the expense ledger
+Checks rollups against the old JSON summaries, legacy JSON import, concurrent writers and compaction.
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+import pytest
+
+from vaani.services.finance.expense_ledger import ExpenseLedger
+from vaani.services.finance.expense_tracker_service import ExpenseTracker
+
+
+def test_rollups_summarize_days_and_months(tmp_path):
+    ledger = ExpenseLedger(str(tmp_path / "ledger.db"))
+    ledger.ensure_user("u1")
+    ledger.append("u1", "expense", "खाना", 200, date=datetime(2024, 6, 1, 9))
+    ledger.append("u1", "income", "आमदनी", 1000, date=datetime(2024, 6, 1, 18))
+    ledger.append("u1", "expense", "यातायात", 50, date=datetime(2024, 6, 2, 8))
+    ledger.append("u1", "expense", "खाना", 100, date=datetime(2024, 6, 2, 20))
+    ledger.append("u1", "expense", "खाना", 70, date=datetime(2024, 7, 1, 9))
+    ledger.append("u2", "expense", "फोन", 99, date=datetime(2024, 6, 1, 9))
+
+    assert ledger.summary("u1", 'month', "2024-06") == {
+        "income": 1000, "expense": 350, "balance": 650, "count": 4,
+        "categories": {"खाना": 300, "यातायात": 50}}
+    assert list(ledger.summary("u1", 'month', "2024-06")["categories"]) == ["खाना", "यातायात"]
+    assert ledger.summary("u1", 'day', "2024-06-02")["expense"] == 150
+    assert ledger.summary("u1", 'day', "2024-06-03") is None
+    assert [t["amount"] for t in ledger.transactions("u1", 'day', "2024-06-01")] == [200, 1000]
+    assert len(list(ledger.transactions("u1"))) == 5
+
+
+def test_tracker_summaries(tmp_path):
+    tracker = ExpenseTracker(str(tmp_path))
+    assert tracker.add_transaction("u1", "500 रुपये सब्जी खरीदी")[0] == "खर्चा जोड़ दिया गया: 500 रुपये, श्रेणी: खाना"
+    assert tracker.add_transaction("u1", "मजदूरी के 800 रुपये मिला")[0] == "आमदनी जोड़ दी गई: 800 रुपये"
+
+    today = tracker.get_today_summary("u1")
+    assert today.startswith("आज का हिसाब: आमदनी 800 रुपये, खर्च 500 रुपये, बचत 300 रुपये।")
+    assert "2. आमदनी: 800 रुपये - आमदनी" in today
+    assert "- खाना: 500 रुपये" in tracker.get_monthly_summary("u1")
+    assert tracker.get_today_summary("u2") == "आज कोई लेनदेन नहीं किया गया है।"
+
+    data = tracker.load_user_data("u1")
+    assert len(data["transactions"]) == 2
+    assert data["monthly_summary"][datetime.now().strftime("%Y-%m")]["balance"] == 300
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    legacy = {
+        "name": "रामू",
+        "transactions": [
+            {"id": "a1", "date": "2024-05-03T10:00:00", "type": "expense", "category": "खेती",
+             "amount": 1200, "description": "1200 रुपये खाद", "month_year": "2024-05"},
+            {"id": "a2", "date": "2024-05-09T10:00:00", "type": "income", "category": "आमदनी",
+             "amount": 5000, "description": "फसल बेचा 5000", "month_year": "2024-05"}
+        ],
+        "monthly_summary": {"2024-05": {"income": 5000, "expense": 1200, "balance": 3800,
+                                        "categories": {"खेती": 1200}}}
+    }
+    (tmp_path / "u1_expenses.json").write_text(json.dumps(legacy, ensure_ascii=False), encoding='utf-8')
+
+    tracker = ExpenseTracker(str(tmp_path))
+    assert tracker.ensure_user("u1")
+    assert not ExpenseTracker(str(tmp_path)).ensure_user("u1")
+    data = tracker.load_user_data("u1")
+    assert data["name"] == "रामू"
+    assert data["monthly_summary"] == legacy["monthly_summary"]
+    assert [t["id"] for t in data["transactions"]] == ["a1", "a2"]
+
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    path = str(tmp_path / "ledger.db")
+    ExpenseLedger(path).ensure_user("u1")
+
+    def spend(worker):
+        ledger = ExpenseLedger(path)
+        for i in range(25):
+            ledger.append("u1", "expense", f"श्रेणी{worker % 2}", 10)
+
+    threads = [threading.Thread(target=spend, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    summary = ExpenseLedger(path).summary("u1", 'month', datetime.now().strftime("%Y-%m"))
+    assert summary["count"] == 100
+    assert summary["expense"] == 1000
+
+
+def test_colliding_id_is_an_error_not_a_silent_drop(tmp_path, monkeypatch):
+    ledger = ExpenseLedger(str(tmp_path / "ledger.db"))
+    ledger.ensure_user("u1")
+    same = uuid.UUID(int=1)
+    monkeypatch.setattr(uuid, "uuid4", lambda: same)
+    ledger.append("u1", "expense", "खाना", 100, date=datetime(2024, 6, 1))
+    with pytest.raises(sqlite3.IntegrityError):
+        ledger.append("u1", "expense", "खाना", 200, date=datetime(2024, 6, 1))
+    assert ledger.summary("u1", 'day', "2024-06-01")["count"] == 1
+
+    tracker = ExpenseTracker(str(tmp_path / "tracker"))
+    tracker.add_transaction("u1", "100 रुपये सब्जी")
+    assert tracker.add_transaction("u1", "200 रुपये सब्जी") == ("खर्चा जोड़ने में समस्या आई, कृपया फिर से कोशिश करें", None)
+
+
+def test_compact_rebuilds_rollups_from_the_log(tmp_path):
+    ledger = ExpenseLedger(str(tmp_path / "ledger.db"))
+    ledger.ensure_user("u1")
+    for amount in (10, 20, 30):
+        ledger.append("u1", "expense", "खाना", amount, date=datetime(2024, 6, 1))
+    before = ledger.summary("u1", 'month', "2024-06")
+
+    ledger._db().execute("UPDATE rollups SET amount = 0")
+    ledger.compact()
+    assert ledger.summary("u1", 'month', "2024-06") == before
+    assert ledger.get_stats()['transactions'] == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,109 @@
+"""
+Test script for expense reports
+Checks CSV import (and re-import), reports across users, CSV export and the command line.
+"""
+
+import csv
+import io
+
+import pytest
+
+from vaani.services.finance import expense_reports
+from vaani.services.finance.expense_reports import build_report, export, import_csv
+from vaani.services.finance.expense_tracker_service import ExpenseTracker
+
+CSV_TEXT = """user_id,date,type,category,amount,description
+u1,2024-05-03T10:00:00,expense,खाना,200,सब्जी
+u1,2024-05-09T10:00:00,income,,3000,मजदूरी
+u1,2024-06-01T09:00:00,expense,,700,दवाई
+u2,2024-05-04T10:00:00,expense,राशन,800,
+u2,2024-05-20T10:00:00,,,60000,फसल बेचा
+u3,2024-05-05,expense,खाना,abc,
+,2024-05-05,expense,खाना,10,
+"""
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    return ExpenseTracker(str(tmp_path))
+
+
+def test_import_detects_types_and_categories(tracker):
+    result = import_csv(tracker, io.StringIO(CSV_TEXT))
+    assert (result["rows"], result["added"], result["skipped"]) == (7, 5, 0)
+    assert [line for line, _ in result["errors"]] == [7, 8]
+
+    may = tracker.ledger.summary("u2", 'month', "2024-05")
+    # "राशन" is a खाना keyword; "फसल बेचा" is income
+    assert may["categories"] == {"खाना": 800}
+    assert may["income"] == 60000
+    assert tracker.ledger.summary("u1", 'month', "2024-06")["categories"] == {"स्वास्थ्य": 700}
+
+    # Rows without an id get the same derived id again
+    again = import_csv(tracker, io.StringIO(CSV_TEXT))
+    assert (again["added"], again["skipped"]) == (0, 5)
+    assert tracker.ledger.summary("u2", 'month', "2024-05")["income"] == 60000
+
+
+def test_identical_rows_are_all_kept(tracker):
+    text = "user_id,date,type,category,amount,description\n" + "u1,2024-06-01,expense,खाना,50,चाय\n" * 2
+    result = import_csv(tracker, io.StringIO(text))
+    assert (result["added"], result["skipped"]) == (2, 0)
+    assert tracker.ledger.summary("u1", 'day', "2024-06-01")["expense"] == 100
+
+    again = import_csv(tracker, io.StringIO(text))
+    assert (again["added"], again["skipped"]) == (0, 2)
+
+
+def test_report_across_users(tracker):
+    import_csv(tracker, io.StringIO(CSV_TEXT))
+    report = build_report(tracker)
+
+    assert report["users"] == 2
+    assert report["months"] == {
+        "2024-05": {"income": 63000, "expense": 1000, "balance": 62000, "users": 2},
+        "2024-06": {"income": 0, "expense": 700, "balance": -700, "users": 1}}
+    assert report["categories"] == {"खाना": 1000, "स्वास्थ्य": 700}
+    assert report["distribution"]["income"] == {"0": 1, "2501-5000": 1, "50000+": 1}
+    assert (report["distribution"]["saved"], report["distribution"]["overspent"]) == (2, 1)
+
+    only_u1_in_may = build_report(tracker, users={"u1"}, first_month="2024-05", last_month="2024-05")
+    assert only_u1_in_may["months"] == {"2024-05": {"income": 3000, "expense": 200, "balance": 2800, "users": 1}}
+
+
+def test_export_round_trips_without_duplicates(tracker, tmp_path):
+    import_csv(tracker, io.StringIO(CSV_TEXT))
+    path = str(tmp_path / "snapshot.csv")
+    assert export(tracker.ledger, path) == 5
+    assert export(tracker.ledger, str(tmp_path / "june.csv"), "2024-06", "2024-06") == 1
+
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["user_id"] == "u1" and rows[0]["category"] == "खाना"
+
+    with open(path, encoding='utf-8', newline='') as f:
+        result = import_csv(tracker, f)
+    assert (result["added"], result["skipped"]) == (0, 5)
+    assert build_report(tracker)["months"]["2024-05"]["expense"] == 1000
+
+
+def test_command_line(tmp_path, capsys):
+    csv_path = tmp_path / "in.csv"
+    csv_path.write_text(CSV_TEXT, encoding='utf-8')
+    data_dir = str(tmp_path / "data")
+
+    assert expense_reports.main(["--data-dir", data_dir, "import", str(csv_path)]) == 1
+    assert "✗ line 7: amount is not a number" in capsys.readouterr().out
+
+    assert expense_reports.main(["--data-dir", data_dir, "report", "--from", "2024-06"]) == 0
+    out = capsys.readouterr().out
+    assert "2024-06       1          0        700       -700" in out
+    assert "2024-05" not in out
+
+    if not expense_reports.PYARROW_AVAILABLE:
+        assert expense_reports.main(["--data-dir", data_dir, "export", str(tmp_path / "out.parquet")]) == 1
+        assert "pyarrow" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,48 @@
+"""
+Test script for the weather geocode index
+Checks preloaded market cities, name normalization and learning new cities.
+"""
+
+import os
+import tempfile
+
+from vaani.core import config as Config
+from vaani.services.agriculture.agri_price_service import MARKET_MAPPING
+from vaani.services.weather.geocode_index import GeocodeIndex, SEED_FILE
+
+
+def test_known_markets_preloaded():
+    """Every market city in the agriculture config has coordinates"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = GeocodeIndex(store_file=os.path.join(tmp, "geocode.json"))
+        assert index.missing_known_cities() == []
+        for city in list(MARKET_MAPPING) + Config.agri_markets:
+            assert index.lookup(city) is not None, city
+
+
+def test_lookup_normalizes_names():
+    """Hindi and English names, case and spacing resolve alike"""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = GeocodeIndex(store_file=os.path.join(tmp, "geocode.json"))
+        assert index.lookup("लखनऊ") == index.lookup("Lucknow") == index.lookup("  lucknow ")
+        assert index.lookup("Atlantis") is None
+        assert index.stats['misses'] == 1
+
+
+def test_learned_cities_persist():
+    """Resolved cities are written to the store and reloaded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = os.path.join(tmp, "geocode.json")
+        index = GeocodeIndex(seed_file=SEED_FILE, store_file=store)
+        index.learn("सीतापुर", 27.57, 80.68, "Sitapur")
+        assert os.listdir(tmp) == ["geocode.json"]
+
+        reloaded = GeocodeIndex(seed_file=SEED_FILE, store_file=store)
+        assert reloaded.lookup("सीतापुर") == (27.57, 80.68)
+
+
+if __name__ == "__main__":
+    test_known_markets_preloaded()
+    test_lookup_normalizes_names()
+    test_learned_cities_persist()
+    print("✓ Geocode index tests passed")
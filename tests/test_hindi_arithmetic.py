@@ -0,0 +1,84 @@
+"""
+Test script for local Hindi arithmetic
+Checks spoken number parsing and the calculations answered without Gemini.
+"""
+
+import pytest
+
+from vaani.services.finance.hindi_arithmetic import quantities, solve, tokenize
+
+
+def _numbers(text):
+    return [q.value for q in quantities(tokenize(text))]
+
+
+def test_spoken_numbers():
+    assert _numbers("साढ़े तीन") == [3.5]
+    assert _numbers("डेढ़ सौ") == [150]
+    assert _numbers("सवा लाख") == [125000]
+    assert _numbers("पौने दो सौ") == [175]
+    assert _numbers("दो हजार पांच सौ पचास") == [2550]
+    assert _numbers("२५ और 1,000 और five hundred") == [25, 1000, 500]
+    # "दो" after a verb means "give"
+    assert _numbers("12 और 8 जोड़ दो") == [12, 8]
+    assert _numbers("5 किलो दो") == [5]
+    # ...but joined on with "और", or after "पौने", it is two
+    assert _numbers("तीन और दो") == [3, 2]
+    assert _numbers("एक सौ एक और दो") == [101, 2]
+    assert _numbers("सवा लाख और पौने दो") == [125000, 1.75]
+
+
+@pytest.mark.parametrize("query, operation, value, unit", [
+    ("12 और 8 जोड़ो", 'add', 20, None),
+    ("1000 रुपये में से 350 खर्च किए, कितने बचे?", 'subtract', 650, 'रुपये'),
+    ("पौने दो सौ गुणा चार", 'multiply', 700, None),
+    ("5 बोरी चावल हैं, हर बोरी में 50 किलो है, कुल कितना?", 'rate', 250, 'किलो'),
+    ("मेरी 300 रुपये रोज़ की मजदूरी है, 10 दिन में कितना होगा?", 'rate', 3000, 'रुपये'),
+    ("40 रुपये किलो के भाव से 5 किलो आलू", 'rate', 200, 'रुपये'),
+    ("12 दर्जन अंडे हर दर्जन 60 रुपये", 'rate', 720, 'रुपये'),
+    ("तीन और दो", 'add', 5, None),
+    ("सवा लाख और पौने दो", 'add', 125001.75, None),
+    ("20 मज़दूरों को 500 रुपये बांटने हैं, हर एक को कितना मिलेगा?", 'divide', 25, 'रुपये'),
+    ("2 एकड़ ज़मीन में 50 किलो बीज चाहिए, 5 एकड़ में कितना?", 'proportion', 125, 'किलो'),
+    ("200 का 15 प्रतिशत", 'percent', 30, None),
+    ("500 रुपये पर 10% छूट", 'percent', 450, 'रुपये'),
+    ("10000 रुपये पर 8 प्रतिशत ब्याज 2 साल का", 'interest', 1600, 'रुपये'),
+    ("5000 रुपये 2 रुपये सैकड़ा 6 महीने का ब्याज", 'interest', 600, 'रुपये'),
+])
+def test_solves_locally(query, operation, value, unit):
+    solution = solve(query)
+    assert (solution.operation, solution.value, solution.unit) == (operation, value, unit)
+    assert "जवाब:" in solution.explanation
+
+
+def test_rate_is_the_price_of_each():
+    explanation = solve("12 दर्जन अंडे हर दर्जन 60 रुपये").explanation
+    assert explanation.startswith("हर एक के हिसाब से 60 रुपये है, और कुल 12 दर्जन हैं। तो, 12 x 60 = 720।")
+
+
+def test_unclear_queries_are_left_to_gemini():
+    assert solve("5 का वर्गमूल और 3 जोड़ो") is None
+    assert solve("कितना है 5") is None
+    assert solve("10000 पर चक्रवृद्धि ब्याज 2 साल") is None
+    # More than one operation, or prices summed with quantities
+    assert solve("10 में 2 जोड़ो और 3 घटाओ") is None
+    assert solve("मैंने 3 किलो चावल 40 रुपये किलो और 2 किलो दाल 100 रुपये किलो लिया") is None
+
+
+def test_saving_is_not_subtraction():
+    solution = solve("हर महीने 2000 बचाता हूँ, 12 महीने में कितना")
+    assert (solution.operation, solution.value, solution.unit) == ('rate', 24000, None)
+
+
+def test_calculator_answers_without_gemini(monkeypatch):
+    from vaani import web
+
+    spoken = []
+    monkeypatch.setattr(web, "text_to_speech_file", lambda text, lang='hi', **kw: spoken.append(text))
+    result = web.process_command("10000 रुपये पर 8 प्रतिशत ब्याज 2 साल का", 'calc-user')
+
+    assert result['text'].endswith("जवाब: ब्याज 1600 रुपये, कुल 11600 रुपये")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,142 @@
+"""
+Test script for the shared HTTP client
+Runs a local server to check connection reuse, retries and latency stats.
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from vaani.core.http import AsyncHttpClient, HttpClient, HTTPX_AVAILABLE
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    fail_first = 0
+    client_ports = set()
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.client_ports.add(self.client_address[1])
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            failing = cls.fail_first > 0
+            if failing:
+                cls.fail_first -= 1
+        if self.path.startswith('/slow'):
+            time.sleep(0.1)
+        body = b'{"ok": true}'
+        self.send_response(503 if failing else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with cls.lock:
+            cls.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_server():
+    _Handler.fail_first = 0
+    _Handler.client_ports = set()
+    _Handler.active = 0
+    _Handler.peak = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_connection_reuse_and_histogram():
+    """Sequential requests to one host reuse a pooled connection"""
+    server, base = _start_server()
+    client = HttpClient(host_settings={})
+    try:
+        for _ in range(5):
+            assert client.get(f"{base}/ok").json() == {"ok": True}
+
+        assert len(_Handler.client_ports) == 1
+        stats = client.get_stats()[f"127.0.0.1:{server.server_address[1]}"]
+        assert stats['requests'] == 5
+        assert sum(stats['histogram'].values()) == 5
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_retries_with_backoff():
+    """5xx responses on GET are retried until success"""
+    server, base = _start_server()
+    _Handler.fail_first = 2
+    client = HttpClient(host_settings={}, max_retries=2, backoff_base=0.01)
+    try:
+        response = client.get(f"{base}/ok")
+        assert response.status_code == 200
+
+        stats = client.get_stats()[f"127.0.0.1:{server.server_address[1]}"]
+        assert stats['retries'] == 2
+        assert stats['errors'] == 2
+    finally:
+        client.close()
+        server.shutdown()
+
+
+def test_per_host_connection_cap():
+    """No more than max_connections requests run at once per host"""
+    server, base = _start_server()
+    host = f"127.0.0.1:{server.server_address[1]}"
+    client = HttpClient(host_settings={host: {'max_connections': 2}})
+    try:
+        threads = [threading.Thread(target=client.get, args=(f"{base}/slow",)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert _Handler.peak <= 2
+        assert client.get_stats()[host]['requests'] == 6
+    finally:
+        client.close()
+        server.shutdown()
+
+
+@pytest.mark.skipif(not HTTPX_AVAILABLE, reason="httpx not installed")
+def test_async_client_retries_and_caps():
+    """The async client keeps the retry policy and per-host cap without threads"""
+    server, base = _start_server()
+    host = f"127.0.0.1:{server.server_address[1]}"
+    _Handler.fail_first = 1
+
+    async def run():
+        client = AsyncHttpClient(host_settings={host: {'max_connections': 2}}, backoff_base=0.01)
+        try:
+            first = await client.get(f"{base}/ok")
+            responses = await asyncio.gather(*[client.get(f"{base}/slow") for _ in range(6)])
+            return first, responses, client.get_stats()[host]
+        finally:
+            await client.close()
+
+    try:
+        first, responses, stats = asyncio.run(run())
+        assert first.json() == {"ok": True}
+        assert all(r.status_code == 200 for r in responses)
+        assert stats['retries'] == 1
+        assert _Handler.peak <= 2
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_connection_reuse_and_histogram()
+    test_retries_with_backoff()
+    test_per_host_connection_cap()
+    test_async_client_retries_and_caps()
+    print("✓ HTTP client tests passed")
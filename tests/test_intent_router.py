@@ -0,0 +1,151 @@
+"""
+Test script for the Intent Router
+Checks that the compiled router labels commands exactly like the old
+any(phrase in command ...) chain, and benchmarks both.
+
+Run the benchmark with: python -m tests.test_intent_router
+"""
+
+import time
+import statistics
+
+from vaani.core import config as Config
+from vaani.core.intent_router import PhraseMatcher, get_intent_router
+
+
+SAMPLE_COMMANDS = [
+    "अभी टाइम क्या है",
+    "आज क्या तारीख है",
+    "लखनऊ का मौसम",
+    "दिल्ली में कब बारिश होगी",
+    "आज की खबर सुनाओ",
+    "विकिपीडिया पर ताजमहल",
+    "बैंक में खाता कैसे खोलें",
+    "5 बोरी चावल हैं हर बोरी में 50 किलो कुल कितना",
+    "500 रुपये सब्जी पर खर्च किए",
+    "आलू का भाव बताओ",
+    "कानपुर मंडी",
+    "वृद्धावस्था पेंशन के बारे में",
+    "15 अगस्त 1947 इतिहास बताओ",
+    "नमस्ते वाणी",
+    "आसमान नीला क्यों होता है?",
+    "मेरी मां बीमार हैं, मदद चाहिए",
+    "switch to English",
+    "बस करो",
+    "कुछ भी नहीं",
+]
+
+
+def naive_intents(command):
+    """The old linear chain, expressed as a set of labels"""
+    command_lower = command.lower()
+    labels = set()
+    checks = {
+        'goodbye': any(p in command for p in Config.goodbye_triggers),
+        'time': any(p in command for p in Config.timedekh),
+        'date': any(p in command for p in Config.date_trigger),
+        'weather': any(p in command for p in Config.weather_trigger + Config.rain_trigger),
+        'rain_outlook': any(p in command for p in Config.rain_most_significant),
+        'news': any(p in command for p in Config.news_trigger),
+        'wikipedia': any(p in command for p in Config.wikipedia_trigger),
+        'historical_date': any(p in command for p in Config.historical_date_trigger),
+        'greeting': any(p in command for p in Config.greeting_triggers),
+        'question_mark': '?' in command,
+        'sentence_end': '।' in command,
+        'expense': any(p in command_lower for p in Config.expense_trigger),
+        'agriculture': (any(p in command_lower for p in Config.agri_trigger) or
+                        any(p in command_lower for p in Config.agri_commodities)),
+        'agri_market': any(p in command_lower for p in Config.agri_markets),
+        'social_scheme': any(p in command_lower for p in Config.social_scheme_trigger),
+        'general_knowledge': any(p in command_lower for p in Config.general_knowledge_triggers),
+        'curiosity': any(p in command_lower for p in Config.child_curiosity_topics),
+        'language_switch': any(p in command_lower for p in Config.language_switch_trigger),
+    }
+    for label, matched in checks.items():
+        if matched:
+            labels.add(label)
+    return labels
+
+
+def test_phrase_matcher_overlaps():
+    """Overlapping and nested phrases are all reported with spans"""
+    matcher = PhraseMatcher()
+    for phrase in ["he", "she", "his", "hers"]:
+        matcher.add(phrase, phrase)
+    matcher.build()
+
+    found = sorted((start, end, label) for start, end, label, _ in matcher.find_all("ushers"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_router_matches_naive_chain():
+    """Router labels agree with the old any(...) checks"""
+    router = get_intent_router()
+    commands = SAMPLE_COMMANDS + Config.timedekh[:20] + Config.agri_commodities + Config.greeting_triggers
+
+    for command in commands:
+        routed = set(router.match(command).intents)
+        routed.discard('emergency')
+        routed.discard('financial')
+        routed.discard('calculation')
+        assert routed == naive_intents(command), command
+
+
+def test_router_spans():
+    """Matched spans point at the trigger phrase in the command"""
+    router = get_intent_router()
+    command = "लखनऊ का मौसम"
+    match = router.match(command)
+
+    assert match.has('weather')
+    start, end, phrase = match.spans['weather'][0]
+    assert command[start:end] == phrase == "मौसम"
+
+
+def test_handler_gates():
+    """Emergency, financial and calculator keywords are labelled for gating"""
+    router = get_intent_router()
+
+    assert router.match("घर में आग लग गई").has('emergency')
+    assert router.match("सभी emergency numbers बताओ").has('emergency')
+    assert router.match("OTP दो वरना खाता बंद").has('financial')
+    assert router.match("5 और 7 जोड़ो").has('calculation')
+    assert router.match("लोन क्या होता है").first(['emergency', 'financial']) == 'financial'
+
+
+def benchmark(iterations=2000):
+    """Compare the compiled router with the old linear chain"""
+    router = get_intent_router()
+
+    def run(func):
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(iterations // len(SAMPLE_COMMANDS)):
+                for command in SAMPLE_COMMANDS:
+                    func(command)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    calls = (iterations // len(SAMPLE_COMMANDS)) * len(SAMPLE_COMMANDS)
+    naive_time = run(naive_intents)
+    router_time = run(router.match)
+
+    print("\n" + "=" * 60)
+    print("📊 INTENT ROUTING BENCHMARK")
+    print("=" * 60)
+    print(f"Trigger phrases:  {router.phrase_count}")
+    print(f"Commands routed:  {calls}")
+    print(f"Linear chain:     {naive_time / calls * 1e6:.1f} µs/command")
+    print(f"Intent router:    {router_time / calls * 1e6:.1f} µs/command")
+    print(f"Speedup:          {naive_time / router_time:.1f}x")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    test_phrase_matcher_overlaps()
+    test_router_matches_naive_chain()
+    test_router_spans()
+    test_handler_gates()
+    print("✓ Intent router agrees with the linear chain")
+    benchmark()
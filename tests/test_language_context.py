@@ -0,0 +1,81 @@
+"""
+Test script for per-session language
+Checks that LanguageManager is read-only and that a language switch stays in its own session.
+"""
+
+import threading
+
+import pytest
+
+from vaani import web
+from vaani.core.language_manager import LanguageContext, get_language_manager
+
+
+def test_language_manager_is_read_only():
+    manager = get_language_manager()
+    with pytest.raises(AttributeError):
+        manager.current_language = 'en'
+    with pytest.raises(TypeError):
+        manager.languages['en'] = {}
+    with pytest.raises(TypeError):
+        manager.phrases['error']['hi'] = "बदला हुआ"
+    assert manager.get_phrase('greeting', 'en')[0] == 'Hello'
+
+
+def test_context_switches_only_itself():
+    first, second = LanguageContext(), LanguageContext()
+    assert first.set_language('en')
+    assert not first.set_language('xx')
+
+    assert first.get_tts_code() == 'en'
+    assert second.get_tts_code() == 'hi'
+    assert second.get_phrase('error') == get_language_manager().get_phrase('error', 'hi')
+    assert LanguageContext('xx').code == 'hi'
+
+
+def _unanswered(monkeypatch):
+    """Leave general knowledge questions unanswered and record each TTS language"""
+    spoken = []
+    monkeypatch.setattr(web, "handle_general_knowledge_query", lambda command, say: False)
+    monkeypatch.setattr(web, "text_to_speech_file", lambda text, lang='hi', **kw: spoken.append((text, lang)))
+    return spoken
+
+
+def test_switch_does_not_leak_to_other_sessions(monkeypatch):
+    spoken = _unanswered(monkeypatch)
+    manager = get_language_manager()
+
+    assert web.process_command("switch to english", 'lang-a')['language'] == 'en'
+    result_b = web.process_command("कौन हो तुम?", 'lang-b')
+    result_a = web.process_command("कौन हो तुम?", 'lang-a')
+
+    assert result_b['text'] == manager.get_phrase('error', 'hi')
+    assert result_b['language'] == 'hi'
+    assert result_a['text'] == manager.get_phrase('error', 'en')
+    assert [lang for _, lang in spoken] == ['en', 'hi', 'en']
+
+
+def test_concurrent_sessions_keep_their_language(monkeypatch):
+    _unanswered(monkeypatch)
+    manager = get_language_manager()
+    for i in range(8):
+        if i % 2:
+            web.process_command("switch to english", f"lang-c{i}")
+
+    results = {}
+
+    def ask(i):
+        results[i] = web.process_command("कौन हो तुम?", f"lang-c{i}")['text']
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i, text in results.items():
+        assert text == manager.get_phrase('error', 'en' if i % 2 else 'hi')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
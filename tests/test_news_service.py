@@ -0,0 +1,68 @@
+"""
+Test script for the news cache
+Checks that the disk cache is read once into memory and written back atomically in the background.
+"""
+
+import json
+import time
+
+import pytest
+
+from vaani.services.news import news_service
+from vaani.services.news.news_service import NewsService, flush_news_cache
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "news_cache.json"
+    monkeypatch.setattr(news_service, "NEWS_CACHE_FILE", str(path))
+    monkeypatch.setattr(news_service, "_stale_news", {})
+    monkeypatch.setattr(news_service, "_disk_loaded", False)
+    news_service._news_cache.clear()
+    yield path
+    news_service._news_cache.clear()
+
+
+def entry(title, age):
+    return {"query": "", "articles": [{"title": title}], "timestamp": time.time() - age}
+
+
+def test_disk_cache_is_read_once(cache_file):
+    fresh, old = entry("ताज़ा खबर", 60), entry("पुरानी खबर", 2 * news_service.NEWS_CACHE_EXPIRY)
+    cache_file.write_text(json.dumps({"fresh": fresh, "old": old}, ensure_ascii=False), encoding='utf-8')
+
+    service = NewsService()
+    assert service.get_cached_news("fresh") == fresh
+    assert service.get_cached_news("old") is None
+
+    # Later lookups are answered from memory
+    cache_file.unlink()
+    assert service.get_stale_news("old") == old
+    assert NewsService().get_cached_news("fresh") == fresh
+
+
+def test_stored_news_is_written_back_atomically(cache_file):
+    service = NewsService()
+    headlines = entry("नई खबर", 0)
+    service.store_news("top", headlines)
+    assert service.get_cached_news("top") == headlines
+    for _ in range(100):
+        if cache_file.exists():
+            break
+        time.sleep(0.01)
+
+    # Another worker's newer headlines for a different query are kept
+    on_disk = json.loads(cache_file.read_text(encoding='utf-8'))
+    on_disk["weather"] = entry("मौसम", 0)
+    cache_file.write_text(json.dumps(on_disk, ensure_ascii=False), encoding='utf-8')
+    assert flush_news_cache()
+
+    on_disk = json.loads(cache_file.read_text(encoding='utf-8'))
+    assert set(on_disk) == {"top", "weather"}
+    assert on_disk["top"]["articles"] == [{"title": "नई खबर"}]
+    assert service.get_stale_news("weather")["articles"] == [{"title": "मौसम"}]
+    assert [path.name for path in cache_file.parent.iterdir()] == ["news_cache.json"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,134 @@
+"""
+Test script for the offline answer store
+Checks similarity lookups through the word index, legacy JSON import and concurrent writers.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+
+from vaani.core import offline_store
+from vaani.core.offline_mode import OfflineMode
+from vaani.core.offline_store import OfflineAnswerStore, query_hash, query_words
+
+
+def test_find_matches_like_a_full_scan(tmp_path):
+    store = OfflineAnswerStore(str(tmp_path / "answers.db"))
+    store.put('financial', "बैंक में खाता कैसे खोलें", "खाता खोलने का तरीका")
+    store.put('financial', "ATM से पैसे कैसे निकालें", "ATM का तरीका")
+    store.put('agriculture', "बैंक में खाता कैसे खोलें", "गलत सेवा")
+
+    assert store.find('financial', "बैंक में खाता कैसे खोलें") == ("खाता खोलने का तरीका", 1.0)
+    answer, score = store.find('financial', "बैंक में खाता कैसे खोलूं")
+    assert answer == "खाता खोलने का तरीका" and 0.6 < score < 1.0
+    assert store.find('financial', "ATM कैसे काम करता है") is None
+    assert store.find('schemes', "बैंक में खाता कैसे खोलें") is None
+
+
+def test_find_agrees_with_brute_force(tmp_path):
+    rng = random.Random(3)
+    common, rare = ["क्या", "कैसे", "है", "में", "की"], [f"शब्द{i}" for i in range(40)]
+    store = OfflineAnswerStore(str(tmp_path / "answers.db"))
+    saved = {}
+    for i in range(300):
+        question = ' '.join(rng.sample(common, rng.randint(0, 4)) + rng.sample(rare, rng.randint(1, 3)))
+        store.put('general', question, question)
+        saved[question] = query_words(question)
+
+    for _ in range(200):
+        question = ' '.join(rng.sample(common, rng.randint(0, 4)) + rng.sample(rare, rng.randint(1, 3)))
+        if question in saved:
+            continue
+        words = query_words(question)
+        best = max((len(words & other) / len(words | other) for other in saved.values()), default=0)
+        found = store.find('general', question)
+        if best > 0.6:
+            assert found is not None and found[1] == best
+        else:
+            assert found is None
+
+
+def test_index_without_answer_lengths_is_rebuilt(tmp_path):
+    path = str(tmp_path / "answers.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE answers (id INTEGER PRIMARY KEY, service TEXT NOT NULL, hash TEXT NOT NULL, "
+               "query TEXT NOT NULL, response TEXT NOT NULL, timestamp TEXT NOT NULL, "
+               "words INTEGER NOT NULL, similar_to TEXT, UNIQUE (service, hash))")
+    db.execute("CREATE TABLE answer_words (service TEXT NOT NULL, word TEXT NOT NULL, answer_id INTEGER NOT NULL, "
+               "PRIMARY KEY (service, word, answer_id)) WITHOUT ROWID")
+    db.execute("CREATE TABLE word_counts (service TEXT NOT NULL, word TEXT NOT NULL, answers INTEGER NOT NULL, "
+               "PRIMARY KEY (service, word)) WITHOUT ROWID")
+    db.execute("INSERT INTO answers VALUES (1, 'schemes', ?, 'पेंशन कैसे मिलेगी', 'जवाब', '2024-01-01', 3, NULL)",
+               (query_hash('पेंशन कैसे मिलेगी'),))
+    for word in ('पेंशन', 'कैसे', 'मिलेगी'):
+        db.execute("INSERT INTO answer_words VALUES ('schemes', ?, 1)", (word,))
+        db.execute("INSERT INTO word_counts VALUES ('schemes', ?, 1)", (word,))
+    db.commit()
+    db.close()
+
+    store = OfflineAnswerStore(path)
+    assert store.find('schemes', "पेंशन कैसे मिलेगी जी") == ("जवाब", 0.75)
+
+
+def test_candidate_cap_keeps_the_closest_answers(tmp_path, monkeypatch):
+    monkeypatch.setattr(offline_store, "MAX_CANDIDATES", 3)
+    store = OfflineAnswerStore(str(tmp_path / "answers.db"))
+    for i in range(10):
+        store.put('financial', f"खाता {i} क्या है", f"जवाब {i}")
+    store.put('financial', "जन धन खाता क्या है", "जन धन का जवाब")
+
+    answer, score = store.find('financial', "जन धन खाता क्या होता है")
+    assert answer == "जन धन का जवाब" and score > 0.6
+
+
+def test_replacing_an_answer_keeps_the_index_consistent(tmp_path):
+    store = OfflineAnswerStore(str(tmp_path / "answers.db"))
+    store.put('financial', "लोन कैसे लें", "पहला जवाब")
+    store.put('financial', "लोन कैसे लें", "नया जवाब")
+    assert store.count('financial') == 1
+    assert store.find('financial', "लोन कैसे लें?") is None
+    assert store.find('financial', "लोन कैसे लें") == ("नया जवाब", 1.0)
+
+    # Earlier similar questions point at the newest answer
+    assert store.put('financial', "लोन कैसे लें जी", "तीसरा जवाब") == 1
+    assert store.entries('financial')[query_hash("लोन कैसे लें")]["similar_to"] == query_hash("लोन कैसे लें जी")
+
+
+def test_legacy_json_cache_is_imported(tmp_path):
+    legacy = {query_hash("धान कब बोएं"): {"query": "धान कब बोएं", "response": "जून में", "timestamp": "2024-01-01"}}
+    (tmp_path / "agriculture_cache.json").write_text(json.dumps(legacy, ensure_ascii=False), encoding='utf-8')
+
+    offline = OfflineMode(cache_dir=str(tmp_path))
+    assert offline.store.count('agriculture') == 1
+    offline.is_online = lambda: False
+    assert offline.get_response('agriculture', "धान कब बोएं", None) == ("जून में", True)
+    # The seeded answers are still there
+    assert offline.get_response('calculator', "100 गुना 5", None) == ("100 × 5 = 500", True)
+
+    # A second start does not import again
+    assert OfflineMode(cache_dir=str(tmp_path)).store.count('agriculture') == 1
+
+
+def test_concurrent_writers(tmp_path):
+    offline = OfflineMode(cache_dir=str(tmp_path))
+    offline.is_online = lambda: True
+
+    def ask(worker):
+        for i in range(20):
+            offline.get_response('schemes', f"योजना {worker} सवाल {i}", lambda query: f"जवाब: {query}")
+
+    threads = [threading.Thread(target=ask, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert offline.store.count('schemes') == 80
+    offline.is_online = lambda: False
+    assert offline.get_response('schemes', "योजना 3 सवाल 7", None) == ("जवाब: योजना 3 सवाल 7", True)
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
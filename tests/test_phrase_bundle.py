@@ -0,0 +1,79 @@
+"""
+Test script for the pre-rendered phrase bundle
+Covers phrase collection, incremental builds and runtime lookups.
+"""
+
+import os
+import tempfile
+
+from vaani.core import config as Config
+from vaani.core.phrase_bundle import PhraseBundle, build_bundle, collect_phrases
+
+
+def _fake_render(calls):
+    def render(text, lang):
+        calls.append((text, lang))
+        return f"{lang}:{text}".encode('utf-8')
+    return render
+
+
+def test_collect_covers_all_static_phrases():
+    """Config responses, every language's prompts and the offline fallbacks are collected"""
+    phrases = collect_phrases()
+    assert (Config.web_greeting_text, 'hi') in phrases
+    assert (Config.goodbye_responses[0].strip(), 'hi') in phrases
+    assert ('Please speak:', 'en') in phrases
+    assert ('தயவுசெய்து பேசுங்கள்:', 'ta') in phrases
+    # Bhojpuri is spoken with the Hindi voice
+    assert ('हम ना समझ पाईं, फेर से कहीं।', 'hi') in phrases
+    assert len(phrases) == len(set(phrases))
+
+
+def test_build_is_incremental_and_lookups_hit():
+    """Rebuilding renders only new phrases and drops removed ones"""
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+        manifest, errors = build_bundle(tmp, [("नमस्ते", 'hi'), ("Hello", 'en')], _fake_render(calls))
+        assert not errors and len(manifest['phrases']) == 2 and len(calls) == 2
+
+        calls.clear()
+        manifest, errors = build_bundle(tmp, [("नमस्ते", 'hi'), ("अलविदा", 'hi')], _fake_render(calls))
+        assert calls == [("अलविदा", 'hi')]
+        assert len([f for f in os.listdir(tmp) if f.startswith('phrase_')]) == 2
+
+        bundle = PhraseBundle(tmp)
+        assert bundle.read(" नमस्ते ", 'hi') == "hi:नमस्ते".encode('utf-8')
+        assert bundle.get("Hello", 'en') is None
+        assert bundle.get("नमस्ते", 'mr') is None
+
+        path = bundle.get("अलविदा", 'hi')
+        assert bundle.path_for_file(os.path.basename(path)) == path
+        assert bundle.path_for_file("phrase_unknown.mp3") is None
+        assert bundle.path_for_file("../manifest.json") is None
+
+
+def test_render_errors_are_reported():
+    """A phrase that fails to render is left out and reported"""
+    def render(text, lang):
+        if text == "खराब":
+            raise RuntimeError("network down")
+        return b"ok"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest, errors = build_bundle(tmp, [("अच्छा", 'hi'), ("खराब", 'hi')], render)
+        assert len(manifest['phrases']) == 1 and len(errors) == 1
+        assert PhraseBundle(tmp).get("खराब", 'hi') is None
+
+
+def test_missing_bundle_is_empty():
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = PhraseBundle(os.path.join(tmp, 'absent'))
+        assert len(bundle) == 0 and bundle.get("नमस्ते") is None
+
+
+if __name__ == "__main__":
+    test_collect_covers_all_static_phrases()
+    test_build_is_incremental_and_lookups_hit()
+    test_render_errors_are_reported()
+    test_missing_bundle_is_empty()
+    print("✓ Phrase bundle tests passed")
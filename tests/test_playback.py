@@ -0,0 +1,90 @@
+"""
+Test script for the persistent playback engine
+Runs on SDL's dummy audio driver: checks back-to-back timing, ordering and flush.
+"""
+
+import os
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import struct
+import threading
+import time
+import wave
+from io import BytesIO
+
+from vaani.core.playback import PlaybackEngine
+from vaani.core.voice_tool import SpeechPipeline
+
+
+def _tone(seconds, rate=24000):
+    frames = struct.pack('<h', 1000) * int(seconds * rate)
+    output = BytesIO()
+    with wave.open(output, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(frames)
+    return output.getvalue()
+
+
+def test_queued_sounds_play_back_to_back():
+    """Three 0.2s sounds take about 0.6s and finish in order"""
+    engine = PlaybackEngine()
+    finished = []
+    start = time.perf_counter()
+    items = [engine.enqueue(_tone(0.2)) for _ in range(3)]
+    for i, item in enumerate(items):
+        assert item.wait(timeout=3)
+        finished.append(i)
+    elapsed = time.perf_counter() - start
+
+    assert finished == [0, 1, 2]
+    assert all(item.played for item in items)
+    assert 0.55 < elapsed < 0.9
+    assert engine.get_stats()['gapless'] == 2
+
+
+def test_pause_is_queued_as_silence():
+    engine = PlaybackEngine()
+    start = time.perf_counter()
+    engine.enqueue(_tone(0.1), pause=0.3)
+    assert engine.enqueue(_tone(0.1)).wait(timeout=3)
+    assert time.perf_counter() - start > 0.45
+
+
+def test_flush_drops_queued_audio():
+    """Barge-in stops the current sound and releases every waiter at once"""
+    engine = PlaybackEngine()
+    items = [engine.enqueue(_tone(0.5)) for _ in range(3)]
+    time.sleep(0.1)
+
+    start = time.perf_counter()
+    engine.flush()
+    assert all(item.wait(timeout=1) for item in items)
+    assert time.perf_counter() - start < 0.2
+    assert not any(item.played for item in items)
+
+    # The engine keeps working after a flush
+    assert engine.play(_tone(0.1)) is True
+
+
+def test_pipeline_cancel_flushes_engine():
+    engine = PlaybackEngine()
+    pipeline = SpeechPipeline(synthesize=lambda s, lang, style: (BytesIO(_tone(0.3)), 0),
+                              playback=engine)
+    speaker = threading.Thread(target=pipeline.speak, args=("एक। दो। तीन। चार।",))
+    speaker.start()
+    time.sleep(0.4)
+    pipeline.cancel()
+    speaker.join(timeout=2)
+
+    assert not speaker.is_alive()
+    assert engine.get_stats()['played'] < 4
+
+
+if __name__ == "__main__":
+    test_queued_sounds_play_back_to_back()
+    test_pause_is_queued_as_silence()
+    test_flush_drops_queued_audio()
+    test_pipeline_cancel_flushes_engine()
+    print("✓ Playback engine tests passed")
@@ -0,0 +1,137 @@
+"""
+Test script for the Agmarknet price history
+Checks daily rows from API records, paginated prefetch, local price lookups, run claiming and trends.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from vaani.services.agriculture import agri_price_service, price_history
+from vaani.services.agriculture.agri_price_service import clear_price_cache, get_agmarknet_price, get_price_trend
+from vaani.services.agriculture.price_history import PriceHistoryStore, PricePrefetcher, daily_prices, prefetch
+
+
+def record(market, day, modal, commodity="Potato", low="", high=""):
+    return {"state": "Uttar Pradesh", "market": market, "commodity": commodity, "variety": "Other",
+            "arrival_date": day.strftime("%d/%m/%Y"), "min_price": low, "max_price": high, "modal_price": modal}
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = PriceHistoryStore(str(tmp_path / "prices.db"))
+    monkeypatch.setattr(price_history, "_price_history", store)
+    clear_price_cache()
+    yield store
+    clear_price_cache()
+
+
+def test_daily_prices_merge_varieties():
+    today = date.today()
+    rows = daily_prices([
+        record("Lucknow", today, "1200", low="1000", high="1300"),
+        record("Lucknow", today, "1400", low="1100", high="1600"),
+        record("Lucknow", today, "1300"),
+        record("Lucknow", today, "NA"),
+        record("Surat", today, "900"),
+    ], "Potato", ["Lucknow", "Delhi"])
+    assert rows == [("Potato", "Lucknow", today.isoformat(), "Uttar Pradesh", 1000.0, 1600.0, 1300.0)]
+
+
+def test_prefetch_pages_through_every_commodity(store, monkeypatch):
+    today = date.today()
+    requests = []
+
+    def get(url, params=None, **kwargs):
+        requests.append(params)
+        if params['filters[commodity]'] == "Onion":
+            raise ConnectionError("API down")
+        pages = [[record("Lucknow", today, "1200"), record("Delhi", today, "1250")],
+                 [record("Delhi", today - timedelta(days=1), "1240"), record("Pune", today, "1100")],
+                 [record("Kanpur", today, "1180")]]
+        page = pages[int(params['offset']) // 2]
+        return FakeResponse({"total": 5, "records": page})
+
+    monkeypatch.setattr(price_history.http, "get", get)
+    monkeypatch.setattr(price_history.Config, "PRICE_PREFETCH_PAGE_SIZE", 2)
+    result = prefetch(store, api_key="key", commodities=["Potato", "Onion"], markets=["Lucknow", "Delhi", "Kanpur"])
+
+    assert [params['offset'] for params in requests] == ['0', '2', '4', '0']
+    assert (result['commodities'], result['pages'], result['rows']) == (1, 3, 4)
+    assert list(result['errors']) == ["Onion"]
+    assert store.latest("potato", "delhi") == (today.isoformat(), 1250.0)
+
+
+def test_prefetch_pages_without_a_total(store, monkeypatch):
+    today = date.today()
+    pages = [[record("Lucknow", today, "1200"), record("Delhi", today, "1250")],
+             [record("Kanpur", today, "1180"), record("Agra", today, "1190")],
+             [record("Pune", today, "1100")]]
+
+    def get(url, params=None, **kwargs):
+        return FakeResponse({"records": pages[int(params['offset']) // 2]})
+
+    monkeypatch.setattr(price_history.http, "get", get)
+    monkeypatch.setattr(price_history.Config, "PRICE_PREFETCH_PAGE_SIZE", 2)
+    result = prefetch(store, api_key="key", commodities=["Potato"], markets=["Lucknow", "Kanpur"])
+
+    assert (result['pages'], result['rows']) == (3, 2)
+    assert store.latest("Potato", "Kanpur") == (today.isoformat(), 1180.0)
+
+
+def test_price_queries_read_the_store(store, monkeypatch):
+    monkeypatch.delenv('AGMARKNET_API_KEY', raising=False)
+    store.put_many([("Potato", "Lucknow", date.today().isoformat(), None, None, None, 1234.0),
+                    ("Onion", "Lucknow", (date.today() - timedelta(days=30)).isoformat(), None, None, None, 900.0)])
+
+    assert get_agmarknet_price("आलू", "लखनऊ", "उत्तर प्रदेश") == ("1234", "Lucknow", "Potato")
+    # A month-old price is not quoted as today's
+    assert get_agmarknet_price("प्याज", "लखनऊ", "उत्तर प्रदेश") == (None, None, None)
+
+
+def test_api_answers_are_kept_in_history(store):
+    agri_price_service._parse_agmarknet({"records": [record("Agra", date.today(), "1500")]}, "key", "Potato")
+    assert store.latest("Potato", "Agra") == (date.today().isoformat(), 1500.0)
+
+
+def test_only_one_worker_fetches_per_interval(store, monkeypatch):
+    monkeypatch.setenv('AGMARKNET_API_KEY', "key")
+    runs = []
+    monkeypatch.setattr(price_history, "prefetch", lambda store: runs.append(1) or {'rows': 3, 'errors': {}})
+
+    first, second = PricePrefetcher(store, interval=3600), PricePrefetcher(store, interval=3600)
+    assert first.run_once() == {'rows': 3, 'errors': {}}
+    assert second.run_once() is None
+    assert len(runs) == 1
+    assert store.get_stats()['last_run']['rows'] == 3
+
+
+def test_week_over_week_trend(store):
+    newest = date.today()
+    store.put_many([("Potato", "Lucknow", (newest - timedelta(days=days)).isoformat(), None, None, None, price)
+                    for days, price in ((0, 1320), (3, 1280), (8, 1100), (12, 1100))])
+    assert get_price_trend("आलू", "लखनऊ") == \
+        "लखनऊ मंडी में आलू का भाव पिछले सप्ताह से 18% बढ़ा है, 1100 से 1300 रुपये प्रति क्विंटल।"
+
+    store.put_many([("Wheat", "Lucknow", (newest - timedelta(days=days)).isoformat(), None, None, None, 2200)
+                    for days in (1, 9)])
+    assert get_price_trend("गेहूं", "लखनऊ") == \
+        "लखनऊ मंडी में गेहूं का भाव पिछले सप्ताह जैसा ही है, लगभग 2200 रुपये प्रति क्विंटल।"
+
+    # Without two weeks of history, the general note
+    assert get_price_trend("प्याज", "लखनऊ") == "प्याज के भाव में स्थिरता देखी जा रही है।"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
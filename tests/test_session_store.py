@@ -0,0 +1,87 @@
+"""
+Test script for the session store
+Checks TTL expiry, LRU bounds, compact serialization and sharing across workers.
+"""
+
+import time
+
+from vaani.core.session_store import MemorySessionStore, SQLiteSessionStore, dumps, loads, new_session
+
+
+def test_memory_store_expires_and_evicts():
+    store = MemorySessionStore(ttl=0.2, max_sessions=2)
+    session = store.get('a')
+    assert session == new_session()
+    session['waiting_for_news'] = True
+    store.save('a', session)
+
+    # get() hands out a copy; only save() changes the stored session
+    store.get('a')['language'] = 'en'
+    assert store.get('a') == {**new_session(), 'waiting_for_news': True}
+
+    store.save('b', new_session())
+    store.get('a')                      # 'a' is now the most recently used
+    store.save('c', new_session())
+    assert len(store) == 2
+    assert store.get_stats()['evicted'] == 1
+    assert store.get('b') == new_session()
+
+    time.sleep(0.25)
+    assert store.get('a') == new_session()
+    assert store.purge_expired() == 1
+    stats = store.get_stats()
+    assert stats['expired'] == 2
+    assert stats['sessions'] == 0
+
+
+def test_large_sessions_are_compressed():
+    session = {**new_session(), 'articles': [{'title': f"खबर {i}", 'description': "विवरण " * 40} for i in range(10)]}
+    blob = dumps(session)
+    assert blob[:1] == b'z'
+    assert len(blob) < len(dumps(new_session())) * 40
+    assert loads(blob) == session
+    assert dumps(new_session())[:1] == b'j'
+
+
+def test_sqlite_store_is_shared(tmp_path):
+    """Two stores on one file behave like two workers sharing sessions"""
+    path = str(tmp_path / "sessions.db")
+    first, second = SQLiteSessionStore(path, ttl=0.3), SQLiteSessionStore(path, ttl=0.3)
+
+    session = first.get('user')
+    session.update(waiting_for_news=True, articles=[{'title': "पहली खबर"}])
+    first.save('user', session)
+    assert second.get('user') == session
+    assert len(second) == 1
+
+    time.sleep(0.35)
+    assert second.get('user') == new_session()
+    assert second.get_stats()['expired'] == 1
+    assert len(first) == 0
+
+
+def test_news_follow_up_survives_worker_switch(monkeypatch, tmp_path):
+    from vaani import web
+
+    path = str(tmp_path / "sessions.db")
+    seen = []
+
+    def fake_dispatch(command, session, say):
+        seen.append(session['waiting_for_news'])
+        session['waiting_for_news'] = True
+        say("खबरें सुनाऊं?")
+
+    monkeypatch.setattr(web, "dispatch_command", fake_dispatch)
+    monkeypatch.setattr(web, "text_to_speech_file", lambda *args, **kwargs: None)
+
+    monkeypatch.setattr(web, "session_store", SQLiteSessionStore(path))
+    assert web.process_command("खबरें", 'news-user')['waiting_for_news'] is True
+    monkeypatch.setattr(web, "session_store", SQLiteSessionStore(path))
+    web.process_command("पहली", 'news-user')
+
+    assert seen == [False, True]
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
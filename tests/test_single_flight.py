@@ -0,0 +1,106 @@
+"""
+Test script for request coalescing (single-flight)
+Concurrent identical calls must share one upstream execution.
+"""
+
+import asyncio
+import threading
+import time
+
+from vaani.core.single_flight import SingleFlight, make_key
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_make_key_normalizes():
+    """Case and whitespace differences map to one key"""
+    assert make_key('weather', ' Lucknow ') == make_key('weather', 'lucknow')
+    assert make_key('weather', 'New  Delhi') == make_key('weather', 'new delhi')
+    assert make_key('weather', 'Delhi') != make_key('news', 'Delhi')
+
+
+def test_concurrent_calls_collapse():
+    """Only one upstream call runs for identical concurrent misses"""
+    flight = SingleFlight()
+    upstream_calls = []
+
+    def fetch():
+        upstream_calls.append(1)
+        time.sleep(0.2)
+        return {"temp": 31}
+
+    results = _run_concurrently(10, lambda: flight.do(make_key('weather', 'लखनऊ'), fetch))
+
+    stats = flight.get_stats()
+    assert len(upstream_calls) == 1
+    assert all(r == {"temp": 31} for r in results)
+    assert stats['calls'] == 10
+    assert stats['executions'] == 1
+    assert stats['collapsed'] == 9
+    assert stats['namespaces']['weather']['collapsed'] == 9
+    assert stats['in_flight'] == 0
+
+
+def test_errors_are_shared():
+    """Waiters receive the leader's exception, and the key is released"""
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise ConnectionError("upstream down")
+
+    results = _run_concurrently(5, lambda: flight.do(make_key('news', 'top'), failing))
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert flight.get_stats()['executions'] == 1
+
+    # The next call after completion goes upstream again
+    assert flight.do(make_key('news', 'top'), lambda: "fresh") == "fresh"
+    assert flight.get_stats()['executions'] == 2
+
+
+def test_async_calls_collapse():
+    """Concurrent awaits share one task; a cancelled awaiter does not cancel it"""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "data"
+
+    async def run():
+        key = make_key('weather', 'Lucknow')
+        leaver = asyncio.ensure_future(flight.do_async(key, fetch))
+        waiters = [flight.do_async(key, fetch) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        leaver.cancel()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ["data"] * 5
+    assert len(calls) == 1
+    assert flight.in_flight() == 0
+
+
+if __name__ == "__main__":
+    test_make_key_normalizes()
+    test_concurrent_calls_collapse()
+    test_errors_are_shared()
+    test_async_calls_collapse()
+    print("✓ Single-flight tests passed")
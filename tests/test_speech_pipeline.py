@@ -0,0 +1,103 @@
+"""
+Test script for the parallel speech pipeline
+Uses timed stand-ins for synthesis and playback to check ordering,
+overlap between synthesis and playback, and barge-in cancellation.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from vaani.core.voice_tool import SpeechPipeline, break_tag, group_sentences, split_breaks, split_sentences
+
+TEXT = "पहला वाक्य। दूसरा वाक्य। तीसरा वाक्य। चौथा वाक्य। पांचवां वाक्य।"
+
+
+def _pipeline(synth_delay, play_delay, played):
+    def synthesize(sentence, lang, voice_style):
+        time.sleep(synth_delay(sentence))
+        return sentence, 0
+
+    def play(audio, pause, stop_event):
+        if stop_event.wait(play_delay):
+            return
+        played.append(audio)
+
+    return SpeechPipeline(executor=ThreadPoolExecutor(max_workers=4),
+                          synthesize=synthesize, play=play, lookahead=4)
+
+
+def test_sentences_play_in_order():
+    """Faster later sentences still play after earlier ones"""
+    played = []
+    sentences = split_sentences(TEXT)
+    pipeline = _pipeline(lambda s: 0.02 * (len(sentences) - sentences.index(s)), 0.01, played)
+
+    pipeline.speak(TEXT)
+    assert played == sentences
+
+
+def test_synthesis_overlaps_playback():
+    """Total time is close to synthesis of one sentence plus all playback"""
+    played = []
+    pipeline = _pipeline(lambda s: 0.1, 0.1, played)
+
+    start = time.perf_counter()
+    pipeline.speak(TEXT)
+    elapsed = time.perf_counter() - start
+
+    # Sequential synthesize-then-play would take 5 * (0.1 + 0.1) = 1.0s
+    assert len(played) == 5
+    assert elapsed < 0.8
+
+
+def test_cancel_stops_remaining_sentences():
+    """Barge-in stops playback and drops sentences not yet played"""
+    played = []
+    pipeline = _pipeline(lambda s: 0.01, 0.1, played)
+
+    speaker = threading.Thread(target=pipeline.speak, args=(TEXT,))
+    speaker.start()
+    time.sleep(0.15)
+    pipeline.cancel()
+    speaker.join(timeout=2)
+
+    assert not speaker.is_alive()
+    assert 1 <= len(played) < 5
+    assert not pipeline.speaking
+
+
+def test_group_sentences():
+    """Chunks respect the size limit without splitting sentences"""
+    text = " ".join(f"यह वाक्य संख्या {i} है।" for i in range(40))
+    chunks = group_sentences(text, max_chars=100)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_pause_hint_follows_last_sentence():
+    """A service's pause hint is added after the final sentence only"""
+    pauses = []
+    pipeline = SpeechPipeline(executor=ThreadPoolExecutor(max_workers=2),
+                              synthesize=lambda s, lang, style: (s, 0.2),
+                              play=lambda audio, pause, stop_event: pauses.append(pause))
+
+    pipeline.speak("पहला वाक्य। दूसरा वाक्य।", pause=0.5)
+    assert pauses == [0.2, 0.7]
+
+
+def test_break_tags_round_trip():
+    text = "पहला" + break_tag(0.3) + " दूसरा" + break_tag(0) + " तीसरा" + break_tag(0.5)
+    assert split_breaks(text) == [("पहला", 0.3), ("दूसरा तीसरा", 0.5)]
+
+
+if __name__ == "__main__":
+    test_sentences_play_in_order()
+    test_synthesis_overlaps_playback()
+    test_cancel_stops_remaining_sentences()
+    test_group_sentences()
+    test_pause_hint_follows_last_sentence()
+    test_break_tags_round_trip()
+    print("✓ Speech pipeline tests passed")
@@ -0,0 +1,81 @@
+"""
+Test script for the streaming query endpoint
+Checks that chunks are emitted in speaking order with their audio URLs.
+"""
+
+import json
+import time
+
+import vaani.web as web
+
+
+def _parse_events(body):
+    events = []
+    for raw in body.strip().split("\n\n"):
+        lines = raw.split("\n")
+        name = lines[0][len("event: "):]
+        data = json.loads(lines[1][len("data: "):])
+        events.append((name, data))
+    return events
+
+
+def test_stream_keeps_chunk_order(monkeypatch):
+    """Later chunks that synthesize faster still arrive after earlier ones"""
+    chunks = ["पहला वाक्य।", "दूसरा वाक्य।", "तीसरा वाक्य।", "चौथा वाक्य।"]
+
+    def fake_dispatch(command, session, say):
+        for text in chunks:
+            say(text)
+
+    def fake_tts(text, lang='hi'):
+        # Earlier chunks take longer, so they finish out of order
+        time.sleep(0.05 * (len(chunks) - chunks.index(text)))
+        return None
+
+    monkeypatch.setattr(web, "dispatch_command", fake_dispatch)
+    monkeypatch.setattr(web, "text_to_speech_file", fake_tts)
+
+    client = web.app.test_client()
+    response = client.post('/api/query/stream', json={'query': 'कुछ भी', 'session_id': 'stream-test'})
+    events = _parse_events(response.get_data(as_text=True))
+
+    assert response.mimetype == 'text/event-stream'
+    assert [data['text'] for name, data in events if name == 'chunk'] == chunks
+    assert [data['index'] for name, data in events if name == 'chunk'] == [0, 1, 2, 3]
+    assert events[-1][0] == 'done'
+    assert events[-1][1]['text'] == ' '.join(chunks)
+
+
+def test_pause_hints_become_break_tags(monkeypatch):
+    """Pause hints reach TTS as break tags; the displayed text stays clean"""
+    synthesized = []
+
+    def fake_dispatch(command, session, say):
+        say("पहला वाक्य।", pause=0.5)
+        say("दूसरा वाक्य।")
+
+    def fake_tts(text, lang='hi'):
+        synthesized.append(text)
+        return None
+
+    monkeypatch.setattr(web, "dispatch_command", fake_dispatch)
+    monkeypatch.setattr(web, "text_to_speech_file", fake_tts)
+
+    client = web.app.test_client()
+    response = client.post('/api/query/stream', json={'query': 'कुछ भी', 'session_id': 'pause-test'})
+    events = _parse_events(response.get_data(as_text=True))
+
+    assert synthesized == ['पहला वाक्य। <break time="500ms"/>', "दूसरा वाक्य।"]
+    assert events[-1][1]['text'] == "पहला वाक्य। दूसरा वाक्य।"
+
+
+def test_stream_requires_query():
+    """An empty query is rejected before streaming starts"""
+    client = web.app.test_client()
+    response = client.post('/api/query/stream', json={'query': '  '})
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__, "-q"])
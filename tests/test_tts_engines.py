@@ -0,0 +1,116 @@
+"""
+Test script for TTS engine selection
+Covers offline fallback, the latency budget, failure cooldown and cache file formats.
+"""
+
+import os
+import tempfile
+import time
+
+from vaani.core.audio_cache import AudioCache
+from vaani.core.tts_engines import GTTSEngine, TTSEngine, TTSEngineSelector
+
+
+class FakeEngine(TTSEngine):
+    def __init__(self, name, requires_network=False, delay=0.0, fail=False, langs=None, extension='wav'):
+        self.name = name
+        self.requires_network = requires_network
+        self.extension = extension
+        self.delay = delay
+        self.fail = fail
+        self.langs = langs
+        self.calls = 0
+
+    def supports(self, lang):
+        return self.langs is None or lang in self.langs
+
+    def synthesize(self, text, lang='hi'):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("unreachable")
+        return f"{self.name}:{text}".encode('utf-8')
+
+
+def _selector(engines, online=True, **kwargs):
+    return TTSEngineSelector(engines, online_check=lambda: online, online_check_interval=0, **kwargs)
+
+
+def test_prefers_network_engine_when_online():
+    cloud, local = FakeEngine('cloud', requires_network=True, extension='mp3'), FakeEngine('local')
+    assert _selector([cloud, local]).choose('hi') is cloud
+
+
+def test_offline_uses_local_engine():
+    cloud, local = FakeEngine('cloud', requires_network=True), FakeEngine('local')
+    audio, engine = _selector([cloud, local], online=False).synthesize("नमस्ते", 'hi')
+    assert engine is local and audio == "local:नमस्ते".encode('utf-8')
+    assert cloud.calls == 0
+
+
+def test_failure_falls_back_and_cools_down():
+    cloud = FakeEngine('cloud', requires_network=True, fail=True)
+    local = FakeEngine('local')
+    selector = _selector([cloud, local], cooldown=60)
+
+    _, engine = selector.synthesize("एक", 'hi')
+    assert engine is local and cloud.calls == 1
+    # The failed engine is skipped while cooling down
+    _, engine = selector.synthesize("दो", 'hi')
+    assert engine is local and cloud.calls == 1
+    assert selector.get_stats()['engines']['cloud']['cooling_down']
+
+
+def test_slow_network_engine_exceeds_budget():
+    cloud = FakeEngine('cloud', requires_network=True, delay=0.05)
+    local = FakeEngine('local')
+    selector = _selector([cloud, local], latency_budget_ms=10, cooldown=60)
+
+    _, engine = selector.synthesize("धीमा", 'hi')
+    assert engine is cloud
+    assert selector.choose('hi') is local
+    # Still available as a last resort
+    assert selector.candidates('hi') == [local, cloud]
+
+
+def test_language_support_filters_engines():
+    cloud = FakeEngine('cloud', requires_network=True)
+    local = FakeEngine('local', langs={'hi'})
+    selector = _selector([local, cloud], online=False)
+    assert selector.choose('hi') is local
+    # No local voice for Tamil: try the network anyway
+    assert selector.choose('ta') is cloud
+
+
+def test_audio_cache_keeps_engine_format():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AudioCache(tmp)
+
+        def render(filepath):
+            with open(filepath, 'wb') as f:
+                f.write(b'RIFF')
+            return True
+
+        path = cache.get_or_create("नमस्ते", 'hi', 'default', 'espeak', render, ext='wav')
+        assert path.endswith('.wav')
+        assert AudioCache(tmp).get("नमस्ते", 'hi', engine='espeak') == path
+        assert os.path.basename(path).startswith('audio_')
+
+
+def test_gtts_silence_is_whole_mp3_frames():
+    """Break tags in gTTS audio are filled with 24 ms silent MP3 frames"""
+    silence = GTTSEngine().silence(0.48)
+    assert len(silence) == 20 * 96
+    assert all(silence[i:i + 2] == b'\xff\xf3' for i in range(0, len(silence), 96))
+    assert TTSEngine().silence(0.48) is None
+
+
+if __name__ == "__main__":
+    test_prefers_network_engine_when_online()
+    test_offline_uses_local_engine()
+    test_failure_falls_back_and_cools_down()
+    test_slow_network_engine_exceeds_budget()
+    test_language_support_filters_engines()
+    test_audio_cache_keeps_engine_format()
+    test_gtts_silence_is_whole_mp3_frames()
+    print("✓ TTS engine tests passed")
@@ -0,0 +1,77 @@
+"""
+Test script for multi-worker support
+Checks preloading, fork-safety of shared clients and per-worker heartbeats.
+"""
+
+import gc
+import json
+import os
+import time
+
+import pytest
+
+from vaani.core import config as Config
+from vaani.core import http, workers
+from vaani.services.agriculture.agri_scheme_service import load_json_data
+
+
+def test_preload_loads_read_only_data():
+    loaded = workers.preload()
+    try:
+        assert loaded['intent_phrases'] > 0
+        assert loaded['crops'] > 0
+        assert loaded['scheme_files'] > 0
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+    # Scheme files are parsed once and shared afterwards
+    assert load_json_data('loan_data', 'kcc_loan.json') is load_json_data('loan_data', 'kcc_loan.json')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+def test_forked_worker_heartbeat(monkeypatch, tmp_path):
+    """A forked worker gets its own HTTP client and shows up in all_workers()"""
+    monkeypatch.setattr(Config, 'WORKER_STATE_DIR', str(tmp_path))
+    http.get_http_client()
+    workers._preloaded_in = os.getpid()
+
+    pid = os.fork()
+    if pid == 0:
+        ok = http._client is None and workers.worker_health()['preloaded']
+        workers.start_worker(interval=0.05)
+        time.sleep(0.3)
+        os._exit(0 if ok else 1)
+
+    try:
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        pids = [info['pid'] for info in workers.all_workers()]
+        assert pids == sorted([os.getpid(), pid])
+
+        workers.forget_worker(pid, master_pid=os.getpid())
+        assert [info['pid'] for info in workers.all_workers()] == [os.getpid()]
+    finally:
+        workers._preloaded_in = None
+        workers.clear_state()
+
+
+def test_silent_worker_is_unhealthy(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'WORKER_STATE_DIR', str(tmp_path))
+    state_dir = tmp_path / str(os.getpid())
+    state_dir.mkdir()
+    stale = {'pid': 999999, 'uptime': 50.0, 'requests': 3, 'preloaded': True,
+             'last_beat': time.time() - Config.WORKER_HEARTBEAT_TIMEOUT - 5}
+    (state_dir / "999999.json").write_text(json.dumps(stale))
+
+    health = {info['pid']: info['healthy'] for info in workers.all_workers()}
+    assert health == {999999: False, os.getpid(): True}
+
+    from vaani import web
+    response = web.app.test_client().get('/api/health/workers')
+    assert response.status_code == 503
+    assert response.get_json()['status'] == 'degraded'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
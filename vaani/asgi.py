@@ -0,0 +1,425 @@
+"""
+Vaani Web Interface - ASGI Application
+Serves the same routes as vaani.web, with queries handled on an event loop.
+
+Weather, news, mandi prices, Gemini answers and TTS are awaited, so a query
+that is waiting on an upstream holds no thread. Each upstream has its own
+concurrency limit (Config.HTTP_HOST_SETTINGS, Config.ASYNC_UPSTREAM_LIMITS),
+and a client that disconnects cancels its query. Routes without network
+waits (audio files, status, health, the page itself) are answered by the
+Flask app on a worker thread.
+
+Run:
+    uvicorn vaani.asgi:app --port 5000
+    python -m vaani.asgi
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+from collections import deque
+from urllib.parse import parse_qsl
+
+from vaani import web
+from vaani.core import workers
+from vaani.core.context_manager import AgriculturalContext
+from vaani.core.voice_tool import break_tag, text_to_speech_file_async
+from vaani.services.weather.weather_service import get_weather_async
+from vaani.services.news.news_service import get_news_async
+from vaani.services.agriculture.agri_command_processor import process_agriculture_command_async
+from vaani.services.knowledge.general_knowledge_service import handle_general_knowledge_query_async
+
+async def dispatch_command_async(command, session, say):
+    """
+    dispatch_command with the network-bound services awaited.
+    Follows dispatch_command's priority order; intents without an async
+    version are handed to dispatch_command on a worker thread.
+    """
+    intents = web.intent_router.match(command)
+    print(f"Matched intents: {intents.intents}")
+
+    # Emergency, language switching, a pending news selection and time/date
+    # come first in dispatch_command and need no network
+    if intents.has('emergency', 'language_switch', 'time', 'date') or session.get('waiting_for_news', False):
+        await asyncio.to_thread(web.dispatch_command, command, session, say)
+
+    elif intents.has('weather'):
+        await get_weather_async(command, say)
+
+    elif intents.has('news'):
+        articles = await get_news_async(command, say)
+        if articles:
+            session['articles'] = articles
+            session['waiting_for_news'] = True
+
+    # Wikipedia, finance and the expense tracker keep their blocking clients;
+    # finance handlers may also decline and fall through to later intents
+    elif intents.has('wikipedia', 'financial', 'calculation', 'expense'):
+        await asyncio.to_thread(web.dispatch_command, command, session, say)
+
+    elif intents.has('agriculture'):
+        await process_agriculture_command_async(command, say, {}, AgriculturalContext())
+
+    elif intents.has('social_scheme'):
+        await asyncio.to_thread(web.dispatch_command, command, session, say)
+
+    elif intents.has('general_knowledge', 'question_mark'):
+        if not await handle_general_knowledge_query_async(command, say):
+            say(web.language_of(session).get_phrase('error'))
+
+    elif intents.has('greeting'):
+        await asyncio.to_thread(web.dispatch_command, command, session, say)
+
+    # Fallback for unrecognized queries - Try Gemini AI
+    elif not await handle_general_knowledge_query_async(command, say):
+        say("मुझे आपका सवाल समझ नहीं आया। कृपया दोबारा कोशिश करें।")
+
+
+def _collector(put, session):
+    """
+    A say() for services that hands (text, pause, tts_lang) chunks to put(),
+    tts_lang being the session's language when the chunk was spoken.
+    Services that run on a worker thread call it too; those calls are passed
+    to the event loop, where they run before the thread's completion wakes
+    the awaiting task, so no chunk is missed or reordered.
+    """
+    loop = asyncio.get_running_loop()
+    loop_thread = threading.get_ident()
+
+    def say(text, lang='hi', pause=0.0, **kwargs):
+        if text and text.strip():
+            chunk = (text, pause, web.language_of(session).get_tts_code())
+            if threading.get_ident() == loop_thread:
+                put(chunk)
+            else:
+                loop.call_soon_threadsafe(put, chunk)
+        return text
+    return say
+
+
+async def _audio_url(text, lang='hi'):
+    """Synthesize text (lang is a TTS code) and return its audio URL (or None)"""
+    try:
+        audio_path = await text_to_speech_file_async(text, lang=lang)
+        if audio_path and os.path.exists(audio_path):
+            return f'/api/audio/{os.path.basename(audio_path)}'
+    except Exception as e:
+        print(f"[Audio Error]: {e}")
+    return None
+
+
+async def process_command_async(command, session_id=None):
+    """
+    Async process_command: same result dict
+    ('text', 'success', 'audio_file', 'language', 'waiting_for_news').
+    """
+    chunks = []
+    session = web.get_session(session_id)
+    try:
+        await dispatch_command_async(command, session, _collector(chunks.append, session))
+        web.save_session(session_id, session)
+
+        lang = web.language_of(session)
+        if chunks:
+            full_response = ' '.join(text for text, _, _ in chunks)
+            spoken_response = ' '.join(text + break_tag(pause) for text, pause, _ in chunks)
+        else:
+            full_response = spoken_response = lang.get_phrase('error')
+        return {
+            'success': True,
+            'text': full_response,
+            'audio_file': await _audio_url(spoken_response, lang.get_tts_code()),
+            'language': session.get('language', 'hi'),
+            'waiting_for_news': session.get('waiting_for_news', False)
+        }
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {
+            'success': False,
+            'text': f"Error: {str(e)}",
+            'message': str(e)
+        }
+
+
+async def stream_command_async(command, session_id=None):
+    """
+    Async stream_command: yields the same Server-Sent Events.
+    Each chunk's audio is synthesized as soon as it is spoken, and chunks are
+    emitted in speaking order as soon as their audio is ready.
+    """
+    session = web.get_session(session_id)
+    spoken = asyncio.Queue()
+    finished = object()
+    errors = []
+
+    async def run():
+        try:
+            await dispatch_command_async(command, session, _collector(spoken.put_nowait, session))
+            web.save_session(session_id, session)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            errors.append(str(e))
+        finally:
+            # Queued behind any chunks a worker thread is still handing over
+            asyncio.get_running_loop().call_soon(spoken.put_nowait, finished)
+
+    dispatcher = asyncio.create_task(run())
+    pending = deque()   # (index, text, audio task) in speaking order
+    texts = []
+    getter = None
+    done = False
+    try:
+        while not done or pending:
+            waiting = []
+            if not done:
+                if getter is None:
+                    getter = asyncio.ensure_future(spoken.get())
+                waiting.append(getter)
+            if pending:
+                waiting.append(pending[0][2])
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            # Emit every head chunk whose audio is ready
+            while pending and pending[0][2].done():
+                index, text, audio = pending.popleft()
+                yield web._sse_event('chunk', {'index': index, 'text': text, 'audio_file': audio.result()})
+
+            if getter is None or not getter.done():
+                continue
+            item, getter = getter.result(), None
+            if item is finished:
+                done = True
+                if texts or errors:
+                    continue
+                lang = web.language_of(session)
+                item = (lang.get_phrase('error'), 0.0, lang.get_tts_code())
+
+            # A pause hint becomes trailing silence in the chunk's audio
+            text, pause, tts_lang = item
+            texts.append(text)
+            pending.append((len(texts) - 1, text, asyncio.ensure_future(_audio_url(text + break_tag(pause), tts_lang))))
+    finally:
+        # Client gone or stream finished: stop whatever is still running
+        for task in [dispatcher, getter] + [audio for _, _, audio in pending]:
+            if task is not None:
+                task.cancel()
+
+    if errors:
+        yield web._sse_event('done', {'success': False, 'text': f"Error: {errors[0]}", 'message': errors[0]})
+    else:
+        yield web._sse_event('done', {
+            'success': True,
+            'text': ' '.join(texts),
+            'language': session.get('language', 'hi'),
+            'waiting_for_news': session.get('waiting_for_news', False)
+        })
+
+
+# --- ASGI plumbing ---
+
+async def _read_body(receive):
+    """The whole request body, or None if the client disconnected"""
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body += message.get('body', b'')
+        if not message.get('more_body', False):
+            return body
+
+
+async def _until_disconnect(receive, coro):
+    """Run coro, cancelling it if the client disconnects first"""
+    async def disconnected():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    work = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(disconnected())
+    try:
+        await asyncio.wait([work, watcher], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+    if not work.done():
+        work.cancel()
+        print("[ASGI] Client disconnected, query cancelled")
+        return None
+    return work.result()
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(body)).encode('ascii')),
+                            (b'access-control-allow-origin', b'*')]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _query_params(scope, body):
+    """(query, session_id) from a JSON body or, for GET, the query string"""
+    if scope['method'] == 'GET':
+        data = dict(parse_qsl(scope.get('query_string', b'').decode('utf-8')))
+    else:
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+    return (data.get('query') or '').strip(), data.get('session_id', 'default')
+
+
+async def _handle_query(scope, receive, send, body):
+    command, session_id = _query_params(scope, body)
+    if not command:
+        await _send_json(send, {'success': False, 'message': 'No query provided'}, 400)
+        return
+    print(f"Processing command: '{command}' for session: {session_id}")
+    result = await _until_disconnect(receive, process_command_async(command, session_id))
+    if result is not None:
+        await _send_json(send, result)
+
+
+async def _handle_stream(scope, receive, send, body):
+    command, session_id = _query_params(scope, body)
+    if not command:
+        await _send_json(send, {'success': False, 'message': 'No query provided'}, 400)
+        return
+    print(f"Streaming command: '{command}' for session: {session_id}")
+
+    async def pump():
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'text/event-stream; charset=utf-8'),
+                                (b'cache-control', b'no-cache'),
+                                (b'x-accel-buffering', b'no'),
+                                (b'access-control-allow-origin', b'*')]})
+        events = stream_command_async(command, session_id)
+        try:
+            async for event in events:
+                await send({'type': 'http.response.body', 'body': event.encode('utf-8'), 'more_body': True})
+        finally:
+            await events.aclose()
+        await send({'type': 'http.response.body', 'body': b''})
+
+    await _until_disconnect(receive, pump())
+
+
+def _wsgi_environ(scope, body):
+    """PEP 3333 environ for an ASGI HTTP scope"""
+    import io
+
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _run_wsgi(environ):
+    """Call the Flask app; returns (status code, headers, body)"""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['headers'] = headers
+        return chunks.append
+
+    result = web.app(environ, start_response)
+    try:
+        for chunk in result:
+            chunks.append(chunk)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], b''.join(chunks)
+
+
+async def _handle_wsgi(scope, send, body):
+    status, headers, payload = await asyncio.to_thread(_run_wsgi, _wsgi_environ(scope, body))
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                            for name, value in headers]})
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            web.audio_cache.start_janitor()
+            web.price_prefetcher.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            from vaani.core import http
+            await http.get_async_http_client().close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI 3 entry point"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    body = await _read_body(receive)
+    if body is None:
+        return
+    # Queries are answered on the event loop; everything else goes to the Flask app
+    path, method = scope['path'], scope['method']
+    if path == '/api/query' and method == 'POST':
+        workers.note_request()
+        await _handle_query(scope, receive, send, body)
+    elif path == '/api/query/stream' and method in ('GET', 'POST'):
+        workers.note_request()
+        await _handle_stream(scope, receive, send, body)
+    else:
+        await _handle_wsgi(scope, send, body)
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        print("uvicorn is not installed: pip install uvicorn")
+        sys.exit(1)
+
+    for directory in ["data/expense_data", "data/offline_cache", "cache", "logs"]:
+        os.makedirs(directory, exist_ok=True)
+    web.audio_cache.run_janitor()
+
+    port = int(os.getenv('PORT', 5000))
+    host = os.getenv('HOST', '0.0.0.0')
+    print(f"\n🌐 Starting ASGI server on {host}:{port}")
+    uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,297 @@
+"""
+Answer Cache for Vaani
+Persistent cache of Gemini answers, keyed by prompt template and normalized
+question, that also answers near-duplicate rephrasings of a cached question.
+
+Near duplicates are found with MinHash over character 3-grams (LSH bands in
+SQLite pick candidates, exact Jaccard confirms them), so "पौधे हरे क्यों होते हैं?"
+and "पौधे हरे क्यों होते है" share an answer. Numbers, question words,
+negations and any guard the caller passes must match exactly: "5 बोरी x 50 किलो"
+never reuses the answer for "6 बोरी x 50 किलो", nor "आवेदन कैसे करें" the
+answer for "आवेदन क्यों करें".
+
+Usage:
+    from vaani.core.answer_cache import get_answer_cache, template_key
+
+    TEMPLATE = template_key('general_knowledge', PROMPT)
+    cache = get_answer_cache()
+    answer = cache.get(TEMPLATE, question)
+    if answer is None:
+        answer = ask_gemini(PROMPT.format(question=question))
+        cache.put(TEMPLATE, question, answer)
+"""
+
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+import logging
+
+from vaani.core import config as Config
+from vaani.core.sqlite_util import connect_local
+from vaani.services.finance.hindi_arithmetic import ENGLISH_NUMBERS, HINDI_NUMBERS, MULTIPLIERS, PREFIXES
+
+logger = logging.getLogger('answer_cache')
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ANSWER_DB_PATH = os.path.join(_PROJECT_ROOT, 'cache', 'answers.db')
+
+# MinHash signature: BANDS x ROWS permutations. With 16 bands of 4 rows a pair
+# at Jaccard 0.8 becomes a candidate 99.9% of the time, a pair at 0.3 about 12%.
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 4
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x7661616e69)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(BANDS * ROWS)]
+
+# Politeness and filler words that do not change what is being asked
+FILLER_WORDS = frozenset({
+    'बताओ', 'बताइए', 'बताइये', 'बताना', 'बतायें', 'बताएं', 'जरा', 'जी', 'प्लीज',
+    'कृपया', 'मुझे', 'वाणी', 'please', 'tell', 'me', 'vaani'
+})
+
+# Spoken numbers, from the same table the local calculator reads; with digits,
+# question words and negations they form the default guard
+NUMBER_WORDS = frozenset(HINDI_NUMBERS) | frozenset(ENGLISH_NUMBERS) | frozenset(MULTIPLIERS) | frozenset(PREFIXES)
+
+# Words that change the question while barely changing its 3-grams:
+# "आवेदन कैसे करें" / "आवेदन क्यों करें", "लोन लेना चाहिए" / "लोन लेना चाहिए या नहीं"
+QUESTION_WORDS = frozenset({
+    'क्या', 'क्यों', 'क्यूं', 'कैसे', 'कैसा', 'कैसी', 'कब', 'कौन', 'कौनसा', 'कौनसी', 'किस', 'किसे',
+    'किसको', 'कहां', 'किधर', 'कितना', 'कितने', 'कितनी',
+    'what', 'why', 'how', 'when', 'who', 'which', 'where'
+})
+NEGATION_WORDS = frozenset({'नहीं', 'नही', 'मत', 'न', 'ना', 'not', 'no', 'never'})
+GUARD_WORDS = NUMBER_WORDS | QUESTION_WORDS | NEGATION_WORDS
+
+_DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+_DIGITS = re.compile(r'\d')
+
+
+def normalize_question(text):
+    """
+    Canonical form of a question: NFC, lowercase, Devanagari digits as ASCII,
+    no nukta, chandrabindu as anusvara, no punctuation or filler words.
+    """
+    text = unicodedata.normalize('NFD', text or '').replace('़', '')
+    text = unicodedata.normalize('NFC', text).replace('ँ', 'ं')
+    text = text.lower().translate(_DEVANAGARI_DIGITS)
+    text = ''.join(' ' if unicodedata.category(ch)[0] in 'PS' else ch for ch in text)
+    return ' '.join(word for word in text.split() if word not in FILLER_WORDS)
+
+
+def number_guard(normalized):
+    """
+    The numbers, question words and negations in a normalized question, in
+    order, which a near duplicate must share exactly
+    """
+    return ' '.join(word for word in normalized.split() if _DIGITS.search(word) or word in GUARD_WORDS)
+
+
+def shingles(normalized):
+    """Character 3-grams of a normalized question, padded so short words count"""
+    text = f" {normalized} "
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set):
+    """BANDS * ROWS minimum hashes; stable across processes (crc32, fixed seeds)"""
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingle_set]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(template, signature):
+    """One signed 64-bit bucket id per band, scoped to the prompt template"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(f"{template}|{band}|{rows}".encode(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+def template_key(name, template):
+    """Cache namespace for a prompt template; editing the template starts a new namespace"""
+    return f"{name}:{hashlib.sha1(template.encode('utf-8')).hexdigest()[:8]}"
+
+
+class AnswerCache:
+    """
+    Gemini answers in one SQLite file in WAL mode, shared by every worker.
+    Entries expire after ttl seconds; beyond max_entries or max_bytes of
+    answer text the least recently used ones are evicted.
+    """
+
+    def __init__(self, path=ANSWER_DB_PATH, ttl=None, threshold=None, max_entries=None, max_bytes=None):
+        self.path = path
+        self.ttl = ttl or Config.ANSWER_CACHE_TTL
+        self.threshold = threshold or Config.ANSWER_CACHE_SIMILARITY
+        self.max_entries = max_entries or Config.ANSWER_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.ANSWER_CACHE_MAX_BYTES
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._next_purge = 0.0
+        self.stats = {'hits': 0, 'near_hits': 0, 'misses': 0, 'stores': 0, 'expired': 0, 'evicted': 0}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS answers ("
+                   "id INTEGER PRIMARY KEY, template TEXT NOT NULL, question TEXT NOT NULL, "
+                   "guard TEXT NOT NULL, answer TEXT NOT NULL, size INTEGER NOT NULL, "
+                   "expires_at REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0, "
+                   "UNIQUE (template, question, guard))")
+        db.execute("CREATE TABLE IF NOT EXISTS answer_bands ("
+                   "bucket INTEGER NOT NULL, answer_id INTEGER NOT NULL "
+                   "REFERENCES answers (id) ON DELETE CASCADE)")
+        db.execute("CREATE INDEX IF NOT EXISTS answer_bands_bucket ON answer_bands (bucket)")
+        db.execute("CREATE INDEX IF NOT EXISTS answer_bands_answer ON answer_bands (answer_id)")
+        db.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)")
+
+    def _db(self):
+        return connect_local(self._local, self.path, timeout=5, foreign_keys=True)
+
+    def _count(self, stat, n=1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def get(self, template, question, guard='', threshold=None):
+        """
+        The cached answer for question (or a near duplicate of it) under template, or None.
+        guard is extra text (e.g. the operators of a sum) that must match exactly, like the numbers.
+        """
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        guard = f"{number_guard(normalized)}|{guard}"
+        db, now = self._db(), time.time()
+
+        row = db.execute("SELECT id, answer FROM answers "
+                         "WHERE template = ? AND question = ? AND guard = ? AND expires_at > ?",
+                         (template, normalized, guard, now)).fetchone()
+        if row is not None:
+            self._touch(row[0], now)
+            self._count('hits')
+            return row[1]
+
+        threshold = threshold or self.threshold
+        if threshold < 1.0:
+            match = self._nearest(template, normalized, guard, threshold, now)
+            if match is not None:
+                self._touch(match[0], now)
+                self._count('near_hits')
+                return match[1]
+
+        self._count('misses')
+        return None
+
+    def _nearest(self, template, normalized, guard, threshold, now):
+        query_shingles = shingles(normalized)
+        buckets = band_buckets(template, minhash(query_shingles))
+        candidates = self._db().execute(
+            f"SELECT DISTINCT a.id, a.answer, a.question FROM answer_bands b JOIN answers a ON a.id = b.answer_id "
+            f"WHERE b.bucket IN ({','.join('?' * len(buckets))}) AND a.template = ? AND a.guard = ? "
+            f"AND a.expires_at > ?", (*buckets, template, guard, now)).fetchall()
+
+        best, best_score = None, threshold
+        for answer_id, answer, question in candidates:
+            score = jaccard(query_shingles, shingles(question))
+            if score >= best_score:
+                best, best_score = (answer_id, answer), score
+        return best
+
+    def _touch(self, answer_id, now):
+        self._db().execute("UPDATE answers SET last_used = ?, hits = hits + 1 WHERE id = ?", (now, answer_id))
+
+    def put(self, template, question, answer, guard=''):
+        """Cache answer for question under template (replacing any earlier answer)"""
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        guard = f"{number_guard(normalized)}|{guard}"
+        now = time.time()
+        buckets = band_buckets(template, minhash(shingles(normalized)))
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM answers WHERE template = ? AND question = ? AND guard = ?",
+                       (template, normalized, guard))
+            answer_id = db.execute(
+                "INSERT INTO answers (template, question, guard, answer, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (template, normalized, guard, answer,
+                 len(answer.encode('utf-8')), now + self.ttl, now)).lastrowid
+            db.executemany("INSERT INTO answer_bands (bucket, answer_id) VALUES (?, ?)",
+                           [(bucket, answer_id) for bucket in buckets])
+        self._count('stores')
+
+        if now >= self._next_purge:
+            self._next_purge = now + min(self.ttl / 10, 3600)
+            self.purge_expired()
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        db = self._db()
+        count, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM answers").fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        evicted = 0
+        for answer_id, answer_size in db.execute("SELECT id, size FROM answers ORDER BY last_used").fetchall():
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            db.execute("DELETE FROM answers WHERE id = ?", (answer_id,))
+            count, size, evicted = count - 1, size - answer_size, evicted + 1
+        self._count('evicted', evicted)
+
+    def purge_expired(self):
+        """Drop every expired answer; returns the number removed"""
+        removed = self._db().execute("DELETE FROM answers WHERE expires_at <= ?", (time.time(),)).rowcount
+        if removed:
+            self._count('expired', removed)
+        return removed
+
+    def clear(self):
+        self._db().execute("DELETE FROM answers")
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM answers WHERE expires_at > ?",
+                                  (time.time(),)).fetchone()[0]
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['near_hits'] + stats['misses']
+        hit_rate = (stats['hits'] + stats['near_hits']) / lookups * 100 if lookups else 0
+        return {
+            'answers': len(self),
+            'ttl': self.ttl,
+            'similarity': self.threshold,
+            'hit_rate': f"{hit_rate:.1f}%",
+            **stats
+        }
+
+
+# Global instance
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """Get or create the global answer cache"""
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
@@ -0,0 +1,366 @@
+"""
+Audio Cache for Vaani
+Content-addressed store for synthesized speech with a disk budget, pinning and a background janitor.
+
+Files are keyed on (text, lang, voice_style, engine) and stored as MP3 or WAV
+depending on the engine that produced them. An in-memory index tracks
+size, hits and last access for every file, so lookups never scan the cache
+directory; the directory is read once at startup to reconcile the index.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None        # Windows: one process, which always owns the janitor
+
+from vaani.core import config as Config
+from vaani.core.single_flight import single_flight, make_key
+
+logger = logging.getLogger('audio_cache')
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+AUDIO_CACHE_DIR = os.path.join(_PROJECT_ROOT, 'cache')
+INDEX_FILENAME = 'audio_index.json'
+JANITOR_LOCK_FILENAME = 'audio_janitor.lock'
+AUDIO_EXTENSIONS = ('.mp3', '.wav')
+
+
+def audio_key(text, lang='hi', voice_style='default', engine='gtts'):
+    """Content address for a piece of synthesized speech"""
+    material = '\x00'.join([engine, lang, voice_style, text.strip()])
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()[:24]
+
+
+class _AudioEntry:
+    __slots__ = ('filename', 'size', 'hits', 'last_access', 'created')
+
+    def __init__(self, filename, size, hits=0, last_access=None, created=None):
+        now = time.time()
+        self.filename = filename
+        self.size = size
+        self.hits = hits
+        self.last_access = last_access or now
+        self.created = created or now
+
+
+class AudioCache:
+    """
+    Disk-backed audio cache with an in-memory index.
+
+    - Eviction is LFU with LRU tie-breaking; hit counts are halved on every
+      janitor pass so formerly popular entries age out.
+    - Pinned keys (fixed phrases such as the greeting) are never evicted.
+    - Concurrent requests for the same audio synthesize it only once.
+    - Worker processes share the directory. One of them (whichever holds the
+      janitor lock) evicts and writes the index, rescanning the directory so
+      the budget covers every worker's files. A hit whose file is gone is
+      a miss, so the audio is rendered again.
+    """
+
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes or Config.AUDIO_CACHE_MAX_BYTES
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()      # key -> _AudioEntry, in LRU order
+        self._pinned = set()
+        self.total_bytes = 0
+        self._dirty = False
+        self._janitor = None
+        self._janitor_lock_file = None     # open while this process owns the janitor
+        self._stop_janitor = threading.Event()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'evicted_bytes': 0, 'vanished': 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    # ---- index persistence -------------------------------------------------
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, INDEX_FILENAME)
+
+    def _load_index(self):
+        """Load the saved index and reconcile it with the directory (startup only)"""
+        saved = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f).get('entries', {})
+            except Exception as e:
+                logger.warning("Could not read audio index, rebuilding: %s", e)
+
+        on_disk = {}
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                stem, ext = os.path.splitext(item.name)
+                if item.is_file() and stem.startswith('audio_') and ext in AUDIO_EXTENSIONS:
+                    on_disk[stem[len('audio_'):]] = (item.name, item.stat())
+
+        ordered = sorted(on_disk.items(),
+                         key=lambda kv: saved.get(kv[0], {}).get('last_access', kv[1][1].st_mtime))
+        for key, (filename, stat) in ordered:
+            info = saved.get(key, {})
+            self._entries[key] = _AudioEntry(
+                filename, stat.st_size,
+                hits=info.get('hits', 0),
+                last_access=info.get('last_access', stat.st_mtime),
+                created=info.get('created', stat.st_mtime)
+            )
+            self.total_bytes += stat.st_size
+        logger.info("Audio cache: %d files, %.1f KB", len(self._entries), self.total_bytes / 1024)
+
+    def save_index(self):
+        """Persist hit counts and access times so eviction survives restarts (janitor owner only)"""
+        if not self.claim_janitor():
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {
+                key: {'hits': e.hits, 'last_access': e.last_access, 'created': e.created, 'size': e.size}
+                for key, e in self._entries.items()
+            }
+            self._dirty = False
+        try:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'entries': snapshot}, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.warning("Could not save audio index: %s", e)
+
+    # ---- lookups -----------------------------------------------------------
+
+    def path_for(self, key, ext='mp3'):
+        return os.path.join(self.cache_dir, f"audio_{key}.{ext}")
+
+    def get(self, text, lang='hi', voice_style='default', engine='gtts'):
+        """Path of cached audio, or None"""
+        return self.get_by_key(audio_key(text, lang, voice_style, engine))
+
+    def get_by_key(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            path = os.path.join(self.cache_dir, entry.filename)
+            # Touching the file checks it still exists (another worker's janitor may have
+            # evicted it) and tells that janitor it was used
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                del self._entries[key]
+                self.total_bytes -= entry.size
+                self.stats['misses'] += 1
+                self.stats['vanished'] += 1
+                return None
+            except OSError:
+                pass
+            entry.hits += 1
+            entry.last_access = time.time()
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self._dirty = True
+            return path
+
+    def add(self, key, path):
+        """Register a file that was written to path_for(key)"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+            self._entries[key] = _AudioEntry(os.path.basename(path), size, hits=1)
+            self.total_bytes += size
+            self.stats['stores'] += 1
+            self._dirty = True
+        return True
+
+    def get_or_create(self, text, lang, voice_style, engine, render, ext='mp3'):
+        """
+        Return the cached file for this speech, rendering it on a miss.
+
+        render(filepath) must write the audio to filepath and return True on success;
+        ext is the file format the engine produces.
+        """
+        key = audio_key(text, lang, voice_style, engine)
+        cached = self.get_by_key(key)
+        if cached:
+            return cached
+
+        def create():
+            # Another request may have finished while we were waiting
+            with self._lock:
+                if key in self._entries:
+                    return os.path.join(self.cache_dir, self._entries[key].filename)
+            filepath = self.path_for(key, ext)
+            if render(filepath) and self.add(key, filepath):
+                return filepath
+            return None
+
+        return single_flight.do(make_key('tts', key), create)
+
+    # ---- pinning and eviction ----------------------------------------------
+
+    def pin(self, text, lang='hi', voice_style='default', engine='gtts'):
+        """Never evict this speech (it does not have to be cached yet)"""
+        key = audio_key(text, lang, voice_style, engine)
+        with self._lock:
+            self._pinned.add(key)
+        return key
+
+    def unpin(self, text, lang='hi', voice_style='default', engine='gtts'):
+        with self._lock:
+            self._pinned.discard(audio_key(text, lang, voice_style, engine))
+
+    def evict(self):
+        """Evict unpinned entries until within the disk budget; returns the number evicted"""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return 0
+            candidates = sorted(
+                (key for key in self._entries if key not in self._pinned),
+                key=lambda k: (self._entries[k].hits, self._entries[k].last_access)
+            )
+            victims = []
+            for key in candidates:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                entry = self._entries.pop(key)
+                self.total_bytes -= entry.size
+                self.stats['evictions'] += 1
+                self.stats['evicted_bytes'] += entry.size
+                victims.append(entry.filename)
+            self._dirty = True
+
+        for filename in victims:
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except OSError as e:
+                logger.warning("Could not delete %s: %s", filename, e)
+        if victims:
+            logger.info("Audio cache evicted %d files", len(victims))
+        return len(victims)
+
+    def claim_janitor(self):
+        """True if this process runs the janitor for the directory (taking the role if it is free)"""
+        if fcntl is None or self._janitor_lock_file is not None:
+            return True
+        lock_file = open(os.path.join(self.cache_dir, JANITOR_LOCK_FILENAME), 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Held until this process exits; then the next worker to try takes over
+        self._janitor_lock_file = lock_file
+        logger.info("Audio cache janitor runs in process %d", os.getpid())
+        return True
+
+    def rescan(self):
+        """Bring the index in line with the directory: other workers' files, deletions and touches"""
+        on_disk = {}
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                stem, ext = os.path.splitext(item.name)
+                if item.is_file() and stem.startswith('audio_') and ext in AUDIO_EXTENSIONS:
+                    on_disk[stem[len('audio_'):]] = (item.name, item.stat())
+        with self._lock:
+            for key in [key for key in self._entries if key not in on_disk]:
+                self.total_bytes -= self._entries.pop(key).size
+            for key, (filename, stat) in on_disk.items():
+                entry = self._entries.get(key)
+                if entry is None:
+                    self._entries[key] = _AudioEntry(filename, stat.st_size, last_access=stat.st_mtime,
+                                                     created=stat.st_mtime)
+                    self.total_bytes += stat.st_size
+                else:
+                    entry.last_access = max(entry.last_access, stat.st_mtime)
+            self._dirty = True
+
+    def run_janitor(self):
+        """
+        One janitor pass: rescan, enforce the budget, age hit counts, save the index.
+        Does nothing (returns 0) in a worker that does not own the janitor.
+        """
+        if not self.claim_janitor():
+            return 0
+        self.rescan()
+        evicted = self.evict()
+        with self._lock:
+            for entry in self._entries.values():
+                entry.hits //= 2
+            self._dirty = True
+        self.save_index()
+        return evicted
+
+    def start_janitor(self, interval=None):
+        """Run the janitor in a background thread"""
+        interval = interval or Config.AUDIO_CACHE_JANITOR_INTERVAL
+        if self._janitor is not None and self._janitor.is_alive():
+            return
+
+        def loop():
+            while not self._stop_janitor.wait(interval):
+                try:
+                    self.run_janitor()
+                except Exception as e:
+                    logger.error("Audio cache janitor failed: %s", e)
+
+        self._stop_janitor.clear()
+        self._janitor = threading.Thread(target=loop, daemon=True, name='audio-cache-janitor')
+        self._janitor.start()
+
+    def stop_janitor(self):
+        self._stop_janitor.set()
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                'files': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'pinned': len(self._pinned),
+                'hit_rate': f"{(self.stats['hits'] / lookups * 100) if lookups else 0:.1f}%",
+                **self.stats
+            }
+
+
+# Global instances, one per cache directory
+_audio_caches = {}
+_audio_caches_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    """A forked worker must claim the janitor itself, not inherit its parent's lock"""
+    for audio_cache in _audio_caches.values():
+        if audio_cache._janitor_lock_file is not None:
+            audio_cache._janitor_lock_file.close()
+            audio_cache._janitor_lock_file = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_audio_cache(cache_dir=None):
+    """Get or create the audio cache for a directory (default: <project>/cache)"""
+    cache_dir = os.path.abspath(cache_dir or AUDIO_CACHE_DIR)
+    with _audio_caches_lock:
+        audio_cache = _audio_caches.get(cache_dir)
+        if audio_cache is None:
+            audio_cache = AudioCache(cache_dir)
+            _audio_caches[cache_dir] = audio_cache
+        return audio_cache
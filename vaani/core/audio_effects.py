@@ -0,0 +1,175 @@
+"""
+In-memory Voice Effects for Vaani
+NumPy effect chains on decoded PCM, replacing the pydub/FFmpeg decode-process-encode round trip.
+
+MP3 is decoded in-process by the pygame mixer and WAV by the wave module;
+the effect chain for a voice style runs on the PCM buffer and the result is
+encoded once, as WAV, which the mixer plays directly. No subprocess is started.
+NumPy is optional: without it voice_tool falls back to the pydub path.
+"""
+
+import threading
+import wave
+from io import BytesIO
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+_decode_lock = threading.Lock()
+
+_SAMPLE_DTYPES = {1: 'u1', 2: '<i2', 4: '<i4'}
+
+
+def decode(audio_bytes, audio_format='mp3'):
+    """
+    Decode MP3 or WAV bytes to PCM.
+
+    Returns:
+        Tuple of (float32 array of shape (frames, channels) in [-1, 1], sample rate)
+    """
+    if audio_format == 'wav':
+        with wave.open(BytesIO(audio_bytes), 'rb') as wav:
+            channels, width, rate = wav.getnchannels(), wav.getsampwidth(), wav.getframerate()
+            raw = wav.readframes(wav.getnframes())
+        if width not in _SAMPLE_DTYPES:
+            raise ValueError(f"Unsupported WAV sample width: {width}")
+        samples = np.frombuffer(raw, dtype=_SAMPLE_DTYPES[width]).astype(np.float32)
+        if width == 1:
+            samples = (samples - 128.0) / 128.0
+        else:
+            samples /= float(2 ** (8 * width - 1))
+        return samples.reshape(-1, channels), rate
+
+    # MP3: let the pygame mixer decode it to its own output format
+    from pygame import mixer
+    from vaani.core.playback import ensure_mixer
+
+    with _decode_lock:
+        rate, size, channels = ensure_mixer()
+        if size != -16:
+            raise ValueError(f"Unsupported mixer sample format: {size}")
+        raw = mixer.Sound(file=BytesIO(audio_bytes)).get_raw()
+    samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    # Speech is mono; the mixer duplicates it into every channel
+    return samples.reshape(-1, channels)[:, :1], rate
+
+
+def encode_wav(samples, sample_rate):
+    """16-bit PCM WAV bytes for a float sample array"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+    output = BytesIO()
+    with wave.open(output, 'wb') as wav:
+        wav.setnchannels(pcm.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return output.getvalue()
+
+
+class EffectChain:
+    """
+    Resample (pitch), time-stretch (tempo) and gain/normalize on NumPy buffers.
+
+    - pitch > 1 raises the voice and shortens it, like playing it faster
+    - tempo > 1 speaks faster at the same pitch (WSOLA overlap-add)
+    - normalize_headroom_db scales the peak to that many dB below full scale
+    Windows are precomputed once per sample rate.
+    """
+
+    FRAME_SECONDS = 0.04
+    SEARCH_SECONDS = 0.01
+
+    def __init__(self, pitch=1.0, tempo=1.0, gain_db=0.0, normalize_headroom_db=None):
+        self.pitch = pitch
+        self.tempo = tempo
+        self.gain = 10 ** (gain_db / 20)
+        self.normalize_peak = None if normalize_headroom_db is None else 10 ** (-normalize_headroom_db / 20)
+        self._windows = {}
+
+    def _window(self, sample_rate):
+        window = self._windows.get(sample_rate)
+        if window is None:
+            frame = int(sample_rate * self.FRAME_SECONDS) // 2 * 2
+            # Periodic Hann windows at 50% overlap sum to exactly one
+            window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame) / frame)).astype(np.float32)[:, None]
+            self._windows[sample_rate] = window
+        return window
+
+    @staticmethod
+    def resample(samples, factor):
+        """Linear-interpolation resample that plays `factor` times faster"""
+        if factor == 1.0 or len(samples) < 2:
+            return samples
+        positions = np.arange(0, len(samples) - 1, factor)
+        index = positions.astype(np.int64)
+        frac = (positions - index).astype(np.float32)[:, None]
+        return samples[index] * (1 - frac) + samples[index + 1] * frac
+
+    def time_stretch(self, samples, sample_rate):
+        """WSOLA time stretch by self.tempo, keeping the pitch"""
+        if self.tempo == 1.0:
+            return samples
+        window = self._window(sample_rate)
+        frame = len(window)
+        hop_out = frame // 2
+        hop_in = hop_out * self.tempo
+        tolerance = int(sample_rate * self.SEARCH_SECONDS)
+        if len(samples) <= frame + 2 * tolerance:
+            return self.resample(samples, self.tempo)
+
+        # Each frame is taken near its nominal position, shifted by up to
+        # `tolerance` samples to line up with the previous frame's waveform,
+        # so overlapping halves add in phase instead of beating
+        mono = samples.mean(axis=1)
+        padded = np.pad(samples, ((tolerance, frame + tolerance), (0, 0)))
+        padded_mono = np.pad(mono, (tolerance, frame + tolerance))
+        count = int((len(samples) - frame) / hop_in) + 1
+        starts = np.empty(count, dtype=np.int64)
+        starts[0] = tolerance
+        for k in range(1, count):
+            target = padded_mono[starts[k - 1] + hop_out:starts[k - 1] + frame]
+            nominal = tolerance + int(k * hop_in)
+            region = padded_mono[nominal - tolerance:nominal + tolerance + hop_out]
+            scores = sliding_window_view(region, hop_out) @ target
+            starts[k] = nominal - tolerance + int(scores.argmax())
+
+        frames = padded[starts[:, None] + np.arange(frame)] * window
+
+        # With a 50% hop each output block is the first half of one frame
+        # plus the second half of the previous one
+        first, second = frames[:, :hop_out], frames[:, hop_out:]
+        blocks = first.copy()
+        blocks[1:] += second[:-1]
+        return np.concatenate([blocks.reshape(-1, samples.shape[1]), second[-1]])
+
+    def apply(self, samples, sample_rate):
+        samples = self.resample(samples, self.pitch)
+        samples = self.time_stretch(samples, sample_rate)
+        scale = self.gain
+        if self.normalize_peak is not None:
+            peak = float(np.abs(samples).max()) if len(samples) else 0.0
+            if peak > 0:
+                scale = self.normalize_peak / peak
+        return samples * np.float32(scale)
+
+
+# Effect chains per voice style; the values match apply_voice_effects in voice_tool
+VOICE_CHAINS = {
+    'news_anchor': EffectChain(pitch=2.0 ** 0.3, tempo=1.05, gain_db=2.5, normalize_headroom_db=0.1),
+}
+
+
+def has_chain(voice_style):
+    return NUMPY_AVAILABLE and voice_style in VOICE_CHAINS
+
+
+def process(audio_bytes, audio_format='mp3', voice_style='news_anchor'):
+    """Apply a voice style's effect chain; returns WAV bytes"""
+    samples, sample_rate = decode(audio_bytes, audio_format)
+    processed = VOICE_CHAINS[voice_style].apply(samples, sample_rate)
+    return encode_wav(processed, sample_rate)
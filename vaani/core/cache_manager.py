@@ -1,19 +1,69 @@
-# cache_manager.py - Simple yet powerful caching system for Vaani
+# cache_manager.py - Shared, bounded caching system for Vaani
 
-import json
 import time
+import sys
+import threading
+import logging
+from collections import OrderedDict
 from functools import wraps
 import hashlib
-import os
+
+logger = logging.getLogger('cache_manager')
+
+# Default bounds for the process-wide cache
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 32 MB
+
+
+def _estimate_size(obj, _seen=None):
+    """Rough deep size of an object in bytes (used for memory accounting)"""
+    if _seen is None:
+        _seen = set()
+    obj_id = id(obj)
+    if obj_id in _seen:
+        return 0
+    _seen.add(obj_id)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _estimate_size(k, _seen) + _estimate_size(v, _seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _estimate_size(item, _seen)
+    return size
+
+
+class _Entry:
+    __slots__ = ('value', 'category', 'created', 'expires_at', 'size')
+
+    def __init__(self, value, category, created, expires_at, size):
+        self.value = value
+        self.category = category
+        self.created = created
+        self.expires_at = expires_at
+        self.size = size
+
 
 class CacheManager:
     """
-    A simple caching system with TTL (Time To Live) support.
-    Caches data in memory with automatic expiration.
+    A bounded, thread-safe LRU cache with per-category TTL.
+
+    - Every entry is tagged with a category; each category has one TTL.
+    - Entries of a category are kept in insertion order, so the oldest
+      (first to expire) entry is always at the head: the expiry sweep pops
+      expired heads and stops, which is O(1) per expired entry.
+    - The whole cache is bounded by entry count and estimated bytes;
+      the least recently used entries are evicted first.
     """
-    
-    def __init__(self):
-        self.memory_cache = {}
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()       # key -> _Entry, in LRU order
+        self._by_category = {}              # category -> OrderedDict(key -> None), in expiry order
+        self.memory_bytes = 0
         self.cache_ttl = {
             'weather': 1800,      # 30 minutes
             'news': 3600,         # 1 hour
@@ -23,70 +73,189 @@ class CacheManager:
         self.stats = {
             'hits': 0,
             'misses': 0,
-            'total_queries': 0
+            'total_queries': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0
         }
-    
+        self._category_stats = {}
+
+    def register_category(self, category, ttl):
+        """Register (or update) the TTL in seconds for a category. None = never expires."""
+        with self._lock:
+            self.cache_ttl[category] = ttl
+
     def cache_key(self, func_name, *args, **kwargs):
         """Generate unique cache key from function name and arguments"""
         # Create a string representation of the arguments
         key_data = f"{func_name}:{str(args)}:{str(kwargs)}"
         # Hash it to create a consistent key
         return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def get(self, key):
+
+    def _count(self, category, outcome):
+        self.stats[outcome] += 1
+        if category is not None:
+            cat_stats = self._category_stats.setdefault(category, {'hits': 0, 'misses': 0})
+            cat_stats[outcome] += 1
+
+    def _remove(self, key):
+        """Remove an entry (lock must be held)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        queue = self._by_category.get(entry.category)
+        if queue is not None:
+            queue.pop(key, None)
+        self.memory_bytes -= entry.size
+        return entry
+
+    def _sweep_expired(self, now):
+        """Drop expired entries from the head of each category (lock must be held)"""
+        for category, queue in self._by_category.items():
+            while queue:
+                key = next(iter(queue))
+                entry = self._entries.get(key)
+                if entry is not None and (entry.expires_at is None or entry.expires_at > now):
+                    break
+                self._remove(key)
+                queue.pop(key, None)
+                self.stats['expirations'] += 1
+
+    def _enforce_limits(self):
+        """Evict least recently used entries until within bounds (lock must be held)"""
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 self.memory_bytes > self.max_bytes):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.stats['evictions'] += 1
+
+    def get(self, key, category=None):
         """Retrieve data from cache if valid"""
-        self.stats['total_queries'] += 1
-        
-        if key in self.memory_cache:
-            data, timestamp, ttl = self.memory_cache[key]
-            # Check if cache is still valid
-            if time.time() - timestamp < ttl:
-                self.stats['hits'] += 1
-                print(f"✓ Cache HIT for key: {key[:8]}... (Age: {int(time.time() - timestamp)}s)")
-                return data
-            else:
+        now = time.time()
+        with self._lock:
+            self.stats['total_queries'] += 1
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                if entry.expires_at is None or entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._count(entry.category, 'hits')
+                    logger.debug("Cache HIT %s (age %ds)", key[:8], now - entry.created)
+                    return entry.value
                 # Cache expired, remove it
-                print(f"✗ Cache EXPIRED for key: {key[:8]}...")
-                del self.memory_cache[key]
-        
-        self.stats['misses'] += 1
-        print(f"✗ Cache MISS for key: {key[:8]}...")
-        return None
-    
+                self._remove(key)
+                self.stats['expirations'] += 1
+                category = category or entry.category
+
+            self._count(category, 'misses')
+            logger.debug("Cache MISS %s", key[:8])
+            return None
+
+    def peek(self, key):
+        """Return a valid entry without touching LRU order or stats"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry.expires_at is not None and entry.expires_at <= time.time()):
+                return None
+            return entry.value
+
     def set(self, key, data, category='static'):
-        """Store data in cache with TTL"""
+        """Store data in cache with the category's TTL"""
+        now = time.time()
         ttl = self.cache_ttl.get(category, 3600)
-        self.memory_cache[key] = (data, time.time(), ttl)
-        print(f"✓ Cached data for key: {key[:8]}... (TTL: {ttl}s)")
-    
+        size = _estimate_size(data) + sys.getsizeof(key)
+
+        if size > self.max_bytes:
+            logger.warning("Not caching %s: %d bytes exceeds cache budget", key[:8], size)
+            return False
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = _Entry(data, category, now,
+                                        None if ttl is None else now + ttl, size)
+            self._by_category.setdefault(category, OrderedDict())[key] = None
+            self.memory_bytes += size
+            self.stats['sets'] += 1
+
+            self._sweep_expired(now)
+            self._enforce_limits()
+        logger.debug("Cached %s (category: %s, TTL: %ss)", key[:8], category, ttl)
+        return True
+
+    def delete(self, key):
+        """Remove a single entry"""
+        with self._lock:
+            return self._remove(key) is not None
+
+    def purge_expired(self):
+        """Run the expiry sweep now; returns number of entries removed"""
+        with self._lock:
+            before = self.stats['expirations']
+            self._sweep_expired(time.time())
+            return self.stats['expirations'] - before
+
     def clear(self, category=None):
         """Clear cache - all or specific category"""
-        if category:
-            # Clear only entries of specific category (more complex, skip for now)
-            pass
-        else:
-            self.memory_cache.clear()
-            print("✓ Cache cleared completely")
-    
+        with self._lock:
+            if category:
+                queue = self._by_category.get(category)
+                if queue:
+                    for key in list(queue):
+                        self._remove(key)
+                logger.info("Cache cleared for category: %s", category)
+            else:
+                self._entries.clear()
+                self._by_category.clear()
+                self.memory_bytes = 0
+                logger.info("Cache cleared completely")
+
+    def category_size(self, category):
+        """Number of entries currently held for a category"""
+        with self._lock:
+            return len(self._by_category.get(category, ()))
+
+    def view(self, category):
+        """Return a dict-like handle scoped to one category"""
+        return CacheView(self, category)
+
     def get_stats(self):
         """Get cache statistics"""
-        if self.stats['total_queries'] > 0:
-            hit_rate = (self.stats['hits'] / self.stats['total_queries']) * 100
-        else:
-            hit_rate = 0
-        
-        return {
-            'total_queries': self.stats['total_queries'],
-            'hits': self.stats['hits'],
-            'misses': self.stats['misses'],
-            'hit_rate': f"{hit_rate:.1f}%",
-            'cache_size': len(self.memory_cache)
-        }
-    
+        with self._lock:
+            if self.stats['total_queries'] > 0:
+                hit_rate = (self.stats['hits'] / self.stats['total_queries']) * 100
+            else:
+                hit_rate = 0
+
+            categories = {}
+            for category, queue in self._by_category.items():
+                cat_stats = self._category_stats.get(category, {'hits': 0, 'misses': 0})
+                categories[category] = {
+                    'entries': len(queue),
+                    'bytes': sum(self._entries[k].size for k in queue if k in self._entries),
+                    'ttl': self.cache_ttl.get(category, 3600),
+                    'hits': cat_stats['hits'],
+                    'misses': cat_stats['misses']
+                }
+
+            return {
+                'total_queries': self.stats['total_queries'],
+                'hits': self.stats['hits'],
+                'misses': self.stats['misses'],
+                'hit_rate': f"{hit_rate:.1f}%",
+                'cache_size': len(self._entries),
+                'memory_bytes': self.memory_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'sets': self.stats['sets'],
+                'evictions': self.stats['evictions'],
+                'expirations': self.stats['expirations'],
+                'categories': categories
+            }
+
     def cached_call(self, category='static'):
         """
         Decorator for caching function results.
-        
+
         Usage:
         @cache.cached_call('weather')
         def get_weather(city):
@@ -98,24 +267,23 @@ class CacheManager:
             def wrapper(*args, **kwargs):
                 # Generate cache key
                 key = self.cache_key(func.__name__, *args, **kwargs)
-                
+
                 # Try to get from cache
-                cached = self.get(key)
+                cached = self.get(key, category)
                 if cached is not None:
                     return cached
-                
+
                 # If not in cache, call the function
-                print(f"→ Executing {func.__name__}...")
                 result = func(*args, **kwargs)
-                
+
                 # Store result in cache
                 if result is not None:  # Don't cache None/errors
                     self.set(key, result, category)
-                
+
                 return result
             return wrapper
         return decorator
-    
+
     def print_stats(self):
         """Print cache statistics in a nice format"""
         stats = self.get_stats()
@@ -127,40 +295,100 @@ class CacheManager:
         print(f"Cache Misses:  {stats['misses']}")
         print(f"Hit Rate:      {stats['hit_rate']}")
         print(f"Cache Size:    {stats['cache_size']} items")
+        print(f"Memory:        {stats['memory_bytes'] / 1024:.1f} KB")
+        print(f"Evictions:     {stats['evictions']}")
+        print(f"Expirations:   {stats['expirations']}")
+        for category, info in stats['categories'].items():
+            print(f"  {category:<12} {info['entries']:>5} items  "
+                  f"{info['hits']:>5} hits  {info['misses']:>5} misses")
         print("="*50 + "\n")
 
+
+class CacheView:
+    """
+    Dict-like access to one category of a CacheManager.
+    Lets services keep simple `cache[key] = value` code while sharing
+    one cache policy and one stats surface.
+    """
+
+    def __init__(self, manager, category):
+        self.manager = manager
+        self.category = category
+        self._prefix = f"{category}:"
+
+    def _key(self, key):
+        return self._prefix + str(key)
+
+    def get(self, key, default=None):
+        value = self.manager.get(self._key(key), self.category)
+        return default if value is None else value
+
+    def set(self, key, value):
+        return self.manager.set(self._key(key), value, self.category)
+
+    def pop(self, key, default=None):
+        value = self.manager.peek(self._key(key))
+        self.manager.delete(self._key(key))
+        return default if value is None else value
+
+    def clear(self):
+        self.manager.clear(self.category)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        self.manager.delete(self._key(key))
+
+    def __contains__(self, key):
+        return self.manager.peek(self._key(key)) is not None
+
+    def __len__(self):
+        return self.manager.category_size(self.category)
+
+
 # Global cache instance (singleton pattern)
 cache = CacheManager()
 
 # For testing purposes
 if __name__ == "__main__":
     print("Testing Cache Manager...")
-    
+
     # Test basic cache operations
     cache.set("test_key", {"data": "test value"}, "weather")
     result = cache.get("test_key")
     print(f"Retrieved: {result}")
-    
+
     # Test decorator
     @cache.cached_call('weather')
     def test_function(city):
         print(f"  [Simulating API call for {city}]")
         time.sleep(1)  # Simulate slow API
         return f"Weather data for {city}"
-    
+
     # First call - should be slow
     print("\nFirst call (should be slow):")
     start = time.time()
     result1 = test_function("Lucknow")
     print(f"  Result: {result1}")
     print(f"  Time: {time.time() - start:.2f}s")
-    
+
     # Second call - should be instant
     print("\nSecond call (should be instant from cache):")
     start = time.time()
     result2 = test_function("Lucknow")
     print(f"  Result: {result2}")
     print(f"  Time: {time.time() - start:.2f}s")
-    
+
+    # Clear one category
+    cache.clear('weather')
+    print(f"\nAfter clearing 'weather': {cache.get_stats()['cache_size']} items")
+
     # Print statistics
     cache.print_stats()
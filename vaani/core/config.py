@@ -1,4 +1,76 @@
 AGMARKNET_BASE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+
+# Outbound HTTP settings (used by vaani.core.http)
+HTTP_DEFAULT_TIMEOUT = (3.05, 5)        # (connect, read) seconds
+HTTP_MAX_RETRIES = 2                    # retries after the first attempt, idempotent requests only
+HTTP_BACKOFF_BASE = 0.25                # seconds, doubled per retry with full jitter
+HTTP_BACKOFF_MAX = 2.0
+HTTP_MAX_CONNECTIONS_PER_HOST = 8
+HTTP_HOST_SETTINGS = {
+    "api.openweathermap.org": {"timeout": (3.05, 5), "max_connections": 8},
+    "api.open-meteo.com": {"timeout": (3.05, 5), "max_connections": 8},
+    "gnews.io": {"timeout": (3.05, 5), "max_connections": 4},
+    "api.data.gov.in": {"timeout": (3.05, 10), "max_connections": 4},
+}
+ASYNC_UPSTREAM_LIMITS = {               # concurrent async calls to non-HTTP upstreams (vaani.asgi)
+    "gemini": 4,
+    "tts": 4,
+}
+
+# Connectivity monitor (used by vaani.core.connectivity)
+CONNECTIVITY_PROBE_TIMEOUT = 3              # seconds a probe waits for 8.8.8.8:53
+CONNECTIVITY_INTERVAL = 30                  # seconds between probes while the state holds
+CONNECTIVITY_FAST_INTERVAL = 5              # seconds between probes right after a change...
+CONNECTIVITY_FAST_PROBES = 3                # ...for this many probes
+CONNECTIVITY_FAILURE_THRESHOLD = 3          # upstream connection failures in a row that mean offline
+
+# Synthesized speech cache (used by vaani.core.audio_cache)
+AUDIO_CACHE_MAX_BYTES = 100 * 1024 * 1024   # disk budget for cached audio
+AUDIO_CACHE_JANITOR_INTERVAL = 60           # seconds between eviction passes
+
+# Pre-rendered static phrases (used by vaani.core.phrase_bundle)
+PHRASE_BUNDLE_WORKERS = 4                   # parallel gTTS requests during the build step
+
+# Text-to-speech engines (used by vaani.core.tts_engines and vaani.core.voice_tool)
+TTS_ENGINE_ORDER = ['gtts', 'piper', 'espeak']  # preference order among usable engines
+TTS_LATENCY_BUDGET_MS = 1500                # network engines averaging slower than this per request are skipped
+TTS_ONLINE_CHECK_INTERVAL = 30              # seconds a custom online_check result is reused
+TTS_ENGINE_COOLDOWN = 60                    # seconds before a failed or slow engine is tried again
+ESPEAK_SPEED = 150                          # words per minute
+PIPER_MODELS = {}                           # lang -> piper .onnx voice model, e.g. {'hi': 'models/hi_IN-voice.onnx'}
+TTS_WORKERS = None                          # synthesis threads per process, shared by every request; None = 2 x WORKER_THREADS
+
+# CLI audio playback (used by vaani.core.playback)
+PLAYBACK_FREQUENCY = 24000                  # gTTS output rate, so most speech is not resampled
+PLAYBACK_CHANNELS = 1
+PLAYBACK_BUFFER = 512                       # device buffer in samples; smaller starts sooner
+
+# Web sessions (used by vaani.core.session_store)
+SESSION_BACKEND = 'memory'                  # 'memory' (one process) or 'sqlite' (shared by all workers); env SESSION_BACKEND overrides
+SESSION_TTL = 30 * 60                       # seconds without a request before a session expires
+SESSION_MAX_SESSIONS = 10000                # memory backend: least recently used sessions beyond this are evicted
+SESSION_COMPRESS_MIN_BYTES = 512            # serialized sessions at least this large are zlib-compressed
+
+# Gemini answer cache (used by vaani.core.answer_cache)
+ANSWER_CACHE_TTL = 7 * 24 * 60 * 60         # seconds a cached answer is reused
+ANSWER_CACHE_SIMILARITY = 0.8               # character 3-gram Jaccard at which a rephrased question reuses an answer; 1.0 = exact only
+ANSWER_CACHE_MAX_ENTRIES = 20000            # least recently used answers beyond this are evicted
+ANSWER_CACHE_MAX_BYTES = 20 * 1024 * 1024   # ... as are answers beyond this much text
+
+# Multi-worker server (used by vaani.core.workers and gunicorn.conf.py)
+WORKER_HEARTBEAT_INTERVAL = 10              # seconds between worker heartbeats
+WORKER_HEARTBEAT_TIMEOUT = 30               # a worker silent this long is reported unhealthy
+WORKER_STATE_DIR = None                     # heartbeat files; None uses the system temp directory
+WORKER_THREADS = 8                          # request threads per worker when serving the WSGI app
+
+# Agmarknet price history (used by vaani.services.agriculture.price_history)
+PRICE_PREFETCH_INTERVAL = 6 * 60 * 60       # seconds between bulk fetches of every commodity at every market
+PRICE_PREFETCH_PAGE_SIZE = 1000             # records per API request
+PRICE_PREFETCH_TIMEOUT = (3.05, 30)         # (connect, read) seconds; large pages take longer than a single lookup
+PRICE_HISTORY_MAX_AGE_DAYS = 3              # a stored price older than this is not quoted; the API is asked instead
+PRICE_HISTORY_RETENTION_DAYS = 400          # stored prices older than this are dropped after each run
+PRICE_TREND_STEADY_PERCENT = 2              # week-over-week changes smaller than this are reported as steady
+
 KEY = b'3e69lMJLmT9MnI2S0GF7HmucJVbTA464WurRGd3KZII='
 GFORM_ID = b'gAAAAABoo3iUcmMkUzwNN1G7x5FV7l_-10fWBNr7AXAG8XIqr98sGGwfzPfrBPEtfb8wUdJsoO3o7oCPQ516xNw9IRo4q6WtRBq4Cj4sR1yGp9n8JHBY3wwW9McRFpMi-rrL70nLtVDahze_StOgT1Rz1X6M-KI_Hw=='
 ENTRY_ID = b'gAAAAABoo3iUahwAQH04P197gCXrcc0QPwTwhGDk3FcugFc8Ua1xys4QooGZ9UjFW67jQLGo6ckG7RXPtlI1ZN4BX_sT7HMSPQ=='
@@ -313,6 +385,10 @@ startup_responses = [
     "हम आपन मददगार। भरोसा करऽ।",
     "शुरू करऽ। हम तोहरा संगे बाड़ी。"
 ]
+
+# Spoken by the web UI on the first mic click
+web_greeting_text = "नमस्ते! मैं वाणी हूं, आपकी आवाज सहायक। आप मुझसे मौसम, समाचार, सरकारी योजनाएं और बहुत कुछ पूछ सकते हैं।"
+
 wikipedia_trigger = [
     "विकिपीडिया पर", "विकिपीडिया में", "विकिपीडिया से"
 ]
@@ -559,6 +635,12 @@ social_scheme_trigger = [
     "रोजगार योजना", "गैस सब्सिडी", "राशन", "आधार", "स्वच्छ भारत", "डिजिटल इंडिया"
 ]
 
+# Expense tracker triggers
+expense_trigger = ["खर्च", "खर्चा", "expense", "पैसा", "रुपये", "हिसाब"]
+
+# Language switch triggers (web interface)
+language_switch_trigger = ['english', 'hindi', 'hinglish', 'हिंदी', 'अंग्रेजी']
+
 # Keywords for agriculture sub-intents
 price_keywords = ["भाव", "कीमत", "दाम", "रेट", "मूल्य", "प्राइस"]
 scheme_keywords = ["योजना", "स्कीम", "सब्सिडी", "अनुदान", "लोन", "ऋण", "बीमा", "सहायता"]
@@ -0,0 +1,194 @@
+"""
+Connectivity Monitor for Vaani
+Probes the internet in a background thread and publishes the result, so
+callers read the current state instead of opening a socket themselves.
+
+Probes run every CONNECTIVITY_INTERVAL seconds, and every
+CONNECTIVITY_FAST_INTERVAL seconds for a few probes after the state changes.
+Upstream calls report connection failures and successes as a passive signal:
+enough failures in a row switch to offline at once and probe right away.
+
+Usage:
+    from vaani.core.connectivity import get_connectivity_monitor
+
+    monitor = get_connectivity_monitor()
+    if monitor.is_online():                     # never blocks
+        ...
+    monitor.on_change(lambda online: print("online" if online else "offline"))
+"""
+
+import os
+import socket
+import threading
+import time
+import logging
+
+from vaani.core import config as Config
+
+logger = logging.getLogger('connectivity')
+
+
+def check_connectivity(timeout=None):
+    """Check if internet connection is available (blocks up to timeout seconds)"""
+    try:
+        # Try to connect to Google DNS to check internet
+        with socket.create_connection(("8.8.8.8", 53), timeout=timeout or Config.CONNECTIVITY_PROBE_TIMEOUT):
+            return True
+    except OSError:
+        return False
+
+
+class ConnectivityMonitor:
+    """
+    The last known connectivity state, kept fresh by a daemon thread.
+    online is None until the first probe finishes; is_online() treats that
+    as online so startup never waits on the network.
+    """
+
+    def __init__(self, probe=check_connectivity, interval=None, fast_interval=None, fast_probes=None,
+                 failure_threshold=None):
+        self.probe = probe
+        self.interval = interval or Config.CONNECTIVITY_INTERVAL
+        self.fast_interval = fast_interval or Config.CONNECTIVITY_FAST_INTERVAL
+        self.fast_probes = Config.CONNECTIVITY_FAST_PROBES if fast_probes is None else fast_probes
+        self.failure_threshold = failure_threshold or Config.CONNECTIVITY_FAILURE_THRESHOLD
+        self.online = None
+        self.since = None            # time.time() of the last change
+        self.checked_at = None       # time.time() of the last probe or passive signal
+        self.source = None           # 'probe' or the upstream that reported the change
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._hooks = []
+        self._fast_left = 0
+        self._failures = 0           # consecutive upstream connection failures
+        self.stats = {'probes': 0, 'changes': 0, 'upstream_failures': 0}
+
+    def start(self):
+        """Start probing in the background (no-op if already running in this process)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="connectivity", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                logger.error("Connectivity probe failed: %s", e)
+            self._wake.wait(self.next_interval())
+            self._wake.clear()
+
+    def next_interval(self):
+        return self.fast_interval if self._fast_left > 0 else self.interval
+
+    def check(self):
+        """Probe now (blocking) and publish the result"""
+        online = bool(self.probe())
+        with self._lock:
+            self.stats['probes'] += 1
+        self._publish(online, 'probe')
+        return online
+
+    def _publish(self, online, source):
+        with self._lock:
+            now = time.time()
+            self.checked_at = now
+            changed = online != self.online
+            if changed:
+                if self.online is not None:
+                    self.stats['changes'] += 1
+                self.online, self.since, self.source = online, now, source
+                self._fast_left = self.fast_probes
+            elif source == 'probe' and self._fast_left > 0:
+                self._fast_left -= 1
+            if online and source == 'probe':
+                self._failures = 0
+            hooks = list(self._hooks) if changed else []
+
+        if changed:
+            logger.info("Connectivity: %s (%s)", "online" if online else "offline", source)
+        for hook in hooks:
+            try:
+                hook(online)
+            except Exception as e:
+                logger.error("Connectivity hook %r failed: %s", hook, e)
+
+    def is_online(self):
+        """The last published state; never blocks. Starts the monitor on first use."""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        return self.online is not False
+
+    def record_failure(self, upstream=''):
+        """An upstream call could not connect; enough of these in a row mean we are offline"""
+        with self._lock:
+            self._failures += 1
+            self.stats['upstream_failures'] += 1
+            tripped = self._failures >= self.failure_threshold and self.online is not False
+        if tripped:
+            self._publish(False, upstream or 'upstream')
+            self._wake.set()          # confirm with a probe now
+
+    def record_success(self, upstream=''):
+        """An upstream call got through: we are online, whatever the last probe said"""
+        with self._lock:
+            self._failures = 0
+            recovered = self.online is False
+        if recovered:
+            self._publish(True, upstream or 'upstream')
+            self._wake.set()
+
+    def on_change(self, hook):
+        """Call hook(online) on every change of state; returns hook, so it works as a decorator"""
+        with self._lock:
+            self._hooks.append(hook)
+        return hook
+
+    def get_state(self):
+        with self._lock:
+            return {
+                'online': self.online,
+                'since': self.since,
+                'checked_at': self.checked_at,
+                'source': self.source,
+                'next_probe_in': self.next_interval(),
+                'consecutive_failures': self._failures,
+                **self.stats
+            }
+
+
+# Global instance
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_connectivity_monitor():
+    """Get or create the global connectivity monitor"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ConnectivityMonitor()
+    return _monitor
+
+
+def _reset_after_fork():
+    """The probe thread does not survive a fork; a worker starts its own on first use"""
+    global _monitor_lock
+    _monitor_lock = threading.Lock()
+    if _monitor is not None:
+        _monitor._lock = threading.Lock()
+        _monitor._thread = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,403 @@
+"""
+Shared HTTP Client for Vaani
+Pooled keep-alive sessions per upstream host with retries, connection caps and latency stats.
+
+Usage:
+    from vaani.core import http
+
+    response = http.get(url, params=params)
+    response.raise_for_status()
+
+    # In async code (ASGI server), the same policy without holding a thread:
+    response = await http.aget(url, params=params)
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+import logging
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+from vaani.core import config as Config
+from vaani.core.connectivity import get_connectivity_monitor
+
+logger = logging.getLogger('http')
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+_LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+# A read timeout means the host was reached, so it says nothing about connectivity
+_READ_TIMEOUTS = (requests.exceptions.ReadTimeout,) + ((httpx.ReadTimeout,) if HTTPX_AVAILABLE else ())
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class _HostStats:
+    """Request counters and latency histogram for one upstream host"""
+
+    def __init__(self, host, timeout, max_connections):
+        self.host = host
+        self.timeout = timeout
+        self.max_connections = max_connections
+
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms, failed):
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        if failed:
+            self.errors += 1
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, fraction):
+        """Approximate latency percentile (bucket upper bound) in ms"""
+        if not self.requests:
+            return 0
+        target = fraction * self.requests
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float('inf')
+        return float('inf')
+
+    def summary(self):
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'max_connections': self.max_connections,
+            'avg_ms': round(self.total_ms / self.requests, 1) if self.requests else 0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'histogram': dict(zip(labels, self.buckets))
+        }
+
+
+class _HostState(_HostStats):
+    """Pooled session and concurrency cap for one upstream host"""
+
+    def __init__(self, host, timeout, max_connections):
+        super().__init__(host, timeout, max_connections)
+        self.slots = threading.BoundedSemaphore(max_connections)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client.
+
+    - One pooled requests.Session per host, so repeated calls reuse
+      TCP/TLS connections instead of handshaking every time.
+    - At most `max_connections` requests in flight per host; extra callers wait.
+    - Connection errors, timeouts and 429/5xx responses on idempotent
+      requests are retried with full-jitter exponential backoff.
+    - Every attempt is timed into a per-host latency histogram.
+    """
+
+    def __init__(self, host_settings=None, default_timeout=None, max_retries=None,
+                 backoff_base=None, backoff_max=None, max_connections=None):
+        self.host_settings = host_settings if host_settings is not None else Config.HTTP_HOST_SETTINGS
+        self.default_timeout = default_timeout or Config.HTTP_DEFAULT_TIMEOUT
+        self.max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.HTTP_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.max_connections = max_connections or Config.HTTP_MAX_CONNECTIONS_PER_HOST
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                settings = self.host_settings.get(host, {})
+                state = _HostState(
+                    host,
+                    settings.get('timeout', self.default_timeout),
+                    settings.get('max_connections', self.max_connections)
+                )
+                self._hosts[host] = state
+            return state
+
+    def _backoff(self, attempt):
+        """Full jitter: sleep a random amount up to the capped exponential delay"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send a request through the host's pooled session and return the Response"""
+        method = method.upper()
+        state = self._host_state(urlsplit(url).netloc.lower())
+        if retries is None:
+            retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        timeout = timeout or state.timeout
+
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            start = time.perf_counter()
+            with state.slots:
+                try:
+                    response = state.session.request(method, url, timeout=timeout, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _report_connectivity(state.host, error)
+
+            failed = error is not None or response.status_code >= 500
+            with self._lock:
+                state.record(elapsed_ms, failed)
+
+            retryable = error is not None or response.status_code in RETRY_STATUSES
+            if not retryable or attempt >= retries:
+                if error is not None:
+                    raise error
+                return response
+
+            if response is not None:
+                response.close()
+            delay = self._backoff(attempt)
+            attempt += 1
+            with self._lock:
+                state.retries += 1
+            logger.info("Retrying %s %s in %.2fs (attempt %d of %d): %s",
+                        method, state.host, delay, attempt, retries,
+                        error or f"HTTP {response.status_code}")
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_stats(self):
+        """Per-host request counts, errors, retries and latency histograms"""
+        with self._lock:
+            return {host: state.summary() for host, state in self._hosts.items()}
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            for state in self._hosts.values():
+                state.session.close()
+            self._hosts.clear()
+
+
+class _AsyncHostState(_HostStats):
+    """httpx client and concurrency cap for one upstream host, on one event loop"""
+
+    def __init__(self, host, timeout, max_connections, transport=None):
+        super().__init__(host, timeout, max_connections)
+        self.slots = asyncio.Semaphore(max_connections)
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport
+        )
+
+
+class AsyncHttpClient(HttpClient):
+    """
+    HttpClient for asyncio code: the same per-host timeouts, connection caps,
+    retry policy and latency stats, on httpx.AsyncClient. A request waiting on
+    the network holds no thread. Bound to the event loop it is first used on;
+    get_async_http_client() keeps one per loop.
+    """
+
+    def __init__(self, transport=None, **kwargs):
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is required for async HTTP (pip install httpx)")
+        super().__init__(**kwargs)
+        self.transport = transport
+
+    def _host_state(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                settings = self.host_settings.get(host, {})
+                state = _AsyncHostState(
+                    host,
+                    settings.get('timeout', self.default_timeout),
+                    settings.get('max_connections', self.max_connections),
+                    self.transport
+                )
+                self._hosts[host] = state
+            return state
+
+    async def request(self, method, url, timeout=None, retries=None, **kwargs):
+        """Send a request through the host's pooled client and return the httpx.Response"""
+        method = method.upper()
+        state = self._host_state(urlsplit(url).netloc.lower())
+        if retries is None:
+            retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        if timeout is not None:
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            kwargs['timeout'] = httpx.Timeout(read, connect=connect)
+
+        attempt = 0
+        while True:
+            response = None
+            error = None
+            start = time.perf_counter()
+            async with state.slots:
+                try:
+                    response = await state.client.request(method, url, **kwargs)
+                except (httpx.TransportError, httpx.TimeoutException) as e:
+                    error = e
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            _report_connectivity(state.host, error)
+
+            failed = error is not None or response.status_code >= 500
+            with self._lock:
+                state.record(elapsed_ms, failed)
+
+            retryable = error is not None or response.status_code in RETRY_STATUSES
+            if not retryable or attempt >= retries:
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self._backoff(attempt)
+            attempt += 1
+            with self._lock:
+                state.retries += 1
+            logger.info("Retrying %s %s in %.2fs (attempt %d of %d): %s",
+                        method, state.host, delay, attempt, retries,
+                        error or f"HTTP {response.status_code}")
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        """Close all pooled clients"""
+        with self._lock:
+            states = list(self._hosts.values())
+            self._hosts.clear()
+        for state in states:
+            await state.client.aclose()
+
+
+# Global client instance
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Get or create the global HTTP client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def get(url, **kwargs):
+    """GET through the shared client"""
+    return get_http_client().get(url, **kwargs)
+
+
+# One async client (and one set of upstream limits) per event loop
+_async_clients = weakref.WeakKeyDictionary()
+_upstream_slots = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client():
+    """Get or create the async HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient()
+    return client
+
+
+async def aget(url, **kwargs):
+    """GET through the running loop's async client"""
+    return await get_async_http_client().get(url, **kwargs)
+
+
+def upstream_slots(name):
+    """
+    Semaphore capping concurrent async calls to a non-HTTP upstream
+    (Gemini, TTS), sized by Config.ASYNC_UPSTREAM_LIMITS.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _upstream_slots.setdefault(loop, {})
+    if name not in slots:
+        slots[name] = asyncio.Semaphore(Config.ASYNC_UPSTREAM_LIMITS.get(name, Config.HTTP_MAX_CONNECTIONS_PER_HOST))
+    return slots[name]
+
+
+def post(url, **kwargs):
+    """POST through the shared client"""
+    return get_http_client().post(url, **kwargs)
+
+
+def _report_connectivity(host, error):
+    """Let the connectivity monitor know whether an upstream could be reached"""
+    if urlsplit(f"//{host}").hostname in _LOCAL_HOSTS:
+        return
+    monitor = get_connectivity_monitor()
+    if error is None:
+        monitor.record_success(host)
+    elif not isinstance(error, _READ_TIMEOUTS):
+        monitor.record_failure(host)
+
+
+def _reset_after_fork():
+    """A forked worker opens its own connections instead of sharing the parent's sockets"""
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+    _async_clients.clear()
+    _upstream_slots.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+if __name__ == "__main__":
+    client = get_http_client()
+    for _ in range(3):
+        try:
+            r = client.get("https://api.open-meteo.com/v1/forecast?latitude=26.85&longitude=80.95&daily=precipitation_probability_mean&forecast_days=1")
+            print(f"Status: {r.status_code}")
+        except Exception as e:
+            print(f"Request failed: {e}")
+    print(client.get_stats())
@@ -0,0 +1,226 @@
+"""
+Intent Router for Vaani
+Labels a command with every matching intent in a single pass over the text.
+
+All trigger phrases from config.py (and the keyword lists owned by the
+emergency, financial and calculator services) are compiled once into an
+Aho-Corasick automaton. Routing a command then costs O(len(command)) no
+matter how many trigger phrases we add.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vaani.core import config as Config
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick multi-pattern matcher.
+
+    Patterns are added with a label, then build() computes the failure links.
+    find_all() returns every (start, end, label, phrase) occurrence in one scan.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]
+        self._built = False
+
+    def add(self, phrase: str, label: str) -> None:
+        """Add a phrase that should be reported with the given label"""
+        if not phrase:
+            return
+        node = 0
+        for char in phrase:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if (label, phrase) not in self._out[node]:
+            self._out[node].append((label, phrase))
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links (breadth-first) and merge outputs"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+        self._built = True
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str, str]]:
+        """Return (start, end, label, phrase) for every occurrence in text"""
+        if not self._built:
+            self.build()
+
+        matches = []
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                end = index + 1
+                for label, phrase in out[node]:
+                    matches.append((end - len(phrase), end, label, phrase))
+        return matches
+
+    @property
+    def size(self) -> int:
+        """Number of states in the automaton"""
+        return len(self._goto)
+
+
+class IntentMatch:
+    """Result of routing one command: matched intents with their spans"""
+
+    def __init__(self, command: str, spans: Dict[str, List[Tuple[int, int, str]]]):
+        self.command = command
+        self.spans = spans
+
+    def has(self, *intents: str) -> bool:
+        """True if any of the given intents matched"""
+        return any(intent in self.spans for intent in intents)
+
+    def first(self, priority: Iterable[str]) -> Optional[str]:
+        """Return the first intent from a priority list that matched"""
+        for intent in priority:
+            if intent in self.spans:
+                return intent
+        return None
+
+    @property
+    def intents(self) -> List[str]:
+        return list(self.spans.keys())
+
+    def __repr__(self):
+        return f"IntentMatch({self.intents})"
+
+
+class IntentRouter:
+    """
+    Compiles trigger phrases for every intent into two automata:
+    one matched against the command as spoken, one against command.lower().
+    This keeps the exact/lowercase semantics of the old any(...) checks.
+    """
+
+    def __init__(self):
+        self._exact = PhraseMatcher()
+        self._folded = PhraseMatcher()
+        self.intent_names: List[str] = []
+        self.phrase_count = 0
+
+    def add_intent(self, intent: str, phrases: Iterable[str], fold_case: bool = False) -> None:
+        """Register trigger phrases for an intent"""
+        matcher = self._folded if fold_case else self._exact
+        for phrase in phrases:
+            if phrase:
+                matcher.add(phrase.lower() if fold_case else phrase, intent)
+                self.phrase_count += 1
+        if intent not in self.intent_names:
+            self.intent_names.append(intent)
+
+    def build(self) -> "IntentRouter":
+        self._exact.build()
+        self._folded.build()
+        return self
+
+    def match(self, command: str) -> IntentMatch:
+        """Label a command with every matching intent and its matched spans"""
+        spans: Dict[str, List[Tuple[int, int, str]]] = {}
+        if not command:
+            return IntentMatch(command, spans)
+
+        for start, end, intent, phrase in self._exact.find_all(command):
+            spans.setdefault(intent, []).append((start, end, phrase))
+        for start, end, intent, phrase in self._folded.find_all(command.lower()):
+            spans.setdefault(intent, []).append((start, end, phrase))
+        return IntentMatch(command, spans)
+
+
+def build_default_router() -> IntentRouter:
+    """Build the router over all Vaani trigger lists"""
+    # Imported here so the services' own keyword lists stay the single source of truth
+    from vaani.services.social.emergency_assistance_service import (
+        get_emergency_service, EMERGENCY_LIST_KEYWORDS
+    )
+    from vaani.services.finance.financial_literacy_service import get_financial_service
+    from vaani.services.finance.simple_calculator_service import get_calculator_service
+
+    router = IntentRouter()
+
+    # Case-sensitive triggers (matched against the command as spoken)
+    router.add_intent('goodbye', Config.goodbye_triggers)
+    router.add_intent('time', Config.timedekh)
+    router.add_intent('date', Config.date_trigger)
+    router.add_intent('weather', Config.weather_trigger + Config.rain_trigger)
+    router.add_intent('rain_outlook', Config.rain_most_significant)
+    router.add_intent('news', Config.news_trigger)
+    router.add_intent('wikipedia', Config.wikipedia_trigger)
+    router.add_intent('historical_date', Config.historical_date_trigger)
+    router.add_intent('greeting', Config.greeting_triggers)
+    router.add_intent('question_mark', ['?'])
+    router.add_intent('sentence_end', ['।'])
+
+    # Triggers matched against command.lower()
+    emergency = get_emergency_service()
+    for keywords in emergency.emergency_keywords.values():
+        router.add_intent('emergency', keywords, fold_case=True)
+    router.add_intent('emergency', EMERGENCY_LIST_KEYWORDS, fold_case=True)
+
+    financial = get_financial_service()
+    router.add_intent('financial', financial.scam_keywords, fold_case=True)
+    for info in financial.topics.values():
+        router.add_intent('financial', info['keywords'], fold_case=True)
+
+    calculator = get_calculator_service()
+    router.add_intent('calculation', calculator.calc_keywords, fold_case=True)
+
+    router.add_intent('language_switch', Config.language_switch_trigger, fold_case=True)
+    router.add_intent('expense', Config.expense_trigger, fold_case=True)
+    router.add_intent('agriculture', Config.agri_trigger + Config.agri_commodities, fold_case=True)
+    router.add_intent('agri_market', Config.agri_markets, fold_case=True)
+    router.add_intent('social_scheme', Config.social_scheme_trigger, fold_case=True)
+    router.add_intent('general_knowledge', Config.general_knowledge_triggers, fold_case=True)
+    router.add_intent('curiosity', Config.child_curiosity_topics, fold_case=True)
+
+    return router.build()
+
+
+# Global instance
+_intent_router = None
+
+def get_intent_router() -> IntentRouter:
+    """Get or create the global IntentRouter instance"""
+    global _intent_router
+    if _intent_router is None:
+        _intent_router = build_default_router()
+        print(f"Intent router ready: {len(_intent_router.intent_names)} intents, "
+              f"{_intent_router.phrase_count} trigger phrases")
+    return _intent_router
+
+
+# Test function
+if __name__ == "__main__":
+    router = get_intent_router()
+    for query in ["अभी टाइम क्या है", "लखनऊ का मौसम", "आलू का भाव बताओ", "आसमान नीला क्यों होता है?"]:
+        print(f"{query} -> {router.match(query)}")
@@ -1,28 +1,46 @@
 """
 Multi-Language Support Manager for Vaani
 Supports Hindi, English, Bhojpuri, Marathi, Tamil, Telugu, Gujarati, Bengali
+
+LanguageManager holds the language tables and is read-only once built, so
+every thread shares one instance without locking. The language a user is
+speaking lives in a LanguageContext, one per web session (or per CLI run).
 """
 
 import os
+from types import MappingProxyType
+
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 
 load_dotenv()
 
+DEFAULT_LANGUAGE = 'hi'
+
+
+def _freeze(value):
+    """Read-only copy of nested dicts and lists"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 class LanguageManager:
     def __init__(self):
         """Initialize language manager with supported languages"""
-        self.api_key = os.getenv('GEMINI_API_KEY')
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
+        api_key = os.getenv('GEMINI_API_KEY')
+        if api_key:
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel('gemini-2.5-flash')
         else:
-            self.model = None
+            model = None
             print("Warning: GEMINI_API_KEY not found")
         
         # Supported languages with their codes and names
-        self.languages = {
+        languages = {
             'hi': {'name': 'हिंदी', 'name_en': 'Hindi', 'tts_code': 'hi', 'stt_code': 'hi-IN'},
             'en': {'name': 'English', 'name_en': 'English', 'tts_code': 'en', 'stt_code': 'en-IN'},
             'bho': {'name': 'भोजपुरी', 'name_en': 'Bhojpuri', 'tts_code': 'hi', 'stt_code': 'hi-IN'},  # Use Hindi
@@ -35,11 +53,14 @@ class LanguageManager:
             'kn': {'name': 'ಕನ್ನಡ', 'name_en': 'Kannada', 'tts_code': 'kn', 'stt_code': 'kn-IN'},
         }
         
-        # Default language
-        self.current_language = 'hi'
-        
+        object.__setattr__(self, 'api_key', api_key)
+        object.__setattr__(self, 'model', model)
+        object.__setattr__(self, 'languages', _freeze(languages))
         # Common phrases in all languages
-        self.phrases = self._load_common_phrases()
+        object.__setattr__(self, 'phrases', _freeze(self._load_common_phrases()))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("LanguageManager is read-only; keep the user's language in a LanguageContext")
     
     def _load_common_phrases(self):
         """Load common phrases for all languages"""
@@ -106,34 +127,30 @@ class LanguageManager:
             }
         }
     
+    def is_supported(self, lang_code):
+        return lang_code in self.languages
+    
     def get_language_name(self, lang_code=None):
         """Get language name in native script"""
-        code = lang_code or self.current_language
+        code = lang_code or DEFAULT_LANGUAGE
         return self.languages.get(code, {}).get('name', 'Unknown')
     
     def get_tts_code(self, lang_code=None):
         """Get TTS language code"""
-        code = lang_code or self.current_language
+        code = lang_code or DEFAULT_LANGUAGE
         return self.languages.get(code, {}).get('tts_code', 'hi')
     
     def get_stt_code(self, lang_code=None):
         """Get Speech-to-Text language code for Google Speech Recognition"""
-        code = lang_code or self.current_language
+        code = lang_code or DEFAULT_LANGUAGE
         return self.languages.get(code, {}).get('stt_code', 'hi-IN')
     
-    def set_language(self, lang_code):
-        """Set current language"""
-        if lang_code in self.languages:
-            self.current_language = lang_code
-            return True
-        return False
-    
     def get_phrase(self, phrase_key, lang_code=None):
         """Get a common phrase in specified language"""
-        code = lang_code or self.current_language
+        code = lang_code or DEFAULT_LANGUAGE
         return self.phrases.get(phrase_key, {}).get(code, self.phrases[phrase_key]['hi'])
     
-    def detect_language(self, text):
+    def detect_language(self, text, default=DEFAULT_LANGUAGE):
         """
         Detect language from text using simple heuristics
         Returns language code
@@ -158,8 +175,8 @@ class LanguageManager:
             if any(keyword in text_lower for keyword in keywords):
                 return lang_code
         
-        # Default to current language
-        return self.current_language
+        # Default to the language already in use
+        return default
     
     def translate_text(self, text, target_lang=None, source_lang=None):
         """
@@ -168,7 +185,7 @@ class LanguageManager:
         if not self.model:
             return text, "Translation not available - Gemini API not configured"
         
-        target = target_lang or self.current_language
+        target = target_lang or DEFAULT_LANGUAGE
         source = source_lang or 'hi'
         
         # If same language, no translation needed
@@ -207,7 +224,7 @@ class LanguageManager:
         """
         Convert response to user's preferred language if different from default
         """
-        user_language = user_lang or self.current_language
+        user_language = user_lang or DEFAULT_LANGUAGE
         
         # If response is already in user's language, return as is
         if user_language == 'hi':  # Assuming most responses are in Hindi
@@ -235,6 +252,46 @@ class LanguageManager:
         return "Supported languages: " + ", ".join(langs)
 
 
+class LanguageContext:
+    """
+    The language one user is speaking, over the shared LanguageManager.
+
+    Web requests build one from the session's 'language'; the CLI keeps one
+    for the whole run. Switching language changes only this context.
+    """
+
+    __slots__ = ('manager', 'code')
+
+    def __init__(self, code=DEFAULT_LANGUAGE, manager=None):
+        self.manager = manager or get_language_manager()
+        self.code = code if self.manager.is_supported(code) else DEFAULT_LANGUAGE
+
+    def set_language(self, lang_code):
+        """Switch this user's language; False if it is not supported"""
+        if self.manager.is_supported(lang_code):
+            self.code = lang_code
+            return True
+        return False
+
+    def get_phrase(self, phrase_key):
+        return self.manager.get_phrase(phrase_key, self.code)
+
+    def get_tts_code(self):
+        return self.manager.get_tts_code(self.code)
+
+    def get_stt_code(self):
+        return self.manager.get_stt_code(self.code)
+
+    def get_language_name(self):
+        return self.manager.get_language_name(self.code)
+
+    def detect_language(self, text):
+        return self.manager.detect_language(text, default=self.code)
+
+    def __repr__(self):
+        return f"LanguageContext({self.code!r})"
+
+
 # Global instance
 _language_manager = None
 
@@ -246,13 +303,13 @@ def get_language_manager():
     return _language_manager
 
 
-def handle_language_command(command):
+def handle_language_command(command, current_language=DEFAULT_LANGUAGE):
     """
     Check if command is a language switching request
     Returns (is_language_command, new_language_code)
     """
     manager = get_language_manager()
-    detected_lang = manager.detect_language(command)
+    detected_lang = manager.detect_language(command, default=current_language)
     
     # Check if it's explicitly a language change command
     language_switch_phrases = [
@@ -263,10 +320,10 @@ def handle_language_command(command):
     
     is_switch_command = any(phrase in command.lower() for phrase in language_switch_phrases)
     
-    if is_switch_command and detected_lang != manager.current_language:
+    if is_switch_command and detected_lang != current_language:
         return True, detected_lang
     
-    return False, manager.current_language
+    return False, current_language
 
 
 # Test function
@@ -14,6 +14,7 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 from vaani.core.voice_tool import bolo_stream as bolo, listen_command
 from vaani.core.context_manager import BaseContext, NewsContext, AgriculturalContext, SchemeContext
+from vaani.core.intent_router import get_intent_router
 from vaani.services.time.time_service import current_time, get_date_of_day_in_week, get_day_summary
 from vaani.services.weather.weather_service import get_weather
 # Use enhanced news service instead of the old one
@@ -22,12 +23,13 @@ from vaani.services.knowledge.wikipedia_service import search_wikipedia
 from vaani.services.agriculture.agri_command_processor import process_agriculture_command
 from vaani.services.social.social_scheme_service import handle_social_schemes_query
 from vaani.services.knowledge.general_knowledge_service import handle_general_knowledge_query
-from vaani.core.language_manager import get_language_manager, handle_language_command
+from vaani.core.language_manager import LanguageContext, handle_language_command
 from vaani.services.finance.financial_literacy_service import handle_financial_query
 from vaani.services.finance.simple_calculator_service import handle_calculation_query
 from vaani.services.social.emergency_assistance_service import handle_emergency_query
 # New SDG Goal 1 services (No Poverty)
 from vaani.core.offline_mode import OfflineMode
+from vaani.core.connectivity import get_connectivity_monitor
 from vaani.services.finance.expense_tracker_service import process_expense_command
 # Import SMS integration if enabled in config
 SMS_INTEGRATION_ENABLED = getattr(Config, 'SMS_INTEGRATION_ENABLED', False)
@@ -44,17 +46,25 @@ if SMS_INTEGRATION_ENABLED:
 api_key_manager.setup_api_keys()
 load_dotenv()
 
-# Initialize language manager
-lang_manager = get_language_manager()
+# The language this CLI user is speaking
+lang = LanguageContext()
 
 # Initialize offline mode
 offline_mgr = OfflineMode()
 
+# Compile all trigger phrases once
+intent_router = get_intent_router()
+
 # Check if running in offline mode
 def is_online():
     return offline_mgr.is_online()
 
-print(f"Internet connection: {'Available' if is_online() else 'Not available (OFFLINE MODE)'}")
+# The first probe runs in the background; report it once it is in
+@get_connectivity_monitor().on_change
+def announce_connectivity(online):
+    print(f"Internet connection: {'Available' if online else 'Not available (OFFLINE MODE)'}")
+
+get_connectivity_monitor().start()
 
 # Create required directories
 for directory in ["data/expense_data", "data/offline_cache"]:
@@ -83,18 +93,17 @@ def main():
     global current_articles
     
     # Get greeting in current language
-    startup_message = lang_manager.get_phrase('greeting')[0] + "! " + random.choice(Config.startup_responses)
+    startup_message = lang.get_phrase('greeting')[0] + "! " + random.choice(Config.startup_responses)
     print(startup_message)
-    bolo(startup_message, lang=lang_manager.get_tts_code())
+    bolo(startup_message, lang=lang.get_tts_code())
 
-    all_weather_triggers = Config.weather_trigger + Config.rain_trigger + Config.rain_most_significant
     is_waiting_for_news_selection = False
 
     while True:
         # Listen with current language's STT code
-        prompt_text = lang_manager.get_phrase('listening')
+        prompt_text = lang.get_phrase('listening')
         command = listen_command(
-            lang_code=lang_manager.get_stt_code(),
+            lang_code=lang.get_stt_code(),
             prompt_text=prompt_text
         )
         if not command:
@@ -102,20 +111,21 @@ def main():
 
         # Store original command for logging
         original_command = command
-        command_lower = command.lower()
+
+        # Label the command with every matching intent in one pass
+        intents = intent_router.match(command)
 
         # PRIORITY 1: Emergency - Handle FIRST and FAST
-        if handle_emergency_query(command, bolo):
+        if intents.has('emergency') and handle_emergency_query(command, bolo):
             continue
         
         # PRIORITY 2: Language switching
-        is_lang_switch, new_lang = handle_language_command(command)
+        is_lang_switch, new_lang = handle_language_command(command, lang.code)
         if is_lang_switch:
-            lang_manager.set_language(new_lang)
-            lang_name = lang_manager.get_language_name(new_lang)
-            response = f"{lang_manager.get_phrase('greeting', new_lang)[0]}! {lang_name} {lang_manager.get_phrase('listening', new_lang)}"
+            lang.set_language(new_lang)
+            response = f"{lang.get_phrase('greeting')[0]}! {lang.get_language_name()} {lang.get_phrase('listening')}"
             print(response)
-            bolo(response, lang=lang_manager.get_tts_code(new_lang))
+            bolo(response, lang=lang.get_tts_code())
             continue
 
         if is_waiting_for_news_selection:
@@ -129,87 +139,83 @@ def main():
         # Priority order: Most specific triggers first to avoid conflicts
         
         # 1. Goodbye (highest priority)
-        if any(phrase in command for phrase in Config.goodbye_triggers):
+        if intents.has('goodbye'):
             bolo(random.choice(Config.goodbye_responses))
             break
 
         # 2. Time requests (very specific)
-        elif any(phrase in command for phrase in Config.timedekh):
+        elif intents.has('time'):
             current_time(bolo)
 
         # 3. Date requests (specific)
-        elif any(phrase in command for phrase in Config.date_trigger):
+        elif intents.has('date'):
             get_date_of_day_in_week(command, bolo)
 
         # 4. Weather (before agriculture to avoid conflicts)
-        elif any(word in command for word in all_weather_triggers):
+        elif intents.has('weather', 'rain_outlook'):
             get_weather(command, bolo)
 
         # 5. News (specific)
-        elif any(phrase in command for phrase in Config.news_trigger):
+        elif intents.has('news'):
             articles = get_news(command, bolo)
             if articles:
                 current_articles = articles
                 is_waiting_for_news_selection = True
 
         # 6. Wikipedia (specific)
-        elif any(phrase in command for phrase in Config.wikipedia_trigger):
+        elif intents.has('wikipedia'):
             search_wikipedia(command, bolo)
 
         # 7. Financial Literacy (for illiterate users - SDG Goal 1)
-        elif handle_financial_query(command, bolo):
+        elif intents.has('financial') and handle_financial_query(command, bolo):
             pass  # Already handled
 
         # 8. Simple Calculator (for daily math needs)
-        elif handle_calculation_query(command, bolo):
+        elif intents.has('calculation') and handle_calculation_query(command, bolo):
             pass  # Already handled
             
         # 9. Expense Tracker (NEW - for financial tracking)
-        elif any(word in command_lower for word in ["खर्च", "खर्चा", "expense", "पैसा", "रुपये", "हिसाब"]):
+        elif intents.has('expense'):
             response = process_expense_command(command, USER_ID)
             bolo(response)
 
         # 10. Agriculture-related (check for specific agriculture context)
-        elif (any(word in command_lower for word in Config.agri_trigger) or 
-              any(crop in command_lower for crop in Config.agri_commodities) or
-              any(market in command_lower for market in Config.agri_markets)):
+        elif intents.has('agriculture', 'agri_market'):
             
             # Use unified context for agriculture processing
             context = AgriculturalContext()
             process_agriculture_command(command, bolo, {}, context)
 
         # 10. Social scheme triggers (specific schemes only)
-        elif any(phrase in command_lower for phrase in Config.social_scheme_trigger):
+        elif intents.has('social_scheme'):
             # Use unified context for social schemes
             context = SchemeContext()
             handle_social_schemes_query(command, bolo, context)
 
         # 11. Historical date (now more specific, less likely to conflict)
-        elif any(phrase in command for phrase in Config.historical_date_trigger):
+        elif intents.has('historical_date'):
             get_day_summary(command, bolo)
 
         # 12. Greeting (low priority)
-        elif any(phrase in command for phrase in Config.greeting_triggers):
+        elif intents.has('greeting'):
             bolo(random.choice(Config.greeting_responses))
 
         # 13. General Knowledge Questions (before unrecognized)
         # Check if it's a curiosity/general knowledge question
-        elif (any(trigger in command_lower for trigger in Config.general_knowledge_triggers) or 
-              any(topic in command_lower for topic in Config.child_curiosity_topics) or
-              '?' in command or '।' in command):
+        elif intents.has('general_knowledge', 'curiosity', 'question_mark', 'sentence_end'):
             # Try to handle as general knowledge question
             if not handle_general_knowledge_query(command, bolo):
                 # If not handled, fall through to unrecognized
-                error_msg = lang_manager.get_phrase('error')
+                error_msg = lang.get_phrase('error')
                 print(error_msg)
-                bolo(error_msg, lang=lang_manager.get_tts_code())
+                bolo(error_msg, lang=lang.get_tts_code())
                 log_unprocessed_query(original_command)
 
         # 14. Unrecognized command
         else:
-            error_msg = lang_manager.get_phrase('error')
+            error_msg = lang.get_phrase('error')
             print(error_msg)
-            bolo(error_msg, lang=lang_manager.get_tts_code())
+            bolo(error_msg, lang=lang.get_tts_code())
             log_unprocessed_query(original_command)
         
         time.sleep(1)
@@ -9,6 +9,9 @@ import hashlib
 from datetime import datetime
 import logging
 
+from vaani.core.connectivity import get_connectivity_monitor
+from vaani.core.offline_store import OfflineAnswerStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,11 +21,25 @@ logging.basicConfig(
 
 logger = logging.getLogger('offline_mode')
 
+# Responses used when nothing is cached for a service
+FALLBACK_RESPONSES = {
+    "financial": "मुझे खेद है, इस प्रश्न का उत्तर ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
+    "emergency": "आपातकालीन नंबर: पुलिस: 100, एम्बुलेंस: 108, आग: 101, महिला हेल्पलाइन: 1091",
+    "agriculture": "मुझे खेद है, फसल संबंधी जानकारी ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
+    "schemes": "मुझे खेद है, योजना संबंधी जानकारी ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
+    "calculator": "मुझे खेद है, इस गणना का उत्तर ऑफलाइन मोड में उपलब्ध नहीं है।"
+}
+DEFAULT_FALLBACK_RESPONSE = "इंटरनेट कनेक्शन न होने के कारण जानकारी उपलब्ध नहीं है।"
+
+
 class OfflineMode:
     def __init__(self, cache_dir="offline_cache"):
         """Initialize the offline mode manager with cache directory"""
         self.cache_dir = cache_dir
         self.ensure_cache_dir()
+        self.store = OfflineAnswerStore(os.path.join(cache_dir, "offline_answers.db"))
+        for service in FALLBACK_RESPONSES:
+            self.import_json_cache(service)
         self.services = {
             "financial": self.get_financial_cache_file(),
             "emergency": self.get_emergency_cache_file(),
@@ -38,37 +55,37 @@ class OfflineMode:
             logger.info(f"Created cache directory: {self.cache_dir}")
     
     def is_online(self):
-        """Check if internet connection is available"""
-        try:
-            # Try to connect to Google DNS to check internet
-            import socket
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
-            return True
-        except OSError:
-            return False
+        """Last known connectivity from the background monitor (does not block)"""
+        return get_connectivity_monitor().is_online()
     
     def get_cache_path(self, service):
-        """Get the cache file path for a specific service"""
+        """Get the legacy JSON cache file path for a specific service"""
         return os.path.join(self.cache_dir, f"{service}_cache.json")
     
-    def load_cache(self, service):
-        """Load cached data for a service"""
+    def import_json_cache(self, service):
+        """Move answers from a legacy <service>_cache.json into the store (once, while it has none)"""
         cache_path = self.get_cache_path(service)
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding cache file: {cache_path}")
-                return {}
-        return {}
+        if not os.path.exists(cache_path) or self.store.count(service):
+            return 0
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            logger.error(f"Error decoding cache file: {cache_path}")
+            return 0
+        self.save_cache(service, data)
+        logger.info(f"Imported {len(data)} cached answers for {service} from {cache_path}")
+        return len(data)
+    
+    def load_cache(self, service):
+        """All cached answers for a service, keyed by query hash"""
+        return self.store.entries(service)
     
     def save_cache(self, service, data):
-        """Save data to cache for a service"""
-        cache_path = self.get_cache_path(service)
+        """Save answers ({hash: {"query", "response", ...}}) to the cache for a service"""
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            for entry in data.values():
+                self.store.put(service, entry["query"], entry["response"])
             logger.info(f"Updated cache for {service}")
             return True
         except Exception as e:
@@ -92,51 +109,20 @@ class OfflineMode:
             try:
                 response = online_function(query)
                 
-                # Save successful response to cache
+                # Save successful response to cache, linking similar earlier queries to it
                 if response:
-                    cache = self.load_cache(service)
-                    query_hash = hashlib.md5(query.encode()).hexdigest()
-                    
-                    cache[query_hash] = {
-                        "query": query,
-                        "response": response,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    # Find similar queries to link together
-                    for existing_hash, data in list(cache.items()):
-                        if self.query_similarity(query, data["query"]) > 0.7:
-                            cache[existing_hash]["similar_to"] = query_hash
-                    
-                    self.save_cache(service, cache)
+                    self.store.put(service, query, response, link_threshold=0.7)
                     return response, False  # False = not from cache
                 
             except Exception as e:
                 logger.error(f"Error with online function: {str(e)}")
                 # Fall back to cache on error
         
-        # If offline or online function failed, try to find in cache
-        cache = self.load_cache(service)
-        if not cache:
-            return self.get_fallback_response(service, query), True
-        
-        # Try exact match first
-        query_hash = hashlib.md5(query.encode()).hexdigest()
-        if query_hash in cache:
-            return cache[query_hash]["response"], True
-        
-        # Try similarity matching
-        best_match = None
-        best_score = 0.6  # Minimum similarity threshold
-        
-        for item_hash, data in cache.items():
-            similarity = self.query_similarity(query, data["query"])
-            if similarity > best_score:
-                best_match = item_hash
-                best_score = similarity
-        
-        if best_match:
-            return cache[best_match]["response"], True
+        # If offline or online function failed, try an exact match, then the
+        # most similar cached query (minimum similarity 0.6)
+        match = self.store.find(service, query, threshold=0.6)
+        if match:
+            return match[0], True
             
         # No match found, return fallback response
         return self.get_fallback_response(service, query), True
@@ -158,20 +144,12 @@ class OfflineMode:
     
     def get_fallback_response(self, service, query):
         """Get a fallback response when no cache is available"""
-        fallbacks = {
-            "financial": "मुझे खेद है, इस प्रश्न का उत्तर ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
-            "emergency": "आपातकालीन नंबर: पुलिस: 100, एम्बुलेंस: 108, आग: 101, महिला हेल्पलाइन: 1091",
-            "agriculture": "मुझे खेद है, फसल संबंधी जानकारी ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
-            "schemes": "मुझे खेद है, योजना संबंधी जानकारी ऑफलाइन मोड में उपलब्ध नहीं है। कृपया इंटरनेट कनेक्शन होने पर पुनः प्रयास करें।",
-            "calculator": "मुझे खेद है, इस गणना का उत्तर ऑफलाइन मोड में उपलब्ध नहीं है।"
-        }
-        return fallbacks.get(service, "इंटरनेट कनेक्शन न होने के कारण जानकारी उपलब्ध नहीं है।")
+        return FALLBACK_RESPONSES.get(service, DEFAULT_FALLBACK_RESPONSE)
     
     # Pre-cached content files
     def get_financial_cache_file(self):
         """Get or create financial literacy cache file"""
-        cache_path = self.get_cache_path("financial")
-        if not os.path.exists(cache_path):
+        if not self.store.count("financial"):
             basic_financial = {
                 hashlib.md5("बैंक में खाता कैसे खोलें".encode()).hexdigest(): {
                     "query": "बैंक में खाता कैसे खोलें",
@@ -239,8 +217,7 @@ class OfflineMode:
     
     def get_emergency_cache_file(self):
         """Get or create emergency assistance cache file"""
-        cache_path = self.get_cache_path("emergency")
-        if not os.path.exists(cache_path):
+        if not self.store.count("emergency"):
             emergency_data = {
                 hashlib.md5("emergency numbers".encode()).hexdigest(): {
                     "query": "emergency numbers",
@@ -290,22 +267,19 @@ class OfflineMode:
     
     def get_agriculture_cache_file(self):
         """Get or create agriculture cache file"""
-        cache_path = self.get_cache_path("agriculture")
-        if not os.path.exists(cache_path):
+        if not self.store.count("agriculture"):
             # This will be populated from crop_data folder in the future
             self.save_cache("agriculture", {})
     
     def get_schemes_cache_file(self):
         """Get or create schemes cache file"""
-        cache_path = self.get_cache_path("schemes")
-        if not os.path.exists(cache_path):
+        if not self.store.count("schemes"):
             # This will be populated from scheme_data folder in the future
             self.save_cache("schemes", {})
     
     def get_calculator_cache_file(self):
         """Get or create calculator cache file"""
-        cache_path = self.get_cache_path("calculator")
-        if not os.path.exists(cache_path):
+        if not self.store.count("calculator"):
             # Simple calculations that can be done offline
             calc_data = {
                 hashlib.md5("100 गुना 5".encode()).hexdigest(): {
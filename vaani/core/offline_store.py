@@ -0,0 +1,232 @@
+"""
+Offline Answer Store for Vaani
+Answers saved while online, served again when offline: one SQLite (WAL) file
+with an inverted word index, so a lookup only scores the answers that share
+a word with the question and saving an answer touches only its own rows.
+
+Similar questions are matched by word-set Jaccard, as before. A prefix filter
+over the rarest words of the question keeps the candidate set small: an
+answer that shares none of them cannot reach the threshold, so the filter
+finds the same best match as a full scan. The index is keyed by answer length
+too, so only answers long and short enough to reach the threshold are read,
+and shared words are counted in SQL without reading any answer text.
+
+Usage:
+    store = OfflineAnswerStore("offline_cache/offline_answers.db")
+    store.put('financial', "बैंक में खाता कैसे खोलें", answer)
+    store.find('financial', "बैंक खाता कैसे खोलें")    # (answer, score) or None
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from datetime import datetime
+import logging
+
+from vaani.core.sqlite_util import connect_local
+
+logger = logging.getLogger('offline_store')
+
+# SQLite allows 999 bound parameters in older builds; larger IN lists are split
+_MAX_PARAMS = 900
+
+# Most answers scored per prefix word; those sharing the most words come first
+MAX_CANDIDATES = 5000
+
+
+def query_hash(query):
+    return hashlib.md5(query.encode()).hexdigest()
+
+
+def query_words(query):
+    """The words a query is matched on"""
+    return set(query.lower().split())
+
+
+class OfflineAnswerStore:
+    """
+    Cached answers per service.
+    Each thread has its own connection, so any number of threads and worker
+    processes can read and write the same file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS answers ("
+                   "id INTEGER PRIMARY KEY, service TEXT NOT NULL, hash TEXT NOT NULL, "
+                   "query TEXT NOT NULL, response TEXT NOT NULL, timestamp TEXT NOT NULL, "
+                   "words INTEGER NOT NULL, similar_to TEXT, UNIQUE (service, hash))")
+        # Inverted index: which answers (of how many words) contain a word, and how many do
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            columns = [row[1] for row in db.execute("PRAGMA table_info(answer_words)")]
+            if columns and 'words' not in columns:
+                # Stores from before answer lengths were indexed
+                db.execute("DROP TABLE answer_words")
+            db.execute("CREATE TABLE IF NOT EXISTS answer_words ("
+                       "service TEXT NOT NULL, word TEXT NOT NULL, words INTEGER NOT NULL, "
+                       "answer_id INTEGER NOT NULL, PRIMARY KEY (service, word, words, answer_id)) WITHOUT ROWID")
+            if columns and 'words' not in columns:
+                for service, answer_id, query in db.execute("SELECT service, id, query FROM answers").fetchall():
+                    self._index(db, service, answer_id, query_words(query))
+                logger.info("Rebuilt the offline answer word index with answer lengths")
+        db.execute("CREATE TABLE IF NOT EXISTS word_counts ("
+                   "service TEXT NOT NULL, word TEXT NOT NULL, answers INTEGER NOT NULL, "
+                   "PRIMARY KEY (service, word)) WITHOUT ROWID")
+
+    def _db(self):
+        return connect_local(self._local, self.path)
+
+    def put(self, service, query, response, link_threshold=0.7):
+        """
+        Save (or replace) the answer to query. Earlier answers more than
+        link_threshold similar to it are marked similar_to this one.
+        Returns the number of answers linked.
+        """
+        words = query_words(query)
+        digest = query_hash(query)
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            old = db.execute("SELECT id FROM answers WHERE service = ? AND hash = ?", (service, digest)).fetchone()
+            if old is not None:
+                self._unindex(db, service, old[0])
+            answer_id = db.execute(
+                "INSERT INTO answers (service, hash, query, response, timestamp, words) VALUES (?, ?, ?, ?, ?, ?)",
+                (service, digest, query, response, datetime.now().isoformat(), len(words))).lastrowid
+            self._index(db, service, answer_id, words)
+            db.executemany("INSERT INTO word_counts (service, word, answers) VALUES (?, ?, 1) "
+                           "ON CONFLICT (service, word) DO UPDATE SET answers = answers + 1",
+                           [(service, word) for word in words])
+
+            similar = [other for other, score in self._scored(db, service, words, link_threshold)
+                       if other != answer_id and score > link_threshold]
+            for chunk in _chunks(similar):
+                db.execute(f"UPDATE answers SET similar_to = ? WHERE id IN ({','.join('?' * len(chunk))})",
+                           (digest, *chunk))
+        return len(similar)
+
+    @staticmethod
+    def _index(db, service, answer_id, words):
+        db.executemany("INSERT INTO answer_words (service, word, words, answer_id) VALUES (?, ?, ?, ?)",
+                       [(service, word, len(words), answer_id) for word in words])
+
+    def _unindex(self, db, service, answer_id):
+        words = query_words(db.execute("SELECT query FROM answers WHERE id = ?", (answer_id,)).fetchone()[0])
+        db.executemany("UPDATE word_counts SET answers = answers - 1 WHERE service = ? AND word = ?",
+                       [(service, word) for word in words])
+        db.execute("DELETE FROM word_counts WHERE service = ? AND answers <= 0", (service,))
+        db.executemany("DELETE FROM answer_words WHERE service = ? AND word = ? AND words = ? AND answer_id = ?",
+                       [(service, word, len(words), answer_id) for word in words])
+        db.execute("DELETE FROM answers WHERE id = ?", (answer_id,))
+
+    def get(self, service, query):
+        """The answer saved for exactly this query, or None"""
+        row = self._db().execute("SELECT response FROM answers WHERE service = ? AND hash = ?",
+                                 (service, query_hash(query))).fetchone()
+        return row[0] if row else None
+
+    def find(self, service, query, threshold=0.6):
+        """(answer, similarity) for the exact query or the most similar one above threshold, else None"""
+        exact = self.get(service, query)
+        if exact is not None:
+            return exact, 1.0
+        db = self._db()
+        best_id, best_score = None, threshold
+        for answer_id, score in self._scored(db, service, query_words(query), threshold, best=True):
+            if score > best_score:
+                best_id, best_score = answer_id, score
+        if best_id is None:
+            return None
+        return db.execute("SELECT response FROM answers WHERE id = ?", (best_id,)).fetchone()[0], best_score
+
+    def _scored(self, db, service, words, threshold, best=False):
+        """
+        (answer id, Jaccard similarity) for the answers that score above threshold;
+        with best=True, only as many as it takes to find the highest score
+        """
+        if not words:
+            return []
+        words = list(words)
+        counts = dict(self._in(db, "SELECT word, answers FROM word_counts WHERE service = ? AND word IN ({})",
+                               (service,), words))
+        rarest = sorted((word for word in words if word in counts), key=counts.get)
+        scored = {}
+        for position, word in enumerate(rarest):
+            # Answers with a rarer word were counted already, so the ones left share
+            # at most the words from here on
+            bounds = _length_bounds(len(words), threshold, len(rarest) - position)
+            if bounds is None:
+                break
+            shortest, longest, needed = bounds
+            # Shared words are counted in the index, for answers of a possible length
+            # only; no answer text is read. A question has far fewer words than
+            # _MAX_PARAMS, so one statement does it.
+            rows = db.execute(
+                "SELECT candidate.answer_id, candidate.words, COUNT(*) FROM answer_words AS candidate "
+                "CROSS JOIN answer_words AS shared ON shared.service = candidate.service "
+                f"AND shared.word IN ({','.join('?' * len(words))}) AND shared.words = candidate.words "
+                "AND shared.answer_id = candidate.answer_id "
+                "WHERE candidate.service = ? AND candidate.word = ? AND candidate.words BETWEEN ? AND ? "
+                f"GROUP BY candidate.answer_id HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC LIMIT {MAX_CANDIDATES}",
+                (*words, service, word, shortest, longest, needed)).fetchall()
+            for answer_id, length, shared in rows:
+                scored[answer_id] = shared / (len(words) + length - shared)
+            if best and scored:
+                # Only a higher score matters now, which needs more shared words
+                threshold = max(threshold, max(scored.values()))
+        return list(scored.items())
+
+    @staticmethod
+    def _in(db, sql, params, values):
+        rows = []
+        for chunk in _chunks(values):
+            rows += db.execute(sql.format(','.join('?' * len(chunk))), (*params, *chunk)).fetchall()
+        return rows
+
+    def entries(self, service):
+        """Every saved answer for service, keyed by query hash (the old JSON cache layout)"""
+        rows = self._db().execute("SELECT hash, query, response, timestamp, similar_to FROM answers "
+                                  "WHERE service = ? ORDER BY id", (service,)).fetchall()
+        entries = {}
+        for digest, query, response, timestamp, similar_to in rows:
+            entries[digest] = {"query": query, "response": response, "timestamp": timestamp}
+            if similar_to:
+                entries[digest]["similar_to"] = similar_to
+        return entries
+
+    def count(self, service=None):
+        if service is None:
+            return self._db().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        return self._db().execute("SELECT COUNT(*) FROM answers WHERE service = ?", (service,)).fetchone()[0]
+
+
+def _length_bounds(size, threshold, most):
+    """
+    (shortest, longest, needed) for a question of size words and answers sharing
+    at most `most` words with it: an answer of n words scores above threshold
+    only if shortest <= n <= longest, and then shares at least needed words.
+    None if no answer can.
+    """
+    if threshold <= 0:
+        return 1, sys.maxsize, 1
+    feasible = []
+    for length in range(1, int(size / threshold) + 2):
+        # Same float arithmetic as the score itself, so a bound never excludes a match
+        least = next((shared for shared in range(1, min(most, length) + 1)
+                      if shared / (size + length - shared) > threshold), None)
+        if least is not None:
+            feasible.append((length, least))
+    if not feasible:
+        return None
+    return feasible[0][0], feasible[-1][0], min(least for _, least in feasible)
+
+
+def _chunks(values, size=_MAX_PARAMS):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
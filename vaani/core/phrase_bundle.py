@@ -0,0 +1,295 @@
+"""
+Phrase Bundle for Vaani
+Pre-rendered audio for every fixed response, served without synthesis or network.
+
+Greetings, goodbyes, startup lines, the multilingual LanguageManager phrases,
+the emergency numbers list and the offline fallbacks never change at runtime,
+so they are rendered once into data/phrase_bundle/ by the build step:
+
+    python -m vaani.core.phrase_bundle build
+
+At runtime the manifest is loaded into memory and text_to_speech_file /
+synthesize_sentence return bundled audio before trying gTTS.
+"""
+
+import json
+import os
+import sys
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from vaani.core import config as Config
+from vaani.core.audio_cache import audio_key
+
+logger = logging.getLogger('phrase_bundle')
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BUNDLE_DIR = os.path.join(_PROJECT_ROOT, 'data', 'phrase_bundle')
+MANIFEST_FILENAME = 'manifest.json'
+BUNDLE_VERSION = 1
+BUNDLE_ENGINE = 'gtts'
+
+
+def collect_phrases():
+    """
+    Every static phrase with the TTS language it is spoken in.
+
+    Multi-sentence phrases are also listed sentence by sentence, because the
+    voice pipeline synthesizes one sentence at a time.
+
+    Returns:
+        List of unique (text, tts_lang) pairs in a stable order
+    """
+    from vaani.core.language_manager import get_language_manager
+    from vaani.core.offline_mode import FALLBACK_RESPONSES, DEFAULT_FALLBACK_RESPONSE
+    from vaani.core.voice_tool import split_sentences
+    from vaani.services.social.emergency_assistance_service import get_emergency_service
+
+    phrases = []
+    hindi = (
+        list(Config.greeting_responses)
+        + list(Config.goodbye_responses)
+        + list(Config.startup_responses)
+        + [Config.web_greeting_text]
+        + [get_emergency_service().get_all_emergency_numbers()]
+        + list(FALLBACK_RESPONSES.values())
+        + [DEFAULT_FALLBACK_RESPONSE]
+    )
+    phrases.extend((text, 'hi') for text in hindi)
+
+    lang_manager = get_language_manager()
+    for translations in lang_manager.phrases.values():
+        for lang_code, value in translations.items():
+            tts_lang = lang_manager.get_tts_code(lang_code)
+            for text in (value if isinstance(value, (list, tuple)) else [value]):
+                phrases.append((text, tts_lang))
+
+    unique = {}
+    for text, lang in phrases:
+        text = text.strip()
+        if not text:
+            continue
+        unique.setdefault((text, lang), None)
+        sentences = split_sentences(text)
+        if len(sentences) > 1:
+            for sentence in sentences:
+                unique.setdefault((sentence, lang), None)
+    return list(unique)
+
+
+def _render_gtts(text, lang):
+    from gtts import gTTS
+
+    mp3_fp = BytesIO()
+    gTTS(text=text, lang=lang, slow=False).write_to_fp(mp3_fp)
+    return mp3_fp.getvalue()
+
+
+def _read_manifest(bundle_dir):
+    path = os.path.join(bundle_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception as e:
+        logger.warning("Could not read phrase bundle manifest: %s", e)
+        return None
+    if manifest.get('version') != BUNDLE_VERSION:
+        logger.info("Phrase bundle manifest is from another version, ignoring it")
+        return None
+    return manifest
+
+
+def build_bundle(bundle_dir=BUNDLE_DIR, phrases=None, render=_render_gtts, workers=None):
+    """
+    Render every missing phrase into the bundle and rewrite the manifest.
+
+    Already rendered phrases are kept, so rebuilding after adding a phrase only
+    synthesizes the new one; files for phrases that no longer exist are deleted.
+
+    Returns:
+        Tuple of (manifest, list of render errors)
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    phrases = collect_phrases() if phrases is None else phrases
+    previous = (_read_manifest(bundle_dir) or {}).get('phrases', {})
+
+    entries = {}
+    pending = []
+    for text, lang in phrases:
+        key = audio_key(text, lang, 'default', BUNDLE_ENGINE)
+        if key in entries:
+            continue
+        old = previous.get(key)
+        if old and os.path.exists(os.path.join(bundle_dir, old['file'])):
+            entries[key] = old
+        else:
+            entries[key] = None
+            pending.append((key, text, lang))
+
+    errors = []
+
+    def render_one(key, text, lang):
+        filename = f"phrase_{key}.mp3"
+        audio_bytes = render(text, lang)
+        if not audio_bytes:
+            raise ValueError("no audio returned")
+        tmp_path = os.path.join(bundle_dir, filename + '.part')
+        with open(tmp_path, 'wb') as f:
+            f.write(audio_bytes)
+        os.replace(tmp_path, os.path.join(bundle_dir, filename))
+        return {'text': text, 'lang': lang, 'file': filename, 'bytes': len(audio_bytes)}
+
+    with ThreadPoolExecutor(max_workers=workers or Config.PHRASE_BUNDLE_WORKERS) as executor:
+        futures = [(key, text, lang, executor.submit(render_one, key, text, lang))
+                   for key, text, lang in pending]
+        for key, text, lang, future in futures:
+            try:
+                entries[key] = future.result()
+            except Exception as e:
+                errors.append(f"[{lang}] {text[:40]!r}: {e}")
+
+    entries = {key: entry for key, entry in entries.items() if entry is not None}
+    keep = {entry['file'] for entry in entries.values()}
+    for filename in os.listdir(bundle_dir):
+        if filename.startswith('phrase_') and filename not in keep:
+            os.remove(os.path.join(bundle_dir, filename))
+
+    manifest = {'version': BUNDLE_VERSION, 'engine': BUNDLE_ENGINE, 'phrases': entries}
+    tmp_path = os.path.join(bundle_dir, MANIFEST_FILENAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, os.path.join(bundle_dir, MANIFEST_FILENAME))
+    return manifest, errors
+
+
+class PhraseBundle:
+    """
+    Read-only view of the built bundle.
+
+    The manifest is held in memory, so a lookup is one hash and one dict
+    access; audio bytes are read from disk once and then kept in memory.
+    An unbuilt bundle is simply empty and every lookup misses.
+    """
+
+    def __init__(self, bundle_dir=BUNDLE_DIR):
+        self.bundle_dir = bundle_dir
+        self._lock = threading.Lock()
+        self._files = {}        # key -> filename
+        self._bytes = {}        # key -> audio bytes, filled on first read
+        self.engine = BUNDLE_ENGINE
+        self.stats = {'hits': 0, 'misses': 0}
+
+        manifest = _read_manifest(bundle_dir)
+        if manifest is None:
+            logger.info("No phrase bundle found in %s", bundle_dir)
+            return
+        self.engine = manifest.get('engine', BUNDLE_ENGINE)
+        for key, entry in manifest.get('phrases', {}).items():
+            if os.path.exists(os.path.join(bundle_dir, entry['file'])):
+                self._files[key] = entry['file']
+        logger.info("Phrase bundle loaded with %d phrases", len(self._files))
+
+    def _lookup(self, text, lang):
+        if not text or not self._files:
+            return None
+        key = audio_key(text, lang, 'default', self.engine)
+        with self._lock:
+            found = key if key in self._files else None
+            self.stats['hits' if found else 'misses'] += 1
+        return found
+
+    def get(self, text, lang='hi'):
+        """Path of the bundled audio for this phrase, or None"""
+        key = self._lookup(text, lang)
+        return os.path.join(self.bundle_dir, self._files[key]) if key else None
+
+    def read(self, text, lang='hi'):
+        """MP3 bytes of the bundled audio for this phrase, or None"""
+        key = self._lookup(text, lang)
+        if key is None:
+            return None
+        audio_bytes = self._bytes.get(key)
+        if audio_bytes is None:
+            with open(os.path.join(self.bundle_dir, self._files[key]), 'rb') as f:
+                audio_bytes = f.read()
+            self._bytes[key] = audio_bytes
+        return audio_bytes
+
+    def preload(self):
+        """Read every phrase's audio into memory now; returns the number of phrases held"""
+        for key, filename in self._files.items():
+            if key not in self._bytes:
+                with open(os.path.join(self.bundle_dir, filename), 'rb') as f:
+                    self._bytes[key] = f.read()
+        return len(self._bytes)
+
+    def path_for_file(self, filename):
+        """Path of a bundle file by name (as served over HTTP), or None if it is not in the bundle"""
+        if not filename.startswith('phrase_') or not filename.endswith('.mp3'):
+            return None
+        key = filename[len('phrase_'):-len('.mp3')]
+        if self._files.get(key) != filename:
+            return None
+        return os.path.join(self.bundle_dir, filename)
+
+    def get_stats(self):
+        with self._lock:
+            return {'phrases': len(self._files), **self.stats}
+
+    def __len__(self):
+        return len(self._files)
+
+
+# Global instance
+_phrase_bundle = None
+_phrase_bundle_lock = threading.Lock()
+
+
+def get_phrase_bundle():
+    """Get or create the global phrase bundle"""
+    global _phrase_bundle
+    if _phrase_bundle is None:
+        with _phrase_bundle_lock:
+            if _phrase_bundle is None:
+                _phrase_bundle = PhraseBundle()
+    return _phrase_bundle
+
+
+def main(argv=None):
+    """Build command: render every static phrase, or check which are missing"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] not in ('build', 'check'):
+        print("Usage: python -m vaani.core.phrase_bundle [build|check]")
+        return 2
+
+    phrases = collect_phrases()
+    languages = sorted({lang for _, lang in phrases})
+    print(f"Static phrases: {len(phrases)} in {len(languages)} languages ({', '.join(languages)})")
+
+    if argv and argv[0] == 'check':
+        bundle = PhraseBundle()
+        missing = [(text, lang) for text, lang in phrases if bundle.get(text, lang) is None]
+        for text, lang in missing:
+            print(f"✗ missing [{lang}] {text[:60]!r}")
+        if missing:
+            return 1
+        print(f"✓ All {len(phrases)} phrases are bundled")
+        return 0
+
+    manifest, errors = build_bundle(phrases=phrases)
+    total_bytes = sum(entry['bytes'] for entry in manifest['phrases'].values())
+    print(f"Bundled:        {len(manifest['phrases'])} files, {total_bytes // 1024} KB in {BUNDLE_DIR}")
+    for error in errors:
+        print(f"✗ {error}")
+    if errors:
+        return 1
+    print("✓ Phrase bundle is complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""
+Audio Playback Engine for Vaani
+One long-lived audio device session with a queue of decoded buffers, gapless playback and flush for barge-in.
+
+Usage:
+    from vaani.core.playback import get_playback_engine
+
+    engine = get_playback_engine()
+    item = engine.enqueue(mp3_fp, pause=0.15)
+    item.wait()             # returns when the sentence has played
+    engine.flush()          # barge-in: stop now and drop everything queued
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from io import BytesIO
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', "1")
+from pygame import mixer
+
+from vaani.core import config as Config
+
+logger = logging.getLogger('playback')
+
+# Hand the next buffer to the device this long before the current one ends
+QUEUE_LEAD = 0.05
+
+_mixer_lock = threading.Lock()
+
+
+def ensure_mixer():
+    """Open the audio device once for the whole process"""
+    with _mixer_lock:
+        if not mixer.get_init():
+            mixer.init(frequency=Config.PLAYBACK_FREQUENCY, size=-16,
+                       channels=Config.PLAYBACK_CHANNELS, buffer=Config.PLAYBACK_BUFFER)
+            mixer.set_reserved(1)
+        return mixer.get_init()
+
+
+class PlaybackItem:
+    """A queued buffer; wait() blocks until it has played or was flushed"""
+
+    __slots__ = ('sound', 'length', 'generation', 'played', '_done')
+
+    def __init__(self, sound, generation):
+        self.sound = sound
+        self.length = sound.get_length()
+        self.generation = generation
+        self.played = False
+        self._done = threading.Event()
+
+    def finish(self, played):
+        self.played = played
+        self._done.set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+class PlaybackEngine:
+    """
+    Plays queued sounds back to back on one reserved mixer channel.
+
+    - The device is opened once; sentences are decoded into Sound buffers
+      when they are enqueued, not when they start.
+    - While one sound plays, the next is handed to the channel's own queue
+      shortly before the end, so the device moves on without a gap; pauses
+      are queued as exact-length silence.
+    - The player thread sleeps until the computed end of the current sound
+      or until flush() wakes it; nothing polls.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._wake = threading.Condition()
+        self._generation = 0
+        self._thread = None
+        self._channel = None
+        self._start_lock = threading.Lock()
+        self.stats = {'played': 0, 'flushed': 0, 'gapless': 0}
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                ensure_mixer()
+                self._channel = mixer.Channel(0)
+                self._thread = threading.Thread(target=self._run, daemon=True, name='playback')
+                self._thread.start()
+
+    def _silence(self, seconds):
+        frequency, _, channels = ensure_mixer()
+        frames = max(1, int(frequency * seconds))
+        return mixer.Sound(buffer=bytes(2 * channels * frames))
+
+    def enqueue(self, audio, pause=0.0):
+        """
+        Queue MP3/WAV data (bytes or a file object) for playback.
+
+        Returns:
+            PlaybackItem for the audio; its pause, if any, is queued right after it
+        """
+        self._start()
+        if isinstance(audio, (bytes, bytearray)):
+            audio = BytesIO(audio)
+        sound = mixer.Sound(file=audio)
+        with self._wake:
+            generation = self._generation
+        item = PlaybackItem(sound, generation)
+        self._queue.put(item)
+        if pause > 0:
+            self._queue.put(PlaybackItem(self._silence(pause), generation))
+        return item
+
+    def play(self, audio, pause=0.0):
+        """Play audio and block until it has finished or been flushed"""
+        item = self.enqueue(audio, pause)
+        item.wait()
+        return item.played
+
+    def flush(self):
+        """Stop playback immediately and drop every queued buffer"""
+        with self._wake:
+            self._generation += 1
+            self._wake.notify_all()
+        if self._channel is not None:
+            self._channel.stop()
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            item.finish(False)
+            self.stats['flushed'] += 1
+
+    @property
+    def busy(self):
+        return not self._queue.empty() or (self._channel is not None and self._channel.get_busy())
+
+    def _sleep_until(self, deadline, generation):
+        """Sleep until deadline; False if a flush happened meanwhile"""
+        with self._wake:
+            return not self._wake.wait_for(
+                lambda: self._generation != generation,
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+
+    def _next(self, block):
+        while True:
+            try:
+                item = self._queue.get(block=block)
+            except queue.Empty:
+                return None
+            if item.generation == self._generation:
+                return item
+            item.finish(False)
+
+    def _run(self):
+        current, ends_at = None, 0.0
+        while True:
+            if current is None:
+                current = self._next(block=True)
+                self._channel.play(current.sound)
+                ends_at = time.monotonic() + current.length
+                continue
+
+            generation = current.generation
+            flushed = not self._sleep_until(ends_at - QUEUE_LEAD, generation)
+            following = None if flushed else self._next(block=False)
+            if following is not None:
+                # The channel starts it the moment the current sound ends
+                self._channel.queue(following.sound)
+                self.stats['gapless'] += 1
+            if not flushed:
+                flushed = not self._sleep_until(ends_at, generation)
+
+            current.finish(not flushed)
+            if flushed:
+                self._channel.stop()
+                self.stats['flushed'] += 1
+                if following is not None:
+                    following.finish(False)
+                current = None
+                continue
+            self.stats['played'] += 1
+            if following is not None:
+                current, ends_at = following, ends_at + following.length
+            else:
+                current = None
+
+    def get_stats(self):
+        return {'queued': self._queue.qsize(), **self.stats}
+
+
+# Global instance
+_playback_engine = None
+_playback_engine_lock = threading.Lock()
+
+
+def get_playback_engine():
+    """Get or create the process-wide playback engine"""
+    global _playback_engine
+    if _playback_engine is None:
+        with _playback_engine_lock:
+            if _playback_engine is None:
+                _playback_engine = PlaybackEngine()
+    return _playback_engine
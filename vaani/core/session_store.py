@@ -0,0 +1,243 @@
+"""
+Session Store for Vaani
+Web session state with TTL expiry: a bounded in-memory backend for one process
+and a SQLite (WAL) backend shared by every worker on the machine.
+
+Usage:
+    from vaani.core.session_store import get_session_store
+
+    store = get_session_store()
+    session = store.get(session_id)       # a fresh session if missing or expired
+    session['waiting_for_news'] = True
+    store.save(session_id, session)       # persist and extend the TTL
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+import logging
+from collections import OrderedDict
+
+from vaani.core import config as Config
+from vaani.core.sqlite_util import connect_local
+
+logger = logging.getLogger('session_store')
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SESSION_DB_PATH = os.path.join(_PROJECT_ROOT, 'cache', 'sessions.db')
+
+
+def new_session():
+    """The state kept for a web session that has not been seen yet"""
+    return {
+        'articles': [],
+        'waiting_for_news': False,
+        'language': 'hi',
+        'context': None
+    }
+
+
+def dumps(session):
+    """Compact bytes for a session: minified JSON, zlib-compressed when large"""
+    data = json.dumps(session, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(data) >= Config.SESSION_COMPRESS_MIN_BYTES:
+        return b'z' + zlib.compress(data)
+    return b'j' + data
+
+
+def loads(blob):
+    blob = bytes(blob)
+    data = zlib.decompress(blob[1:]) if blob[:1] == b'z' else blob[1:]
+    return json.loads(data.decode('utf-8'))
+
+
+class SessionStore:
+    """
+    Common interface; sessions are plain dicts.
+
+    get() always returns a session (a new one for an unknown or expired id);
+    changes are kept only once save() is called.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or Config.SESSION_TTL
+        self._stats_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'saves': 0, 'expired': 0, 'evicted': 0}
+
+    def _count(self, stat, n=1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def get(self, session_id):
+        raise NotImplementedError
+
+    def save(self, session_id, session):
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """Drop every expired session; returns the number removed"""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def get_stats(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        return {
+            'backend': self.backend,
+            'sessions': len(self),
+            'ttl': self.ttl,
+            'hit_rate': f"{(stats['hits'] / lookups * 100) if lookups else 0:.1f}%",
+            **stats
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sessions for one process, in LRU order.
+    Expired sessions are dropped when touched or by purge_expired(); beyond
+    max_sessions the least recently used one is evicted.
+    """
+
+    backend = 'memory'
+
+    def __init__(self, ttl=None, max_sessions=None):
+        super().__init__(ttl)
+        self.max_sessions = max_sessions or Config.SESSION_MAX_SESSIONS
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()     # id -> (expires_at, serialized session)
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[0] <= now:
+                del self._sessions[session_id]
+                self._count('expired')
+                entry = None
+            if entry is not None:
+                self._sessions.move_to_end(session_id)
+        if entry is None:
+            self._count('misses')
+            return new_session()
+        self._count('hits')
+        # Each request works on its own copy, as with the shared backend
+        return loads(entry[1])
+
+    def save(self, session_id, session):
+        blob = dumps(session)
+        with self._lock:
+            self._sessions[session_id] = (time.time() + self.ttl, blob)
+            self._sessions.move_to_end(session_id)
+            evicted = 0
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                evicted += 1
+        self._count('saves')
+        if evicted:
+            self._count('evicted', evicted)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (expires_at, _) in self._sessions.items() if expires_at <= now]
+            for sid in expired:
+                del self._sessions[sid]
+        if expired:
+            self._count('expired', len(expired))
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in one SQLite file in WAL mode, so every worker process reads
+    and writes the same sessions without blocking readers.
+    Each thread has its own connection; expired rows are purged every
+    ttl/10 seconds by whichever process saves next.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path=SESSION_DB_PATH, ttl=None):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        self._next_purge = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                   "id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL)")
+        db.execute("CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (expires_at)")
+
+    def _db(self):
+        return connect_local(self._local, self.path, timeout=5)
+
+    def get(self, session_id):
+        row = self._db().execute("SELECT data, expires_at FROM sessions WHERE id = ?",
+                                 (session_id,)).fetchone()
+        if row is not None and row[1] <= time.time():
+            self._db().execute("DELETE FROM sessions WHERE id = ? AND expires_at <= ?",
+                               (session_id, time.time()))
+            self._count('expired')
+            row = None
+        if row is None:
+            self._count('misses')
+            return new_session()
+        self._count('hits')
+        return loads(row[0])
+
+    def save(self, session_id, session):
+        now = time.time()
+        self._db().execute("INSERT OR REPLACE INTO sessions (id, data, expires_at) VALUES (?, ?, ?)",
+                           (session_id, dumps(session), now + self.ttl))
+        self._count('saves')
+        if now >= self._next_purge:
+            self._next_purge = now + self.ttl / 10
+            self.purge_expired()
+
+    def delete(self, session_id):
+        self._db().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def purge_expired(self):
+        removed = self._db().execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+        if removed:
+            self._count('expired', removed)
+        return removed
+
+    def __len__(self):
+        return self._db().execute("SELECT COUNT(*) FROM sessions WHERE expires_at > ?",
+                                  (time.time(),)).fetchone()[0]
+
+
+# Global instance
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Get or create the session store selected by SESSION_BACKEND (env) or Config.SESSION_BACKEND"""
+    global _session_store
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                backend = os.getenv('SESSION_BACKEND', Config.SESSION_BACKEND)
+                if backend == 'sqlite':
+                    _session_store = SQLiteSessionStore()
+                else:
+                    _session_store = MemorySessionStore()
+                logger.info("Session store: %s", _session_store.backend)
+    return _session_store
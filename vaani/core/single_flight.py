@@ -0,0 +1,143 @@
+"""
+Request Coalescing (single-flight) for Vaani
+Concurrent identical upstream calls wait on one in-flight request and share its result.
+
+Usage:
+    from vaani.core.single_flight import single_flight, make_key
+
+    key = make_key('weather', city)
+    data = single_flight.do(key, _fetch_current_weather, city)
+
+    # From a coroutine: concurrent awaits for the key share one task
+    data = await single_flight.do_async(key, _fetch_current_weather_async, city)
+"""
+
+import asyncio
+import threading
+import logging
+
+logger = logging.getLogger('single_flight')
+
+
+def make_key(namespace, *parts):
+    """Build a normalized key: whitespace collapsed and case-folded"""
+    return (namespace,) + tuple(' '.join(str(part).split()).casefold() for part in parts)
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution.
+
+    The first caller (the leader) runs the function; callers arriving while it
+    is in flight block until it finishes and receive the same result, or the
+    same exception. Once the call completes the key is forgotten, so the next
+    miss triggers a fresh upstream request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.stats = {'calls': 0, 'executions': 0, 'collapsed': 0}
+        self._namespace_stats = {}
+
+    def _count(self, key, field):
+        self.stats[field] += 1
+        namespace = key[0] if isinstance(key, tuple) and key else 'default'
+        ns_stats = self._namespace_stats.setdefault(
+            namespace, {'calls': 0, 'executions': 0, 'collapsed': 0}
+        )
+        ns_stats[field] += 1
+
+    def do(self, key, func, *args, **kwargs):
+        """Run func(*args, **kwargs) once per key among concurrent callers"""
+        with self._lock:
+            self._count(key, 'calls')
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._count(key, 'collapsed')
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._count(key, 'executions')
+                is_leader = True
+
+        if not is_leader:
+            logger.debug("Joined in-flight call for %s", key)
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+            if call.waiters:
+                logger.info("Shared one upstream call for %s with %d waiters", key, call.waiters)
+
+    async def do_async(self, key, coro_func, *args, **kwargs):
+        """
+        Await coro_func(*args, **kwargs) once per key among concurrent awaiters.
+        The call runs as its own task, so one awaiter being cancelled (a client
+        disconnecting) does not cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._count(key, 'calls')
+            task = self._tasks.get((loop, key))
+            if task is not None:
+                self._count(key, 'collapsed')
+            else:
+                self._count(key, 'executions')
+                task = loop.create_task(coro_func(*args, **kwargs))
+                self._tasks[(loop, key)] = task
+
+                def forget(done, loop_key=(loop, key)):
+                    with self._lock:
+                        self._tasks.pop(loop_key, None)
+                    if not done.cancelled():
+                        done.exception()    # retrieved, even if every awaiter left
+                task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        """Number of calls currently running"""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def get_stats(self):
+        """Counters overall and per namespace"""
+        with self._lock:
+            calls = self.stats['calls']
+            collapse_rate = (self.stats['collapsed'] / calls * 100) if calls else 0
+            return {
+                'calls': calls,
+                'executions': self.stats['executions'],
+                'collapsed': self.stats['collapsed'],
+                'collapse_rate': f"{collapse_rate:.1f}%",
+                'in_flight': len(self._calls) + len(self._tasks),
+                'namespaces': {ns: dict(values) for ns, values in self._namespace_stats.items()}
+            }
+
+
+# Global instance shared by all upstream services
+single_flight = SingleFlight()
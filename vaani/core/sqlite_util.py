@@ -0,0 +1,32 @@
+"""
+SQLite helpers for Vaani
+The stores (answer cache, sessions, offline answers, expense ledger, price
+history) share one SQLite file between threads and gunicorn workers. Each
+keeps a threading.local and asks connect_local for its connection.
+
+Usage:
+    from vaani.core.sqlite_util import connect_local
+
+    self._local = threading.local()
+    db = connect_local(self._local, self.path)
+"""
+
+import os
+import sqlite3
+
+
+def connect_local(local, path, timeout=10, foreign_keys=False):
+    """
+    The calling thread's connection to path, kept on local (a threading.local).
+    Connections are per thread and must not cross a fork, so a child process
+    opens its own. New connections are in autocommit mode with WAL journaling.
+    """
+    db = getattr(local, 'db', None)
+    if db is None or local.pid != os.getpid():
+        db = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        if foreign_keys:
+            db.execute("PRAGMA foreign_keys=ON")
+        local.db, local.pid = db, os.getpid()
+    return db
@@ -0,0 +1,299 @@
+"""
+Text-to-Speech Engines for Vaani
+gTTS plus local CPU-only engines (espeak-ng, piper), picked per request by connectivity and latency.
+
+Usage:
+    from vaani.core.tts_engines import get_tts_selector
+
+    audio_bytes, engine = get_tts_selector().synthesize("नमस्ते", 'hi')
+    # engine.extension is 'mp3' or 'wav'
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import logging
+from io import BytesIO
+
+from vaani.core import config as Config
+from vaani.core.connectivity import get_connectivity_monitor
+
+logger = logging.getLogger('tts_engines')
+
+
+class TTSEngine:
+    """One way of turning text into audio bytes"""
+
+    name = ''
+    extension = 'mp3'
+    requires_network = False
+    concatenable = False    # output chunks can be joined byte-wise (MP3 frames)
+
+    def available(self):
+        return True
+
+    def supports(self, lang):
+        return True
+
+    def synthesize(self, text, lang='hi'):
+        """Audio bytes for text, raising on failure"""
+        raise NotImplementedError
+
+    def silence(self, seconds):
+        """Silent audio that can be joined to this engine's output, or None"""
+        return None
+
+
+# gTTS speaks MPEG-2 Layer III, 24 kHz, 32 kbit/s mono. A frame of that format
+# with zeroed side info decodes to 576 samples (24 ms) of silence.
+_SILENT_MP3_FRAME = bytes([0xFF, 0xF3, 0x44, 0xC0]) + bytes(92)
+_MP3_FRAME_SECONDS = 576 / 24000
+
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS: natural voices, one network round trip per request"""
+
+    name = 'gtts'
+    extension = 'mp3'
+    requires_network = True
+    concatenable = True
+
+    def synthesize(self, text, lang='hi'):
+        from gtts import gTTS
+
+        mp3_fp = BytesIO()
+        gTTS(text=text, lang=lang, slow=False).write_to_fp(mp3_fp)
+        return mp3_fp.getvalue()
+
+    def silence(self, seconds):
+        return _SILENT_MP3_FRAME * max(1, round(seconds / _MP3_FRAME_SECONDS))
+
+
+class EspeakEngine(TTSEngine):
+    """espeak-ng formant synthesizer: robotic but instant and fully offline"""
+
+    name = 'espeak'
+    extension = 'wav'
+    VOICES = {
+        'hi': 'hi', 'en': 'en-us', 'mr': 'mr', 'ta': 'ta', 'te': 'te',
+        'gu': 'gu', 'bn': 'bn', 'pa': 'pa', 'kn': 'kn',
+    }
+
+    def __init__(self, binary=None, speed=None):
+        self.binary = binary or shutil.which('espeak-ng') or shutil.which('espeak')
+        self.speed = speed or Config.ESPEAK_SPEED
+
+    def available(self):
+        return bool(self.binary)
+
+    def supports(self, lang):
+        return lang in self.VOICES
+
+    def synthesize(self, text, lang='hi'):
+        result = subprocess.run(
+            [self.binary, '-v', self.VOICES[lang], '-s', str(self.speed), '--stdout', '--stdin'],
+            input=text.encode('utf-8'), capture_output=True, timeout=30, check=True
+        )
+        return result.stdout
+
+
+class PiperEngine(TTSEngine):
+    """Piper neural TTS: near-natural voices on CPU, one model file per language"""
+
+    name = 'piper'
+    extension = 'wav'
+
+    def __init__(self, binary=None, models=None):
+        self.binary = binary or shutil.which('piper')
+        self.models = Config.PIPER_MODELS if models is None else models
+
+    def available(self):
+        return bool(self.binary) and bool(self.models)
+
+    def supports(self, lang):
+        model = self.models.get(lang)
+        return bool(model) and os.path.exists(model)
+
+    def synthesize(self, text, lang='hi'):
+        fd, wav_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        try:
+            subprocess.run(
+                [self.binary, '--model', self.models[lang], '--output_file', wav_path],
+                input=text.encode('utf-8'), capture_output=True, timeout=60, check=True
+            )
+            with open(wav_path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(wav_path)
+
+
+ENGINE_CLASSES = {cls.name: cls for cls in (GTTSEngine, PiperEngine, EspeakEngine)}
+
+
+class _EngineHealth:
+    __slots__ = ('requests', 'failures', 'avg_ms', 'last_used', 'down_until')
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.avg_ms = None      # moving average of request latency
+        self.last_used = 0.0
+        self.down_until = 0.0
+
+
+class TTSEngineSelector:
+    """
+    Chooses an engine per request and falls back on failure.
+
+    Engines are tried in preference order, skipping any that
+    - are not installed or have no voice for the language,
+    - need the network while the device is offline,
+    - failed recently (cooldown), or
+    - need the network and have been averaging over the latency budget.
+    A slow engine is probed again once the cooldown has passed, so it
+    comes back when the connection improves.
+    """
+
+    def __init__(self, engines=None, online_check=None, latency_budget_ms=None,
+                 online_check_interval=None, cooldown=None):
+        if engines is None:
+            engines = [ENGINE_CLASSES[name]() for name in Config.TTS_ENGINE_ORDER if name in ENGINE_CLASSES]
+        self.engines = engines
+        # Without a custom check, read the connectivity monitor (already cached, never blocks)
+        self.online_check = online_check or get_connectivity_monitor().is_online
+        if online_check is None and online_check_interval is None:
+            online_check_interval = 0
+        self.latency_budget_ms = latency_budget_ms or Config.TTS_LATENCY_BUDGET_MS
+        self.online_check_interval = Config.TTS_ONLINE_CHECK_INTERVAL if online_check_interval is None else online_check_interval
+        self.cooldown = Config.TTS_ENGINE_COOLDOWN if cooldown is None else cooldown
+        self._lock = threading.Lock()
+        self._health = {engine.name: _EngineHealth() for engine in engines}
+        self._online = None
+        self._online_checked = 0.0
+
+    def is_online(self):
+        """Connectivity, re-checked at most every online_check_interval seconds"""
+        now = time.monotonic()
+        if self._online is None or now - self._online_checked >= self.online_check_interval:
+            self._online = self.online_check()
+            self._online_checked = now
+        return self._online
+
+    def _over_budget(self, health, now):
+        return (health.avg_ms is not None and health.avg_ms > self.latency_budget_ms
+                and now - health.last_used < self.cooldown)
+
+    def candidates(self, lang='hi'):
+        """Engines to try for this language, best first"""
+        usable = [e for e in self.engines if e.available() and e.supports(lang)]
+        if any(e.requires_network for e in usable) and not self.is_online():
+            offline = [e for e in usable if not e.requires_network]
+            usable = offline or usable     # nothing local installed: still try the network
+
+        now = time.monotonic()
+        with self._lock:
+            healthy = [e for e in usable if self._health[e.name].down_until <= now]
+            preferred = [e for e in healthy
+                         if not (e.requires_network and self._over_budget(self._health[e.name], now))]
+        fallback = [e for e in healthy if e not in preferred] + [e for e in usable if e not in healthy]
+        return preferred + fallback
+
+    def choose(self, lang='hi'):
+        """The engine the next request for this language should use, or None"""
+        engines = self.candidates(lang)
+        return engines[0] if engines else None
+
+    def run(self, engine, text, lang='hi'):
+        """Synthesize with one engine, recording its latency and failures"""
+        start = time.perf_counter()
+        try:
+            audio_bytes = engine.synthesize(text, lang)
+            if not audio_bytes:
+                raise ValueError(f"{engine.name} returned no audio")
+        except Exception:
+            self._record(engine, (time.perf_counter() - start) * 1000, failed=True)
+            raise
+        self._record(engine, (time.perf_counter() - start) * 1000, failed=False)
+        return audio_bytes
+
+    def synthesize(self, text, lang='hi'):
+        """
+        Synthesize with the best engine, falling back to the next on failure.
+
+        Returns:
+            Tuple of (audio bytes, engine that produced them)
+        """
+        last_error = None
+        for engine in self.candidates(lang):
+            try:
+                return self.run(engine, text, lang), engine
+            except Exception as e:
+                logger.warning("TTS engine %s failed: %s", engine.name, e)
+                last_error = e
+        raise last_error or RuntimeError(f"No TTS engine available for '{lang}'")
+
+    def _record(self, engine, elapsed_ms, failed):
+        with self._lock:
+            health = self._health.setdefault(engine.name, _EngineHealth())
+            health.requests += 1
+            health.last_used = time.monotonic()
+            if failed:
+                health.failures += 1
+                health.down_until = health.last_used + self.cooldown
+                if engine.requires_network:
+                    self._online = None     # re-check connectivity on the next request
+            else:
+                health.avg_ms = elapsed_ms if health.avg_ms is None else 0.7 * health.avg_ms + 0.3 * elapsed_ms
+        # Network engines double as a passive connectivity signal
+        if engine.requires_network:
+            monitor = get_connectivity_monitor()
+            if failed:
+                monitor.record_failure(f"tts:{engine.name}")
+            else:
+                monitor.record_success(f"tts:{engine.name}")
+
+    def get_stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'online': self._online,
+                'latency_budget_ms': self.latency_budget_ms,
+                'engines': {
+                    engine.name: {
+                        'available': engine.available(),
+                        'requests': self._health[engine.name].requests,
+                        'failures': self._health[engine.name].failures,
+                        'avg_ms': round(self._health[engine.name].avg_ms or 0, 1),
+                        'cooling_down': self._health[engine.name].down_until > now,
+                    }
+                    for engine in self.engines
+                }
+            }
+
+
+# Global instance
+_tts_selector = None
+_tts_selector_lock = threading.Lock()
+
+
+def get_tts_selector():
+    """Get or create the global engine selector"""
+    global _tts_selector
+    if _tts_selector is None:
+        with _tts_selector_lock:
+            if _tts_selector is None:
+                _tts_selector = TTSEngineSelector()
+    return _tts_selector
+
+
+if __name__ == "__main__":
+    selector = get_tts_selector()
+    print(f"Online: {selector.is_online()}")
+    for engine in selector.engines:
+        print(f"{engine.name}: available={engine.available()} hindi={engine.supports('hi')}")
+    chosen = selector.choose('hi')
+    print(f"Selected for Hindi: {chosen.name if chosen else 'none'}")
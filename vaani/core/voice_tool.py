@@ -1,14 +1,21 @@
 import os
+import asyncio
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "1"
 import speech_recognition as sr
-import time
 import sys
-from gtts import gTTS
-from pygame import mixer
 import re
 from io import BytesIO
 import warnings
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+from vaani.core import http
+from vaani.core.audio_cache import get_audio_cache
+from vaani.core.phrase_bundle import get_phrase_bundle
+from vaani.core.tts_engines import get_tts_selector
+from vaani.core import audio_effects
+from vaani.core.playback import get_playback_engine
 
 # Try to from vaani.core import config as Config for FFmpeg path
 try:
@@ -99,15 +106,235 @@ def apply_voice_effects(audio_segment, voice_style='news_anchor'):
     
     return audio_segment
 
-def bolo_stream(text, lang='hi', voice_style='news_anchor'):
+# Parallel TTS: upcoming sentences are synthesized while the current one plays.
+# Every web request thread submits its chunks to the same pool, so it is sized
+# with the request threads rather than for a single speaker.
+TTS_WORKERS = Config.TTS_WORKERS or 2 * Config.WORKER_THREADS
+TTS_LOOKAHEAD = 4       # sentences SpeechPipeline synthesizes ahead of the one playing
+TTS_CHUNK_CHARS = 300   # text_to_speech_file groups sentences into chunks of about this size
+
+_tts_executor = ThreadPoolExecutor(max_workers=TTS_WORKERS, thread_name_prefix='tts')
+
+
+def split_sentences(text):
+    """Split text into sentences on . ? ! and ।"""
+    sentences = re.split(r'(?<=[.?!।])\s+', text.strip())
+    sentences = [s.strip() for s in sentences if s.strip()]
+    return sentences or ([text.strip()] if text.strip() else [])
+
+
+# Services pass pause hints (bolo_func(text, pause=0.3)) instead of sleeping.
+# The CLI queues them as silence; the web path carries them in the response
+# text as SSML-style break tags that text_to_speech_file renders as silence.
+_BREAK_TAG = re.compile(r'\s*<break time="(\d+)ms"\s*/>\s*')
+
+
+def break_tag(pause):
+    """Break tag for a pause hint in seconds ('' when there is no pause)"""
+    return f' <break time="{round(pause * 1000)}ms"/>' if pause and pause > 0 else ''
+
+
+def split_breaks(text):
+    """Split text on break tags into (segment, pause in seconds after it) pairs"""
+    parts = _BREAK_TAG.split(text)
+    segments = []
+    # re.split alternates text and the captured milliseconds
+    for i in range(0, len(parts), 2):
+        segment = parts[i].strip()
+        pause = int(parts[i + 1]) / 1000 if i + 1 < len(parts) else 0.0
+        if segment:
+            segments.append((segment, pause))
+        elif segments:
+            segments[-1] = (segments[-1][0], segments[-1][1] + pause)
+    return segments
+
+
+def strip_breaks(text):
+    """Text with its break tags removed"""
+    return ' '.join(segment for segment, _ in split_breaks(text))
+
+
+def synthesize_sentence(sentence, lang='hi', voice_style='news_anchor'):
+    """
+    Generate speech for one sentence, with voice effects when available.
+
+    Returns:
+    - (BytesIO with MP3 or WAV data, pause in seconds to leave after playing it)
+    """
+    audio_bytes, audio_format = synthesize_audio(sentence, lang)
+    mp3_fp = BytesIO(audio_bytes)
+
+    # Preferred: NumPy effect chain on decoded PCM, no FFmpeg round trips
+    if audio_effects.has_chain(voice_style):
+        try:
+            return BytesIO(audio_effects.process(audio_bytes, audio_format, voice_style)), 0.15
+        except Exception as e:
+            print(f"In-memory voice effects failed, trying pydub: {e}")
+
+    # Check if voice enhancement is available and requested
+    if voice_style == 'news_anchor' and PYDUB_AVAILABLE and FFMPEG_AVAILABLE:
+        try:
+            # Apply voice effects for news anchor style
+            audio = AudioSegment.from_file(mp3_fp, format=audio_format)
+            modified_audio = apply_voice_effects(audio, voice_style='news_anchor')
+
+            output = BytesIO()
+            modified_audio.export(output, format='mp3')
+            output.seek(0)
+            return output, 0.15
+        except Exception as e:
+            # If voice effects fail, fall back to original
+            print(f"Voice enhancement failed, using original voice: {e}")
+            mp3_fp.seek(0)
+
+    return mp3_fp, 0.2
+
+
+def play_audio(mp3_fp, pause=0.2, stop_event=None):
+    """Play MP3 or WAV data through the playback engine and block until it finishes"""
+    if stop_event is not None and stop_event.is_set():
+        return
+    get_playback_engine().play(mp3_fp, pause)
+
+
+class _Utterance:
+    """One call to speak(): its sentences and its cancellation flag"""
+
+    def __init__(self):
+        self.stop_event = threading.Event()
+        self.futures = []
+
+
+class SpeechPipeline:
+    """
+    Producer/consumer speech pipeline.
+
+    A bounded thread pool synthesizes (and post-processes) up to `lookahead`
+    upcoming sentences while the current one plays. Sentences are always
+    played in order. cancel() - or a new speak() from another thread - stops
+    playback and drops sentences not yet played, which is how a user barging
+    in interrupts a long answer.
+
+    By default sentences go to the shared playback engine, one sentence ahead
+    of the one playing, so they follow each other without dead air. A custom
+    `play(audio, pause, stop_event)` callable is called blocking instead.
+    """
+
+    def __init__(self, executor=None, synthesize=synthesize_sentence, play=None, lookahead=TTS_LOOKAHEAD,
+                 playback=None):
+        self.executor = executor or _tts_executor
+        self.synthesize = synthesize
+        self.play = play
+        self.playback = playback if playback is not None or play is not None else get_playback_engine()
+        self.lookahead = max(1, lookahead)
+        self._lock = threading.Lock()
+        self._current = None
+
+    def cancel(self):
+        """Stop the utterance that is currently being spoken"""
+        with self._lock:
+            utterance = self._current
+        if utterance is not None:
+            utterance.stop_event.set()
+            for future in utterance.futures:
+                future.cancel()
+            if self.playback is not None:
+                self.playback.flush()
+
+    @property
+    def speaking(self):
+        return self._current is not None
+
+    def speak(self, text, lang='hi', voice_style='news_anchor', pause=0.0):
+        """
+        Speak text sentence by sentence; returns once done or cancelled.
+        `pause` is extra silence after the last sentence, queued on the playback
+        engine so the next utterance waits behind it without anyone sleeping.
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return
+
+        self.cancel()
+        utterance = _Utterance()
+        with self._lock:
+            self._current = utterance
+
+        previous = None     # queued on the playback engine, not yet finished
+        try:
+            next_index = 0
+            for index in range(len(sentences)):
+                # Keep the pool busy with the next few sentences
+                while next_index < len(sentences) and next_index < index + self.lookahead:
+                    utterance.futures.append(
+                        self.executor.submit(self.synthesize, sentences[next_index], lang, voice_style)
+                    )
+                    next_index += 1
+
+                if utterance.stop_event.is_set():
+                    break
+                try:
+                    mp3_fp, gap = utterance.futures[index].result()
+                except CancelledError:
+                    break
+                except Exception as e:
+                    print(f"Error in bolo_stream function: {e}")
+                    continue
+
+                if utterance.stop_event.is_set():
+                    break
+                if index == len(sentences) - 1:
+                    gap += pause
+                try:
+                    if self.playback is None:
+                        self.play(mp3_fp, gap, utterance.stop_event)
+                        continue
+                    item = self.playback.enqueue(mp3_fp, gap)
+                    # Wait for the sentence before this one; this one is already queued behind it
+                    if previous is not None:
+                        previous.wait()
+                    previous = item
+                except Exception as e:
+                    print(f"Error in bolo_stream function: {e}")
+
+            if previous is not None:
+                previous.wait()
+        finally:
+            for future in utterance.futures:
+                future.cancel()
+            with self._lock:
+                if self._current is utterance:
+                    self._current = None
+
+
+# Global pipeline instance
+_speech_pipeline = None
+
+
+def get_speech_pipeline():
+    """Get or create the global speech pipeline"""
+    global _speech_pipeline
+    if _speech_pipeline is None:
+        _speech_pipeline = SpeechPipeline()
+    return _speech_pipeline
+
+
+def stop_speaking():
+    """Interrupt whatever Vaani is currently saying (barge-in)"""
+    get_speech_pipeline().cancel()
+
+
+def bolo_stream(text, lang='hi', voice_style='news_anchor', pause=0.0):
     """
     ENHANCED FUNCTION: Processes and plays audio with professional news anchor voice.
     Falls back to original voice if FFmpeg is not available.
+    Sentences are synthesized in parallel and played in order.
     
     Parameters:
     - text: Text to speak
     - lang: Language code (default 'hi' for Hindi)
     - voice_style: 'news_anchor' for Palki Sharma style, 'default' for original gTTS
+    - pause: Extra silence in seconds after the text (a pacing hint from the service)
     """
     # Clean and validate input text
     if not text or not text.strip():
@@ -118,68 +345,7 @@ def bolo_stream(text, lang='hi', voice_style='news_anchor'):
     
     # Print the full text to terminal before speaking
     print(f"\n🔊 Vaani: {text}\n")
-    sentences = re.split(r'(?<=[.?!।])\s+', text)
-    sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 0]
-    
-    # If no sentences found, treat whole text as one sentence
-    if not sentences:
-        sentences = [text]
-
-    for sentence in sentences:
-        if not sentence or len(sentence) < 1:
-            continue
-        try:
-            # Generate speech with gTTS
-            tts = gTTS(text=sentence, lang=lang, slow=False)
-            mp3_fp = BytesIO()
-            tts.write_to_fp(mp3_fp)
-            mp3_fp.seek(0)
-            
-            # Check if voice enhancement is available and requested
-            if voice_style == 'news_anchor' and PYDUB_AVAILABLE and FFMPEG_AVAILABLE:
-                try:
-                    # Apply voice effects for news anchor style
-                    audio = AudioSegment.from_mp3(mp3_fp)
-                    modified_audio = apply_voice_effects(audio, voice_style='news_anchor')
-                    
-                    # Export to BytesIO for playback
-                    output = BytesIO()
-                    modified_audio.export(output, format='mp3')
-                    output.seek(0)
-                    
-                    # Play modified audio
-                    mixer.init()
-                    mixer.music.load(output)
-                    mixer.music.play()
-                    while mixer.music.get_busy():
-                        time.sleep(0.1)
-                    time.sleep(0.15)
-                    mixer.quit()
-                except Exception as e:
-                    # If voice effects fail, fall back to original
-                    print(f"Voice enhancement failed, using original voice: {e}")
-                    mp3_fp.seek(0)  # Reset to beginning
-                    mixer.init()
-                    mixer.music.load(mp3_fp)
-                    mixer.music.play()
-                    while mixer.music.get_busy():
-                        time.sleep(0.1)
-                    time.sleep(0.2)
-                    mixer.quit()
-            else:
-                # Original streaming without effects (fallback)
-                mixer.init()
-                mixer.music.load(mp3_fp)
-                mixer.music.play()
-                while mixer.music.get_busy():
-                    time.sleep(0.1)
-                time.sleep(0.2)
-                mixer.quit()
-
-        except Exception as e:
-            print(f"Error in bolo_stream function: {e}")
-            if mixer.get_init():
-                mixer.quit()
+    get_speech_pipeline().speak(text, lang=lang, voice_style=voice_style, pause=pause)
 
 def listen_command(lang_code='hi-IN', prompt_text="कृपया बोलिए :"):
     """
@@ -218,14 +384,44 @@ def listen_command(lang_code='hi-IN', prompt_text="कृपया बोलि
         bolo_stream("Google Speech Recognition सेवा से कनेक्ट नहीं हो सका।")
         return ""
 
-def text_to_speech_file(text, lang='hi', output_dir='cache'):
+def group_sentences(text, max_chars=TTS_CHUNK_CHARS):
+    """Group consecutive sentences into chunks of at most max_chars (a longer sentence is its own chunk)"""
+    chunks = []
+    current = ""
+    for sentence in split_sentences(text):
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def synthesize_audio(text, lang='hi'):
+    """
+    Raw audio for one piece of text, from the phrase bundle or the selected TTS engine.
+
+    Returns:
+    - (audio bytes, format: 'mp3' or 'wav')
+    """
+    bundled = get_phrase_bundle().read(text, lang)
+    if bundled:
+        return bundled, 'mp3'
+    audio_bytes, engine = get_tts_selector().synthesize(text, lang)
+    return audio_bytes, engine.extension
+
+
+def text_to_speech_file(text, lang='hi', output_dir=None, voice_style='default'):
     """
     Generate audio file from text and save it to disk
     
     Parameters:
-    - text: Text to convert to speech
+    - text: Text to convert to speech; break tags (see break_tag) become silence
     - lang: Language code (default 'hi' for Hindi)
-    - output_dir: Directory to save the audio file
+    - output_dir: Audio cache directory (default: <project>/cache)
+    - voice_style: Part of the cache key; files are stored unprocessed
     
     Returns:
     - Path to the generated audio file, or None if failed
@@ -234,54 +430,93 @@ def text_to_speech_file(text, lang='hi', output_dir='cache'):
         print("[Audio] Empty text, skipping audio generation")
         return None
     
-    # Warn if text is very long
-    if len(text) > 2000:
-        print(f"[Audio Warning] Text is very long ({len(text)} chars), audio generation may fail or take time")
-    
-    try:
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate unique filename based on text content
-        import hashlib
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:12]
-        filename = f"audio_{text_hash}.mp3"
-        filepath = os.path.join(output_dir, filename)
-        
-        # Check if file already exists (cache)
-        if os.path.exists(filepath):
-            print(f"[Audio] Using cached file: {filename}")
-            return filepath
-        
+    text = text.strip()
+
+    # Fixed responses are pre-rendered; serve them without touching any engine
+    bundled = get_phrase_bundle().get(text, lang)
+    if bundled:
+        print(f"[Audio] Using bundled phrase: {os.path.basename(bundled)}")
+        return bundled
+
+    audio_cache = get_audio_cache(output_dir)
+    selector = get_tts_selector()
+
+    def render(filepath, engine):
+        filename = os.path.basename(filepath)
         print(f"[Audio] Generating new audio file: {filename}")
         print(f"[Audio] Text length: {len(text)} chars")
-        print(f"[Audio] Language: {lang}")
+        print(f"[Audio] Language: {lang}, engine: {engine.name}")
         
-        # Generate speech with gTTS (requires internet)
         try:
-            tts = gTTS(text=text, lang=lang, slow=False)
-            tts.save(filepath)
-            
-            # Verify file was created
-            if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
-                print(f"[Audio] Successfully generated: {filename} ({os.path.getsize(filepath)} bytes)")
-                return filepath
+            if engine.concatenable:
+                # Long text: synthesize sentence chunks in parallel, then join them in order.
+                # gTTS output is plain MP3 frames, so the chunks and the silence
+                # for break tags concatenate cleanly.
+                parts = []
+                for segment, pause in split_breaks(text):
+                    parts.extend(_tts_executor.submit(selector.run, engine, chunk, lang)
+                                 for chunk in group_sentences(segment))
+                    silence = engine.silence(pause) if pause else None
+                    if silence:
+                        parts.append(silence)
+                chunk_count = sum(1 for part in parts if not isinstance(part, bytes))
+                if chunk_count > 1:
+                    print(f"[Audio] Synthesizing {chunk_count} chunks in parallel")
             else:
-                print(f"[Audio Error] File created but is empty or missing")
-                return None
+                # WAV output can't be joined byte-wise: one call, pauses left to punctuation
+                parts = [_tts_executor.submit(selector.run, engine, strip_breaks(text), lang)]
+            audio_bytes = b''.join(part if isinstance(part, bytes) else part.result() for part in parts)
+            
+            # Verify audio was produced
+            if not audio_bytes:
+                print(f"[Audio Error] {engine.name} returned no audio")
+                return False
+            
+            # Write atomically so a half-written file is never served
+            tmp_path = filepath + '.part'
+            with open(tmp_path, 'wb') as f:
+                f.write(audio_bytes)
+            os.replace(tmp_path, filepath)
+            print(f"[Audio] Successfully generated: {filename} ({len(audio_bytes)} bytes)")
+            return True
                 
-        except Exception as gtts_error:
-            print(f"[Audio Error] gTTS failed: {gtts_error}")
+        except Exception as tts_error:
+            print(f"[Audio Error] {engine.name} failed: {tts_error}")
             # Check if it's a network issue
-            if "Connection" in str(gtts_error) or "Network" in str(gtts_error):
+            if "Connection" in str(tts_error) or "Network" in str(tts_error):
                 print("[Audio Error] Network issue detected. Please check your internet connection.")
-            return None
-        
+            return False
+    
+    try:
+        # Best engine first; if it fails the next one (e.g. offline espeak) gets a turn
+        for engine in selector.candidates(lang):
+            path = audio_cache.get_or_create(
+                text, lang, voice_style, engine.name,
+                lambda filepath, engine=engine: render(filepath, engine),
+                ext=engine.extension
+            )
+            if path:
+                return path
+        return None
     except Exception as e:
         print(f"[Audio Error] Failed to generate audio: {e}")
         import traceback
         traceback.print_exc()
         return None
 
+
+async def text_to_speech_file_async(text, lang='hi', output_dir=None, voice_style='default'):
+    """
+    text_to_speech_file for async callers (ASGI server).
+    gTTS and the local engines are blocking libraries, so synthesis runs on a
+    worker thread; the 'tts' upstream limit caps how many run at once.
+    Bundled phrases are returned without leaving the event loop.
+    """
+    bundled = get_phrase_bundle().get(text.strip(), lang) if text and text.strip() else None
+    if bundled:
+        return bundled
+    async with http.upstream_slots('tts'):
+        return await asyncio.to_thread(text_to_speech_file, text, lang, output_dir, voice_style)
+
 # Create alias for backward compatibility
 bolo = bolo_stream
\ No newline at end of file
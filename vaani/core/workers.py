@@ -0,0 +1,185 @@
+"""
+Multi-worker Support for Vaani
+Preloads read-only data in the master process before workers fork, and tracks per-worker health.
+
+Used by gunicorn.conf.py:
+    preload()               # master, before fork: indexes, scheme data, phrase audio
+    start_worker()          # each worker, after fork: heartbeat thread
+    forget_worker(pid)      # master, when a worker exits
+    worker_health()         # this worker
+    all_workers()           # every worker of this server, from their heartbeats
+"""
+
+import gc
+import json
+import os
+import tempfile
+import threading
+import time
+import itertools
+import logging
+
+from vaani.core import config as Config
+
+logger = logging.getLogger('workers')
+
+_started = time.time()
+_requests = itertools.count()
+_served = 0
+_preloaded_in = None        # pid of the process that ran preload()
+_master_pid = None          # set in workers started by start_worker()
+_heartbeat = None
+_stop_heartbeat = threading.Event()
+
+
+def preload():
+    """
+    Load every read-only dataset into memory and move it out of the GC's view.
+
+    Called in the master before forking, so workers share these pages
+    copy-on-write; gc.freeze() keeps a worker's collections from writing
+    to (and so copying) them.
+
+    Returns:
+        Dict of dataset name -> number of entries loaded
+    """
+    global _preloaded_in
+    from vaani.core.intent_router import get_intent_router
+    from vaani.core.phrase_bundle import get_phrase_bundle
+    from vaani.services.agriculture.crop_index import get_crop_index
+    from vaani.services.agriculture.agri_scheme_service import preload_scheme_data
+    from vaani.services.weather.geocode_index import get_geocode_index
+
+    loaded = {
+        'intent_phrases': get_intent_router().phrase_count,
+        'crops': len(get_crop_index()),
+        'cities': len(get_geocode_index()),
+        'scheme_files': preload_scheme_data(),
+        'phrase_audio': get_phrase_bundle().preload(),
+    }
+    gc.collect()
+    gc.freeze()
+    _preloaded_in = os.getpid()
+    logger.info("Preloaded %s; %d objects frozen", loaded, gc.get_freeze_count())
+    return loaded
+
+
+def note_request():
+    """Count a request served by this worker"""
+    global _served
+    _served = next(_requests) + 1
+
+
+def _reset_after_fork():
+    global _started, _requests, _served, _master_pid, _heartbeat
+    _started = time.time()
+    _requests = itertools.count()
+    _served = 0
+    _master_pid = None
+    _heartbeat = None
+    _stop_heartbeat.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def worker_health():
+    """Health of this worker process"""
+    now = time.time()
+    return {
+        'pid': os.getpid(),
+        'uptime': round(now - _started, 1),
+        'requests': _served,
+        # True when the read-only data was loaded by the parent and is shared
+        'preloaded': _preloaded_in is not None and _preloaded_in != os.getpid(),
+        'last_beat': now,
+    }
+
+
+def _state_dir(master_pid=None):
+    """Heartbeat directory for one server; workers of the same master share it"""
+    base = Config.WORKER_STATE_DIR or os.path.join(tempfile.gettempdir(), 'vaani-workers')
+    return os.path.join(base, str(master_pid or _master_pid or os.getpid()))
+
+
+def _write_heartbeat():
+    state_dir = _state_dir()
+    os.makedirs(state_dir, exist_ok=True)
+    path = os.path.join(state_dir, f"{os.getpid()}.json")
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(worker_health(), f)
+    os.replace(tmp_path, path)
+
+
+def start_worker(interval=None):
+    """Start this worker's heartbeat (after fork)"""
+    global _master_pid, _heartbeat
+    _master_pid = os.getppid()
+    interval = interval or Config.WORKER_HEARTBEAT_INTERVAL
+    if _heartbeat is not None and _heartbeat.is_alive():
+        return
+
+    def loop():
+        while True:
+            try:
+                _write_heartbeat()
+            except OSError as e:
+                logger.error("Worker heartbeat failed: %s", e)
+            if _stop_heartbeat.wait(interval):
+                return
+
+    _heartbeat = threading.Thread(target=loop, daemon=True, name='worker-heartbeat')
+    _heartbeat.start()
+
+
+def stop_worker():
+    """Stop the heartbeat and remove this worker's file"""
+    _stop_heartbeat.set()
+    forget_worker(os.getpid())
+
+
+def forget_worker(pid, master_pid=None):
+    """Remove a worker's heartbeat file (from the worker itself or, with master_pid, from the master)"""
+    try:
+        os.remove(os.path.join(_state_dir(master_pid), f"{pid}.json"))
+    except FileNotFoundError:
+        pass
+
+
+def clear_state(master_pid=None):
+    """Remove a server's heartbeat directory (master, on exit)"""
+    state_dir = _state_dir(master_pid)
+    if os.path.isdir(state_dir):
+        for filename in os.listdir(state_dir):
+            os.remove(os.path.join(state_dir, filename))
+        os.rmdir(state_dir)
+
+
+def all_workers():
+    """
+    Every worker's last heartbeat, including this one.
+
+    Returns:
+        List of worker_health() dicts with 'healthy' set; a worker that has
+        not written a heartbeat within WORKER_HEARTBEAT_TIMEOUT is unhealthy
+    """
+    now = time.time()
+    workers = {}
+    state_dir = _state_dir()
+    if os.path.isdir(state_dir):
+        for filename in os.listdir(state_dir):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(state_dir, filename), 'r', encoding='utf-8') as f:
+                    info = json.load(f)
+            except (OSError, ValueError):
+                continue
+            workers[info['pid']] = info
+    workers[os.getpid()] = worker_health()
+
+    for info in workers.values():
+        info['healthy'] = now - info['last_beat'] <= Config.WORKER_HEARTBEAT_TIMEOUT
+    return sorted(workers.values(), key=lambda info: info['pid'])
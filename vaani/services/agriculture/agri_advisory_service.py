@@ -3,25 +3,23 @@ Agricultural Advisory Service Module
 Provides farming guidance and crop-specific information.
 """
 
-import json
-import os
-import time
 import logging
 from typing import Optional, Dict, Any
 
-from vaani.core import config as Config
 from vaani.core.voice_tool import bolo
+from vaani.services.agriculture.crop_index import get_crop_index
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# In-memory cache for crop data
-CROP_DATABASE: Dict[str, Dict[str, Any]] = {}
+# Crop knowledge is loaded once at startup from the prebuilt index
+crop_index = get_crop_index()
+CROP_DATABASE = crop_index.crops
 
 
 def load_crop_data(crop_name: str) -> Optional[Dict[str, Any]]:
     """
-    Load crop data from JSON file with caching.
+    Look up crop data in the crop knowledge index.
     
     Args:
         crop_name: Name of the crop in Hindi
@@ -29,35 +27,10 @@ def load_crop_data(crop_name: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing crop information or None if not found
     """
-    global CROP_DATABASE
-    
-    # Return from cache if available
-    if crop_name in CROP_DATABASE:
-        logger.info(f"Using cached data for {crop_name}")
-        return CROP_DATABASE[crop_name]
-
-    try:
-        file_path = os.path.join('data', 'crop_data', f'{crop_name}.json')
-        
-        if not os.path.exists(file_path):
-            logger.error(f"Data file not found for crop '{crop_name}' at {file_path}")
-            return None
-
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            CROP_DATABASE[crop_name] = data
-            logger.info(f"Loaded data for {crop_name}")
-            return data
-            
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error for {crop_name}: {str(e)}")
-        return None
-    except FileNotFoundError as e:
-        logger.error(f"File not found for {crop_name}: {str(e)}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error loading data for {crop_name}: {str(e)}")
-        return None
+    data = crop_index.get_crop(crop_name)
+    if data is None:
+        logger.error(f"No crop data found for '{crop_name}'")
+    return data
 
 
 
@@ -70,30 +43,31 @@ def speak_full_info(crop_name: str, crop_data: Dict[str, Any], bolo_func) -> Non
         crop_data: Dictionary containing crop information
         bolo_func: Function to speak the response
     """
-    bolo_func(f"ज़रूर, मैं आपको {crop_name} के बारे में पूरी जानकारी देती हूँ।")
-    time.sleep(0.4)
+    bolo_func(f"ज़रूर, मैं आपको {crop_name} के बारे में पूरी जानकारी देती हूँ।", pause=0.4)
 
     for main_key, main_value in crop_data.items():
         spoken_key = main_key.replace('_', ' ').capitalize()
-        bolo_func(f"{spoken_key}:")
+        lines = [(f"{spoken_key}:", 0.0)]
         
         if isinstance(main_value, dict):
             for sub_key, sub_value in main_value.items():
                 spoken_sub_key = sub_key.replace('_', ' ').capitalize()
                 
                 if isinstance(sub_value, dict):
-                    bolo_func(f"{spoken_sub_key} के तहत:")
+                    lines.append((f"{spoken_sub_key} के तहत:", 0.0))
                     for item_key, item_value in sub_value.items():
                         spoken_item_key = item_key.replace('_', ' ').capitalize()
-                        bolo_func(f"{spoken_item_key}: {item_value}")
-                        time.sleep(0.3)
+                        lines.append((f"{spoken_item_key}: {item_value}", 0.3))
                 else:
-                    bolo_func(f"{spoken_sub_key}: {sub_value}")
-                    time.sleep(0.3)
+                    lines.append((f"{spoken_sub_key}: {sub_value}", 0.3))
         else:
-            bolo_func(str(main_value))
-            
-        time.sleep(0.8)
+            lines.append((str(main_value), 0.0))
+
+        # Longer break after each section
+        text, pause = lines[-1]
+        lines[-1] = (text, pause + 0.8)
+        for text, pause in lines:
+            bolo_func(text, pause=pause)
 
 
 def get_farming_advisory(
@@ -139,18 +113,17 @@ def get_farming_advisory(
         return
 
     # Provide specific stage information
-    if stage in crop_data:
-        stage_info = crop_data[stage]
+    section = crop_index.section_key(crop, stage)
+    if section is not None:
+        stage_info = crop_data[section]
         response = f"{crop} के लिए {stage} की जानकारी: "
         
         if isinstance(stage_info, dict):
-            bolo_func(response)
-            time.sleep(0.3)
+            bolo_func(response, pause=0.3)
             
             for key, value in stage_info.items():
                 formatted_key = key.replace('_', ' ').capitalize()
-                bolo_func(f"{formatted_key}: {value}")
-                time.sleep(0.4)
+                bolo_func(f"{formatted_key}: {value}", pause=0.4)
         else:
             response += str(stage_info)
             bolo_func(response)
@@ -176,13 +149,13 @@ def handle_advice_query(command: str, bolo_func, context) -> None:
     # Check if this is a contextual reply for a crop name
     if (context.state == 'awaiting_agri_response' and 
         context.data.get('query_type') == 'advice_crop'):
-        found_crop = next((c for c in Config.agri_commodities if c in command), None)
+        found_crop = crop_index.find_crop(command)
         if found_crop:
             get_farming_advisory(found_crop, None, bolo_func, context)
             return
     
     # Extract crop from command
-    found_crop = next((c for c in Config.agri_commodities if c in command), None)
+    found_crop = crop_index.find_crop(command)
 
     if not found_crop:
         response = (
@@ -209,7 +182,7 @@ def handle_advice_query(command: str, bolo_func, context) -> None:
         found_stage = "पूरी जानकारी"
     else:
         # Try to extract stage from command
-        found_stage = next((s for s in Config.agri_stages if s in command), None)
+        found_stage = crop_index.find_stage(command)
 
     get_farming_advisory(found_crop, found_stage, bolo_func, context)
     logger.info(f"Handled advice query for crop: {found_crop}, stage: {found_stage}")
\ No newline at end of file
@@ -4,11 +4,12 @@ Agricultural Command Processor Module
 Main entry point for routing agricultural queries to appropriate services.
 """
 
+import asyncio
 import logging
 from typing import Optional
 
 from vaani.core.voice_tool import bolo
-from vaani.services.agriculture.agri_price_service import handle_price_query
+from vaani.services.agriculture.agri_price_service import handle_price_query, handle_price_query_async
 from vaani.services.agriculture.agri_scheme_service import handle_scheme_query
 from vaani.services.agriculture.agri_advisory_service import handle_advice_query
 from vaani.core import config as Config
@@ -54,27 +55,7 @@ def process_agriculture_command(
             return True
 
     # --- Step 2: Keyword-Based Intent Detection ---
-    command_lower = command.lower()
-    intent_to_use = force_intent
-    
-    # If no forced intent, detect based on keywords
-    if not intent_to_use:
-        # Priority order: price > scheme > advice (most specific to most general)
-        if any(keyword in command_lower for keyword in Config.price_keywords):
-            intent_to_use = "get_agri_price"
-        elif any(keyword in command_lower for keyword in Config.scheme_keywords):
-            intent_to_use = "get_agri_scheme"
-        elif any(keyword in command_lower for keyword in Config.advice_keywords):
-            intent_to_use = "get_agri_advice"
-        else:
-            # Check if any crop is mentioned - default to advice
-            found_crop = next((c for c in Config.agri_commodities if c in command), None)
-            if found_crop:
-                intent_to_use = "get_agri_advice"
-            else:
-                intent_to_use = "get_agri_advice"  # Default fallback
-    
-    logger.info(f"Agriculture Command Router - Intent: {intent_to_use}, Command: {command[:50]}...")
+    intent_to_use = detect_agri_intent(command, force_intent)
     
     # --- Step 3: Route to Appropriate Service ---
     try:
@@ -96,4 +77,55 @@ def process_agriculture_command(
     except Exception as e:
         logger.error(f"Error processing agriculture command: {str(e)}")
         bolo_func("माफ़ कीजिए, आपके प्रश्न को प्रोसेस करने में कुछ समस्या आई। कृपया पुनः प्रयास करें।")
-        return False
\ No newline at end of file
+        return False
+
+
+async def process_agriculture_command_async(
+    command: str,
+    bolo_func,
+    entities: dict,
+    context,
+    force_intent: Optional[str] = None
+) -> bool:
+    """
+    Async process_agriculture_command for the ASGI server.
+    Price queries await the Agmarknet API; scheme and advice answers come from
+    local data and run in a worker thread.
+    """
+    awaiting = hasattr(context, 'state') and context.state == 'awaiting_agri_response'
+    if awaiting or detect_agri_intent(command, force_intent) != "get_agri_price":
+        return await asyncio.to_thread(process_agriculture_command, command, bolo_func,
+                                       entities, context, force_intent)
+    try:
+        await handle_price_query_async(command, bolo_func, entities)
+        return True
+    except Exception as e:
+        logger.error(f"Error processing agriculture command: {str(e)}")
+        bolo_func("माफ़ कीजिए, आपके प्रश्न को प्रोसेस करने में कुछ समस्या आई। कृपया पुनः प्रयास करें।")
+        return False
+
+
+def detect_agri_intent(command: str, force_intent: Optional[str] = None) -> str:
+    """Keyword-based agricultural intent: price > scheme > advice (most specific first)"""
+    command_lower = command.lower()
+    intent_to_use = force_intent
+    
+    # If no forced intent, detect based on keywords
+    if not intent_to_use:
+        # Priority order: price > scheme > advice (most specific to most general)
+        if any(keyword in command_lower for keyword in Config.price_keywords):
+            intent_to_use = "get_agri_price"
+        elif any(keyword in command_lower for keyword in Config.scheme_keywords):
+            intent_to_use = "get_agri_scheme"
+        elif any(keyword in command_lower for keyword in Config.advice_keywords):
+            intent_to_use = "get_agri_advice"
+        else:
+            # Check if any crop is mentioned - default to advice
+            found_crop = next((c for c in Config.agri_commodities if c in command), None)
+            if found_crop:
+                intent_to_use = "get_agri_advice"
+            else:
+                intent_to_use = "get_agri_advice"  # Default fallback
+    
+    logger.info(f"Agriculture Command Router - Intent: {intent_to_use}, Command: {command[:50]}...")
+    return intent_to_use
@@ -7,11 +7,15 @@ import requests
 import os
 import random
 import logging
-from typing import Optional, Tuple, Dict
-from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from datetime import timedelta
 import json
 
 from vaani.core import config as Config
+from vaani.core import http
+from vaani.core.cache_manager import cache
+from vaani.core.single_flight import single_flight, make_key
+from vaani.services.agriculture.price_history import get_price_history, daily_prices, format_price
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -44,9 +48,11 @@ STATE_MAPPING = {
     "तेलंगाना": "Telangana", "ओडिशा": "Odisha", "झारखंड": "Jharkhand", "असम": "Assam"
 }
 
-# In-memory cache for API responses
-_price_cache: Dict[str, Tuple[any, datetime]] = {}
+# API responses live in the shared cache under their own category
 CACHE_DURATION = timedelta(hours=6)  # Cache prices for 6 hours
+PRICE_CACHE_CATEGORY = 'agri_prices'
+cache.register_category(PRICE_CACHE_CATEGORY, CACHE_DURATION.total_seconds())
+_price_cache = cache.view(PRICE_CACHE_CATEGORY)
 
 
 
@@ -57,20 +63,100 @@ def _get_cache_key(commodity: str, market: str, state: str) -> str:
 
 def _get_cached_price(cache_key: str) -> Optional[Tuple[str, str, str]]:
     """Retrieve price from cache if not expired."""
-    if cache_key in _price_cache:
-        data, timestamp = _price_cache[cache_key]
-        if datetime.now() - timestamp < CACHE_DURATION:
-            logger.info(f"Cache hit for {cache_key}")
-            return data
-        else:
-            del _price_cache[cache_key]
-            logger.info(f"Cache expired for {cache_key}")
-    return None
+    data = _price_cache.get(cache_key)
+    if data:
+        logger.info(f"Cache hit for {cache_key}")
+    return data
 
 
 def _set_cached_price(cache_key: str, data: Tuple[str, str, str]) -> None:
-    """Store price in cache with timestamp."""
-    _price_cache[cache_key] = (data, datetime.now())
+    """Store price in the shared cache (expiry is handled by the cache)."""
+    _price_cache[cache_key] = data
+
+
+def _fetch_agmarknet_price(
+    english_commodity: str,
+    english_market: str,
+    english_state: str,
+    api_key: str,
+    cache_key: str
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Query the Agmarknet API and cache a valid modal price."""
+    params = _agmarknet_params(english_commodity, english_market, english_state, api_key)
+    logger.info(f"Fetching price for {english_commodity} from {english_market}, {english_state}")
+
+    response = http.get(Config.AGMARKNET_BASE_URL, params=params)
+    response.raise_for_status()
+    return _parse_agmarknet(response.json(), cache_key, english_commodity)
+
+
+async def _fetch_agmarknet_price_async(
+    english_commodity: str,
+    english_market: str,
+    english_state: str,
+    api_key: str,
+    cache_key: str
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Async _fetch_agmarknet_price."""
+    params = _agmarknet_params(english_commodity, english_market, english_state, api_key)
+    logger.info(f"Fetching price for {english_commodity} from {english_market}, {english_state}")
+
+    response = await http.aget(Config.AGMARKNET_BASE_URL, params=params)
+    response.raise_for_status()
+    return _parse_agmarknet(response.json(), cache_key, english_commodity)
+
+
+def _agmarknet_params(english_commodity: str, english_market: str, english_state: str, api_key: str) -> dict:
+    return {
+        'api-key': api_key,
+        'format': 'json',
+        'limit': '5',
+        'filters[commodity]': english_commodity,
+        'filters[market]': english_market,
+        'filters[state]': english_state,
+        'sort[arrival_date]': 'desc'
+    }
+
+
+def _parse_agmarknet(data: dict, cache_key: str,
+                     english_commodity: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Pick the latest valid modal price from an API response and cache it."""
+    _record_history(data.get('records') or [], english_commodity)
+    if data.get('records') and len(data['records']) > 0:
+        record = data['records'][0]
+        price = record.get('modal_price')
+        market = record.get('market')
+        commodity = record.get('commodity')
+
+        if price and price not in ['N/A', '0', '', 'NA']:
+            result = (price, market, commodity)
+            _set_cached_price(cache_key, result)
+            logger.info(f"Price fetched successfully: {price}")
+            return result
+
+    logger.warning(f"No valid price data found in API response")
+    return None, None, None
+
+
+def _record_history(records: list, english_commodity: str) -> None:
+    """Keep the daily prices from an API response in the local price history."""
+    try:
+        get_price_history().put_many(daily_prices(records, english_commodity))
+    except Exception as e:
+        logger.warning(f"Could not store price history: {str(e)}")
+
+
+def _get_stored_price(english_commodity: str, english_market: str) -> Optional[Tuple[str, str, str]]:
+    """The latest recent price from the local price history, if there is one."""
+    try:
+        stored = get_price_history().latest(english_commodity, english_market, Config.PRICE_HISTORY_MAX_AGE_DAYS)
+    except Exception as e:
+        logger.warning(f"Could not read price history: {str(e)}")
+        return None
+    if stored:
+        logger.info(f"Price history hit for {english_commodity} in {english_market} ({stored[0]})")
+        return format_price(stored[1]), english_market, english_commodity
+    return None
 
 
 def get_agmarknet_price(
@@ -90,58 +176,12 @@ def get_agmarknet_price(
         Tuple of (price, market, commodity) or (None, None, None) if failed
     """
     try:
-        # Check cache first
-        cache_key = _get_cache_key(hindi_commodity, hindi_market, hindi_state)
-        cached_data = _get_cached_price(cache_key)
-        if cached_data:
-            return cached_data
-
-        # Get API key from environment
-        api_key = os.getenv('AGMARKNET_API_KEY')
-        if not api_key:
-            logger.warning("AGMARKNET_API_KEY not configured. Using fallback data.")
-            return None, None, None
-
-        # Translate to English
-        english_commodity = COMMODITY_MAPPING.get(hindi_commodity, hindi_commodity)
-        english_market = MARKET_MAPPING.get(hindi_market, hindi_market)
-        english_state = STATE_MAPPING.get(hindi_state, hindi_state)
-
-        # Prepare API request
-        params = {
-            'api-key': api_key,
-            'format': 'json',
-            'limit': '5',
-            'filters[commodity]': english_commodity,
-            'filters[market]': english_market,
-            'filters[state]': english_state,
-            'sort[arrival_date]': 'desc'
-        }
-        
-        logger.info(f"Fetching price for {english_commodity} from {english_market}, {english_state}")
-        
-        response = requests.get(
-            Config.AGMARKNET_BASE_URL,
-            params=params,
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get('records') and len(data['records']) > 0:
-            record = data['records'][0]
-            price = record.get('modal_price')
-            market = record.get('market')
-            commodity = record.get('commodity')
-            
-            if price and price not in ['N/A', '0', '', 'NA']:
-                result = (price, market, commodity)
-                _set_cached_price(cache_key, result)
-                logger.info(f"Price fetched successfully: {price}")
-                return result
-        
-        logger.warning(f"No valid price data found in API response")
-        return None, None, None
+        cached_data, fetch_args = _prepare_price_lookup(hindi_commodity, hindi_market, hindi_state)
+        if cached_data or not fetch_args:
+            return cached_data or (None, None, None)
+
+        # Identical concurrent lookups share one API request
+        return single_flight.do(make_key('agmarknet', *fetch_args[:3]), _fetch_agmarknet_price, *fetch_args)
         
     except requests.exceptions.Timeout:
         logger.error(f"API request timeout for {hindi_commodity}")
@@ -154,6 +194,54 @@ def get_agmarknet_price(
         return None, None, None
 
 
+async def get_agmarknet_price_async(
+    hindi_commodity: str, 
+    hindi_market: str, 
+    hindi_state: str
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Async get_agmarknet_price: the API request is awaited (ASGI server)."""
+    try:
+        cached_data, fetch_args = _prepare_price_lookup(hindi_commodity, hindi_market, hindi_state)
+        if cached_data or not fetch_args:
+            return cached_data or (None, None, None)
+
+        return await single_flight.do_async(make_key('agmarknet', *fetch_args[:3]),
+                                            _fetch_agmarknet_price_async, *fetch_args)
+    except Exception as e:
+        logger.error(f"API request failed: {str(e)}")
+        return None, None, None
+
+
+def _prepare_price_lookup(hindi_commodity: str, hindi_market: str, hindi_state: str):
+    """
+    Returns (cached price or None, API fetch arguments or None).
+    The fetch arguments are None when no API key is configured.
+    """
+    # Check cache first
+    cache_key = _get_cache_key(hindi_commodity, hindi_market, hindi_state)
+    cached_data = _get_cached_price(cache_key)
+    if cached_data:
+        return cached_data, None
+
+    # Translate to English
+    english_commodity = COMMODITY_MAPPING.get(hindi_commodity, hindi_commodity)
+    english_market = MARKET_MAPPING.get(hindi_market, hindi_market)
+    english_state = STATE_MAPPING.get(hindi_state, hindi_state)
+
+    # Prices stored by the prefetcher (or an earlier lookup) are read locally
+    stored = _get_stored_price(english_commodity, english_market)
+    if stored:
+        return stored, None
+
+    # Get API key from environment
+    api_key = os.getenv('AGMARKNET_API_KEY')
+    if not api_key:
+        logger.warning("AGMARKNET_API_KEY not configured. Using fallback data.")
+        return None, None
+
+    return None, (english_commodity, english_market, english_state, api_key, cache_key)
+
+
 def get_fallback_price(
     commodity: str, 
     market: str, 
@@ -208,6 +296,20 @@ def handle_price_query(command: str, bolo_func, entities: dict) -> None:
         bolo_func: Function to speak the response
         entities: Dictionary containing extracted entities (crop, market, etc.)
     """
+    target = _price_query_target(command, bolo_func, entities)
+    if target:
+        _speak_price(*target, get_agmarknet_price(*target), bolo_func)
+
+
+async def handle_price_query_async(command: str, bolo_func, entities: dict) -> None:
+    """Async handle_price_query: the Agmarknet request is awaited (ASGI server)."""
+    target = _price_query_target(command, bolo_func, entities)
+    if target:
+        _speak_price(*target, await get_agmarknet_price_async(*target), bolo_func)
+
+
+def _price_query_target(command: str, bolo_func, entities: dict) -> Optional[Tuple[str, str, str]]:
+    """The (commodity, market, state) a price query asks about; asks back and returns None if unclear."""
     # Extract commodity from entities or command
     found_commodity = entities.get('crop')
     
@@ -221,7 +323,7 @@ def handle_price_query(command: str, bolo_func, entities: dict) -> None:
         if not found_commodity:
             response = "आप किस चीज़ का भाव जानना चाहते हैं? जैसे: आलू, प्याज, टमाटर, गेहूं, या धान।"
             bolo_func(response)
-            return
+            return None
 
     # Extract market and state
     found_market = entities.get('market', Config.DEFAULT_MARKET)
@@ -231,13 +333,12 @@ def handle_price_query(command: str, bolo_func, entities: dict) -> None:
     )
 
     logger.info(f"Price query - Commodity: {found_commodity}, Market: {found_market}, State: {found_state}")
+    return found_commodity, found_market, found_state
 
-    # Try API first
-    price, api_market, api_commodity = get_agmarknet_price(
-        found_commodity, 
-        found_market, 
-        found_state
-    )
+
+def _speak_price(found_commodity: str, found_market: str, found_state: str, api_result, bolo_func) -> None:
+    """Speak the API price, or the fallback price when the API had none."""
+    price, api_market, api_commodity = api_result
     
     source = "live API"
     
@@ -281,17 +382,34 @@ def handle_price_query(command: str, bolo_func, entities: dict) -> None:
 
 def clear_price_cache() -> None:
     """Clear the price cache. Useful for testing or manual refresh."""
-    global _price_cache
     _price_cache.clear()
     logger.info("Price cache cleared")
 
 
 def get_price_trend(commodity: str, market: str) -> str:
     """
-    Provides simple price trend information.
-    
-    TODO: Implement actual trend analysis by comparing historical prices
+    Week-over-week price trend from the local price history: the average modal
+    price over the last 7 stored days against the 7 days before. Without two
+    weeks of history, a general note for the commodity (or "").
     """
+    english_commodity = COMMODITY_MAPPING.get(commodity, commodity)
+    english_market = MARKET_MAPPING.get(market, market)
+    try:
+        change = get_price_history().weekly_change(english_commodity, english_market)
+    except Exception as e:
+        logger.warning(f"Could not read price history: {str(e)}")
+        change = None
+
+    if change:
+        this_week, last_week = change
+        percent = (this_week - last_week) / last_week * 100
+        if abs(percent) < Config.PRICE_TREND_STEADY_PERCENT:
+            return (f"{market} मंडी में {commodity} का भाव पिछले सप्ताह जैसा ही है, "
+                    f"लगभग {format_price(round(this_week))} रुपये प्रति क्विंटल।")
+        direction = "बढ़ा" if percent > 0 else "घटा"
+        return (f"{market} मंडी में {commodity} का भाव पिछले सप्ताह से {abs(percent):.0f}% {direction} है, "
+                f"{format_price(round(last_week))} से {format_price(round(this_week))} रुपये प्रति क्विंटल।")
+
     trends = {
         "आलू": "आलू के भाव में पिछले सप्ताह की तुलना में मामूली उतार-चढ़ाव है।",
         "प्याज": "प्याज के भाव में स्थिरता देखी जा रही है।",
@@ -300,4 +418,4 @@ def get_price_trend(commodity: str, market: str) -> str:
         "धान": "धान के भाव में मंडी आगमन के अनुसार बदलाव आ रहा है।"
     }
     
-    return trends.get(commodity, "")
\ No newline at end of file
+    return trends.get(commodity, "")
@@ -5,9 +5,8 @@ Provides information about government schemes, subsidies, and loans for farmers.
 
 import json
 import os
-import time
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from vaani.core import config as Config
 from vaani.core.voice_tool import bolo
@@ -73,6 +72,12 @@ def clean_text(text: Any) -> str:
     return str(text)
 
 
+# Parsed scheme, subsidy and loan files by (folder, filename)
+_json_cache: Dict[Tuple[str, str], Any] = {}
+
+SCHEME_DATA_FOLDERS = ('scheme_data', 'subsidy_data', 'loan_data')
+
+
 def load_json_data(folder: str, filename: str) -> Optional[Dict[str, Any]]:
     """
     Load JSON file from specified folder with error handling.
@@ -84,6 +89,9 @@ def load_json_data(folder: str, filename: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing the data or None if error
     """
+    key = (folder, filename)
+    if key in _json_cache:
+        return _json_cache[key]
     try:
         file_path = os.path.join('data', folder, filename)
         
@@ -94,6 +102,8 @@ def load_json_data(folder: str, filename: str) -> Optional[Dict[str, Any]]:
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
             logger.info(f"Successfully loaded {filename} from {folder}")
+            # Scheme files are read-only, so one parsed copy serves every request
+            _json_cache[key] = data
             return data
             
     except json.JSONDecodeError as e:
@@ -104,6 +114,17 @@ def load_json_data(folder: str, filename: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def preload_scheme_data() -> int:
+    """Parse every scheme, subsidy and loan file now; returns the number loaded"""
+    for folder in SCHEME_DATA_FOLDERS:
+        folder_path = os.path.join('data', folder)
+        if os.path.isdir(folder_path):
+            for filename in sorted(os.listdir(folder_path)):
+                if filename.endswith('.json'):
+                    load_json_data(folder, filename)
+    return len(_json_cache)
+
+
 
 # --- Core Logic Functions ---
 
@@ -134,45 +155,35 @@ def speak_scheme_details(scheme_data: Dict[str, Any], bolo_func) -> None:
     name = scheme_data.get('yojana_ka_naam', 'योजना')
     description = scheme_data.get('yojana_ke_baare_mein', 'विवरण उपलब्ध नहीं है।')
 
-    bolo_func(name)
-    time.sleep(0.3)
-    bolo_func(f"इस योजना के बारे में: {description}")
-    time.sleep(0.4)
+    bolo_func(name, pause=0.3)
+    bolo_func(f"इस योजना के बारे में: {description}", pause=0.4)
 
     # Speak eligibility criteria
     eligibility = scheme_data.get('पात्रता', []) or scheme_data.get('kaun_laabh_le_sakta_hai', [])
     if eligibility:
-        bolo_func("पात्रता मानदंड:")
-        time.sleep(0.2)
+        bolo_func("पात्रता मानदंड:", pause=0.2)
         for criterion in eligibility:
-            bolo_func(f"• {criterion}")
-            time.sleep(0.3)
+            bolo_func(f"• {criterion}", pause=0.3)
 
     # Speak benefits
     benefits = scheme_data.get('kya_laabh_milega', [])
     if benefits:
-        bolo_func("इस योजना के लाभ:")
-        time.sleep(0.2)
+        bolo_func("इस योजना के लाभ:", pause=0.2)
         benefits_list = [benefits] if isinstance(benefits, str) else benefits
         for benefit in benefits_list:
-            bolo_func(f"• {benefit}")
-            time.sleep(0.3)
+            bolo_func(f"• {benefit}", pause=0.3)
 
     # Speak application process
     application_process = scheme_data.get('aavedan_prakriya', "") or scheme_data.get('apply_kaise_karein', "")
     if isinstance(application_process, dict):
         if 'jagah' in application_process:
-            bolo_func(f"आवेदन कहाँ करें: {application_process['jagah']}")
-            time.sleep(0.3)
+            bolo_func(f"आवेदन कहाँ करें: {application_process['jagah']}", pause=0.3)
         if 'prakriya' in application_process and isinstance(application_process['prakriya'], list):
-            bolo_func("आवेदन प्रक्रिया:")
-            time.sleep(0.2)
+            bolo_func("आवेदन प्रक्रिया:", pause=0.2)
             for i, step in enumerate(application_process['prakriya'], 1):
-                bolo_func(f"{i}. {step}")
-                time.sleep(0.3)
+                bolo_func(f"{i}. {step}", pause=0.3)
     elif application_process:
-        bolo_func(f"आवेदन प्रक्रिया: {application_process}")
-        time.sleep(0.3)
+        bolo_func(f"आवेदन प्रक्रिया: {application_process}", pause=0.3)
 
     # Speak contact information
     contact_info = scheme_data.get('sampark_jankari', "")
@@ -204,8 +215,7 @@ def get_subsidy_info(crop_type: str, bolo_func, context) -> None:
     if subsidy_data and isinstance(subsidy_data, list):
         scheme_names = [s.get('yojana_naam', 'अज्ञात योजना') for s in subsidy_data]
         response = f"{crop_type} की खेती के लिए ये सब्सिडी योजनाएं उपलब्ध हैं: {', '.join(scheme_names)}।"
-        bolo_func(response)
-        time.sleep(0.3)
+        bolo_func(response, pause=0.3)
         
         bolo_func("क्या आप इनमें से किसी विशेष योजना के बारे में विस्तार से जानना चाहते हैं?")
         
@@ -236,10 +246,8 @@ def get_loan_info(bolo_func) -> None:
     loan_data = load_json_data('loan_data', 'loans.json')
     
     if loan_data:
-        bolo_func("कृषि ऋण के बारे में जानकारी:")
-        time.sleep(0.3)
+        bolo_func("कृषि ऋण के बारे में जानकारी:", pause=0.3)
         speak_scheme_details(loan_data, bolo_func)
-        time.sleep(0.3)
         bolo_func("अधिक जानकारी और आवेदन के लिए, अपने नजदीकी बैंक शाखा से संपर्क करें।")
         logger.info("Provided loan information")
     else:
@@ -256,18 +264,15 @@ def get_all_schemes_info(bolo_func, context) -> None:
         bolo_func: Function to speak the response
         context: Context object for managing conversation state
     """
-    bolo_func("केंद्र सरकार की प्रमुख कृषि योजनाएं:")
-    time.sleep(0.3)
+    bolo_func("केंद्र सरकार की प्रमुख कृषि योजनाएं:", pause=0.3)
     
     scheme_list = list(GENERAL_SCHEME_MAP.keys())
     
     for i, scheme in enumerate(scheme_list[:10], 1):  # Limit to top 10 to avoid long list
-        bolo_func(f"{i}. {scheme}")
-        time.sleep(0.4)
+        bolo_func(f"{i}. {scheme}", pause=0.4)
     
     if len(scheme_list) > 10:
-        bolo_func(f"और भी कई योजनाएं उपलब्ध हैं।")
-        time.sleep(0.3)
+        bolo_func(f"और भी कई योजनाएं उपलब्ध हैं।", pause=0.3)
     
     bolo_func("आप किस योजना के बारे में जानना चाहते हैं? कृपया उसका नाम बताएं।")
     
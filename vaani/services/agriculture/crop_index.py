@@ -0,0 +1,246 @@
+"""
+Crop Knowledge Index
+Precomputed crop -> section -> subsection data with alias lookups, loaded once at startup.
+
+The index is built from data/crop_data/*.json into a pickle artifact so the
+request path never parses JSON. Build and validate it ahead of time with:
+
+    python -m vaani.services.agriculture.crop_index build
+"""
+
+import json
+import os
+import pickle
+import sys
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from vaani.core import config as Config
+from vaani.core.intent_router import PhraseMatcher
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+CROP_DATA_DIR = os.path.join(_PROJECT_ROOT, "data", "crop_data")
+INDEX_FILE = os.path.join(_PROJECT_ROOT, "data", "crop_index", "crop_index.pkl")
+
+
+def normalize_key(key: str) -> str:
+    """Section keys are compared with underscores as spaces, case-folded"""
+    return " ".join(key.replace("_", " ").split()).casefold()
+
+
+def _source_signature(data_dir: str) -> Dict[str, Tuple[int, int]]:
+    """(size, mtime) of every crop file, used to detect a stale artifact"""
+    signature = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if filename.endswith(".json"):
+            stat = os.stat(os.path.join(data_dir, filename))
+            signature[filename] = (stat.st_size, stat.st_mtime_ns)
+    return signature
+
+
+def build_index(data_dir: str = CROP_DATA_DIR) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Parse and validate every crop file.
+
+    Returns:
+        Tuple of (index payload, list of validation errors)
+    """
+    errors = []
+    crops: Dict[str, Dict[str, Any]] = {}
+    sections: Dict[str, Dict[str, str]] = {}
+
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith(".json"):
+            continue
+        crop = filename[:-len(".json")].strip()
+        path = os.path.join(data_dir, filename)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            errors.append(f"{filename}: invalid JSON ({e})")
+            continue
+
+        if not isinstance(data, dict) or not data:
+            errors.append(f"{filename}: expected a non-empty object of sections")
+            continue
+        if crop in crops:
+            errors.append(f"{filename}: duplicate crop '{crop}'")
+            continue
+
+        crops[crop] = data
+        sections[crop] = {normalize_key(key): key for key in data}
+
+    # Crop aliases: every commodity name from config plus the file names themselves.
+    # Rank follows config order so the first listed commodity wins, as before.
+    crop_aliases: Dict[str, Tuple[int, str]] = {}
+    for rank, name in enumerate(list(Config.agri_commodities) + sorted(crops)):
+        crop_aliases.setdefault(name, (rank, name))
+
+    stage_aliases: Dict[str, Tuple[int, str]] = {}
+    for rank, stage in enumerate(Config.agri_stages):
+        stage_aliases.setdefault(stage, (rank, stage))
+
+    payload = {
+        "version": INDEX_VERSION,
+        "signature": _source_signature(data_dir),
+        "crops": crops,
+        "sections": sections,
+        "crop_aliases": crop_aliases,
+        "stage_aliases": stage_aliases,
+    }
+    return payload, errors
+
+
+def write_index(payload: Dict[str, Any], index_file: str = INDEX_FILE) -> None:
+    """Write the index artifact atomically"""
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    tmp_file = f"{index_file}.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_file, index_file)
+
+
+def _read_index(index_file: str, data_dir: str) -> Optional[Dict[str, Any]]:
+    """Load the artifact if it exists and matches the current crop files"""
+    if not os.path.exists(index_file):
+        return None
+    try:
+        with open(index_file, "rb") as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read crop index, rebuilding: {e}")
+        return None
+    if payload.get("version") != INDEX_VERSION or payload.get("signature") != _source_signature(data_dir):
+        logger.info("Crop index is stale, rebuilding")
+        return None
+    return payload
+
+
+class CropIndex:
+    """
+    In-memory crop knowledge index.
+
+    - crops: crop -> section -> subsection (the parsed crop files)
+    - crop/stage alias matchers: find the crop or stage named in a command
+      in one pass, preferring the earliest alias in config order
+    - per-crop section map: stage or section name -> actual section key
+    """
+
+    def __init__(self, payload: Dict[str, Any]):
+        self.crops: Dict[str, Dict[str, Any]] = payload["crops"]
+        self._sections: Dict[str, Dict[str, str]] = payload["sections"]
+        self._crop_aliases: Dict[str, Tuple[int, str]] = payload["crop_aliases"]
+        self._stage_aliases: Dict[str, Tuple[int, str]] = payload["stage_aliases"]
+
+        self._crop_matcher = PhraseMatcher()
+        for alias in self._crop_aliases:
+            self._crop_matcher.add(alias, alias)
+        self._crop_matcher.build()
+
+        self._stage_matcher = PhraseMatcher()
+        for alias in self._stage_aliases:
+            self._stage_matcher.add(alias, alias)
+        self._stage_matcher.build()
+
+    @staticmethod
+    def _best(matcher: PhraseMatcher, aliases: Dict[str, Tuple[int, str]], command: str) -> Optional[str]:
+        best = None
+        for _, _, alias, _ in matcher.find_all(command):
+            candidate = aliases[alias]
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+        return best[1] if best else None
+
+    def find_crop(self, command: str) -> Optional[str]:
+        """Crop named in the command, if any"""
+        return self._best(self._crop_matcher, self._crop_aliases, command)
+
+    def find_stage(self, command: str) -> Optional[str]:
+        """Farming stage named in the command, if any"""
+        return self._best(self._stage_matcher, self._stage_aliases, command)
+
+    def get_crop(self, crop: str) -> Optional[Dict[str, Any]]:
+        """Sections of a crop, or None if there is no data for it"""
+        return self.crops.get(crop.strip())
+
+    def section_key(self, crop: str, stage: str) -> Optional[str]:
+        """Actual section key in the crop's data for a stage name"""
+        crop_data = self.get_crop(crop)
+        if crop_data is None:
+            return None
+        if stage in crop_data:
+            return stage
+        return self._sections.get(crop.strip(), {}).get(normalize_key(stage))
+
+    def __len__(self):
+        return len(self.crops)
+
+    def __contains__(self, crop):
+        return crop.strip() in self.crops
+
+
+def load_index(index_file: str = INDEX_FILE, data_dir: str = CROP_DATA_DIR) -> CropIndex:
+    """Load the prebuilt artifact, rebuilding (and saving) it if missing or stale"""
+    payload = _read_index(index_file, data_dir)
+    if payload is None:
+        payload, errors = build_index(data_dir)
+        for error in errors:
+            logger.error(f"Crop data error: {error}")
+        try:
+            write_index(payload, index_file)
+        except OSError as e:
+            logger.warning(f"Could not save crop index: {e}")
+    index = CropIndex(payload)
+    logger.info(f"Crop index ready with {len(index)} crops")
+    return index
+
+
+# Global instance
+_crop_index = None
+_crop_index_lock = threading.Lock()
+
+
+def get_crop_index() -> CropIndex:
+    """Get or create the global crop index"""
+    global _crop_index
+    if _crop_index is None:
+        with _crop_index_lock:
+            if _crop_index is None:
+                _crop_index = load_index()
+    return _crop_index
+
+
+def main(argv=None) -> int:
+    """Build command: validate every crop file and write the index artifact"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] not in ("build", "check"):
+        print("Usage: python -m vaani.services.agriculture.crop_index [build|check]")
+        return 2
+
+    payload, errors = build_index()
+    total_files = len(payload["signature"])
+    print(f"Crop files:    {total_files}")
+    print(f"Crops indexed: {len(payload['crops'])}")
+    print(f"Crop aliases:  {len(payload['crop_aliases'])}")
+    print(f"Stage aliases: {len(payload['stage_aliases'])}")
+    for error in errors:
+        print(f"✗ {error}")
+    if errors:
+        return 1
+
+    if not argv or argv[0] == "build":
+        write_index(payload)
+        print(f"✓ Wrote {INDEX_FILE} ({os.path.getsize(INDEX_FILE) // 1024} KB)")
+    else:
+        print("✓ All crop files are valid")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+Agmarknet Price History
+Daily mandi prices for every commodity in COMMODITY_MAPPING at every market in
+MARKET_MAPPING, fetched in bulk and kept in one SQLite (WAL) file keyed by
+(commodity, market, date). Price queries read the latest stored day instead of
+calling the API, and get_price_trend() compares the last two weeks.
+
+A prefetch run asks the API for one commodity at a time, all markets at once,
+in pages of PRICE_PREFETCH_PAGE_SIZE records, and keeps the markets we know.
+Every worker may run the prefetcher; runs are claimed in the database, so
+only one of them fetches per PRICE_PREFETCH_INTERVAL.
+
+Run once by hand or from cron with:
+
+    python -m vaani.services.agriculture.price_history fetch
+    python -m vaani.services.agriculture.price_history trend आलू लखनऊ
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from vaani.core import config as Config
+from vaani.core import http
+from vaani.core.sqlite_util import connect_local
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+PRICE_HISTORY_PATH = os.path.join(_PROJECT_ROOT, "data", "price_history.db")
+
+INVALID_PRICES = {'N/A', '0', '', 'NA'}
+
+
+def parse_arrival_date(value: str) -> Optional[str]:
+    """Agmarknet arrival_date ('03/06/2024') as an ISO date, or None"""
+    for fmt in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime((value or "").strip(), fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def _price(value) -> Optional[float]:
+    if value is None or str(value).strip() in INVALID_PRICES:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        return None
+    return price if price > 0 else None
+
+
+def daily_prices(records: List[dict], commodity: str, markets: Optional[Iterable[str]] = None) -> list:
+    """
+    API records for one commodity as rows of (commodity, market, date, state,
+    min, max, modal): the median modal price over the varieties reported that
+    day, with the lowest min and highest max. With markets given, records from
+    other markets are dropped.
+    """
+    wanted = {market.lower() for market in markets} if markets is not None else None
+    days = {}
+    for record in records:
+        market = (record.get('market') or "").strip()
+        if wanted is not None and market.lower() not in wanted:
+            continue
+        day = parse_arrival_date(record.get('arrival_date'))
+        modal = _price(record.get('modal_price'))
+        if not market or not day or modal is None:
+            continue
+        entry = days.setdefault((market, day), {'state': record.get('state'), 'modal': [], 'min': [], 'max': []})
+        entry['modal'].append(modal)
+        for field in ('min', 'max'):
+            value = _price(record.get(f'{field}_price'))
+            if value is not None:
+                entry[field].append(value)
+
+    return [(commodity, market, day, entry['state'], min(entry['min'], default=None),
+             max(entry['max'], default=None), statistics.median(entry['modal']))
+            for (market, day), entry in days.items()]
+
+
+def format_price(price: float) -> str:
+    return str(int(price)) if float(price).is_integer() else f"{price:.2f}"
+
+
+class PriceHistoryStore:
+    """
+    Stored daily prices and the log of prefetch runs.
+    Each thread has its own connection, so any number of threads and worker
+    processes can read and write the same file.
+    """
+
+    def __init__(self, path: str = PRICE_HISTORY_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS prices ("
+                   "commodity TEXT NOT NULL COLLATE NOCASE, market TEXT NOT NULL COLLATE NOCASE, "
+                   "date TEXT NOT NULL, state TEXT, min_price REAL, max_price REAL, modal_price REAL NOT NULL, "
+                   "fetched_at REAL NOT NULL, PRIMARY KEY (commodity, market, date)) WITHOUT ROWID")
+        db.execute("CREATE TABLE IF NOT EXISTS runs ("
+                   "id INTEGER PRIMARY KEY, started REAL NOT NULL, finished REAL, rows INTEGER, error TEXT)")
+
+    def _db(self):
+        return connect_local(self._local, self.path)
+
+    def put_many(self, rows: list) -> int:
+        """Save (commodity, market, date, state, min, max, modal) rows, replacing the same day's price"""
+        now = time.time()
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("INSERT OR REPLACE INTO prices (commodity, market, date, state, min_price, max_price, "
+                           "modal_price, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           [(*row, now) for row in rows])
+        return len(rows)
+
+    def latest(self, commodity: str, market: str, max_age_days: Optional[int] = None) -> Optional[Tuple[str, float]]:
+        """(date, modal price) of the newest stored day, or None (also when older than max_age_days)"""
+        row = self._db().execute("SELECT date, modal_price FROM prices WHERE commodity = ? AND market = ? "
+                                 "ORDER BY date DESC LIMIT 1", (commodity, market)).fetchone()
+        if row is None:
+            return None
+        if max_age_days is not None and date.fromisoformat(row[0]) < date.today() - timedelta(days=max_age_days):
+            return None
+        return row[0], row[1]
+
+    def history(self, commodity: str, market: str, days: int = 14) -> List[Tuple[str, float]]:
+        """(date, modal price) for the days stored in the days up to the newest one, oldest first"""
+        newest = self.latest(commodity, market)
+        if newest is None:
+            return []
+        start = (date.fromisoformat(newest[0]) - timedelta(days=days - 1)).isoformat()
+        return self._db().execute("SELECT date, modal_price FROM prices WHERE commodity = ? AND market = ? "
+                                  "AND date >= ? ORDER BY date", (commodity, market, start)).fetchall()
+
+    def weekly_change(self, commodity: str, market: str) -> Optional[Tuple[float, float]]:
+        """
+        (average modal price over the 7 days up to the newest stored day, average over
+        the 7 days before that), or None without data in both weeks
+        """
+        history = self.history(commodity, market, 14)
+        if not history:
+            return None
+        split = (date.fromisoformat(history[-1][0]) - timedelta(days=7)).isoformat()
+        this_week = [price for day, price in history if day > split]
+        last_week = [price for day, price in history if day <= split]
+        if not this_week or not last_week:
+            return None
+        return statistics.mean(this_week), statistics.mean(last_week)
+
+    def claim_run(self, interval: float) -> Optional[int]:
+        """Start a prefetch run unless one started less than interval seconds ago; returns its id"""
+        now = time.time()
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            last = db.execute("SELECT MAX(started) FROM runs").fetchone()[0]
+            if last is not None and now - last < interval:
+                return None
+            return db.execute("INSERT INTO runs (started) VALUES (?)", (now,)).lastrowid
+
+    def finish_run(self, run_id: int, rows: int, error: Optional[str] = None) -> None:
+        self._db().execute("UPDATE runs SET finished = ?, rows = ?, error = ? WHERE id = ?",
+                           (time.time(), rows, error, run_id))
+
+    def prune(self, retention_days: int) -> int:
+        """Drop prices older than retention_days; returns the rows dropped"""
+        cutoff = (date.today() - timedelta(days=retention_days)).isoformat()
+        return self._db().execute("DELETE FROM prices WHERE date < ?", (cutoff,)).rowcount
+
+    def get_stats(self) -> Dict:
+        db = self._db()
+        prices, first, last = db.execute("SELECT COUNT(*), MIN(date), MAX(date) FROM prices").fetchone()
+        run = db.execute("SELECT started, finished, rows, error FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        return {
+            'prices': prices,
+            'first_date': first,
+            'last_date': last,
+            'last_run': dict(zip(('started', 'finished', 'rows', 'error'), run)) if run else None
+        }
+
+
+def fetch_commodity(english_commodity: str, api_key: str, markets: Iterable[str],
+                    page_size: Optional[int] = None) -> Tuple[list, int]:
+    """Every record for one commodity, page by page, as daily_prices rows; returns (rows, pages)"""
+    page_size = page_size or Config.PRICE_PREFETCH_PAGE_SIZE
+    records, offset, pages = [], 0, 0
+    while True:
+        response = http.get(Config.AGMARKNET_BASE_URL, timeout=Config.PRICE_PREFETCH_TIMEOUT, params={
+            'api-key': api_key,
+            'format': 'json',
+            'limit': str(page_size),
+            'offset': str(offset),
+            'filters[commodity]': english_commodity
+        })
+        response.raise_for_status()
+        data = response.json()
+        page = data.get('records') or []
+        records += page
+        pages += 1
+        offset += len(page)
+        # Some responses leave out 'total'; then only a short page ends the commodity
+        total = int(data.get('total') or 0)
+        if len(page) < page_size or (total and offset >= total):
+            break
+    return daily_prices(records, english_commodity, markets), pages
+
+
+def prefetch(store: Optional["PriceHistoryStore"] = None, api_key: Optional[str] = None,
+             commodities: Optional[Iterable[str]] = None, markets: Optional[Iterable[str]] = None) -> Dict:
+    """
+    Fetch and store today's prices for every commodity (English names, default
+    COMMODITY_MAPPING) at every market (default MARKET_MAPPING). One commodity
+    failing does not stop the others.
+    """
+    from vaani.services.agriculture.agri_price_service import COMMODITY_MAPPING, MARKET_MAPPING
+
+    store = store or get_price_history()
+    api_key = api_key or os.getenv('AGMARKNET_API_KEY')
+    if not api_key:
+        raise RuntimeError("AGMARKNET_API_KEY not configured")
+    commodities = list(commodities or dict.fromkeys(COMMODITY_MAPPING.values()))
+    markets = list(markets or MARKET_MAPPING.values())
+
+    result = {'commodities': 0, 'pages': 0, 'rows': 0, 'errors': {}}
+    for commodity in commodities:
+        try:
+            rows, pages = fetch_commodity(commodity, api_key, markets)
+        except Exception as e:
+            logger.error(f"Price prefetch failed for {commodity}: {str(e)}")
+            result['errors'][commodity] = str(e)
+            continue
+        result['commodities'] += 1
+        result['pages'] += pages
+        result['rows'] += store.put_many(rows)
+    store.prune(Config.PRICE_HISTORY_RETENTION_DAYS)
+    logger.info(f"Price prefetch stored {result['rows']} prices for {result['commodities']} commodities "
+                f"in {result['pages']} requests")
+    return result
+
+
+class PricePrefetcher:
+    """Runs prefetch() every PRICE_PREFETCH_INTERVAL seconds in a daemon thread, while an API key is set"""
+
+    def __init__(self, store: Optional[PriceHistoryStore] = None, interval: Optional[float] = None):
+        self._store = store
+        self.interval = interval or Config.PRICE_PREFETCH_INTERVAL
+        self._thread = None
+        self._stop = threading.Event()
+        self.last_result = None
+
+    @property
+    def store(self) -> PriceHistoryStore:
+        return self._store or get_price_history()
+
+    def run_once(self) -> Optional[Dict]:
+        """Prefetch now unless another worker did within the interval; returns the result or None"""
+        if not os.getenv('AGMARKNET_API_KEY'):
+            return None
+        run_id = self.store.claim_run(self.interval)
+        if run_id is None:
+            return None
+        result = None
+        try:
+            result = prefetch(self.store)
+        finally:
+            errors = result['errors'] if result else {'run': 'failed'}
+            self.store.finish_run(run_id, result['rows'] if result else 0, "; ".join(errors) or None)
+        self.last_result = result
+        return result
+
+    def start(self) -> None:
+        """Prefetch now and then every interval in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def loop():
+            while True:
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.error(f"Price prefetcher failed: {str(e)}")
+                if self._stop.wait(self.interval):
+                    break
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, daemon=True, name='price-prefetcher')
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+# Global instances
+_price_history = None
+_price_prefetcher = None
+_price_history_lock = threading.Lock()
+
+
+def get_price_history() -> PriceHistoryStore:
+    """Get or create the global price history store"""
+    global _price_history
+    if _price_history is None:
+        with _price_history_lock:
+            if _price_history is None:
+                _price_history = PriceHistoryStore()
+    return _price_history
+
+
+def get_price_prefetcher() -> PricePrefetcher:
+    """Get or create the global price prefetcher"""
+    global _price_prefetcher
+    if _price_prefetcher is None:
+        with _price_history_lock:
+            if _price_prefetcher is None:
+                _price_prefetcher = PricePrefetcher()
+    return _price_prefetcher
+
+
+def main(argv=None) -> int:
+    """Fetch command: prefetch every price now; trend command: print a stored trend"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ("fetch", "trend") or (argv[0] == "trend" and len(argv) != 3):
+        print("Usage: python -m vaani.services.agriculture.price_history [fetch|trend <commodity> <market>]")
+        return 2
+
+    if argv[0] == "trend":
+        from vaani.services.agriculture.agri_price_service import get_price_trend
+        print(get_price_trend(argv[1], argv[2]) or "✗ No price history yet")
+        return 0
+
+    try:
+        result = prefetch()
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        return 1
+    print(f"Commodities:  {result['commodities']}")
+    print(f"API requests: {result['pages']}")
+    print(f"Prices saved: {result['rows']}")
+    for commodity, error in result['errors'].items():
+        print(f"✗ {commodity}: {error}")
+    stats = get_price_history().get_stats()
+    print(f"✓ {stats['prices']} prices from {stats['first_date']} to {stats['last_date']} in {PRICE_HISTORY_PATH}")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -111,7 +111,7 @@ class SMSIntegration:
         
         # Otherwise, attempt to send via API
         try:
-            import requests
+            from vaani.core import http
             
             headers = {
                 "Content-Type": "application/json",
@@ -124,7 +124,7 @@ class SMSIntegration:
                 "sender": self.config.get("shortcode", "VAANI")
             }
             
-            response = requests.post(
+            response = http.post(
                 provider["api_endpoint"],
                 json=data,
                 headers=headers,
@@ -275,17 +275,10 @@ class SMSIntegration:
         
         try:
             # Import the expense tracker module
-            from vaani.services.finance.expense_tracker_service import ExpenseTracker
+            from vaani.services.finance.expense_tracker_service import get_expense_tracker
             
-            tracker = ExpenseTracker()
-            
-            # Create user if not exists
-            user_file = os.path.join("expense_data", f"{user_id}_expenses.json")
-            if not os.path.exists(user_file):
-                tracker.create_user(user_id)
-            
-            # Process the expense details
-            result = tracker.handle_query(user_id, details)
+            # Process the expense details (the user is added on first use)
+            result = get_expense_tracker().handle_query(user_id, details)
             
             # Return a shortened version for SMS
             if isinstance(result, tuple):
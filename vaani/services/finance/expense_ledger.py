@@ -0,0 +1,261 @@
+"""
+Expense Ledger for Vaani
+Every user's transactions in one SQLite (WAL) file: an append-only log indexed
+by user and day/month, plus daily and monthly rollups per (type, category)
+kept up to date in the same write transaction as each append.
+
+Adding a transaction writes one log row and two rollup rows, and a day or
+month summary reads its rollup rows, so neither gets slower as a user's
+history grows. Each append is its own write transaction, so concurrent
+requests (threads or worker processes) for the same user never lose a
+write.
+
+Usage:
+    ledger = ExpenseLedger("expense_data/ledger.db")
+    ledger.ensure_user("u1")
+    ledger.append("u1", "expense", "खाना", 500, "500 रुपये सब्जी खरीदी")
+    ledger.summary("u1", "month", "2024-06")     # income, expense, balance, categories
+"""
+
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+import logging
+
+from vaani.core.sqlite_util import connect_local
+
+logger = logging.getLogger('expense_ledger')
+
+PERIODS = ('day', 'month')
+
+
+def transaction_periods(date):
+    """The rollup keys a transaction dated date (a datetime) counts towards"""
+    return {'day': date.date().isoformat(), 'month': date.strftime("%Y-%m")}
+
+
+class ExpenseLedger:
+    """
+    Transactions and rollups for all users.
+    Each thread has its own connection, so any number of threads and worker
+    processes can append to the same file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.execute("CREATE TABLE IF NOT EXISTS users ("
+                   "user_id TEXT PRIMARY KEY, name TEXT, created TEXT NOT NULL, last_updated TEXT NOT NULL)")
+        # The log: rows are only ever inserted; seq keeps the order they were added in
+        db.execute("CREATE TABLE IF NOT EXISTS transactions ("
+                   "seq INTEGER PRIMARY KEY, user_id TEXT NOT NULL, id TEXT NOT NULL, date TEXT NOT NULL, "
+                   "day TEXT NOT NULL, month TEXT NOT NULL, type TEXT NOT NULL, category TEXT NOT NULL, "
+                   "amount NUMERIC NOT NULL, description TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS transactions_day ON transactions (user_id, day)")
+        db.execute("CREATE INDEX IF NOT EXISTS transactions_month ON transactions (user_id, month)")
+        # A transaction id is added once per user, so importing the same rows again is harmless
+        db.execute("CREATE UNIQUE INDEX IF NOT EXISTS transactions_id ON transactions (user_id, id)")
+        # Totals per user, period ('day' or 'month'), type and category; first_seq keeps
+        # categories in the order they were first used, as the JSON summaries did
+        db.execute("CREATE TABLE IF NOT EXISTS rollups ("
+                   "user_id TEXT NOT NULL, period TEXT NOT NULL, key TEXT NOT NULL, type TEXT NOT NULL, "
+                   "category TEXT NOT NULL, amount NUMERIC NOT NULL, count INTEGER NOT NULL, "
+                   "first_seq INTEGER NOT NULL, PRIMARY KEY (user_id, period, key, type, category)) WITHOUT ROWID")
+
+    def _db(self):
+        return connect_local(self._local, self.path)
+
+    def has_user(self, user_id):
+        return self._db().execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+    def ensure_user(self, user_id, name=None, transactions=()):
+        """
+        Create user_id with the given earlier transactions (dicts in the JSON
+        file layout). Does nothing if the user exists; returns True if created.
+        """
+        now = datetime.now().isoformat()
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            created = db.execute("INSERT OR IGNORE INTO users (user_id, name, created, last_updated) "
+                                 "VALUES (?, ?, ?, ?)", (user_id, name, now, now)).rowcount == 1
+            if created:
+                for transaction in transactions:
+                    self._append(db, user_id, transaction)
+        return created
+
+    def append(self, user_id, type, category, amount, description='', date=None):
+        """
+        Add a transaction (now, unless date is given) and return it in the JSON file layout.
+        Raises sqlite3.IntegrityError if nothing was added.
+        """
+        date = date or datetime.now()
+        transaction = {
+            "id": uuid.uuid4().hex,
+            "date": date.isoformat(),
+            "type": type,
+            "category": category,
+            "amount": amount,
+            "description": description,
+            "month_year": date.strftime("%Y-%m")
+        }
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            if not self._append(db, user_id, transaction):
+                raise sqlite3.IntegrityError(f"Transaction {transaction['id']} already exists for {user_id}")
+            db.execute("UPDATE users SET last_updated = ? WHERE user_id = ?", (datetime.now().isoformat(), user_id))
+        return transaction
+
+    def append_many(self, transactions):
+        """
+        Add (user_id, transaction) pairs, transactions in the JSON file layout,
+        in one write transaction. Ids the user already has are skipped.
+        Returns the number added.
+        """
+        db = self._db()
+        now = datetime.now().isoformat()
+        added = 0
+        users = set()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            for user_id, transaction in transactions:
+                if self._append(db, user_id, transaction):
+                    added += 1
+                    users.add(user_id)
+            db.executemany("UPDATE users SET last_updated = ? WHERE user_id = ?", [(now, user) for user in users])
+        return added
+
+    def _append(self, db, user_id, transaction):
+        periods = transaction_periods(datetime.fromisoformat(transaction["date"]))
+        cursor = db.execute(
+            "INSERT OR IGNORE INTO transactions (user_id, id, date, day, month, type, category, amount, description) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (user_id, transaction.get("id") or uuid.uuid4().hex, transaction["date"], periods['day'],
+             transaction.get("month_year") or periods['month'], transaction["type"], transaction["category"],
+             transaction["amount"], transaction.get("description", '')))
+        if cursor.rowcount != 1:
+            return False
+        seq = cursor.lastrowid
+        db.executemany("INSERT INTO rollups (user_id, period, key, type, category, amount, count, first_seq) "
+                       "VALUES (?, ?, ?, ?, ?, ?, 1, ?) ON CONFLICT (user_id, period, key, type, category) "
+                       "DO UPDATE SET amount = amount + excluded.amount, count = count + 1",
+                       [(user_id, period, key, transaction["type"], transaction["category"],
+                         transaction["amount"], seq) for period, key in periods.items()])
+        return True
+
+    def summary(self, user_id, period, key):
+        """
+        Totals for one day ('2024-06-01') or month ('2024-06'):
+        {"income", "expense", "balance", "categories" (expense per category), "count"},
+        or None if the user has no transactions in it
+        """
+        rows = self._db().execute("SELECT type, category, amount, count FROM rollups "
+                                  "WHERE user_id = ? AND period = ? AND key = ? ORDER BY first_seq",
+                                  (user_id, period, key)).fetchall()
+        if not rows:
+            return None
+        summary = {"income": 0, "expense": 0, "balance": 0, "categories": {}, "count": 0}
+        for type, category, amount, count in rows:
+            summary["count"] += count
+            if type == "income":
+                summary["income"] += amount
+            else:
+                summary["expense"] += amount
+                summary["categories"][category] = summary["categories"].get(category, 0) + amount
+        summary["balance"] = summary["income"] - summary["expense"]
+        return summary
+
+    def transactions(self, user_id, period=None, key=None):
+        """A user's transactions, oldest first: all of them, or one day's or month's"""
+        sql = "SELECT id, date, type, category, amount, description, month FROM transactions WHERE user_id = ?"
+        params = (user_id,)
+        if period is not None:
+            if period not in PERIODS:
+                raise ValueError(f"Unknown period: {period}")
+            sql += f" AND {period} = ?"
+            params += (key,)
+        for id, date, type, category, amount, description, month in self._db().execute(sql + " ORDER BY seq", params):
+            yield {"id": id, "date": date, "type": type, "category": category, "amount": amount,
+                   "description": description, "month_year": month}
+
+    def scan(self, first_month=None, last_month=None):
+        """
+        Every user's transactions, in the order they were added, as
+        (user_id, transaction) pairs; optionally only months first..last
+        ('2024-06'). Rows are read as they are yielded, so memory does not grow
+        with the ledger.
+        """
+        sql, params = self._month_range("SELECT user_id, id, date, type, category, amount, description, month "
+                                        "FROM transactions", "month", first_month, last_month)
+        for user_id, id, date, type, category, amount, description, month in self._db().execute(
+                sql + " ORDER BY seq", params):
+            yield user_id, {"id": id, "date": date, "type": type, "category": category, "amount": amount,
+                            "description": description, "month_year": month}
+
+    def scan_rollups(self, period='month', first=None, last=None):
+        """(user_id, key, type, category, amount, count) rollup rows, grouped by user and then key"""
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        sql, params = self._month_range("SELECT user_id, key, type, category, amount, count FROM rollups "
+                                        "WHERE period = ?", "key", first, last, (period,))
+        yield from self._db().execute(sql + " ORDER BY user_id, key, first_seq", params)
+
+    @staticmethod
+    def _month_range(sql, column, first, last, params=()):
+        conditions = []
+        if first is not None:
+            conditions.append(f"{column} >= ?")
+            params += (first,)
+        if last is not None:
+            # '2024-06-30' sorts after '2024-06', so compare with the next key
+            conditions.append(f"{column} < ?")
+            params += (last + '\uffff',)
+        if conditions:
+            sql += (" AND " if " WHERE " in sql else " WHERE ") + " AND ".join(conditions)
+        return sql, params
+
+    def user(self, user_id):
+        row = self._db().execute("SELECT name, created, last_updated FROM users WHERE user_id = ?",
+                                 (user_id,)).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "created": row[1], "last_updated": row[2]}
+
+    def rebuild_rollups(self, user_id=None):
+        """Recompute rollups from the log (for one user or everyone); returns the rows written"""
+        where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+        db = self._db()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(f"DELETE FROM rollups {where}", params)
+            written = 0
+            for period in PERIODS:
+                written += db.execute(
+                    "INSERT INTO rollups (user_id, period, key, type, category, amount, count, first_seq) "
+                    f"SELECT user_id, ?, {period}, type, category, SUM(amount), COUNT(*), MIN(seq) "
+                    f"FROM transactions {where} GROUP BY user_id, {period}, type, category",
+                    (period, *params)).rowcount
+        return written
+
+    def compact(self):
+        """Rebuild the rollups, fold the WAL into the database and reclaim free pages"""
+        self.rebuild_rollups()
+        db = self._db()
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        db.execute("VACUUM")
+        logger.info(f"Compacted expense ledger {self.path}")
+
+    def get_stats(self):
+        db = self._db()
+        return {
+            'users': db.execute("SELECT COUNT(*) FROM users").fetchone()[0],
+            'transactions': db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0],
+            'rollups': db.execute("SELECT COUNT(*) FROM rollups").fetchone()[0],
+            'bytes': sum(os.path.getsize(self.path + suffix) for suffix in ('', '-wal')
+                         if os.path.exists(self.path + suffix))
+        }
@@ -0,0 +1,318 @@
+"""
+Expense Reports for Vaani
+Bulk CSV import, CSV/Parquet export and reports across many users' ledgers,
+for field coordinators who look after a whole village.
+
+Every command streams the ledger: a report reads the monthly rollups (the
+same totals users hear by voice) grouped by user and month, so memory grows
+with the number of months and categories, not with users or transactions.
+
+    python -m vaani.services.finance.expense_reports report [--from 2024-01] [--to 2024-06] [--users ids.txt] [--json]
+    python -m vaani.services.finance.expense_reports import transactions.csv
+    python -m vaani.services.finance.expense_reports export snapshot.parquet [--from 2024-01] [--to 2024-06]
+
+CSV files have the columns user_id, date, type, category, amount, description
+and optionally id. A missing type or category is detected from the
+description the same way as a voice command; a missing id is derived from the
+row and how many identical rows came before it in the file, so importing the
+same file twice adds its rows once and identical rows are all kept.
+"""
+
+import argparse
+import bisect
+import csv
+import hashlib
+import json
+import sys
+from datetime import datetime
+import logging
+
+from vaani.services.finance.expense_tracker_service import ExpenseTracker
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger('expense_reports')
+
+CSV_FIELDS = ["user_id", "id", "date", "type", "category", "amount", "description"]
+# Rows added (or written to Parquet) per batch
+BATCH_SIZE = 5000
+# Upper bounds of the rupee bands one user's monthly income or expense is counted in
+AMOUNT_BANDS = [0, 1000, 2500, 5000, 10000, 25000, 50000]
+
+
+def band_label(amount):
+    """The AMOUNT_BANDS band an amount falls in, e.g. '1001-2500' or '50000+'"""
+    index = bisect.bisect_left(AMOUNT_BANDS, amount)
+    if index == len(AMOUNT_BANDS):
+        return f"{AMOUNT_BANDS[-1]}+"
+    if index == 0:
+        return "0"
+    return f"{AMOUNT_BANDS[index - 1] + 1}-{AMOUNT_BANDS[index]}"
+
+
+def parse_row(tracker, row, seen=None):
+    """
+    A CSV row as (user_id, transaction); raises ValueError if it cannot be used.
+    seen counts the rows without an id read so far from the same file.
+    """
+    user_id = (row.get("user_id") or "").strip()
+    if not user_id:
+        raise ValueError("user_id is missing")
+    try:
+        date = datetime.fromisoformat((row.get("date") or "").strip())
+    except ValueError:
+        raise ValueError(f"date is not ISO formatted: {row.get('date')!r}")
+    try:
+        amount = float(row.get("amount") or "")
+    except ValueError:
+        raise ValueError(f"amount is not a number: {row.get('amount')!r}")
+    if amount <= 0:
+        raise ValueError(f"amount must be positive: {row.get('amount')!r}")
+
+    description = (row.get("description") or "").strip()
+    transaction_type = (row.get("type") or "").strip().lower() or tracker.detect_transaction_type(description)
+    if transaction_type not in ("income", "expense"):
+        raise ValueError(f"type must be income or expense: {row.get('type')!r}")
+    # Categories outside ExpenseTracker.categories are mapped the way a spoken word would be
+    category = (row.get("category") or "").strip()
+    if category not in tracker.categories:
+        category = tracker.detect_category(category or description)
+
+    amount = int(amount) if amount.is_integer() else amount
+    transaction_id = (row.get("id") or "").strip()
+    if not transaction_id:
+        material = (user_id, date.isoformat(), transaction_type, amount, description)
+        occurrence = 0
+        if seen is not None:
+            occurrence = seen.get(material, 0)
+            seen[material] = occurrence + 1
+        transaction_id = row_id(*material, occurrence=occurrence)
+    return user_id, {
+        "id": transaction_id,
+        "date": date.isoformat(),
+        "type": transaction_type,
+        "category": category,
+        "amount": amount,
+        "description": description,
+        "month_year": date.strftime("%Y-%m")
+    }
+
+
+def row_id(user_id, date, transaction_type, amount, description, occurrence=0):
+    """
+    Id for a CSV row without one: the same row always gets the same id, and
+    the nth identical row of a file (from 0) its own one
+    """
+    parts = [user_id, date, transaction_type, str(amount), description]
+    if occurrence:
+        parts.append(str(occurrence))
+    material = '\x00'.join(parts)
+    return hashlib.sha1(material.encode('utf-8')).hexdigest()[:32]
+
+
+def import_csv(tracker, lines, batch_size=BATCH_SIZE):
+    """
+    Add the transactions in a CSV file (an open file or any iterable of lines).
+    Rows whose id the user already has are skipped, so a file can be imported twice.
+    Returns {"rows", "added", "skipped", "errors": [(line number, message)]}.
+    """
+    result = {"rows": 0, "added": 0, "skipped": 0, "errors": []}
+    known_users = set()
+    seen = {}
+    batch = []
+
+    def flush():
+        added = tracker.ledger.append_many(batch)
+        result["added"] += added
+        result["skipped"] += len(batch) - added
+        batch.clear()
+
+    for line, row in enumerate(csv.DictReader(lines), 2):
+        result["rows"] += 1
+        try:
+            user_id, transaction = parse_row(tracker, row, seen)
+        except ValueError as e:
+            result["errors"].append((line, str(e)))
+            continue
+        if user_id not in known_users:
+            # New users bring in their legacy JSON history first
+            tracker.ensure_user(user_id)
+            known_users.add(user_id)
+        batch.append((user_id, transaction))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    logger.info(f"Imported {result['added']} of {result['rows']} transactions")
+    return result
+
+
+def export(ledger, path, first_month=None, last_month=None, batch_size=BATCH_SIZE):
+    """
+    Write every transaction (optionally only months first..last) to path:
+    Parquet if it ends in .parquet (needs pyarrow), CSV otherwise.
+    Returns the number of rows written.
+    """
+    rows = ledger.scan(first_month, last_month)
+    if path.endswith(".parquet"):
+        return _export_parquet(rows, path, batch_size)
+
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for user_id, t in rows:
+            writer.writerow([user_id, t["id"], t["date"], t["type"], t["category"], t["amount"], t["description"]])
+            written += 1
+    return written
+
+
+def _export_parquet(rows, path, batch_size):
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow); use a .csv path instead")
+    schema = pa.schema([("user_id", pa.string()), ("id", pa.string()), ("date", pa.string()),
+                        ("month", pa.string()), ("type", pa.string()), ("category", pa.string()),
+                        ("amount", pa.float64()), ("description", pa.string())])
+    columns = {name: [] for name in schema.names}
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for user_id, t in rows:
+            for name, value in (("user_id", user_id), ("id", t["id"]), ("date", t["date"]),
+                                ("month", t["month_year"]), ("type", t["type"]), ("category", t["category"]),
+                                ("amount", float(t["amount"])), ("description", t["description"])):
+                columns[name].append(value)
+            written += 1
+            if len(columns["id"]) >= batch_size:
+                writer.write_batch(pa.record_batch(list(columns.values()), schema=schema))
+                columns = {name: [] for name in schema.names}
+        if columns["id"]:
+            writer.write_batch(pa.record_batch(list(columns.values()), schema=schema))
+    return written
+
+
+def build_report(tracker, users=None, first_month=None, last_month=None):
+    """
+    Totals across users (all, or the given user ids) in one pass over the monthly rollups:
+    - months: income, expense, balance and active users per month
+    - categories: expense per category, in ExpenseTracker.categories order
+    - distribution: user-months per AMOUNT_BANDS band of income and of expense,
+      and how many user-months saved money or spent more than they earned
+    """
+    report = {
+        "users": 0,
+        "months": {},
+        "categories": {},
+        "distribution": {"income": {}, "expense": {}, "saved": 0, "overspent": 0}
+    }
+    current, totals = None, None
+    last_user = None
+
+    def close(user_month, totals):
+        month = report["months"].setdefault(user_month[1], {"income": 0, "expense": 0, "balance": 0, "users": 0})
+        month["income"] += totals["income"]
+        month["expense"] += totals["expense"]
+        month["balance"] += totals["income"] - totals["expense"]
+        month["users"] += 1
+        distribution = report["distribution"]
+        for kind in ("income", "expense"):
+            band = band_label(totals[kind])
+            distribution[kind][band] = distribution[kind].get(band, 0) + 1
+        distribution["saved" if totals["income"] >= totals["expense"] else "overspent"] += 1
+
+    for user_id, month, kind, category, amount, count in tracker.ledger.scan_rollups('month', first_month, last_month):
+        if users is not None and user_id not in users:
+            continue
+        if (user_id, month) != current:
+            if current is not None:
+                close(current, totals)
+            current, totals = (user_id, month), {"income": 0, "expense": 0}
+            if user_id != last_user:
+                report["users"] += 1
+                last_user = user_id
+        totals["income" if kind == "income" else "expense"] += amount
+        if kind != "income":
+            report["categories"][category] = report["categories"].get(category, 0) + amount
+    if current is not None:
+        close(current, totals)
+
+    order = list(tracker.categories) + ["अन्य"]
+    report["months"] = dict(sorted(report["months"].items()))
+    report["categories"] = dict(sorted(report["categories"].items(),
+                                       key=lambda item: (order.index(item[0]) if item[0] in order else len(order),
+                                                         item[0])))
+    bands = [band_label(bound) for bound in AMOUNT_BANDS] + [band_label(AMOUNT_BANDS[-1] + 1)]
+    for kind in ("income", "expense"):
+        counts = report["distribution"][kind]
+        report["distribution"][kind] = {band: counts[band] for band in bands if band in counts}
+    return report
+
+
+def format_report(report):
+    lines = [f"Users: {report['users']}", "", "Month      Users     Income    Expense    Balance"]
+    for month, totals in report["months"].items():
+        lines.append(f"{month}  {totals['users']:>6} {totals['income']:>10} {totals['expense']:>10} "
+                     f"{totals['balance']:>10}")
+    lines += ["", "Expense by category:"]
+    lines += [f"  {category}: {amount}" for category, amount in report["categories"].items()]
+    distribution = report["distribution"]
+    for kind in ("income", "expense"):
+        lines += ["", f"Monthly {kind} per user (user-months):"]
+        lines += [f"  {band:>11}: {count}" for band, count in distribution[kind].items()]
+    lines += ["", f"Saved: {distribution['saved']} user-months, spent more than earned: {distribution['overspent']}"]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Report, import and export commands for the expense ledger"""
+    parser = argparse.ArgumentParser(prog="python -m vaani.services.finance.expense_reports")
+    parser.add_argument("--data-dir", default="expense_data", help="ExpenseTracker data directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report_parser = commands.add_parser("report", help="totals across users")
+    report_parser.add_argument("--users", help="file with one user id per line (default: all users)")
+    report_parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    import_parser = commands.add_parser("import", help="add transactions from a CSV file")
+    import_parser.add_argument("path")
+    export_parser = commands.add_parser("export", help="write transactions to a .csv or .parquet file")
+    export_parser.add_argument("path")
+    for command in (report_parser, export_parser):
+        command.add_argument("--from", dest="first", help="first month, e.g. 2024-01")
+        command.add_argument("--to", dest="last", help="last month, e.g. 2024-06")
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    tracker = ExpenseTracker(args.data_dir)
+    if args.command == "report":
+        users = None
+        if args.users:
+            with open(args.users, encoding='utf-8') as f:
+                users = {line.strip() for line in f if line.strip()}
+        report = build_report(tracker, users, args.first, args.last)
+        print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_report(report))
+        return 0
+
+    if args.command == "import":
+        with open(args.path, encoding='utf-8-sig', newline='') as f:
+            result = import_csv(tracker, f)
+        print(f"Rows:    {result['rows']}")
+        print(f"Added:   {result['added']}")
+        print(f"Skipped: {result['skipped']} (already in the ledger)")
+        for line, error in result["errors"]:
+            print(f"✗ line {line}: {error}")
+        return 1 if result["errors"] else 0
+
+    try:
+        written = export(tracker.ledger, args.path, args.first, args.last)
+    except RuntimeError as e:
+        print(f"✗ {e}")
+        return 1
+    print(f"✓ Wrote {written} transactions to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
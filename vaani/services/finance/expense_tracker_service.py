@@ -8,8 +8,12 @@ import os
 import json
 from datetime import datetime, timedelta
 import logging
+import sqlite3
+import threading
 import uuid
 
+from vaani.services.finance.expense_ledger import ExpenseLedger
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +28,7 @@ class ExpenseTracker:
         """Initialize the expense tracker with data directory"""
         self.data_dir = data_dir
         self.ensure_data_dir()
+        self.ledger = ExpenseLedger(os.path.join(data_dir, "ledger.db"))
         self.categories = {
             "खाना": ["खाना", "भोजन", "राशन", "सब्जी", "फल", "दूध", "चावल", "गेहूं", "आटा"],
             "किराना": ["किराना", "साबुन", "तेल", "मसाला", "चीनी", "नमक"],
@@ -45,48 +50,47 @@ class ExpenseTracker:
             logger.info(f"Created data directory: {self.data_dir}")
     
     def get_user_data_path(self, user_id):
-        """Get the user data file path"""
+        """Get the legacy per-user JSON file path"""
         return os.path.join(self.data_dir, f"{user_id}_expenses.json")
     
-    def load_user_data(self, user_id):
-        """Load user's expense data"""
+    def ensure_user(self, user_id, name=None):
+        """Add user_id to the ledger, with the transactions from its legacy JSON file if there is one"""
+        if self.ledger.has_user(user_id):
+            return False
+        data = {}
         data_path = self.get_user_data_path(user_id)
         if os.path.exists(data_path):
             try:
                 with open(data_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except json.JSONDecodeError:
                 logger.error(f"Error decoding data file: {data_path}")
-                return self.initialize_user_data()
-        return self.initialize_user_data()
+        transactions = data.get("transactions", [])
+        if self.ledger.ensure_user(user_id, data.get("name", name), transactions) and transactions:
+            logger.info(f"Imported {len(transactions)} transactions for user {user_id} from {data_path}")
+        return True
     
-    def initialize_user_data(self):
-        """Create a new user data structure"""
-        return {
-            "transactions": [],
+    def load_user_data(self, user_id):
+        """User's whole history in the legacy JSON layout (summaries do not need this)"""
+        user = self.ledger.user(user_id) or {}
+        transactions = list(self.ledger.transactions(user_id))
+        data = {
+            "transactions": transactions,
             "monthly_summary": {},
-            "last_updated": datetime.now().isoformat()
+            "last_updated": user.get("last_updated", datetime.now().isoformat())
         }
-    
-    def save_user_data(self, user_id, data):
-        """Save user's expense data"""
-        data_path = self.get_user_data_path(user_id)
-        try:
-            with open(data_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.info(f"Updated data for user {user_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving data for user {user_id}: {str(e)}")
-            return False
+        if user.get("name"):
+            data["name"] = user["name"]
+        for month_year in dict.fromkeys(t["month_year"] for t in transactions):
+            summary = self.ledger.summary(user_id, 'month', month_year)
+            summary.pop("count")
+            data["monthly_summary"][month_year] = summary
+        return data
     
     def create_user(self, name=None):
         """Create a new user"""
         user_id = str(uuid.uuid4())[:8]
-        data = self.initialize_user_data()
-        if name:
-            data["name"] = name
-        self.save_user_data(user_id, data)
+        self.ledger.ensure_user(user_id, name)
         return user_id
     
     def detect_transaction_type(self, command):
@@ -142,84 +146,29 @@ class ExpenseTracker:
         if not amount:
             return "मुझे राशि समझ नहीं आई। कृपया फिर से बताएं, जैसे '500 रुपये सब्जी खरीदी'", None
         
-        # Load user data
-        user_data = self.load_user_data(user_id)
-        
-        # Create transaction
-        transaction = {
-            "id": str(uuid.uuid4())[:8],
-            "date": datetime.now().isoformat(),
-            "type": transaction_type,
-            "category": category,
-            "amount": amount,
-            "description": command,
-            "month_year": datetime.now().strftime("%Y-%m")
-        }
-        
-        # Add to transactions
-        user_data["transactions"].append(transaction)
-        
-        # Update monthly summary
-        month_year = transaction["month_year"]
-        if month_year not in user_data["monthly_summary"]:
-            user_data["monthly_summary"][month_year] = {
-                "income": 0,
-                "expense": 0,
-                "balance": 0,
-                "categories": {}
-            }
+        self.ensure_user(user_id)
+        try:
+            transaction = self.ledger.append(user_id, transaction_type, category, amount, command)
+        except sqlite3.Error as e:
+            logger.error(f"Error saving transaction for user {user_id}: {str(e)}")
+            return "खर्चा जोड़ने में समस्या आई, कृपया फिर से कोशिश करें", None
         
-        # Update the amounts
         if transaction_type == "income":
-            user_data["monthly_summary"][month_year]["income"] += amount
+            return f"आमदनी जोड़ दी गई: {amount} रुपये", transaction
         else:
-            user_data["monthly_summary"][month_year]["expense"] += amount
-            
-            # Update category amount
-            if category not in user_data["monthly_summary"][month_year]["categories"]:
-                user_data["monthly_summary"][month_year]["categories"][category] = 0
-                
-            user_data["monthly_summary"][month_year]["categories"][category] += amount
-        
-        # Calculate balance
-        user_data["monthly_summary"][month_year]["balance"] = (
-            user_data["monthly_summary"][month_year]["income"] - 
-            user_data["monthly_summary"][month_year]["expense"]
-        )
-        
-        # Save user data
-        if self.save_user_data(user_id, user_data):
-            if transaction_type == "income":
-                return f"आमदनी जोड़ दी गई: {amount} रुपये", transaction
-            else:
-                return f"खर्चा जोड़ दिया गया: {amount} रुपये, श्रेणी: {category}", transaction
-        else:
-            return "खर्चा जोड़ने में समस्या आई, कृपया फिर से कोशिश करें", None
+            return f"खर्चा जोड़ दिया गया: {amount} रुपये, श्रेणी: {category}", transaction
 
     def get_today_summary(self, user_id):
         """Get summary of today's transactions"""
-        user_data = self.load_user_data(user_id)
         today = datetime.now().date().isoformat()
+        summary = self.ledger.summary(user_id, 'day', today)
         
-        today_income = 0
-        today_expense = 0
-        transactions = []
-        
-        for transaction in user_data["transactions"]:
-            trans_date = datetime.fromisoformat(transaction["date"]).date().isoformat()
-            if trans_date == today:
-                transactions.append(transaction)
-                if transaction["type"] == "income":
-                    today_income += transaction["amount"]
-                else:
-                    today_expense += transaction["amount"]
-        
-        if not transactions:
+        if not summary:
             return "आज कोई लेनदेन नहीं किया गया है।"
         
-        response = f"आज का हिसाब: आमदनी {today_income} रुपये, खर्च {today_expense} रुपये, बचत {today_income - today_expense} रुपये।\n\n"
+        response = f"आज का हिसाब: आमदनी {summary['income']} रुपये, खर्च {summary['expense']} रुपये, बचत {summary['balance']} रुपये।\n\n"
         
-        for i, t in enumerate(transactions, 1):
+        for i, t in enumerate(self.ledger.transactions(user_id, 'day', today), 1):
             type_str = "आमदनी" if t["type"] == "income" else "खर्च"
             response += f"{i}. {type_str}: {t['amount']} रुपये - {t['category']}\n"
             
@@ -227,18 +176,15 @@ class ExpenseTracker:
 
     def get_monthly_summary(self, user_id, month_offset=0):
         """Get monthly summary with optional offset (0=current month, -1=last month)"""
-        user_data = self.load_user_data(user_id)
-        
         target_date = datetime.now() - timedelta(days=30 * month_offset)
         month_year = target_date.strftime("%Y-%m")
         
         month_name = self.get_hindi_month_name(target_date.month)
         
-        if month_year not in user_data["monthly_summary"]:
+        monthly_data = self.ledger.summary(user_id, 'month', month_year)
+        if not monthly_data:
             return f"{month_name} {target_date.year} का कोई हिसाब नहीं मिला।"
         
-        monthly_data = user_data["monthly_summary"][month_year]
-        
         response = f"{month_name} {target_date.year} का मासिक हिसाब:\n\n"
         response += f"कुल आमदनी: {monthly_data['income']} रुपये\n"
         response += f"कुल खर्च: {monthly_data['expense']} रुपये\n"
@@ -262,6 +208,7 @@ class ExpenseTracker:
     def handle_query(self, user_id, query):
         """Handle natural language queries about expenses"""
         query_lower = query.lower()
+        self.ensure_user(user_id)
         
         # Check for summary requests
         if any(keyword in query_lower for keyword in ["आज का हिसाब", "आज का खर्च", "आज कितना"]):
@@ -278,20 +225,23 @@ class ExpenseTracker:
         # General query - try to parse as a transaction
         return self.add_transaction(user_id, query)
 
+# Global instance
+_tracker = None
+_tracker_lock = threading.Lock()
+
+def get_expense_tracker():
+    """Get or create the global expense tracker"""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ExpenseTracker()
+    return _tracker
+
 # Example usage
 def handle_expense_command(command, user_id="demo_user"):
     """Process expense tracking command"""
-    if not os.path.exists("expense_data"):
-        os.makedirs("expense_data")
-        
-    tracker = ExpenseTracker()
-    
-    # Create user if not exists
-    user_file = os.path.join("expense_data", f"{user_id}_expenses.json")
-    if not os.path.exists(user_file):
-        tracker.create_user(user_id)
-    
-    return tracker.handle_query(user_id, command)
+    return get_expense_tracker().handle_query(user_id, command)
 
 # Integration function for main.py
 def process_expense_command(command, user_id="default_user"):
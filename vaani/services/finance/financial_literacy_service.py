@@ -8,8 +8,42 @@ import os
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from vaani.core.answer_cache import get_answer_cache, template_key
+from vaani.services.finance import hindi_arithmetic
+
 load_dotenv()
 
+# Prompt optimized for illiterate users - VERY SHORT
+EXPLANATION_PROMPT = """
+            एक अनपढ़ व्यक्ति से बात कर रहे हो। बहुत छोटा जवाब दो।
+            
+            सवाल: {query}
+            
+            नियम:
+            1. केवल 2-3 छोटे वाक्य (maximum 30-40 words)
+            2. बहुत आसान हिंदी, कोई अंग्रेजी नहीं
+            3. रोज़मर्रा का उदाहरण दो
+            4. तकनीकी शब्द बिल्कुल नहीं
+            
+            बहुत छोटा जवाब दो (2-3 वाक्य):
+            """
+
+GUIDE_PROMPT = """
+            एक अनपढ़ व्यक्ति को बताओ: {task}
+            
+            नियम:
+            1. केवल 3-4 मुख्य चरण (बहुत छोटे)
+            2. हर चरण में 1-2 वाक्य
+            3. कुल 40-50 शब्द maximum
+            4. बहुत आसान हिंदी, कोई अंग्रेजी नहीं
+            
+            बहुत छोटा जवाब दो:
+            """
+
+EXPLANATION_TEMPLATE = template_key('financial_explanation', EXPLANATION_PROMPT)
+GUIDE_TEMPLATE = template_key('financial_guide', GUIDE_PROMPT)
+
+
 class FinancialLiteracyService:
     def __init__(self):
         """Initialize financial literacy service"""
@@ -56,6 +90,13 @@ class FinancialLiteracyService:
                 'help': 'पैसे का हिसाब रखना, खर्च कम करना, बचत बढ़ाना'
             }
         }
+        
+        # Phrases that suggest someone is trying to scam the user
+        self.scam_keywords = [
+            'otp दो', 'pin बताओ', 'पासवर्ड दो', 'account number बताओ',
+            'कार्ड नंबर', 'cvv', 'लॉटरी जीती', 'इनाम मिला', 
+            'मुफ्त पैसे', 'free money', 'link पर click'
+        ]
     
     def is_configured(self):
         """Check if Gemini API is configured"""
@@ -110,21 +151,12 @@ class FinancialLiteracyService:
         if not self.is_configured():
             return None, "Financial literacy service not available"
         
+        cached = get_answer_cache().get(EXPLANATION_TEMPLATE, query)
+        if cached:
+            return cached, None
+        
         try:
-            # Create a prompt optimized for illiterate users - VERY SHORT
-            prompt = f"""
-            एक अनपढ़ व्यक्ति से बात कर रहे हो। बहुत छोटा जवाब दो।
-            
-            सवाल: {query}
-            
-            नियम:
-            1. केवल 2-3 छोटे वाक्य (maximum 30-40 words)
-            2. बहुत आसान हिंदी, कोई अंग्रेजी नहीं
-            3. रोज़मर्रा का उदाहरण दो
-            4. तकनीकी शब्द बिल्कुल नहीं
-            
-            बहुत छोटा जवाब दो (2-3 वाक्य):
-            """
+            prompt = EXPLANATION_PROMPT.format(query=query)
             
             response = self.model.generate_content(prompt)
             
@@ -135,6 +167,7 @@ class FinancialLiteracyService:
                 clean_text = '\n'.join(clean_lines)
                 # Remove markdown formatting that causes issues in TTS
                 clean_text = clean_text.replace('**', '')
+                get_answer_cache().put(EXPLANATION_TEMPLATE, query, clean_text)
                 return clean_text, None
             else:
                 return None, "व्याख्या नहीं मिली"
@@ -151,18 +184,12 @@ class FinancialLiteracyService:
         if not self.is_configured():
             return None, "Service not available"
         
+        cached = get_answer_cache().get(GUIDE_TEMPLATE, task)
+        if cached:
+            return cached, None
+        
         try:
-            prompt = f"""
-            एक अनपढ़ व्यक्ति को बताओ: {task}
-            
-            नियम:
-            1. केवल 3-4 मुख्य चरण (बहुत छोटे)
-            2. हर चरण में 1-2 वाक्य
-            3. कुल 40-50 शब्द maximum
-            4. बहुत आसान हिंदी, कोई अंग्रेजी नहीं
-            
-            बहुत छोटा जवाब दो:
-            """
+            prompt = GUIDE_PROMPT.format(task=task)
             
             response = self.model.generate_content(prompt)
             
@@ -173,6 +200,7 @@ class FinancialLiteracyService:
                 clean_text = '\n'.join(clean_lines)
                 # Remove markdown formatting that causes issues in TTS
                 clean_text = clean_text.replace('**', '')
+                get_answer_cache().put(GUIDE_TEMPLATE, task, clean_text)
                 return clean_text, None
             else:
                 return None, "गाइड नहीं मिली"
@@ -182,15 +210,9 @@ class FinancialLiteracyService:
     
     def warn_about_scam(self, query):
         """Detect potential scam scenarios and warn user"""
-        scam_keywords = [
-            'otp दो', 'pin बताओ', 'पासवर्ड दो', 'account number बताओ',
-            'कार्ड नंबर', 'cvv', 'लॉटरी जीती', 'इनाम मिला', 
-            'मुफ्त पैसे', 'free money', 'link पर click'
-        ]
-        
         query_lower = query.lower()
         
-        for keyword in scam_keywords:
+        for keyword in self.scam_keywords:
             if keyword in query_lower:
                 return True, """
                 ⚠️ धोखाधड़ी की चेतावनी! ⚠️
@@ -232,6 +254,10 @@ def handle_financial_query(query, voice_output_func):
         voice_output_func(warning)
         return True
     
+    # "10000 रुपये पर 8 प्रतिशत ब्याज 2 साल का" is a sum for the calculator, not a topic
+    if hindi_arithmetic.solve(query) is not None:
+        return False
+    
     # Detect if it's a financial query
     is_financial, topic = service.detect_financial_query(query)
     
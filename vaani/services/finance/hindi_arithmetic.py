@@ -0,0 +1,455 @@
+"""
+Local arithmetic for spoken Hindi/Hinglish calculation queries
+Parses number words (including "साढ़े तीन", "डेढ़ सौ", "सवा लाख"), units,
+percentages, simple interest, per-unit rates and proportions, and explains
+the answer step by step in the same format the Gemini prompt asks for.
+
+solve() returns None for anything it cannot parse with confidence, so the
+caller can fall back to Gemini.
+"""
+
+import re
+import unicodedata
+from collections import namedtuple
+
+# Every Hindi number name below one hundred (without nukta; see _key)
+HINDI_NUMBERS = {
+    'शून्य': 0, 'एक': 1, 'दो': 2, 'तीन': 3, 'चार': 4, 'पांच': 5, 'छह': 6, 'छः': 6, 'छे': 6,
+    'सात': 7, 'आठ': 8, 'नौ': 9, 'दस': 10, 'ग्यारह': 11, 'बारह': 12, 'तेरह': 13, 'चौदह': 14,
+    'पंद्रह': 15, 'पन्द्रह': 15, 'सोलह': 16, 'सत्रह': 17, 'अठारह': 18, 'उन्नीस': 19, 'बीस': 20,
+    'इक्कीस': 21, 'बाईस': 22, 'तेईस': 23, 'चौबीस': 24, 'पच्चीस': 25, 'छब्बीस': 26, 'सत्ताईस': 27,
+    'अट्ठाईस': 28, 'उनतीस': 29, 'तीस': 30, 'इकतीस': 31, 'बत्तीस': 32, 'तैंतीस': 33, 'चौंतीस': 34,
+    'पैंतीस': 35, 'छत्तीस': 36, 'सैंतीस': 37, 'अडतीस': 38, 'उनतालीस': 39, 'चालीस': 40,
+    'इकतालीस': 41, 'बयालीस': 42, 'तैंतालीस': 43, 'चवालीस': 44, 'पैंतालीस': 45, 'छियालीस': 46,
+    'सैंतालीस': 47, 'अडतालीस': 48, 'उनचास': 49, 'पचास': 50, 'इक्यावन': 51, 'बावन': 52,
+    'तिरपन': 53, 'चौवन': 54, 'पचपन': 55, 'छप्पन': 56, 'सत्तावन': 57, 'अट्ठावन': 58, 'उनसठ': 59,
+    'साठ': 60, 'इकसठ': 61, 'बासठ': 62, 'तिरसठ': 63, 'चौंसठ': 64, 'पैंसठ': 65, 'छियासठ': 66,
+    'सडसठ': 67, 'अडसठ': 68, 'उनहत्तर': 69, 'सत्तर': 70, 'इकहत्तर': 71, 'बहत्तर': 72,
+    'तिहत्तर': 73, 'चौहत्तर': 74, 'पचहत्तर': 75, 'छिहत्तर': 76, 'सतहत्तर': 77, 'अठहत्तर': 78,
+    'उन्यासी': 79, 'अस्सी': 80, 'इक्यासी': 81, 'बयासी': 82, 'तिरासी': 83, 'चौरासी': 84,
+    'पचासी': 85, 'छियासी': 86, 'सत्तासी': 87, 'अट्ठासी': 88, 'नवासी': 89, 'नब्बे': 90,
+    'इक्यानवे': 91, 'बानवे': 92, 'तिरानवे': 93, 'चौरानवे': 94, 'पचानवे': 95, 'छियानवे': 96,
+    'सत्तानवे': 97, 'अट्ठानवे': 98, 'निन्यानवे': 99,
+    # Fractions spoken on their own
+    'आधा': 0.5, 'आधी': 0.5, 'आधे': 0.5, 'पाव': 0.25, 'डेढ': 1.5, 'ढाई': 2.5,
+}
+
+ENGLISH_NUMBERS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19, 'twenty': 20,
+    'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+    'half': 0.5,
+}
+
+MULTIPLIERS = {
+    'सौ': 100, 'हजार': 1000, 'लाख': 100000, 'करोड': 10000000,
+    'hundred': 100, 'thousand': 1000, 'lakh': 100000, 'lac': 100000, 'crore': 10000000,
+}
+
+# "साढ़े तीन" = 3.5, "सवा सौ" = 125, "पौने दो" = 1.75
+PREFIXES = {'साढे': 0.5, 'सवा': 0.25, 'पौने': -0.25}
+
+# Spelling variants of units, so "2 एकड़ ... 5 एकड़" and "₹40 ... 40 रुपये" line up
+UNIT_ALIASES = {
+    'रुपये': 'रुपये', 'रुपया': 'रुपये', 'रुपए': 'रुपये', 'रूपये': 'रुपये', 'रूपए': 'रुपये', '₹': 'रुपये',
+    'rs': 'रुपये', 'rupees': 'रुपये', 'rupee': 'रुपये', 'रु': 'रुपये',
+    'किलो': 'किलो', 'kg': 'किलो', 'kilo': 'किलो', 'किलोग्राम': 'किलो',
+    'साल': 'साल', 'वर्ष': 'साल', 'बरस': 'साल', 'year': 'साल', 'years': 'साल',
+    'महीने': 'महीने', 'महीना': 'महीने', 'माह': 'महीने', 'month': 'महीने', 'months': 'महीने',
+    'एकड': 'एकड़', 'acre': 'एकड़', 'acres': 'एकड़',
+    'लीटर': 'लीटर', 'litre': 'लीटर', 'liter': 'लीटर',
+}
+MONEY = 'रुपये'
+
+# Words that are never a unit, however they follow a number
+NOT_UNITS = {
+    'और', 'में', 'से', 'का', 'की', 'के', 'को', 'है', 'हैं', 'था', 'थे', 'तो', 'पर', 'या', 'हर', 'प्रति',
+    'कितना', 'कितने', 'कितनी', 'कुल', 'मिलाकर', 'बचे', 'बचा', 'बची', 'x', 'and', 'of', 'in', 'is',
+    'per', 'each', 'for', 'the', 'लिए', 'वाले', 'वाला', 'ही', 'भी', 'रोज', 'रोजाना', 'सैकडा',
+}
+
+# Operation keywords: (exact tokens, token prefixes)
+OPERATIONS = {
+    'interest': (set(), ('ब्याज', 'सूद', 'interest')),
+    'percent': ({'%', 'प्रतिशत', 'percent', 'फीसदी', 'फीसद'}, ()),
+    'divide': ({'÷', '/'}, ('भाग', 'बांट', 'divid', 'हिस्स')),
+    'subtract': ({'-', 'कम', 'minus', 'बचा', 'बचे', 'बची'}, ('घटा', 'subtract', 'निकाल', 'खर्च')),
+    'rate': ({'हर', 'प्रति', 'per', 'each', 'रोज', 'रोजाना', 'भाव', 'रेट'}, ()),
+    'multiply': ({'x', '×', '*', 'बार', 'times'}, ('गुणा', 'गुना', 'multipl')),
+    'add': ({'+', 'और', 'plus', 'and'}, ('जोड', 'add', 'मिला')),
+}
+INCREASE_WORDS = ('बढ', 'ज्यादा', 'अधिक', 'increase', 'जोड')
+DISCOUNT_WORDS = ('छूट', 'discount', 'घट', 'कम', 'off')
+UNSUPPORTED_WORDS = ('चक्रवृद्धि', 'compound', 'वर्गमूल', 'root', 'घात', 'power', 'औसत', 'average')
+# "बचाता", "बचत" (save) are neither a unit nor subtraction; only "बचा/बचे/बची" (left) subtract
+SAVE_WORDS = ('बच', 'save')
+# A query may use only one of these; "10 में 2 जोड़ो और 3 घटाओ" is left to Gemini
+BASIC_OPERATIONS = ('divide', 'subtract', 'rate', 'multiply', 'add')
+
+# An operation verb right before "दो" makes it "give", not two ("जोड़ दो")
+_VERB_STEMS = ('जोड', 'घटा', 'गुणा', 'भाग', 'बांट', 'बता', 'कर', 'निकाल', 'समझा', 'दे')
+# ...but after these it is always the number ("तीन और दो", "पौने दो")
+_BEFORE_NUMBER = {'और', '+', 'and', 'plus'} | set(PREFIXES)
+# The number after these words is the rate ("हर दर्जन 60 रुपये")
+_EACH_WORDS = {'हर', 'प्रति', 'per', 'each'}
+
+_DEVANAGARI_DIGITS = str.maketrans('०१२३४५६७८९', '0123456789')
+_TOKENS = re.compile(r"\d+(?:\.\d+)?|[+\-*/×÷%₹]|[ऀ-ॣ०-ॿ]+|[a-z]+")
+
+Token = namedtuple('Token', 'text key')
+Quantity = namedtuple('Quantity', 'value unit position end')
+Solution = namedtuple('Solution', 'operation value unit explanation')
+
+
+def _key(text):
+    """Matching form of a word: no nukta, chandrabindu as anusvara"""
+    return unicodedata.normalize('NFC', unicodedata.normalize('NFD', text).replace('़', '')).replace('ँ', 'ं')
+
+
+def tokenize(query):
+    text = unicodedata.normalize('NFC', query).lower().translate(_DEVANAGARI_DIGITS)
+    text = re.sub(r'(?<=\d),(?=\d)', '', text)       # 1,000 -> 1000
+    text = re.sub(r'(?<=\d)x(?=\d)', ' x ', text)     # 5x50 -> 5 x 50
+    return [Token(t, _key(t)) for t in _TOKENS.findall(text)]
+
+
+def format_number(value):
+    """12 not 12.0; at most two decimals"""
+    value = round(value, 2)
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.2f}".rstrip('0')
+
+
+def _small_number(token):
+    if re.fullmatch(r"\d+(?:\.\d+)?", token.key):
+        return float(token.key)
+    if token.key in HINDI_NUMBERS:
+        return float(HINDI_NUMBERS[token.key])
+    return ENGLISH_NUMBERS.get(token.key)
+
+
+def _read_number(tokens, i):
+    """(value, index after the number) for a spoken number starting at tokens[i], or None"""
+    total, group, prefix, start = 0.0, None, None, i
+    after_hundred = False
+    while i < len(tokens):
+        token = tokens[i]
+        small = _small_number(token)
+        if token.key in PREFIXES and prefix is None and group is None:
+            prefix = PREFIXES[token.key]
+        elif small is not None and (group is None or after_hundred):
+            if token.key == 'दो' and _is_verb_do(tokens, i):
+                break
+            if prefix is not None:
+                small += prefix
+                prefix = None
+            group = (group or 0) + small
+            after_hundred = False
+        elif token.key in MULTIPLIERS and (group is not None or prefix is not None):
+            if group is None:
+                group, prefix = 1 + prefix, None
+            multiplier = MULTIPLIERS[token.key]
+            if multiplier == 100:
+                group *= 100
+                after_hundred = True
+            else:
+                total += group * multiplier
+                group, after_hundred = None, True
+        else:
+            break
+        i += 1
+    if group is None and total == 0 and i == start:
+        return None
+    if prefix is not None and group is None and total == 0:
+        return None
+    return total + (group or 0), i
+
+
+def _is_verb_do(tokens, i):
+    """
+    "दो" is "give" right after an operation verb, or at the end of a query
+    that already had a number, unless it is joined on ("तीन और दो")
+    """
+    if i == 0:
+        return False
+    if tokens[i - 1].key.startswith(_VERB_STEMS):
+        return True
+    if i < len(tokens) - 1 or tokens[i - 1].key in _BEFORE_NUMBER:
+        return False
+    return any(_small_number(t) is not None or t.key in MULTIPLIERS for t in tokens[:i])
+
+
+def quantities(tokens):
+    """Every number in the query with the unit word that follows it"""
+    found, i = [], 0
+    while i < len(tokens):
+        if tokens[i].key == 'एक' and i > 0 and tokens[i - 1].key == 'हर':
+            i += 1                                    # "हर एक को" means "each"
+            continue
+        number = _read_number(tokens, i)
+        if number is None:
+            i += 1
+            continue
+        value, end = number
+        unit = None
+        if i > 0 and tokens[i - 1].key == '₹':
+            unit = MONEY
+        elif end < len(tokens) and _is_unit(tokens[end]):
+            unit = UNIT_ALIASES.get(tokens[end].key, tokens[end].text)
+            end += 1
+        found.append(Quantity(value, unit, i, end))
+        i = end
+    return found
+
+
+def _is_unit(token):
+    if token.key in UNIT_ALIASES:
+        return True
+    if token.key in NOT_UNITS or token.key in MULTIPLIERS or _small_number(token) is not None:
+        return False
+    if token.key.startswith(SAVE_WORDS):
+        return False
+    if any(_has_operation(token, name) for name in OPERATIONS):
+        return False
+    return token.key[0].isalpha()
+
+
+def _has_operation(token, name):
+    exact, prefixes = OPERATIONS[name]
+    return token.key in exact or (bool(prefixes) and token.key.startswith(prefixes))
+
+
+def _mentions(tokens, words):
+    return any(token.key.startswith(words) for token in tokens)
+
+
+def _quantity_text(quantity):
+    return f"{format_number(quantity.value)} {quantity.unit}" if quantity.unit else format_number(quantity.value)
+
+
+def _answer(value, unit):
+    return f"{format_number(value)} {unit}" if unit else format_number(value)
+
+
+# Step-by-step explanations, in the format the Gemini prompt uses ("... जवाब: [संख्या]")
+EXPLANATIONS = {
+    'add': "इन्हें जोड़ना है: {items}। तो, {expression} = {result}। जवाब: {answer}",
+    'subtract': "पहले {first} थे। इसमें से {rest} कम हुए। तो, {expression} = {result}। जवाब: {answer}",
+    'multiply': "{first} को {second} से गुणा करना है। तो, {expression} = {result}। जवाब: {answer}",
+    'rate': "हर एक के हिसाब से {rate} है, और कुल {count} हैं। तो, {expression} = {result}। जवाब: {answer}",
+    'divide': "{first} को {second} बराबर हिस्सों में बांटना है। तो, {expression} = {result}। "
+              "जवाब: हर हिस्से में {answer}",
+    'proportion': "{known} में {amount} लगता है। तो 1 {known_unit} में {amount_value} ÷ {known_value} = {per_unit}। "
+                  "{wanted} में {per_unit} x {wanted_value} = {result}। जवाब: {answer}",
+    'percent': "{base} का {rate} प्रतिशत निकालना है। तो, {base_value} x {rate} ÷ 100 = {result}। जवाब: {answer}",
+    'percent_increase': "{base} का {rate} प्रतिशत = {part}। बढ़ने पर {base_value} + {part} = {result}। जवाब: {answer}",
+    'percent_discount': "{base} का {rate} प्रतिशत = {part}। छूट के बाद {base_value} - {part} = {result}। जवाब: {answer}",
+    'percent_of': "{whole} में {part} कितने प्रतिशत है: {part_value} ÷ {whole_value} x 100 = {result}। "
+                  "जवाब: {result} प्रतिशत",
+    'interest': "मूलधन {principal} रुपये, ब्याज {rate} प्रतिशत सालाना, समय {years} साल। "
+                "ब्याज = {principal} x {rate} x {years} ÷ 100 = {interest} रुपये। "
+                "कुल रकम = {principal} + {interest} = {total} रुपये। जवाब: ब्याज {interest} रुपये, कुल {total} रुपये",
+    'interest_monthly': "मूलधन {principal} रुपये, ब्याज {rate} रुपये सैकड़ा महीना, समय {months} महीने। "
+                        "ब्याज = {principal} ÷ 100 x {rate} x {months} = {interest} रुपये। "
+                        "कुल रकम = {principal} + {interest} = {total} रुपये। जवाब: ब्याज {interest} रुपये, कुल {total} रुपये",
+}
+
+
+def _solution(operation, value, unit, **fields):
+    fields.setdefault('result', format_number(value))
+    fields.setdefault('answer', _answer(value, unit))
+    template = operation if operation in EXPLANATIONS else operation.split('_')[0]
+    return Solution(operation.split('_')[0], value, unit, EXPLANATIONS[template].format(**fields))
+
+
+def _solve_interest(tokens, numbers):
+    rate = time = None
+    rest = []
+    for q in numbers:
+        next_key = tokens[q.end].key if q.end < len(tokens) else ''
+        if rate is None and (next_key in OPERATIONS['percent'][0] or q.unit in OPERATIONS['percent'][0]):
+            rate = (q, 'annual')
+        elif rate is None and q.unit == MONEY and next_key == 'सैकडा':
+            rate = (q, 'monthly')
+        elif time is None and q.unit in ('साल', 'महीने'):
+            time = q
+        else:
+            rest.append(q)
+    if rate is None or time is None or len(rest) != 1:
+        return None
+    principal, (rate, kind) = rest[0].value, rate
+    months = time.value if time.unit == 'महीने' else time.value * 12
+    if kind == 'monthly':
+        interest = principal / 100 * rate.value * months
+        return _solution('interest_monthly', interest, MONEY, principal=format_number(principal),
+                         rate=format_number(rate.value), months=format_number(months),
+                         interest=format_number(interest), total=format_number(principal + interest))
+    years = months / 12
+    interest = principal * rate.value * years / 100
+    return _solution('interest', interest, MONEY, principal=format_number(principal),
+                     rate=format_number(rate.value), years=format_number(years),
+                     interest=format_number(interest), total=format_number(principal + interest))
+
+
+def _solve_percent(tokens, numbers):
+    if len(numbers) != 2:
+        return None
+    percent_words = OPERATIONS['percent'][0]
+    rates = [q for q in numbers if q.unit in percent_words
+             or (q.end < len(tokens) and tokens[q.end].key in percent_words)]
+    if not rates:
+        # "200 में 50 कितने प्रतिशत है"
+        whole, part = sorted(numbers, key=lambda q: q.value, reverse=True)
+        if whole.value == 0:
+            return None
+        value = part.value / whole.value * 100
+        return _solution('percent_of', value, 'प्रतिशत', whole=_quantity_text(whole), part=_quantity_text(part),
+                         whole_value=format_number(whole.value), part_value=format_number(part.value))
+    rate = rates[0]
+    base = numbers[1] if rate is numbers[0] else numbers[0]
+    part = base.value * rate.value / 100
+    fields = dict(base=_quantity_text(base), base_value=format_number(base.value),
+                  rate=format_number(rate.value), part=format_number(part))
+    rest = tokens[rate.end:]
+    if _mentions(rest, DISCOUNT_WORDS):
+        return _solution('percent_discount', base.value - part, base.unit, **fields)
+    if _mentions(rest, INCREASE_WORDS):
+        return _solution('percent_increase', base.value + part, base.unit, **fields)
+    return _solution('percent', part, base.unit, **fields)
+
+
+def _solve_proportion(numbers):
+    """2 एकड़ में 50 किलो, 5 एकड़ में कितना? -> 50 ÷ 2 x 5"""
+    if len(numbers) != 3 or any(q.unit is None for q in numbers):
+        return None
+    for i, j in ((0, 2), (0, 1), (1, 2)):
+        known, wanted = numbers[i], numbers[j]
+        amount = numbers[3 - i - j]
+        if known.unit == wanted.unit != amount.unit and known.value:
+            per_unit = amount.value / known.value
+            value = per_unit * wanted.value
+            return _solution('proportion', value, amount.unit, known=_quantity_text(known),
+                             amount=_quantity_text(amount), known_unit=known.unit,
+                             amount_value=format_number(amount.value), known_value=format_number(known.value),
+                             per_unit=format_number(per_unit), wanted=_quantity_text(wanted),
+                             wanted_value=format_number(wanted.value))
+    return None
+
+
+def _result_unit(numbers, preferred=None):
+    units = [q.unit for q in numbers if q.unit]
+    if MONEY in units:
+        return MONEY
+    if preferred is not None and preferred.unit:
+        return preferred.unit
+    return units[-1] if units else None
+
+
+def _solve_rate(tokens, numbers):
+    if len(numbers) != 2:
+        return None
+    # The rate is the number after "हर"/"प्रति" ("हर दर्जन 60 रुपये"), then money followed by
+    # "रोज"/"किलो" ("40 रुपये किलो"), then any number next to a rate word
+    rate, best = None, 0
+    for q in numbers:
+        before = tokens[max(0, q.position - 3):q.position]
+        after = tokens[q.end:q.end + 2]
+        if any(t.key in _EACH_WORDS for t in before):
+            score = 3
+        elif q.unit == MONEY and after and (after[0].key in UNIT_ALIASES or _has_operation(after[0], 'rate')):
+            score = 2
+        elif any(_has_operation(t, 'rate') for t in before + after):
+            score = 1
+        else:
+            continue
+        if score > best:
+            rate, best = q, score
+    if rate is None:
+        return None
+    count = numbers[1] if rate is numbers[0] else numbers[0]
+    value = rate.value * count.value
+    # The count's unit is what the rate is per ("12 महीने"), never the answer's
+    unit = MONEY if any(q.unit == MONEY for q in numbers) else rate.unit
+    return _solution('rate', value, unit, rate=_quantity_text(rate), count=_quantity_text(count),
+                     expression=f"{format_number(count.value)} x {format_number(rate.value)}")
+
+
+def _solve_divide(tokens, numbers):
+    if len(numbers) != 2:
+        return None
+    first, second = numbers
+    divisor_first = any(t.key in ('/', '÷') for t in tokens[first.end:second.position])
+    if not divisor_first and not (tokens[second.end:second.end + 1] and tokens[second.end].key == 'से'):
+        # "20 मज़दूरों को 500 रुपये बांटने हैं": the larger amount is shared out
+        first, second = sorted(numbers, key=lambda q: q.value, reverse=True)
+    if second.value == 0:
+        return None
+    value = first.value / second.value
+    unit = first.unit if first.unit != second.unit else None
+    return _solution('divide', value, unit, first=_quantity_text(first), second=format_number(second.value),
+                     expression=f"{format_number(first.value)} ÷ {format_number(second.value)}")
+
+
+def _operations(tokens, numbers):
+    """The BASIC_OPERATIONS a query mentions, counting "40 रुपये किलो" as a rate"""
+    found = set()
+    for i, token in enumerate(tokens):
+        if token.key == 'हर' and i + 1 < len(tokens) and tokens[i + 1].key == 'एक':
+            continue                                  # "हर एक को" means "each"
+        found.update(name for name in BASIC_OPERATIONS if _has_operation(token, name))
+    if any(q.unit == MONEY and q.end < len(tokens) and tokens[q.end].key in UNIT_ALIASES for q in numbers):
+        found.add('rate')
+    return found
+
+
+def solve(query):
+    """A Solution for a spoken arithmetic query, or None if it cannot be solved locally"""
+    tokens = tokenize(query)
+    if _mentions(tokens, UNSUPPORTED_WORDS):
+        return None
+    numbers = quantities(tokens)
+    if len(numbers) < 2:
+        return None
+
+    def has(name):
+        return any(_has_operation(t, name) for t in tokens)
+
+    if has('interest'):
+        return _solve_interest(tokens, numbers)
+    if has('percent'):
+        return _solve_percent(tokens, numbers)
+    proportion = _solve_proportion(numbers)
+    if proportion is not None:
+        return proportion
+    operations = _operations(tokens, numbers)
+    if len(operations) != 1:
+        return None
+    operation = operations.pop()
+    if operation in ('add', 'subtract'):
+        # Only like amounts are summed: "3 किलो" and "40 रुपये" are not added up
+        if len({q.unit for q in numbers if q.unit}) > 1:
+            return None
+    elif len(numbers) != 2:
+        return None
+
+    if operation == 'divide':
+        return _solve_divide(tokens, numbers)
+    if operation == 'rate':
+        return _solve_rate(tokens, numbers)
+    if operation == 'subtract':
+        first, rest = numbers[0], numbers[1:]
+        value = first.value - sum(q.value for q in rest)
+        return _solution('subtract', value, first.unit or _result_unit(numbers), first=_quantity_text(first),
+                         rest=', '.join(_quantity_text(q) for q in rest),
+                         expression=' - '.join(format_number(q.value) for q in numbers))
+    if operation == 'multiply':
+        return _solution('multiply', numbers[0].value * numbers[1].value, _result_unit(numbers),
+                         first=_quantity_text(numbers[0]), second=_quantity_text(numbers[1]),
+                         expression=' x '.join(format_number(q.value) for q in numbers))
+    value = sum(q.value for q in numbers)
+    units = {q.unit for q in numbers}
+    return _solution('add', value, units.pop() if len(units) == 1 else None,
+                     items=', '.join(_quantity_text(q) for q in numbers),
+                     expression=' + '.join(format_number(q.value) for q in numbers))
@@ -8,8 +8,73 @@ import google.generativeai as genai
 import os
 from dotenv import load_dotenv
 
+from vaani.core.answer_cache import get_answer_cache, normalize_question, template_key
+from vaani.services.finance import hindi_arithmetic
+
 load_dotenv()
 
+SOLVE_PROMPT = """
+            तुम एक बहुत ही सरल तरीके से गणित समझाने वाले शिक्षक हो।
+            एक अनपढ़ व्यक्ति ने तुमसे यह सवाल पूछा है:
+            
+            सवाल: {query}
+            
+            कृपया:
+            1. सबसे पहले सवाल को सरल हिंदी में दोहराओ
+            2. चरण-दर-चरण हल करके दिखाओ (बहुत आसान तरीके से)
+            3. रोज़मर्रा के उदाहरण से समझाओ
+            4. अंत में जवाब बड़े अक्षरों में बताओ: "जवाब: [संख्या]"
+            
+            उदाहरण:
+            सवाल: 5 बोरी चावल हैं, हर बोरी में 50 किलो है, कुल कितना चावल है?
+            
+            जवाब:
+            आपके पास 5 बोरी चावल हैं।
+            हर एक बोरी में 50 किलो चावल है।
+            
+            तो, 5 बोरी x 50 किलो = 250 किलो
+            
+            जवाब: 250 किलो चावल
+            
+            अब इसी तरह समझाओ (केवल हिंदी में):
+            """
+
+# Especially useful for daily wages
+MONEY_PROMPT = """
+            एक मजदूर/किसान को पैसे गिनने में मदद करो।
+            
+            सवाल: {query}
+            
+            सरल हिंदी में:
+            1. कुल पैसे कितने हैं
+            2. अगर नोट/सिक्के हैं तो गिनती बताओ
+            3. यह कितने दिन की मजदूरी/कमाई है
+            
+            बहुत आसान भाषा में बताओ।
+            
+            जवाब (केवल हिंदी में):
+            """
+
+SOLVE_TEMPLATE = template_key('calculator', SOLVE_PROMPT)
+MONEY_TEMPLATE = template_key('money_counting', MONEY_PROMPT)
+
+# What is being done to the numbers: a cached answer is reused only for the same operation
+OPERATION_SYMBOLS = '+-*/×÷%='
+OPERATION_STEMS = ('जोड', 'घट', 'गुणा', 'भाग', 'बांट', 'हिस्स', 'कम', 'बार', 'प्रतिशत', 'आधा', 'दुगुन',
+                   'add', 'plus', 'minus', 'subtract', 'multiply', 'times', 'divide', 'percent', 'half')
+_TIMES_X = re.compile(r'\d\s*[xX]\s*\d')
+
+
+def operation_guard(query):
+    """The operators and operation words in a query, used as the answer cache guard"""
+    normalized = normalize_question(query)
+    found = [stem for stem in OPERATION_STEMS if stem in normalized]
+    found += sorted(set(ch for ch in query if ch in OPERATION_SYMBOLS))
+    if _TIMES_X.search(query):
+        found.append('×')
+    return ' '.join(found)
+
+
 class SimpleCalculatorService:
     def __init__(self):
         """Initialize calculator service"""
@@ -43,7 +108,8 @@ class SimpleCalculatorService:
             'घटा', 'subtract', 'minus', 'कम',
             'गुणा', 'multiply', 'times', 'बार',
             'भाग', 'divide', 'बांटो', 'हिस्सा',
-            'कुल', 'total', 'जोड़', 'कितना'
+            'कुल', 'total', 'जोड़', 'कितना',
+            'प्रतिशत', 'percent', '%', 'ब्याज', 'interest', 'सैकड़ा'
         ]
     
     def is_configured(self):
@@ -59,47 +125,42 @@ class SimpleCalculatorService:
         
         # Check for numbers
         has_numbers = bool(re.search(r'\d+', query)) or any(word in query_lower for word in self.hindi_numbers.keys())
+        has_numbers = has_numbers or bool(hindi_arithmetic.quantities(hindi_arithmetic.tokenize(query)))
         
         return has_calc_keyword and has_numbers
     
+    def solve_locally(self, query):
+        """
+        Solve plain arithmetic, percentages, simple interest, rates and proportions
+        without Gemini; returns the explanation, or None if the query needs Gemini
+        """
+        solution = hindi_arithmetic.solve(query)
+        return solution.explanation if solution else None
+    
     def solve_with_explanation(self, query):
         """
         Solve calculation and explain in simple terms
         """
+        local = self.solve_locally(query)
+        if local:
+            return local, None
+        
         if not self.is_configured():
             return None, "Calculator service not available"
         
+        guard = operation_guard(query)
+        cached = get_answer_cache().get(SOLVE_TEMPLATE, query, guard)
+        if cached:
+            return cached, None
+        
         try:
-            prompt = f"""
-            तुम एक बहुत ही सरल तरीके से गणित समझाने वाले शिक्षक हो।
-            एक अनपढ़ व्यक्ति ने तुमसे यह सवाल पूछा है:
-            
-            सवाल: {query}
-            
-            कृपया:
-            1. सबसे पहले सवाल को सरल हिंदी में दोहराओ
-            2. चरण-दर-चरण हल करके दिखाओ (बहुत आसान तरीके से)
-            3. रोज़मर्रा के उदाहरण से समझाओ
-            4. अंत में जवाब बड़े अक्षरों में बताओ: "जवाब: [संख्या]"
-            
-            उदाहरण:
-            सवाल: 5 बोरी चावल हैं, हर बोरी में 50 किलो है, कुल कितना चावल है?
-            
-            जवाब:
-            आपके पास 5 बोरी चावल हैं।
-            हर एक बोरी में 50 किलो चावल है।
-            
-            तो, 5 बोरी x 50 किलो = 250 किलो
-            
-            जवाब: 250 किलो चावल
-            
-            अब इसी तरह समझाओ (केवल हिंदी में):
-            """
+            prompt = SOLVE_PROMPT.format(query=query)
             
             response = self.model.generate_content(prompt)
             
             if response and response.text:
                 clean_text = ' '.join(response.text.strip().split())
+                get_answer_cache().put(SOLVE_TEMPLATE, query, clean_text, guard)
                 return clean_text, None
             else:
                 return None, "हल नहीं मिला"
@@ -109,29 +170,26 @@ class SimpleCalculatorService:
     
     def help_with_money_counting(self, query):
         """Help count money - especially useful for daily wages"""
+        local = self.solve_locally(query)
+        if local:
+            return local, None
+        
         if not self.is_configured():
             return None, "Service not available"
         
+        guard = operation_guard(query)
+        cached = get_answer_cache().get(MONEY_TEMPLATE, query, guard)
+        if cached:
+            return cached, None
+        
         try:
-            prompt = f"""
-            एक मजदूर/किसान को पैसे गिनने में मदद करो।
-            
-            सवाल: {query}
-            
-            सरल हिंदी में:
-            1. कुल पैसे कितने हैं
-            2. अगर नोट/सिक्के हैं तो गिनती बताओ
-            3. यह कितने दिन की मजदूरी/कमाई है
-            
-            बहुत आसान भाषा में बताओ।
-            
-            जवाब (केवल हिंदी में):
-            """
+            prompt = MONEY_PROMPT.format(query=query)
             
             response = self.model.generate_content(prompt)
             
             if response and response.text:
                 clean_text = ' '.join(response.text.strip().split())
+                get_answer_cache().put(MONEY_TEMPLATE, query, clean_text, guard)
                 return clean_text, None
             else:
                 return None, "गणना नहीं हो पाई"
@@ -158,6 +216,13 @@ def handle_calculation_query(query, voice_output_func):
     if not service.detect_calculation_query(query):
         return False
     
+    # Most calculations are solved locally, in well under a millisecond and offline
+    result = service.solve_locally(query)
+    if result:
+        print(f"Result: {result}")
+        voice_output_func(result, lang='hi')
+        return True
+    
     if not service.is_configured():
         print("Calculator service not available")
         return False
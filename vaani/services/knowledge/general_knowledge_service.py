@@ -7,6 +7,9 @@ import os
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from vaani.core import http
+from vaani.core.answer_cache import get_answer_cache, template_key
+
 load_dotenv()
 
 class GeneralKnowledgeService:
@@ -20,6 +23,7 @@ class GeneralKnowledgeService:
         else:
             self.model = None
             print("Warning: GEMINI_API_KEY not found in .env file")
+        self.answer_template = template_key('general_knowledge', self._prompt('{question}'))
     
     def is_configured(self):
         """Check if Gemini API is properly configured"""
@@ -33,9 +37,39 @@ class GeneralKnowledgeService:
         if not self.is_configured():
             return None, "Gemini API is not configured. Please add GEMINI_API_KEY to your .env file."
         
+        cached = get_answer_cache().get(self.answer_template, question)
+        if cached:
+            return cached, None
+        
         try:
-            # Create a neutral, friendly prompt (suitable for adults and children)
-            prompt = f"""
+            response = self.model.generate_content(self._prompt(question))
+            return self._answer(response, question)
+        except Exception as e:
+            error_msg = f"Error in Gemini API call: {str(e)}"
+            print(error_msg)
+            return None, "क्षमा करें, मुझे कुछ तकनीकी समस्या आ रही है। कृपया फिर से कोशिश करें।"
+    
+    async def ask_question_async(self, question):
+        """ask_question for async callers: awaits Gemini within the 'gemini' upstream limit"""
+        if not self.is_configured():
+            return None, "Gemini API is not configured. Please add GEMINI_API_KEY to your .env file."
+        
+        cached = get_answer_cache().get(self.answer_template, question)
+        if cached:
+            return cached, None
+        
+        try:
+            async with http.upstream_slots('gemini'):
+                response = await self.model.generate_content_async(self._prompt(question))
+            return self._answer(response, question)
+        except Exception as e:
+            error_msg = f"Error in Gemini API call: {str(e)}"
+            print(error_msg)
+            return None, "क्षमा करें, मुझे कुछ तकनीकी समस्या आ रही है। कृपया फिर से कोशिश करें।"
+    
+    def _prompt(self, question):
+        # Create a neutral, friendly prompt (suitable for adults and children)
+        return f"""
             आप एक दोस्ताना, समझाने योग्य और तथ्यात्मक सहायक की भूमिका निभाएँ। उपयोगकर्ता ने यह प्रश्न पूछा है:
 
             सवाल: {question}
@@ -48,29 +82,24 @@ class GeneralKnowledgeService:
 
             जवाब (केवल हिंदी में):
             """
-            
-            # Generate response
-            response = self.model.generate_content(prompt)
-            
-            if response and response.text:
-                # Clean the response text
-                clean_text = response.text.strip()
-                # Remove excessive whitespace and newlines
-                clean_text = ' '.join(clean_text.split())
-                # Ensure proper spacing after punctuation
-                clean_text = clean_text.replace('।', '। ')
-                clean_text = clean_text.replace('!', '! ')
-                clean_text = clean_text.replace('?', '? ')
-                # Remove multiple spaces
-                clean_text = ' '.join(clean_text.split())
-                return clean_text, None
-            else:
-                return None, "मुझे इस सवाल का जवाब नहीं मिल पाया।"
-                
-        except Exception as e:
-            error_msg = f"Error in Gemini API call: {str(e)}"
-            print(error_msg)
-            return None, "क्षमा करें, मुझे कुछ तकनीकी समस्या आ रही है। कृपया फिर से कोशिश करें।"
+    
+    def _answer(self, response, question):
+        """(clean answer text, None) from a Gemini response, or (None, error message); answers are cached"""
+        if response and response.text:
+            # Clean the response text
+            clean_text = response.text.strip()
+            # Remove excessive whitespace and newlines
+            clean_text = ' '.join(clean_text.split())
+            # Ensure proper spacing after punctuation
+            clean_text = clean_text.replace('।', '। ')
+            clean_text = clean_text.replace('!', '! ')
+            clean_text = clean_text.replace('?', '? ')
+            # Remove multiple spaces
+            clean_text = ' '.join(clean_text.split())
+            get_answer_cache().put(self.answer_template, question, clean_text)
+            return clean_text, None
+        else:
+            return None, "मुझे इस सवाल का जवाब नहीं मिल पाया।"
     
     def is_general_knowledge_question(self, query):
         """
@@ -133,8 +162,21 @@ def handle_general_knowledge_query(query, voice_output_func):
     print(f"Processing general knowledge question: {query}")
     
     # Get answer from Gemini
-    answer, error = service.ask_question(query)
+    return _speak_answer(service.ask_question(query), voice_output_func)
+
+
+async def handle_general_knowledge_query_async(query, voice_output_func):
+    """handle_general_knowledge_query for the ASGI server: the Gemini call is awaited"""
+    service = get_gk_service()
+    if not service.is_general_knowledge_question(query) or not service.is_configured():
+        return False
     
+    print(f"Processing general knowledge question: {query}")
+    return _speak_answer(await service.ask_question_async(query), voice_output_func)
+
+
+def _speak_answer(result, voice_output_func):
+    answer, error = result
     if error:
         print(f"Error: {error}")
         voice_output_func(error)
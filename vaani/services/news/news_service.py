@@ -3,10 +3,14 @@ Enhanced News Service for Illiterate Users (SDG Goal 1)
 Makes news consumption easier for users with limited or no literacy
 """
 
-import requests
 from vaani.core import config as Config
+from vaani.core import http
+from vaani.core.cache_manager import cache
+from vaani.core.single_flight import single_flight, make_key
 import os
+import json
 import random
+import threading
 import time
 import hashlib
 from datetime import datetime, timedelta
@@ -25,11 +29,110 @@ logger = logging.getLogger('news_service')
 NEWS_CACHE_FILE = "data/offline_cache/news_cache.json"
 NEWS_CACHE_EXPIRY = 3600  # Cache news for 1 hour
 
+# Fresh headlines are served from the shared in-memory cache;
+# the file above only backs offline / stale fallbacks.
+NEWS_CACHE_CATEGORY = 'news'
+cache.register_category(NEWS_CACHE_CATEGORY, NEWS_CACHE_EXPIRY)
+_news_cache = cache.view(NEWS_CACHE_CATEGORY)
+
+# The stale companion: the newest entry per query, kept after it expires.
+# It is read from NEWS_CACHE_FILE once, and written back by a background
+# thread, so no request reads or writes the file.
+_stale_news = {}
+_stale_lock = threading.Lock()
+_disk_loaded = False
+_disk_dirty = threading.Event()
+_disk_writer = None
+
+
+def _read_news_file():
+    if not os.path.exists(NEWS_CACHE_FILE):
+        return {}
+    try:
+        with open(NEWS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading news cache: {str(e)}")
+        return {}
+
+
+def _write_news_file(entries):
+    """Write entries to NEWS_CACHE_FILE atomically, so a reader never sees half a file"""
+    try:
+        os.makedirs(os.path.dirname(NEWS_CACHE_FILE) or '.', exist_ok=True)
+        tmp_path = f"{NEWS_CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, NEWS_CACHE_FILE)
+        logger.info("News cache updated")
+        return True
+    except Exception as e:
+        logger.error(f"Error saving news cache: {str(e)}")
+        return False
+
+
+def load_news_cache():
+    """Fill the memory cache and its stale companion from NEWS_CACHE_FILE, once per process"""
+    global _disk_loaded
+    with _stale_lock:
+        if _disk_loaded:
+            return
+        _disk_loaded = True
+        entries = _read_news_file()
+        _stale_news.update(entries)
+    now = time.time()
+    for cache_key, entry in entries.items():
+        if now - entry.get("timestamp", 0) < NEWS_CACHE_EXPIRY:
+            _news_cache[cache_key] = entry
+
+
+def flush_news_cache():
+    """
+    Write the stale companion to NEWS_CACHE_FILE, keeping newer entries other
+    workers wrote there since; returns True if the file was written
+    """
+    _disk_dirty.clear()
+    on_disk = _read_news_file()
+    with _stale_lock:
+        for cache_key, entry in on_disk.items():
+            if entry.get("timestamp", 0) > _stale_news.get(cache_key, {}).get("timestamp", 0):
+                _stale_news[cache_key] = entry
+        entries = dict(_stale_news)
+    return _write_news_file(entries)
+
+
+def _schedule_flush():
+    """Ask the writer thread to persist the news cache, starting it if needed"""
+    global _disk_writer
+    _disk_dirty.set()
+    with _stale_lock:
+        if _disk_writer is not None and _disk_writer.is_alive():
+            return
+
+        def loop():
+            while True:
+                _disk_dirty.wait()
+                flush_news_cache()
+
+        _disk_writer = threading.Thread(target=loop, daemon=True, name='news-cache-writer')
+        _disk_writer.start()
+
+
+def _reset_after_fork():
+    """The writer thread does not survive a fork; a worker starts its own on its first store"""
+    global _stale_lock, _disk_writer
+    _stale_lock = threading.Lock()
+    _disk_writer = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 class NewsService:
     def __init__(self):
         """Initialize the news service with cache support"""
         self.ensure_cache_dir()
-        self.cache = self.load_cache()
         self.news_triggers = set(Config.news_trigger)
         self.news_junk = set(Config.news_junk if hasattr(Config, 'news_junk') else [])
         self.number_words = {
@@ -50,128 +153,142 @@ class NewsService:
     
     def load_cache(self):
         """Load news cache"""
-        if os.path.exists(NEWS_CACHE_FILE):
-            try:
-                import json
-                with open(NEWS_CACHE_FILE, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-                return cache
-            except Exception as e:
-                logger.error(f"Error loading news cache: {str(e)}")
-                return {}
-        return {}
+        load_news_cache()
+        with _stale_lock:
+            return dict(_stale_news)
     
     def save_cache(self, cache_data):
         """Save news to cache"""
-        try:
-            import json
-            with open(NEWS_CACHE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            logger.info("News cache updated")
-            return True
-        except Exception as e:
-            logger.error(f"Error saving news cache: {str(e)}")
-            return False
+        with _stale_lock:
+            _stale_news.update(cache_data)
+        return flush_news_cache()
     
-    def is_cache_valid(self, cache_key):
-        """Check if cached news is still valid"""
-        if cache_key in self.cache:
-            cache_time = self.cache[cache_key].get("timestamp", 0)
-            current_time = time.time()
-            return (current_time - cache_time) < NEWS_CACHE_EXPIRY
-        return False
+    def get_cached_news(self, cache_key):
+        """Return still-valid cached news from memory"""
+        load_news_cache()
+        return _news_cache.get(cache_key)
+    
+    def get_stale_news(self, cache_key):
+        """Return cached news even if expired (offline fallback)"""
+        load_news_cache()
+        with _stale_lock:
+            return _stale_news.get(cache_key)
+    
+    def store_news(self, cache_key, entry):
+        """Store fresh news in memory; it is persisted for offline use in the background"""
+        load_news_cache()
+        _news_cache[cache_key] = entry
+        with _stale_lock:
+            _stale_news[cache_key] = entry
+        _schedule_flush()
+    
+    def _articles_url(self, query, api_key):
+        if query:
+            return f"https://gnews.io/api/v4/search?q={query}&lang=hi&country=in&max=5&apikey={api_key}"
+        return f"https://gnews.io/api/v4/top-headlines?category=general&lang=hi&country=in&max=5&apikey={api_key}"
+    
+    def _store_articles(self, query, cache_key, news_data):
+        articles = news_data.get("articles", [])
+        if articles:
+            # Cache the news
+            self.store_news(cache_key, {
+                "query": query,
+                "articles": articles,
+                "timestamp": time.time()
+            })
+        return articles
+    
+    def fetch_articles(self, query, api_key, cache_key):
+        """Fetch articles from GNews and cache them"""
+        response = http.get(self._articles_url(query, api_key))
+        response.raise_for_status()
+        return self._store_articles(query, cache_key, response.json())
+    
+    async def fetch_articles_async(self, query, api_key, cache_key):
+        """Async fetch_articles"""
+        response = await http.aget(self._articles_url(query, api_key))
+        response.raise_for_status()
+        return self._store_articles(query, cache_key, response.json())
+    
+    def _news_key(self, command):
+        """The search query in a command and its cache key"""
+        query = self.extract_query(command)
+        return query, hashlib.md5((query or "top_news").encode()).hexdigest()
+    
+    def _announce(self, intro, articles, bolo_func):
+        """Speak an intro, the headlines and the selection prompt"""
+        bolo_func(intro)
+        self.announce_news_headlines(articles, bolo_func)
+        self.prompt_for_selection(bolo_func)
+        return articles
+    
+    def _announce_stale(self, cache_key, intro, bolo_func):
+        """Fall back to expired cached news, if there is any"""
+        old_news = self.get_stale_news(cache_key)
+        if old_news:
+            return self._announce(intro, old_news["articles"], bolo_func)
+        bolo_func("माफ़ कीजिए, समाचार प्राप्त करने में त्रुटि हुई। इंटरनेट कनेक्शन जांचें।")
+        return []
+    
+    def _announce_cached(self, query, cache_key, bolo_func):
+        """Announce still-valid cached news; None on a cache miss"""
+        cached_news = self.get_cached_news(cache_key)
+        if not cached_news:
+            return None
+        logger.info(f"Using cached news for query: {query or 'top_news'}")
+        source = "कैश से" if query else "कैश से आज के शीर्षक"
+        return self._announce(f"{source} समाचार सुनिए", cached_news["articles"], bolo_func)
+    
+    def _announce_fresh(self, query, articles, bolo_func):
+        if articles:
+            display_topic = query if query else "आज"
+            summary_intro = random.choice(Config.news_summary_responses).format(display_topic)
+            return self._announce(summary_intro, articles, bolo_func)
+        bolo_func(f"माफ़ कीजिए, मुझे '{query if query else 'आज'}' विषय पर कोई ताज़ा खबर नहीं मिली।")
+        return []
     
     def get_news(self, command, bolo_func):
         """Get news based on user command with cache support"""
-        # Extract query from command
-        query = self.extract_query(command)
-        
-        # Generate cache key
-        cache_key = hashlib.md5((query or "top_news").encode()).hexdigest()
+        query, cache_key = self._news_key(command)
         
         # Check if we have valid cached news
-        if self.is_cache_valid(cache_key):
-            logger.info(f"Using cached news for query: {query or 'top_news'}")
-            cached_news = self.cache[cache_key]
-            articles = cached_news["articles"]
-            
-            # Announce the news source
-            source = "कैश से" if query else "कैश से आज के शीर्षक"
-            bolo_func(f"{source} समाचार सुनिए")
-            
-            # Read out cached news summaries
-            self.announce_news_headlines(articles, bolo_func)
-            
-            # Prompt for selection
-            self.prompt_for_selection(bolo_func)
-            
+        articles = self._announce_cached(query, cache_key, bolo_func)
+        if articles is not None:
             return articles
         
         # If not in cache or expired, fetch from API
+        api_key = os.getenv('GNEWS_API_KEY')
+        if not api_key:
+            # No API key, try using any cached news even if expired
+            return self._announce_stale(cache_key, "पुराने समाचार सुनिए, इंटरनेट कनेक्शन नहीं है", bolo_func)
         try:
-            api_key = os.getenv('GNEWS_API_KEY')
-            if not api_key:
-                # No API key, try using any cached news even if expired
-                if cache_key in self.cache:
-                    old_news = self.cache[cache_key]
-                    bolo_func("पुराने समाचार सुनिए, इंटरनेट कनेक्शन नहीं है")
-                    self.announce_news_headlines(old_news["articles"], bolo_func)
-                    self.prompt_for_selection(bolo_func)
-                    return old_news["articles"]
-                else:
-                    # No cache at all
-                    bolo_func("माफ़ कीजिए, समाचार प्राप्त करने में त्रुटि हुई। इंटरनेट कनेक्शन जांचें।")
-                    return []
-            
-            # Build API URL
-            if query:
-                url = f"https://gnews.io/api/v4/search?q={query}&lang=hi&country=in&max=5&apikey={api_key}"
-            else:
-                url = f"https://gnews.io/api/v4/top-headlines?category=general&lang=hi&country=in&max=5&apikey={api_key}"
-            
-            # Make API request
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            news_data = response.json()
-            articles = news_data.get("articles", [])
-            
-            if articles:
-                # Cache the news
-                self.cache[cache_key] = {
-                    "query": query,
-                    "articles": articles,
-                    "timestamp": time.time()
-                }
-                self.save_cache(self.cache)
-                
-                # Announce news
-                display_topic = query if query else "आज"
-                summary_intro = random.choice(Config.news_summary_responses).format(display_topic)
-                bolo_func(summary_intro)
-                
-                # Read out news headlines
-                self.announce_news_headlines(articles, bolo_func)
-                
-                # Prompt for selection
-                self.prompt_for_selection(bolo_func)
-                
-                return articles
-            else:
-                bolo_func(f"माफ़ कीजिए, मुझे '{query if query else 'आज'}' विषय पर कोई ताज़ा खबर नहीं मिली।")
-                return []
-                
+            # Concurrent misses for the same query share one API request
+            articles = single_flight.do(make_key('news', query or "top_news"),
+                                        self.fetch_articles, query, api_key, cache_key)
         except Exception as e:
             logger.error(f"Error fetching news: {str(e)}")
             # Try using expired cache in case of error
-            if cache_key in self.cache:
-                old_news = self.cache[cache_key]
-                bolo_func("इंटरनेट त्रुटि के कारण पुराने समाचार सुनिए")
-                self.announce_news_headlines(old_news["articles"], bolo_func)
-                self.prompt_for_selection(bolo_func)
-                return old_news["articles"]
-            else:
-                bolo_func("माफ़ कीजिए, समाचार प्राप्त करने में त्रुटि हुई। इंटरनेट कनेक्शन जांचें।")
-                return []
+            return self._announce_stale(cache_key, "इंटरनेट त्रुटि के कारण पुराने समाचार सुनिए", bolo_func)
+        return self._announce_fresh(query, articles, bolo_func)
+    
+    async def get_news_async(self, command, bolo_func):
+        """Async get_news: the GNews request is awaited, everything else is shared"""
+        query, cache_key = self._news_key(command)
+        
+        articles = self._announce_cached(query, cache_key, bolo_func)
+        if articles is not None:
+            return articles
+        
+        api_key = os.getenv('GNEWS_API_KEY')
+        if not api_key:
+            return self._announce_stale(cache_key, "पुराने समाचार सुनिए, इंटरनेट कनेक्शन नहीं है", bolo_func)
+        try:
+            articles = await single_flight.do_async(make_key('news', query or "top_news"),
+                                                    self.fetch_articles_async, query, api_key, cache_key)
+        except Exception as e:
+            logger.error(f"Error fetching news: {str(e)}")
+            return self._announce_stale(cache_key, "इंटरनेट त्रुटि के कारण पुराने समाचार सुनिए", bolo_func)
+        return self._announce_fresh(query, articles, bolo_func)
     
     def extract_query(self, command):
         """Extract news query from command"""
@@ -197,10 +314,7 @@ class NewsService:
             
             # Announce with number
             announcement = f"{hindi_numbers[i]}: {title}"
-            bolo_func(announcement)
-            
-            # Small pause between headlines for better comprehension
-            time.sleep(0.5)
+            bolo_func(announcement, pause=0.5)
     
     def prompt_for_selection(self, bolo_func):
         """Prompt user to select a news item in simple language"""
@@ -409,6 +523,11 @@ def get_news(command, bolo_func):
     service = NewsService()
     return service.get_news(command, bolo_func)
 
+async def get_news_async(command, bolo_func):
+    """Get news based on command, awaiting the API call (ASGI server)"""
+    service = NewsService()
+    return await service.get_news_async(command, bolo_func)
+
 def process_news_selection(command, bolo_func, context):
     """Process news selection based on command"""
     service = NewsService()
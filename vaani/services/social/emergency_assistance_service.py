@@ -3,6 +3,9 @@ Emergency Assistance Service for Illiterate Users
 Quick access to emergency numbers, basic first aid, and crisis helplines
 """
 
+# Phrases asking for the full list of emergency numbers
+EMERGENCY_LIST_KEYWORDS = ['emergency number', 'हेल्पलाइन', 'helpline', 'नंबर बताओ']
+
 class EmergencyAssistanceService:
     def __init__(self):
         """Initialize emergency service with important numbers"""
@@ -200,7 +203,7 @@ def handle_emergency_query(query, voice_output_func):
     
     if not is_emergency:
         # Check if asking for emergency numbers list
-        if any(word in query.lower() for word in ['emergency number', 'हेल्पलाइन', 'helpline', 'नंबर बताओ']):
+        if any(word in query.lower() for word in EMERGENCY_LIST_KEYWORDS):
             numbers = service.get_all_emergency_numbers()
             print(numbers)
             voice_output_func(numbers, lang='hi')
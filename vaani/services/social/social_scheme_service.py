@@ -1,7 +1,6 @@
 import json
 import os
 import random
-import time
 from vaani.core.voice_tool import bolo, listen_command
 
 class SocialSchemeService:
@@ -45,24 +44,19 @@ class SocialSchemeService:
 
     def explain_scheme(self, scheme, bolo_func):
         """Explains a single scheme's details in a clear, structured manner."""
-        bolo_func(f"{scheme['name']} के बारे में जानकारी इस प्रकार है:")
-        time.sleep(0.5)
+        bolo_func(f"{scheme['name']} के बारे में जानकारी इस प्रकार है:", pause=0.5)
         
-        bolo_func(f"यह योजना {scheme.get('summary', 'का विवरण उपलब्ध नहीं है।')}")
-        time.sleep(0.5)
+        bolo_func(f"यह योजना {scheme.get('summary', 'का विवरण उपलब्ध नहीं है।')}", pause=0.5)
 
-        bolo_func(f"इसके लाभ हैं: {scheme.get('benefits', 'लाभों की जानकारी उपलब्ध नहीं है।')}")
-        time.sleep(0.5)
+        bolo_func(f"इसके लाभ हैं: {scheme.get('benefits', 'लाभों की जानकारी उपलब्ध नहीं है।')}", pause=0.5)
         
-        bolo_func("आवेदन करने की प्रक्रिया: " + scheme.get('application_process', 'आवेदन प्रक्रिया की जानकारी उपलब्ध नहीं है।'))
-        time.sleep(0.5)
+        bolo_func("आवेदन करने की प्रक्रिया: " + scheme.get('application_process', 'आवेदन प्रक्रिया की जानकारी उपलब्ध नहीं है।'), pause=0.5)
 
         docs = scheme.get('documents', [])
         if docs:
             bolo_func("इसके लिए इन दस्तावेज़ों की ज़रूरत पड़ती है:")
             for doc in docs:
-                bolo_func(f"• {doc}")
-                time.sleep(0.3)
+                bolo_func(f"• {doc}", pause=0.3)
         
         bolo_func("अधिक जानकारी के लिए आप संबंधित विभाग से संपर्क कर सकते हैं।")
 
@@ -82,8 +76,7 @@ class SocialSchemeService:
             return
 
         for i, scheme in enumerate(self.schemes, 1):
-            bolo_func(f"{i}. {scheme['name']}")
-            time.sleep(0.5)
+            bolo_func(f"{i}. {scheme['name']}", pause=0.5)
         
         bolo_func("आप किस योजना के बारे में विस्तार से जानना चाहेंगे? कृपया उसका नाम या नंबर बताएं।")
         context.set(
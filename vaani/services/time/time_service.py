@@ -1,9 +1,9 @@
 import datetime
 import re
 from googlesearch import search
-import requests
 from bs4 import BeautifulSoup 
 from vaani.core import config as Config
+from vaani.core import http
 
 def current_time(bolo_func):
     """Tells the current time with proper greetings."""
@@ -104,7 +104,7 @@ def get_day_summary(command, bolo_func):
             summary = f"{day} {month_hindi} {year} को {day_name} था। "
             
             try:
-                page = requests.get(first_url, timeout=5)
+                page = http.get(first_url)
                 soup = BeautifulSoup(page.content, 'html.parser')
                 
                 paragraphs = soup.find_all('p')
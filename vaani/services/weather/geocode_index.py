@@ -0,0 +1,130 @@
+"""
+Geocode Index for Weather Service
+Persistent city -> coordinates lookup so rain forecasts skip the geo API round trip.
+
+Known market cities are preloaded from data/geocode_data/cities.json; cities
+resolved through the OpenWeatherMap geo API are learned into
+data/offline_cache/geocode_cache.json and served from memory afterwards.
+"""
+
+import json
+import os
+import threading
+import unicodedata
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+SEED_FILE = os.path.join(_PROJECT_ROOT, "data", "geocode_data", "cities.json")
+STORE_FILE = os.path.join(_PROJECT_ROOT, "data", "offline_cache", "geocode_cache.json")
+
+
+def normalize_city(city: str) -> str:
+    """Normalize a city name for lookup (Unicode NFC, case-folded, single spaces)"""
+    return " ".join(unicodedata.normalize("NFC", city).split()).casefold()
+
+
+class GeocodeIndex:
+    """
+    In-memory city index backed by a seed file and a small learned store.
+
+    Reads never touch the disk; `learn` updates memory and rewrites the
+    store file atomically.
+    """
+
+    def __init__(self, seed_file: str = SEED_FILE, store_file: str = STORE_FILE):
+        self.seed_file = seed_file
+        self.store_file = store_file
+        self._lock = threading.Lock()
+        self._coords: Dict[str, Tuple[float, float]] = {}
+        self._learned: Dict[str, dict] = {}
+        self.stats = {'hits': 0, 'misses': 0, 'learned': 0}
+        self._load()
+
+    def _load(self):
+        if os.path.exists(self.seed_file):
+            try:
+                with open(self.seed_file, "r", encoding="utf-8") as f:
+                    seed = json.load(f)
+                for hindi_name, info in seed.items():
+                    coords = (info["lat"], info["lon"])
+                    self._coords[normalize_city(hindi_name)] = coords
+                    if info.get("en"):
+                        self._coords[normalize_city(info["en"])] = coords
+            except Exception as e:
+                logger.error(f"Error loading geocode seed data: {e}")
+
+        if os.path.exists(self.store_file):
+            try:
+                with open(self.store_file, "r", encoding="utf-8") as f:
+                    self._learned = json.load(f)
+                for key, info in self._learned.items():
+                    self._coords[key] = (info["lat"], info["lon"])
+            except Exception as e:
+                logger.error(f"Error loading geocode cache: {e}")
+                self._learned = {}
+
+        logger.info(f"Geocode index loaded with {len(self._coords)} names")
+
+    def lookup(self, city: str) -> Optional[Tuple[float, float]]:
+        """Return (lat, lon) for a known city, or None"""
+        coords = self._coords.get(normalize_city(city))
+        with self._lock:
+            self.stats['hits' if coords else 'misses'] += 1
+        return coords
+
+    def learn(self, city: str, lat: float, lon: float, resolved_name: str = "") -> None:
+        """Remember coordinates for a city and persist them"""
+        key = normalize_city(city)
+        with self._lock:
+            self._coords[key] = (lat, lon)
+            self._learned[key] = {"name": city, "resolved": resolved_name, "lat": lat, "lon": lon}
+            self.stats['learned'] += 1
+            snapshot = dict(self._learned)
+
+            try:
+                os.makedirs(os.path.dirname(self.store_file), exist_ok=True)
+                # Per-process name: gunicorn workers may learn cities at the same time
+                tmp_file = f"{self.store_file}.{os.getpid()}.tmp"
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_file, self.store_file)
+            except Exception as e:
+                logger.error(f"Error saving geocode cache: {e}")
+
+    def missing_known_cities(self):
+        """Market cities from the agriculture config that have no coordinates yet"""
+        from vaani.core import config as Config
+        from vaani.services.agriculture.agri_price_service import MARKET_MAPPING
+
+        names = list(MARKET_MAPPING) + list(Config.agri_markets)
+        return [name for name in dict.fromkeys(names) if normalize_city(name) not in self._coords]
+
+    def __len__(self):
+        return len(self._coords)
+
+    def __contains__(self, city):
+        return normalize_city(city) in self._coords
+
+
+# Global instance
+_geocode_index = None
+
+
+def get_geocode_index() -> GeocodeIndex:
+    """Get or create the global geocode index"""
+    global _geocode_index
+    if _geocode_index is None:
+        _geocode_index = GeocodeIndex()
+    return _geocode_index
+
+
+if __name__ == "__main__":
+    index = get_geocode_index()
+    print(f"Names indexed: {len(index)}")
+    missing = index.missing_known_cities()
+    print(f"Known market cities without coordinates: {missing or 'none'}")
+    for city in ["लखनऊ", "Lucknow", "वाराणसी"]:
+        print(f"{city}: {index.lookup(city)}")
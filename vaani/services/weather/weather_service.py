@@ -1,5 +1,7 @@
-import requests
 from vaani.core import config as Config
+from vaani.core import http
+from vaani.core.single_flight import single_flight, make_key
+from vaani.services.weather.geocode_index import get_geocode_index
 from datetime import date, timedelta, datetime
 import os
 
@@ -35,146 +37,246 @@ def _format_date_hindi(date_str):
     except Exception:
         return date_str # Fallback if there's an error
 
+def _geo_url(city):
+    return f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={os.getenv('WEATHER_API_KEY')}"
+
+def _forecast_url(lat, lon):
+    return (f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}"
+            f"&daily=precipitation_probability_mean&timezone=auto&forecast_days=7")
+
+def _current_weather_url(city):
+    return (f"http://api.openweathermap.org/data/2.5/weather?"
+            f"q={city}&appid={os.getenv('WEATHER_API_KEY')}&units=metric&lang=hi")
+
+def _learn_city(city, geo_data):
+    """Stores a geo API answer in the geocode index; returns (lat, lon) or None"""
+    if not geo_data:
+        return None
+
+    lat = geo_data[0]['lat']
+    lon = geo_data[0]['lon']
+    get_geocode_index().learn(city, lat, lon, geo_data[0].get('name', ''))
+    return lat, lon
+
+def _geocode_city(city):
+    """Returns (lat, lon) for a city from the geocode index, asking the geo API only for new cities."""
+    coords = get_geocode_index().lookup(city)
+    if coords:
+        return coords
+
+    geo_response = http.get(_geo_url(city))
+    geo_response.raise_for_status()
+    return _learn_city(city, geo_response.json())
+
+async def _geocode_city_async(city):
+    """Async _geocode_city"""
+    coords = get_geocode_index().lookup(city)
+    if coords:
+        return coords
+
+    geo_response = await http.aget(_geo_url(city))
+    geo_response.raise_for_status()
+    return _learn_city(city, geo_response.json())
+
+def _fetch_rain_forecast(city):
+    """Geocodes the city and fetches its 7-day rain forecast. Returns None if the city is unknown."""
+    coords = _geocode_city(city)
+    if coords is None:
+        return None
+
+    forecast_response = http.get(_forecast_url(*coords))
+    forecast_response.raise_for_status()
+    return forecast_response.json()
+
+async def _fetch_rain_forecast_async(city):
+    """Async _fetch_rain_forecast"""
+    coords = await _geocode_city_async(city)
+    if coords is None:
+        return None
+
+    forecast_response = await http.aget(_forecast_url(*coords))
+    forecast_response.raise_for_status()
+    return forecast_response.json()
+
 def get_rain_forecast(command, city, bolo_func):
     """Fetches and reports daily rain forecasts with specific, formatted dates."""
     try:
-        geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={city}&limit=1&appid={os.getenv('WEATHER_API_KEY')}"
-        geo_response = requests.get(geo_url, timeout=5)
-        geo_response.raise_for_status()
-        geo_data = geo_response.json()
-        
-        if not geo_data:
-            bolo_func(f"माफ़ कीजिए, मुझे '{city}' नाम की जगह नहीं मिली।")
-            return
-        
-        lat = geo_data[0]['lat']
-        lon = geo_data[0]['lon']
-
-        forecast_url = (f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}"
-                        f"&daily=precipitation_probability_mean&timezone=auto&forecast_days=7")
-        forecast_response = requests.get(forecast_url, timeout=5)
-        forecast_response.raise_for_status()
-        forecast_data = forecast_response.json()
-        
-        daily_forecasts = forecast_data.get('daily', {})
-        time_list = daily_forecasts.get('time', [])
-        prob_list = daily_forecasts.get('precipitation_probability_mean', [])
-
-        if not time_list or not prob_list:
-            bolo_func("माफ़ कीजिए, मैं बारिश का पूर्वानुमान नहीं ला सका।")
-            return
-        
-        today_str = date.today().strftime("%Y-%m-%d")
-        today_formatted = _format_date_hindi(today_str)
-        tomorrow_str = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
-        tomorrow_formatted = _format_date_hindi(tomorrow_str)
-
-        if any(phrase in command for phrase in Config.rain_most_significant):
-            if len(prob_list) > 1:
-                future_probs = prob_list[1:] # Check from tomorrow onwards
-                max_prob = max(future_probs)
-                
-                if max_prob > 50:
-                    max_prob_index = future_probs.index(max_prob) + 1
-                    rainy_date_str = time_list[max_prob_index]
-                    rainy_date_formatted = _format_date_hindi(rainy_date_str)
-                    bolo_func(f"अगले कुछ दिनों में, सबसे ज़्यादा बारिश की संभावना {rainy_date_formatted} को है, जो कि {max_prob} प्रतिशत है।")
-                else:
-                    bolo_func(f"{city} में अगले हफ्ते तक किसी भी दिन भारी बारिश की कोई खास संभावना नहीं है।")
-            else:
-                bolo_func("मेरे पास भविष्य के पूर्वानुमान की पूरी जानकारी नहीं है।")
-
-        elif any(phrase in command for phrase in Config.rain_today):
-            if today_str in time_list:
-                idx = time_list.index(today_str)
-                pop = prob_list[idx]
-                if pop > 45:
-                    bolo_func(f"हाँ, आज, यानी {today_formatted} को, {city} में बारिश की {pop} प्रतिशत संभावना है।")
-                else:
-                    bolo_func(f"नहीं, आज, यानी {today_formatted} को, {city} में बारिश की संभावना बहुत कम है, केवल {pop} प्रतिशत।")
-            else:
-                bolo_func(f"{city} के लिए आज ({today_formatted}) की बारिश की जानकारी नहीं मिल सकी।")
-
-        elif any(phrase in command for phrase in Config.rain_tomorrow):
-            if tomorrow_str in time_list:
-                idx = time_list.index(tomorrow_str)
-                pop = prob_list[idx]
-                if pop > 45:
-                     bolo_func(f"हाँ, कल, यानी {tomorrow_formatted} को, {city} में बारिश होने की {pop} प्रतिशत संभावना है।")
-                else:
-                    bolo_func(f"नहीं, कल, यानी {tomorrow_formatted} को, {city} में बारिश की संभावना काफी कम है।")
-            else:
-                 bolo_func(f"{city} के लिए कल ({tomorrow_formatted}) की बारिश की जानकारी नहीं मिल सकी।")
-
-        else: # General "kab hogi" query
-            found_rain = False
-            for i in range(1, len(time_list)):
-                if prob_list[i] > 50:
-                    day_map = {1: "कल", 2: "परसों"}
-                    day_name = day_map.get(i, f"{i} दिन बाद")
-                    date_str = time_list[i]
-                    date_formatted = _format_date_hindi(date_str)
-                    pop_percent = prob_list[i]
-                    bolo_func(f"{city} में अगली बारिश की संभावना {day_name}, यानी {date_formatted} को है, जो कि {pop_percent} प्रतिशत है।")
-                    found_rain = True
-                    break
-            
-            if not found_rain:
-                bolo_func(f"{city} में अगले हफ्ते तक बारिश की कोई खास संभावना नहीं दिख रही है।")
-    
+        forecast_data = single_flight.do(make_key('rain_forecast', city), _fetch_rain_forecast, city)
+        _speak_rain_forecast(command, city, forecast_data, bolo_func)
+    except Exception as e:
+        print(f"Rain forecast error: {e}")
+        bolo_func("बारिश का पूर्वानुमान लेते समय एक अप्रत्याशित त्रुटि हुई।")
+
+async def get_rain_forecast_async(command, city, bolo_func):
+    """Async get_rain_forecast: the forecast is awaited, the answer is spoken the same way"""
+    try:
+        forecast_data = await single_flight.do_async(make_key('rain_forecast', city),
+                                                     _fetch_rain_forecast_async, city)
+        _speak_rain_forecast(command, city, forecast_data, bolo_func)
     except Exception as e:
         print(f"Rain forecast error: {e}")
         bolo_func("बारिश का पूर्वानुमान लेते समय एक अप्रत्याशित त्रुटि हुई।")
 
+def _speak_rain_forecast(command, city, forecast_data, bolo_func):
+    """Reports the rain forecast the command asks about"""
+    if forecast_data is None:
+        bolo_func(f"माफ़ कीजिए, मुझे '{city}' नाम की जगह नहीं मिली।")
+        return
+
+    daily_forecasts = forecast_data.get('daily', {})
+    time_list = daily_forecasts.get('time', [])
+    prob_list = daily_forecasts.get('precipitation_probability_mean', [])
+
+    if not time_list or not prob_list:
+        bolo_func("माफ़ कीजिए, मैं बारिश का पूर्वानुमान नहीं ला सका।")
+        return
+
+    today_str = date.today().strftime("%Y-%m-%d")
+    today_formatted = _format_date_hindi(today_str)
+    tomorrow_str = (date.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow_formatted = _format_date_hindi(tomorrow_str)
+
+    if any(phrase in command for phrase in Config.rain_most_significant):
+        if len(prob_list) > 1:
+            future_probs = prob_list[1:] # Check from tomorrow onwards
+            max_prob = max(future_probs)
+
+            if max_prob > 50:
+                max_prob_index = future_probs.index(max_prob) + 1
+                rainy_date_str = time_list[max_prob_index]
+                rainy_date_formatted = _format_date_hindi(rainy_date_str)
+                bolo_func(f"अगले कुछ दिनों में, सबसे ज़्यादा बारिश की संभावना {rainy_date_formatted} को है, जो कि {max_prob} प्रतिशत है।")
+            else:
+                bolo_func(f"{city} में अगले हफ्ते तक किसी भी दिन भारी बारिश की कोई खास संभावना नहीं है।")
+        else:
+            bolo_func("मेरे पास भविष्य के पूर्वानुमान की पूरी जानकारी नहीं है।")
+
+    elif any(phrase in command for phrase in Config.rain_today):
+        if today_str in time_list:
+            idx = time_list.index(today_str)
+            pop = prob_list[idx]
+            if pop > 45:
+                bolo_func(f"हाँ, आज, यानी {today_formatted} को, {city} में बारिश की {pop} प्रतिशत संभावना है।")
+            else:
+                bolo_func(f"नहीं, आज, यानी {today_formatted} को, {city} में बारिश की संभावना बहुत कम है, केवल {pop} प्रतिशत।")
+        else:
+            bolo_func(f"{city} के लिए आज ({today_formatted}) की बारिश की जानकारी नहीं मिल सकी।")
+
+    elif any(phrase in command for phrase in Config.rain_tomorrow):
+        if tomorrow_str in time_list:
+            idx = time_list.index(tomorrow_str)
+            pop = prob_list[idx]
+            if pop > 45:
+                 bolo_func(f"हाँ, कल, यानी {tomorrow_formatted} को, {city} में बारिश होने की {pop} प्रतिशत संभावना है।")
+            else:
+                bolo_func(f"नहीं, कल, यानी {tomorrow_formatted} को, {city} में बारिश की संभावना काफी कम है।")
+        else:
+             bolo_func(f"{city} के लिए कल ({tomorrow_formatted}) की बारिश की जानकारी नहीं मिल सकी।")
+
+    else: # General "kab hogi" query
+        found_rain = False
+        for i in range(1, len(time_list)):
+            if prob_list[i] > 50:
+                day_map = {1: "कल", 2: "परसों"}
+                day_name = day_map.get(i, f"{i} दिन बाद")
+                date_str = time_list[i]
+                date_formatted = _format_date_hindi(date_str)
+                pop_percent = prob_list[i]
+                bolo_func(f"{city} में अगली बारिश की संभावना {day_name}, यानी {date_formatted} को है, जो कि {pop_percent} प्रतिशत है।")
+                found_rain = True
+                break
+
+        if not found_rain:
+            bolo_func(f"{city} में अगले हफ्ते तक बारिश की कोई खास संभावना नहीं दिख रही है।")
+
 # Weather.py में
 
+def _fetch_current_weather(city):
+    """Fetches current weather for a city from OpenWeatherMap."""
+    response = http.get(_current_weather_url(city))
+    response.raise_for_status()
+    return response.json()
+
+async def _fetch_current_weather_async(city):
+    """Async _fetch_current_weather"""
+    response = await http.aget(_current_weather_url(city))
+    response.raise_for_status()
+    return response.json()
+
 def get_general_weather(command, city_to_check, bolo_func):
     """Provides general weather details."""
     try:
-        url = (f"http://api.openweathermap.org/data/2.5/weather?"
-               f"q={city_to_check}&appid={os.getenv('WEATHER_API_KEY')}&units=metric&lang=hi")
-        
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        weather_data = response.json()
-        
-        if 'main' in weather_data and 'weather' in weather_data and 'wind' in weather_data:
-            temp = weather_data['main']['temp']
-            humidity = weather_data['main']['humidity']
-            description = weather_data['weather'][0]['description']
-            wind_speed_ms = weather_data['wind']['speed']
-            wind_speed_kph = wind_speed_ms * 3.6
-
-            if any(phrase in command for phrase in Config.weather_full_report):
-                response_string = (f"{city_to_check} में, तापमान {temp:.1f} डिग्री सेल्सियस है, नमी {humidity} प्रतिशत है, "
-                                   f"हवा की गति {wind_speed_kph:.1f} किलोमीटर प्रति घंटा है और "
-                                   f"आसमान में {description} की उम्मीद है।")
-            elif any(phrase in command for phrase in Config.weather_temperature):
-                response_string = (f"{city_to_check} में अभी का तापमान {temp:.1f} डिग्री सेल्सियस है "
-                                   f"और हवा में नमी {humidity} प्रतिशत है।")
-            elif any(phrase in command for phrase in Config.weather_wind):
-                response_string = f"{city_to_check} में हवा की गति {wind_speed_kph:.1f} किलोमीटर प्रति घंटा है।"
-            else:
-                response_string = (f"{city_to_check} में आज आसमान में {description} की उम्मीद है "
-                                   f"और तापमान लगभग {temp:.1f} डिग्री सेल्सियस है।")
-            print(response_string)
-            bolo_func(response_string)
-        else:
-            bolo_func("माफ़ कीजिए, मैं मौसम का विवरण प्राप्त नहीं कर सका।")
+        # Concurrent requests for the same city share one upstream call
+        weather_data = single_flight.do(make_key('weather', city_to_check),
+                                        _fetch_current_weather, city_to_check)
+        _speak_current_weather(command, city_to_check, weather_data, bolo_func)
+    except Exception as e:
+        print(f"General weather error: {e}")
+        bolo_func("मौसम की जानकारी लेते समय एक त्रुटि हुई।")
+
+async def get_general_weather_async(command, city_to_check, bolo_func):
+    """Async get_general_weather"""
+    try:
+        weather_data = await single_flight.do_async(make_key('weather', city_to_check),
+                                                    _fetch_current_weather_async, city_to_check)
+        _speak_current_weather(command, city_to_check, weather_data, bolo_func)
     except Exception as e:
         print(f"General weather error: {e}")
         bolo_func("मौसम की जानकारी लेते समय एक त्रुटि हुई।")
 
+def _speak_current_weather(command, city_to_check, weather_data, bolo_func):
+    """Reports the part of the current weather the command asks about"""
+    if 'main' in weather_data and 'weather' in weather_data and 'wind' in weather_data:
+        temp = weather_data['main']['temp']
+        humidity = weather_data['main']['humidity']
+        description = weather_data['weather'][0]['description']
+        wind_speed_ms = weather_data['wind']['speed']
+        wind_speed_kph = wind_speed_ms * 3.6
 
-def get_weather(command, bolo_func):
-    """Finds the location, then routes to the correct weather/rain function."""
+        if any(phrase in command for phrase in Config.weather_full_report):
+            response_string = (f"{city_to_check} में, तापमान {temp:.1f} डिग्री सेल्सियस है, नमी {humidity} प्रतिशत है, "
+                               f"हवा की गति {wind_speed_kph:.1f} किलोमीटर प्रति घंटा है और "
+                               f"आसमान में {description} की उम्मीद है।")
+        elif any(phrase in command for phrase in Config.weather_temperature):
+            response_string = (f"{city_to_check} में अभी का तापमान {temp:.1f} डिग्री सेल्सियस है "
+                               f"और हवा में नमी {humidity} प्रतिशत है।")
+        elif any(phrase in command for phrase in Config.weather_wind):
+            response_string = f"{city_to_check} में हवा की गति {wind_speed_kph:.1f} किलोमीटर प्रति घंटा है।"
+        else:
+            response_string = (f"{city_to_check} में आज आसमान में {description} की उम्मीद है "
+                               f"और तापमान लगभग {temp:.1f} डिग्री सेल्सियस है।")
+        print(response_string)
+        bolo_func(response_string)
+    else:
+        bolo_func("माफ़ कीजिए, मैं मौसम का विवरण प्राप्त नहीं कर सका।")
+
+
+def _resolve_city(command, bolo_func):
+    """Finds the city in the command, defaulting to Lucknow; True as second value for rain queries."""
     location = _parse_location(command)
     city_to_check = location if location else "Lucknow"
     
     if not location and ("मौसम" in command or "बारिश" in command):
         bolo_func(f"आपने शहर का नाम नहीं बताया, इसलिए मैं लखनऊ की जानकारी दे रहा हूँ।")
     
-    if any(phrase in command for phrase in Config.rain_trigger) or any(phrase in command for phrase in Config.rain_most_significant):
+    is_rain = (any(phrase in command for phrase in Config.rain_trigger)
+               or any(phrase in command for phrase in Config.rain_most_significant))
+    return city_to_check, is_rain
+
+
+def get_weather(command, bolo_func):
+    """Finds the location, then routes to the correct weather/rain function."""
+    city_to_check, is_rain = _resolve_city(command, bolo_func)
+    if is_rain:
         get_rain_forecast(command, city_to_check, bolo_func)
     else:
-        get_general_weather(command, city_to_check, bolo_func)
\ No newline at end of file
+        get_general_weather(command, city_to_check, bolo_func)
+
+
+async def get_weather_async(command, bolo_func):
+    """Async get_weather for the ASGI server: upstream calls are awaited, not blocked on."""
+    city_to_check, is_rain = _resolve_city(command, bolo_func)
+    if is_rain:
+        await get_rain_forecast_async(command, city_to_check, bolo_func)
+    else:
+        await get_general_weather_async(command, city_to_check, bolo_func)
\ No newline at end of file
@@ -3,7 +3,7 @@ Vaani Web Interface - Flask Application
 Provides a web UI for the Vaani voice assistant
 """
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
 import os
 import sys
@@ -15,7 +15,9 @@ import hashlib
 import time
 import glob
 import threading
-import requests
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
 # Fix Unicode encoding for Windows console
@@ -25,11 +27,21 @@ if sys.platform == 'win32':
 
 # Import Vaani core modules
 from vaani.core import config as Config
-from vaani.core.voice_tool import bolo_stream as bolo, text_to_speech_file
-from vaani.core.language_manager import get_language_manager
+from vaani.core.voice_tool import bolo_stream as bolo, text_to_speech_file, break_tag
+from vaani.core.audio_cache import get_audio_cache
+from vaani.core.phrase_bundle import get_phrase_bundle
+from vaani.core.tts_engines import get_tts_selector
+from vaani.core.language_manager import get_language_manager, LanguageContext, DEFAULT_LANGUAGE
 from vaani.core.context_manager import NewsContext, AgriculturalContext, SchemeContext
 from vaani.core.offline_mode import OfflineMode
+from vaani.core.connectivity import get_connectivity_monitor
+from vaani.core.intent_router import get_intent_router
+from vaani.core.single_flight import single_flight
+from vaani.core import http
 from vaani.core import api_key_manager
+from vaani.core import workers
+from vaani.core.session_store import get_session_store
+from vaani.core.answer_cache import get_answer_cache
 
 # Import services
 from vaani.services.time.time_service import current_time, get_date_of_day_in_week
@@ -37,6 +49,7 @@ from vaani.services.weather.weather_service import get_weather
 from vaani.services.news.news_service import get_news, process_news_selection
 from vaani.services.knowledge.wikipedia_service import search_wikipedia
 from vaani.services.agriculture.agri_command_processor import process_agriculture_command
+from vaani.services.agriculture.price_history import get_price_history, get_price_prefetcher
 from vaani.services.social.social_scheme_service import handle_social_schemes_query
 from vaani.services.knowledge.general_knowledge_service import handle_general_knowledge_query
 from vaani.services.finance.financial_literacy_service import handle_financial_query
@@ -54,97 +67,35 @@ CORS(app)
 api_key_manager.setup_api_keys()
 lang_manager = get_language_manager()
 offline_mgr = OfflineMode()
+intent_router = get_intent_router()
+connectivity = get_connectivity_monitor()
 
-# Session storage (in production, use Redis or database)
-user_sessions = {}
+
+@connectivity.on_change
+def announce_connectivity(online):
+    print(f"🌐 Connectivity changed: {'online' if online else 'offline (using cached answers)'}")
+
+# Session state; shared across workers when SESSION_BACKEND=sqlite
+session_store = get_session_store()
+
+# Synthesized audio is cached by content; the greeting is requested by every new visitor
+GREETING_TEXT = Config.web_greeting_text
+audio_cache = get_audio_cache()
+audio_cache.pin(GREETING_TEXT, 'hi')
+# Fixed responses (greetings, prompts, fallbacks) are served from the pre-rendered bundle
+phrase_bundle = get_phrase_bundle()
+# Mandi prices are fetched in bulk in the background and read locally
+price_prefetcher = get_price_prefetcher()
+
+# Synthesizes streamed response chunks while earlier ones are playing
+STREAM_TTS_WORKERS = 3
+stream_tts_executor = ThreadPoolExecutor(max_workers=STREAM_TTS_WORKERS, thread_name_prefix='stream-tts')
 
 # Keep-alive configuration for Render free tier
 KEEP_ALIVE_INTERVAL = 14 * 60  # 14 minutes (just under 15 min timeout)
 KEEP_ALIVE_ENABLED = os.getenv('KEEP_ALIVE_ENABLED', 'true').lower() == 'true'
 RENDER_EXTERNAL_URL = os.getenv('RENDER_EXTERNAL_URL', '')  # Set by Render automatically
 
-def cleanup_old_audio_files(max_age_minutes=30, max_files=50):
-    """
-    Clean up old audio files from cache directory to prevent disk space issues
-    
-    Args:
-        max_age_minutes: Delete files older than this many minutes (default: 30)
-        max_files: Maximum number of files to keep (default: 50)
-    """
-    try:
-        cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
-        
-        if not os.path.exists(cache_dir):
-            return
-        
-        # Get all audio files with their timestamps
-        audio_files = []
-        for filename in os.listdir(cache_dir):
-            if filename.endswith('.mp3'):
-                filepath = os.path.join(cache_dir, filename)
-                try:
-                    mtime = os.path.getmtime(filepath)
-                    size = os.path.getsize(filepath)
-                    audio_files.append({
-                        'path': filepath,
-                        'name': filename,
-                        'mtime': mtime,
-                        'age_minutes': (time.time() - mtime) / 60,
-                        'size': size
-                    })
-                except Exception as e:
-                    print(f"[Cleanup Warning]: Could not stat {filename}: {e}")
-        
-        if not audio_files:
-            return
-        
-        deleted_count = 0
-        deleted_size = 0
-        
-        # Sort by modification time (oldest first)
-        audio_files.sort(key=lambda x: x['mtime'])
-        
-        print(f"\n[Audio Cleanup]: Found {len(audio_files)} audio files in cache")
-        
-        # Delete files older than max_age_minutes
-        current_time = time.time()
-        for file_info in audio_files[:]:
-            age_minutes = file_info['age_minutes']
-            if age_minutes > max_age_minutes:
-                try:
-                    os.remove(file_info['path'])
-                    deleted_count += 1
-                    deleted_size += file_info['size']
-                    audio_files.remove(file_info)
-                    print(f"  ✅ Deleted old file: {file_info['name']} (age: {age_minutes:.1f} min)")
-                except Exception as e:
-                    print(f"  ❌ Failed to delete {file_info['name']}: {e}")
-        
-        # If still too many files, delete oldest ones
-        if len(audio_files) > max_files:
-            files_to_delete = len(audio_files) - max_files
-            print(f"[Audio Cleanup]: Too many files ({len(audio_files)}), deleting {files_to_delete} oldest")
-            
-            for file_info in audio_files[:files_to_delete]:
-                try:
-                    os.remove(file_info['path'])
-                    deleted_count += 1
-                    deleted_size += file_info['size']
-                    print(f"  ✅ Deleted excess file: {file_info['name']}")
-                except Exception as e:
-                    print(f"  ❌ Failed to delete {file_info['name']}: {e}")
-        
-        if deleted_count > 0:
-            print(f"[Audio Cleanup]: ✅ Deleted {deleted_count} files, freed {deleted_size / 1024:.1f} KB")
-            print(f"[Audio Cleanup]: {len(audio_files) - deleted_count} files remaining\n")
-        else:
-            print(f"[Audio Cleanup]: No cleanup needed, {len(audio_files)} files within limits\n")
-            
-    except Exception as e:
-        print(f"[Audio Cleanup Error]: {e}")
-        import traceback
-        traceback.print_exc()
-
 def keep_alive_ping():
     """
     Keep-alive function to prevent Render free tier from spinning down.
@@ -161,7 +112,7 @@ def keep_alive_ping():
                 url = "http://localhost:5000/api/health"
             
             print(f"\n[Keep-Alive] Pinging service at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            response = requests.get(url, timeout=10)
+            response = http.get(url, timeout=10)
             
             if response.status_code == 200:
                 print(f"[Keep-Alive] ✅ Ping successful - Service is alive")
@@ -206,6 +157,137 @@ def capture_output(func, *args, **kwargs):
     except Exception as e:
         return None, [str(e)]
 
+def get_session(session_id):
+    """Get or create the state kept for a web session (a copy; see save_session)"""
+    return session_store.get(session_id)
+
+def language_of(session):
+    """The request's language context, from the session"""
+    return LanguageContext(session.get('language', DEFAULT_LANGUAGE), lang_manager)
+
+def save_session(session_id, session):
+    """Persist a session's changes and extend its expiry"""
+    try:
+        session_store.save(session_id, session)
+    except Exception as e:
+        print(f"[Session Error]: {e}")
+
+def dispatch_command(command, session, say):
+    """
+    Route a command to its service.
+    Every response chunk is passed to say(text) as soon as the service emits it.
+    """
+    command_lower = command.lower()
+    print(f"Command (lowercase): {command_lower}")
+
+    # Label the command with every matching intent in one pass
+    intents = intent_router.match(command)
+    print(f"Matched intents: {intents.intents}")
+    print(f"Session state: {session}")
+    
+    # PRIORITY 1: Emergency - Handle FIRST and FAST
+    print("Checking emergency...")
+    if intents.has('emergency') and handle_emergency_query(command, say):
+        print("Emergency query handled")
+    
+    # PRIORITY 2: Language switching
+    elif intents.has('language_switch'):
+        print("Language switch detected")
+        # Only this session switches; other users keep their language
+        if 'english' in command_lower or 'अंग्रेजी' in command_lower:
+            session['language'] = 'en'
+            say("Switched to English. How can I help you?")
+        elif 'hindi' in command_lower or 'हिंदी' in command_lower:
+            session['language'] = 'hi'
+            say("हिंदी में बदल गया। मैं आपकी कैसे मदद कर सकता हूं?")
+    
+    # Handle news selection if waiting
+    elif session.get('waiting_for_news', False):
+        print("Processing news selection...")
+        context = NewsContext(session.get('articles', []))
+        if process_news_selection(command, say, context):
+            session['waiting_for_news'] = False
+            session['articles'] = []
+    
+    # Time requests
+    elif intents.has('time'):
+        print("Time query detected")
+        current_time(say)
+    
+    # Date requests
+    elif intents.has('date'):
+        print("Date query detected")
+        get_date_of_day_in_week(command, say)
+    
+    # Weather
+    elif intents.has('weather'):
+        print("Weather query detected")
+        get_weather(command, say)
+    
+    # News
+    elif intents.has('news'):
+        print("News query detected")
+        articles = get_news(command, say)
+        if articles:
+            session['articles'] = articles
+            session['waiting_for_news'] = True
+    
+    # Wikipedia
+    elif intents.has('wikipedia'):
+        print("Wikipedia query detected")
+        search_wikipedia(command, say)
+    
+    # Financial Literacy
+    elif intents.has('financial') and handle_financial_query(command, say):
+        print("Financial query handled")
+    
+    # Calculator
+    elif intents.has('calculation') and handle_calculation_query(command, say):
+        print("Calculator query handled")
+    
+    # Expense Tracker
+    elif intents.has('expense'):
+        print("Expense tracker query detected")
+        result = process_expense_command(command, get_user_id())
+        if result:
+            say(result)
+    
+    # Agriculture
+    elif intents.has('agriculture'):
+        print("Agriculture query detected")
+        context = AgriculturalContext()
+        process_agriculture_command(command, say, {}, context)
+    
+    # Social schemes
+    elif intents.has('social_scheme'):
+        print("Social scheme query detected")
+        context = SchemeContext()
+        handle_social_schemes_query(command, say, context)
+    
+    # General Knowledge
+    elif intents.has('general_knowledge', 'question_mark'):
+        print("General knowledge query detected")
+        if not handle_general_knowledge_query(command, say):
+            say(language_of(session).get_phrase('error'))
+    
+    # Greeting
+    elif intents.has('greeting'):
+        print("Greeting detected")
+        import random
+        say(random.choice(Config.greeting_responses))
+    
+    # Fallback for unrecognized queries - Try Gemini AI
+    else:
+        print("Unrecognized query - trying Gemini AI for general question")
+        
+        # Try to answer using Gemini AI
+        if handle_general_knowledge_query(command, say):
+            print("✅ Gemini AI handled the query")
+        else:
+            # If Gemini also fails, show error
+            print("❌ Gemini AI could not handle query - showing error")
+            say("मुझे आपका सवाल समझ नहीं आया। कृपया दोबारा कोशिश करें।")
+
 def process_command(command, session_id=None):
     """
     Process a text command and return response
@@ -219,168 +301,45 @@ def process_command(command, session_id=None):
     if not command or not command.strip():
         return {
             'success': False,
-            'text': lang_manager.get_phrase('error'),
+            'text': lang_manager.get_phrase('error', DEFAULT_LANGUAGE),
             'message': 'Empty command'
         }
     
     response_text = []
+    spoken_text = []    # the same chunks with their pause hints as break tags
     audio_file = None
     
-    def web_bolo(text, lang='hi', **kwargs):
+    def web_bolo(text, lang='hi', pause=0.0, **kwargs):
         """Custom bolo function that collects text"""
         if text and text.strip():
             print(f"[web_bolo] Captured: {text}")
             response_text.append(text)
+            spoken_text.append(text + break_tag(pause))
         return text  # Return text for compatibility
     
-    command_lower = command.lower()
-    print(f"Command (lowercase): {command_lower}")
-    
     try:
-        # Get or create session
-        if session_id not in user_sessions:
-            user_sessions[session_id] = {
-                'articles': [],
-                'waiting_for_news': False,
-                'language': 'hi',
-                'context': None
-            }
-        
-        session = user_sessions[session_id]
-        print(f"Session state: {session}")
-        
-        # PRIORITY 1: Emergency - Handle FIRST and FAST
-        print("Checking emergency...")
-        if handle_emergency_query(command, web_bolo):
-            print("Emergency query handled")
-        
-        # PRIORITY 2: Language switching
-        elif any(word in command_lower for word in ['english', 'hindi', 'hinglish', 'हिंदी', 'अंग्रेजी']):
-            print("Language switch detected")
-            if 'english' in command_lower or 'अंग्रेजी' in command_lower:
-                lang_manager.set_language('en')
-                session['language'] = 'en'
-                response_text.append("Switched to English. How can I help you?")
-            elif 'hindi' in command_lower or 'हिंदी' in command_lower:
-                lang_manager.set_language('hi')
-                session['language'] = 'hi'
-                response_text.append("हिंदी में बदल गया। मैं आपकी कैसे मदद कर सकता हूं?")
-        
-        # Handle news selection if waiting
-        elif session.get('waiting_for_news', False):
-            print("Processing news selection...")
-            context = NewsContext(session.get('articles', []))
-            if process_news_selection(command, web_bolo, context):
-                session['waiting_for_news'] = False
-                session['articles'] = []
-        
-        # Time requests
-        elif any(phrase in command for phrase in Config.timedekh):
-            print("Time query detected")
-            current_time(web_bolo)
-        
-        # Date requests
-        elif any(phrase in command for phrase in Config.date_trigger):
-            print("Date query detected")
-            get_date_of_day_in_week(command, web_bolo)
-        
-        # Weather
-        elif any(word in command for word in Config.weather_trigger + Config.rain_trigger):
-            print("Weather query detected")
-            get_weather(command, web_bolo)
-        
-        # News
-        elif any(phrase in command for phrase in Config.news_trigger):
-            print("News query detected")
-            articles = get_news(command, web_bolo)
-            if articles:
-                session['articles'] = articles
-                session['waiting_for_news'] = True
-        
-        # Wikipedia
-        elif any(phrase in command for phrase in Config.wikipedia_trigger):
-            print("Wikipedia query detected")
-            search_wikipedia(command, web_bolo)
-        
-        # Financial Literacy
-        elif handle_financial_query(command, web_bolo):
-            print("Financial query handled")
-        
-        # Calculator
-        elif handle_calculation_query(command, web_bolo):
-            print("Calculator query handled")
-        
-        # Expense Tracker
-        elif any(word in command_lower for word in ["खर्च", "खर्चा", "expense", "पैसा", "रुपये", "हिसाब"]):
-            print("Expense tracker query detected")
-            result = process_expense_command(command, get_user_id())
-            if result:
-                response_text.append(result)
-        
-        # Agriculture
-        elif (any(word in command_lower for word in Config.agri_trigger) or 
-              any(crop in command_lower for crop in Config.agri_commodities)):
-            print("Agriculture query detected")
-            context = AgriculturalContext()
-            process_agriculture_command(command, web_bolo, {}, context)
-        
-        # Social schemes
-        elif any(phrase in command_lower for phrase in Config.social_scheme_trigger):
-            print("Social scheme query detected")
-            context = SchemeContext()
-            handle_social_schemes_query(command, web_bolo, context)
-        
-        # General Knowledge
-        elif (any(trigger in command_lower for trigger in Config.general_knowledge_triggers) or 
-              '?' in command):
-            print("General knowledge query detected")
-            if not handle_general_knowledge_query(command, web_bolo):
-                response_text.append(lang_manager.get_phrase('error'))
-        
-        # Greeting
-        elif any(phrase in command for phrase in Config.greeting_triggers):
-            print("Greeting detected")
-            import random
-            response_text.append(random.choice(Config.greeting_responses))
-        
-        # Fallback for unrecognized queries - Try Gemini AI
-        else:
-            print("Unrecognized query - trying Gemini AI for general question")
-            
-            # Try to answer using Gemini AI
-            if handle_general_knowledge_query(command, web_bolo):
-                print("✅ Gemini AI handled the query")
-            else:
-                # If Gemini also fails, show error
-                print("❌ Gemini AI could not handle query - showing error")
-                response_text.append("मुझे आपका सवाल समझ नहीं आया। कृपया दोबारा कोशिश करें।")
+        session = get_session(session_id)
+        dispatch_command(command, session, web_bolo)
+        save_session(session_id, session)
 
-        # Generate audio file for response
-        full_response = ' '.join(response_text) if response_text else lang_manager.get_phrase('error')
+        # Generate audio file for response, in the session's language (it may have just changed)
+        lang = language_of(session)
+        full_response = ' '.join(response_text) if response_text else lang.get_phrase('error')
         print(f"\n[Response Generated]: {full_response[:200]}...")
         print(f"[Response Length]: {len(full_response)} characters")
 
         # Create audio file
         audio_file = None
         try:
-            # Limit audio generation to reasonable length (max 1000 characters)
-            # Long text takes too long and may fail
-            audio_text = full_response
-            if len(full_response) > 1000:
-                print(f"[Audio Warning]: Text too long ({len(full_response)} chars), truncating for audio...")
-                # Take first 900 characters and add "..." 
-                audio_text = full_response[:900] + "... अधिक जानकारी के लिए कृपया पढ़ें।"
-            
-            print(f"[Audio Generation]: Starting for {len(audio_text)} characters...")
-            audio_path = text_to_speech_file(audio_text, lang=lang_manager.get_tts_code())
+            # Long answers are synthesized as parallel sentence chunks, so no truncation is needed
+            print(f"[Audio Generation]: Starting for {len(full_response)} characters...")
+            spoken_response = ' '.join(spoken_text) if spoken_text else full_response
+            audio_path = text_to_speech_file(spoken_response, lang=lang.get_tts_code())
             
             if audio_path and os.path.exists(audio_path):
                 # Store relative path for serving
                 audio_file = os.path.basename(audio_path)
                 print(f"[Audio Generated]: {audio_file}")
-                
-                # Clean up old audio files periodically
-                cleanup_old_audio_files(max_age_minutes=30, max_files=50)
             else:
                 print(f"[Audio Warning]: No audio file generated")
         except Exception as e:
@@ -414,6 +373,97 @@ def process_command(command, session_id=None):
             'message': str(e)
         }
 
+def _sse_event(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+def _synthesize_chunk(text, lang=DEFAULT_LANGUAGE):
+    """Synthesize one response chunk (lang is a TTS code) and return its audio URL (or None)"""
+    try:
+        audio_path = text_to_speech_file(text, lang=lang)
+        if audio_path and os.path.exists(audio_path):
+            return f'/api/audio/{os.path.basename(audio_path)}'
+    except Exception as e:
+        print(f"[Stream Audio Error]: {e}")
+    return None
+
+def stream_command(command, session_id=None):
+    """
+    Process a command and yield Server-Sent Events.
+
+    The command runs in a worker thread; each chunk a service speaks is sent
+    to TTS right away, so later chunks are synthesized while the browser plays
+    earlier ones. Chunks are always emitted in the order they were spoken:
+        event: chunk  data: {index, text, audio_file}
+        event: done   data: {success, text, language, waiting_for_news}
+    """
+    session = get_session(session_id)
+    spoken = queue.Queue()
+    finished = object()
+    errors = []
+
+    def web_bolo(text, lang='hi', pause=0.0, **kwargs):
+        if text and text.strip():
+            print(f"[stream] Chunk: {text}")
+            # Spoken in the session's language as of this chunk
+            spoken.put((text, pause, language_of(session).get_tts_code()))
+        return text
+
+    def run():
+        try:
+            dispatch_command(command, session, web_bolo)
+            save_session(session_id, session)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            errors.append(str(e))
+        finally:
+            spoken.put(finished)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    pending = deque()   # (index, text, future) in speaking order
+    texts = []
+    done = False
+    while not done or pending:
+        # Emit the next chunk as soon as its audio is ready
+        if pending and pending[0][2].done():
+            index, text, future = pending.popleft()
+            yield _sse_event('chunk', {'index': index, 'text': text, 'audio_file': future.result()})
+            continue
+
+        if done:
+            pending[0][2].result()   # wait for the head chunk's audio
+            continue
+
+        try:
+            item = spoken.get(timeout=0.05 if pending else None)
+        except queue.Empty:
+            continue
+
+        if item is finished:
+            done = True
+            if texts or errors:
+                continue
+            lang = language_of(session)
+            item = (lang.get_phrase('error'), 0.0, lang.get_tts_code())
+
+        # A pause hint becomes trailing silence in the chunk's audio
+        text, pause, tts_lang = item
+        texts.append(text)
+        pending.append((len(texts) - 1, text,
+                        stream_tts_executor.submit(_synthesize_chunk, text + break_tag(pause), tts_lang)))
+
+    if errors:
+        yield _sse_event('done', {'success': False, 'text': f"Error: {errors[0]}", 'message': errors[0]})
+    else:
+        yield _sse_event('done', {
+            'success': True,
+            'text': ' '.join(texts),
+            'language': session.get('language', 'hi'),
+            'waiting_for_news': session.get('waiting_for_news', False)
+        })
+
 @app.route('/')
 def index():
     """Serve the main web interface"""
@@ -450,13 +500,37 @@ def query():
             'message': str(e)
         }), 500
 
+@app.route('/api/query/stream', methods=['GET', 'POST'])
+def query_stream():
+    """Stream the response to a query as Server-Sent Events, one event per spoken chunk"""
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+    else:
+        data = request.args
+    
+    command = (data.get('query') or '').strip()
+    session_id = data.get('session_id', 'default')
+    
+    if not command:
+        return jsonify({
+            'success': False,
+            'message': 'No query provided'
+        }), 400
+    
+    print(f"Streaming command: '{command}' for session: {session_id}")
+    response = Response(stream_with_context(stream_command(command, session_id)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/api/audio/<path:filename>')
 def serve_audio(filename):
     """Serve generated audio files"""
     try:
         # Get absolute path to cache directory
-        cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
-        audio_path = os.path.join(cache_dir, filename)
+        cache_dir = audio_cache.cache_dir
+        audio_path = phrase_bundle.path_for_file(filename) or os.path.join(cache_dir, filename)
         
         print(f"\n[Audio Request]")
         print(f"  Filename: {filename}")
@@ -472,7 +546,7 @@ def serve_audio(filename):
             # Send file with proper headers
             response = send_file(
                 audio_path, 
-                mimetype='audio/mpeg',
+                mimetype='audio/wav' if filename.endswith('.wav') else 'audio/mpeg',
                 as_attachment=False,
                 download_name=filename
             )
@@ -506,27 +580,26 @@ def status():
     """Get system status"""
     return jsonify({
         'online': offline_mgr.is_online(),
-        'language': lang_manager.current_language,
-        'languages_available': ['hi', 'en', 'hi-en']
+        'connectivity': connectivity.get_state(),
+        'default_language': DEFAULT_LANGUAGE,
+        'languages_available': ['hi', 'en', 'hi-en'],
+        'upstream_calls': single_flight.get_stats(),
+        'http': http.get_http_client().get_stats(),
+        'audio_cache': audio_cache.get_stats(),
+        'phrase_bundle': phrase_bundle.get_stats(),
+        'tts_engines': get_tts_selector().get_stats(),
+        'sessions': session_store.get_stats(),
+        'answer_cache': get_answer_cache().get_stats(),
+        'price_history': get_price_history().get_stats()
     })
 
 @app.route('/api/cleanup-audio', methods=['POST'])
 def cleanup_audio():
-    """Manual cleanup endpoint for audio files"""
+    """Run the audio cache janitor now (evicts down to the disk budget)"""
     try:
-        max_age = request.json.get('max_age_minutes', 30) if request.json else 30
-        max_files = request.json.get('max_files', 50) if request.json else 50
-        
-        cache_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
-        
-        # Get count before cleanup
-        before_count = len([f for f in os.listdir(cache_dir) if f.endswith('.mp3')]) if os.path.exists(cache_dir) else 0
-        
-        # Run cleanup
-        cleanup_old_audio_files(max_age_minutes=max_age, max_files=max_files)
-        
-        # Get count after cleanup
-        after_count = len([f for f in os.listdir(cache_dir) if f.endswith('.mp3')]) if os.path.exists(cache_dir) else 0
+        before_count = audio_cache.get_stats()['files']
+        audio_cache.run_janitor()
+        after_count = audio_cache.get_stats()['files']
         
         return jsonify({
             'success': True,
@@ -578,16 +651,30 @@ def test_audio():
             'message': str(e)
         }), 500
 
+@app.before_request
+def count_request():
+    workers.note_request()
+
 @app.route('/api/health')
 def health():
-    """Health check endpoint"""
-    return jsonify({'status': 'ok', 'service': 'Vaani Web UI'})
+    """Health check endpoint (answered by whichever worker got the request)"""
+    return jsonify({'status': 'ok', 'service': 'Vaani Web UI', 'worker': workers.worker_health()})
+
+@app.route('/api/health/workers')
+def workers_health():
+    """Every worker's last heartbeat; 503 if any has stopped responding"""
+    all_workers = workers.all_workers()
+    healthy = all(info['healthy'] for info in all_workers)
+    return jsonify({
+        'status': 'ok' if healthy else 'degraded',
+        'workers': all_workers
+    }), 200 if healthy else 503
 
 @app.route('/api/greeting')
 def greeting():
     """Generate greeting audio for first mic click"""
     try:
-        greeting_text = "नमस्ते! मैं वाणी हूं, आपकी आवाज सहायक। आप मुझसे मौसम, समाचार, सरकारी योजनाएं और बहुत कुछ पूछ सकते हैं।"
+        greeting_text = GREETING_TEXT
         
         print(f"\n[Greeting Request]")
         print(f"  Generating audio for greeting...")
@@ -627,12 +714,15 @@ if __name__ == '__main__':
     print("=" * 60)
     print("🌾 Vaani Web Interface Starting...")
     print("=" * 60)
-    print(f"Language: {lang_manager.get_language_name()}")
+    print(f"Default language: {lang_manager.get_language_name(DEFAULT_LANGUAGE)}")
     
-    # Clean up old audio files on startup
+    # Enforce the audio cache budget now and keep doing it in the background
     print("\n🧹 Running startup cleanup...")
-    cleanup_old_audio_files(max_age_minutes=30, max_files=50)
-    print(f"Online: {'Yes' if offline_mgr.is_online() else 'No (Offline Mode)'}")
+    audio_cache.run_janitor()
+    audio_cache.start_janitor()
+    connectivity.start()
+    print("Online: checking in the background")
+    price_prefetcher.start()
     
     # Start keep-alive service for Render
     start_keep_alive()